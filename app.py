@@ -8,12 +8,17 @@ os.environ['PYTHONDONTWRITEBYTECODE'] = '1'
 BASE_DIR  = os.path.dirname(os.path.abspath(__file__))
 BIN_DIR   = os.path.join(BASE_DIR, 'binaries')
 if BASE_DIR not in sys.path: sys.path.insert(0, BASE_DIR)
-from system.utils import ConsoleManager, ProcessManager, MPVSafetyManager, DependencyDoctor
-from system import diagnostic_runtime
-from PyQt5.QtWidgets import QApplication, QMessageBox, QProgressDialog, QStyle, QLineEdit, QTextEdit, QPlainTextEdit, QAbstractSpinBox
-from PyQt5.QtCore import QCoreApplication, QObject, QThread, pyqtSignal, QTimer, Qt, QLocale, QEvent
-from PyQt5.QtGui import QIcon
-from ui.styles import UIStyles
+from system.startup_profile import StartupProfile
+STARTUP = StartupProfile("main_app")
+with STARTUP.stage("import_system"):
+    from system.utils import ConsoleManager, ProcessManager, MPVSafetyManager, DependencyDoctor
+    from system import diagnostic_runtime
+with STARTUP.stage("import_qt"):
+    from PyQt5.QtWidgets import QApplication, QMessageBox, QProgressDialog, QStyle, QLineEdit, QTextEdit, QPlainTextEdit, QAbstractSpinBox, QSplashScreen
+    from PyQt5.QtCore import QCoreApplication, QObject, QThread, pyqtSignal, QTimer, Qt, QLocale, QEvent
+    from PyQt5.QtGui import QIcon, QPixmap
+with STARTUP.stage("import_ui_styles"):
+    from ui.styles import UIStyles
 logger = ConsoleManager.initialize(BASE_DIR, "main_app.log", "Main_App")
 import traceback
 import threading
@@ -118,8 +123,8 @@ def get_ffmpeg_hwaccels(ffmpeg_path: str) -> list:
             if line and not line.startswith("Hardware acceleration methods:"): hwaccels.append(line)
         return hwaccels
     except Exception: return []
-from processing.media_utils import check_encoder_capability as _check_encoder_capability
 def check_encoder_capability(ffmpeg_path: str, encoder_name: str) -> bool:
+    from processing.media_utils import check_encoder_capability as _check_encoder_capability
     logger.info(f"GPU: Testing encoder '{encoder_name}'...")
     res = _check_encoder_capability(ffmpeg_path, encoder_name, hardware_scan_details=HARDWARE_SCAN_DETAILS)
     if res: logger.info(f"GPU: Encoder '{encoder_name}' is WORKING.")
@@ -182,7 +187,30 @@ def show_startup_warning(app: QApplication, title: str, text: str):
             try: window.statusBar().showMessage(text, 8000); return
             except Exception: pass
     msg = QMessageBox(); msg.setIcon(QMessageBox.Warning); msg.setWindowTitle(title); msg.setText(text); msg.exec_()
+def app_icon_path() -> str:
+    preferred = os.path.join(BASE_DIR, "icons", "Video_Icon_File.ico"); fallback = os.path.join(BASE_DIR, "icons", "app_icon.ico")
+    return preferred if os.path.exists(preferred) else fallback
+def show_startup_splash(app: QApplication):
+    try:
+        pixmap = QPixmap(app_icon_path())
+        if pixmap.isNull(): return None
+        splash = QSplashScreen(pixmap.scaled(160, 160, Qt.KeepAspectRatio, Qt.SmoothTransformation))
+        splash.showMessage(tr("app_name"), Qt.AlignBottom | Qt.AlignHCenter, Qt.white); splash.show(); app.processEvents()
+        return splash
+    except Exception as e:
+        logger.debug(f"BOOT: Splash unavailable: {e}")
+        return None
+def hide_startup_splash(splash):
+    if splash is None: return
+    try: splash.hide()
+    except Exception: pass
+def boot_result(future, default, label: str):
+    try: return future.result()
+    except Exception as e:
+        logger.error(f"BOOT: Background task '{label}' failed: {e}")
+        return default
 RECOVERY_INSTANCE = None
+MAIN_WINDOW_INSTANCE = None
 
 def exception_hook(exctype, value, tb):
     error_text = "".join(traceback.format_exception(exctype, value, tb)); logger.critical(f"FATAL: Uncaught exception: {error_text}")
@@ -190,6 +218,11 @@ def exception_hook(exctype, value, tb):
     global RECOVERY_INSTANCE
     if RECOVERY_INSTANCE:
         RECOVERY_INSTANCE._skip_cleanup = True
+    if MAIN_WINDOW_INSTANCE is not None and hasattr(MAIN_WINDOW_INSTANCE, "_save_recovery_state"):
+        try:
+            MAIN_WINDOW_INSTANCE._save_recovery_state(sync=True, blocking=True)
+        except Exception as save_err:
+            logger.critical(f"FATAL: Could not save recovery state: {save_err}")
 
     try:
         app = QCoreApplication.instance()
@@ -220,17 +253,24 @@ if __name__ == "__main__":
                 with open(conf_path, 'w', encoding='utf-8') as f: json.dump(data, f, indent=4)
             else: logger.info(f"FILES: Config verified at {conf_path}")
         except Exception as e: logger.error(f"FILES: Error reading {conf_path}: {e}"); write_defaults()
-    validate_crops_coordinations()
-    ProcessManager.kill_orphans(); ProcessManager.cleanup_temp_files()
-    if os.environ.get("FVS_STATE_TRANSFER_RESTORE") != "1":
-        try:
-            from system.temp_video_workspace import cleanup_workspace
-            cleanup_workspace(logger)
-        except Exception as e:
-            logger.warning(f"TEMP_WORKSPACE: boot cleanup skipped: {e}")
-    logger.info("FILES: Verifying FFmpeg core..."); is_valid_deps, ffmpeg_path, dep_error = DependencyDoctor.check_ffmpeg(BASE_DIR); ffprobe_path = os.path.join(os.path.dirname(ffmpeg_path), "ffprobe.exe" if sys.platform == "win32" else "ffprobe")
-    if is_valid_deps: logger.info(f"FILES: FFmpeg core verified: {ffmpeg_path}")
-    else: logger.error(f"FILES: FFmpeg core verification failed: {dep_error}")
+    def boot_cleanup():
+        ProcessManager.kill_orphans(); ProcessManager.cleanup_temp_files()
+        if os.environ.get("FVS_STATE_TRANSFER_RESTORE") != "1":
+            try:
+                from system.temp_video_workspace import cleanup_workspace
+                cleanup_workspace(logger)
+            except Exception as e:
+                logger.warning(f"TEMP_WORKSPACE: boot cleanup skipped: {e}")
+    def verify_ffmpeg_core():
+        logger.info("FILES: Verifying FFmpeg core..."); is_valid_deps, ffmpeg_path, dep_error = DependencyDoctor.check_ffmpeg(BASE_DIR)
+        if is_valid_deps: logger.info(f"FILES: FFmpeg core verified: {ffmpeg_path}")
+        else: logger.error(f"FILES: FFmpeg core verification failed: {dep_error}")
+        return is_valid_deps, ffmpeg_path, dep_error
+    hud_config_task = STARTUP.submit("validate_hud_config", validate_crops_coordinations)
+    cleanup_task = STARTUP.submit("orphan_and_temp_cleanup", boot_cleanup)
+    ffmpeg_task = STARTUP.submit("verify_ffmpeg", verify_ffmpeg_core)
+    logger.info("FILES: Checking MPV dependencies...")
+    mpv_task = STARTUP.submit("probe_mpv", probe_mpv_dependencies)
     app = QCoreApplication.instance()
     if app is None: app = QApplication(sys.argv)
 
@@ -268,10 +308,6 @@ if __name__ == "__main__":
         time.sleep(0.5)
     if not success: logger.warning("BOOT: Single instance lock active. Exiting."); sys.exit(0)
     PID_FILE_HANDLE = pid_handle
-    logger.info("FILES: Checking MPV dependencies...")
-    mpv_ready, mpv_hint = probe_mpv_dependencies()
-    if not mpv_ready:
-        notify_mpv_probe_failure(mpv_hint)
     from system.recovery_manager import RecoveryManager
     recovery = RecoveryManager("main_app", logger)
     RECOVERY_INSTANCE = recovery
@@ -304,9 +340,15 @@ if __name__ == "__main__":
         for h in logger.handlers: h.flush()
     recovery.acquire_lock()
     app.aboutToQuit.connect(recovery.cleanup_lock)
-
-    from ui.main_window import VideoCompressorApp
+    splash = show_startup_splash(app)
+    with STARTUP.stage("import_main_window"):
+        from ui.main_window import VideoCompressorApp
+    is_valid_deps, ffmpeg_path, dep_error = boot_result(ffmpeg_task, (False, os.path.join(BIN_DIR, "ffmpeg.exe"), "FFmpeg verification did not complete."), "verify_ffmpeg"); ffprobe_path = os.path.join(os.path.dirname(ffmpeg_path), "ffprobe.exe" if sys.platform == "win32" else "ffprobe")
+    mpv_ready, mpv_hint = boot_result(mpv_task, (False, "MPV dependency check did not complete."), "probe_mpv")
+    if not mpv_ready:
+        hide_startup_splash(splash); notify_mpv_probe_failure(mpv_hint)
     if not is_valid_deps:
+         hide_startup_splash(splash)
          while True:
             action = show_dependency_error_dialog(ffmpeg_path, ffprobe_path, dep_error)
             if action == "open": continue
@@ -325,7 +367,7 @@ if __name__ == "__main__":
         except: pass
     icon_path = ""
     try:
-        preferred = os.path.join(BASE_DIR, "icons", "Video_Icon_File.ico"); fallback = os.path.join(BASE_DIR, "icons", "app_icon.ico"); icon_path = preferred if os.path.exists(preferred) else fallback
+        icon_path = app_icon_path()
         if os.path.exists(icon_path): app.setWindowIcon(QIcon(icon_path))
         else: app.setWindowIcon(app.style().standardIcon(QStyle.SP_ComputerIcon))
     except: pass
@@ -337,12 +379,19 @@ if __name__ == "__main__":
     if cached_hw == "NVIDIA": os.environ["VIDEO_HW_ENCODER"] = "h264_nvenc"
     elif cached_hw == "AMD": os.environ["VIDEO_HW_ENCODER"] = "h264_amf"
     elif cached_hw == "INTEL": os.environ["VIDEO_HW_ENCODER"] = "h264_qsv"
-    ex = VideoCompressorApp(file_arg, initial_strategy, bin_dir=BIN_DIR, config_manager=cm, tooltip_manager=tm, mpv_ready=mpv_ready, mpv_error_hint=mpv_hint if not mpv_ready else "")
+    boot_result(hud_config_task, None, "validate_hud_config"); boot_result(cleanup_task, None, "orphan_and_temp_cleanup")
+    with STARTUP.stage("build_main_window"):
+        ex = VideoCompressorApp(file_arg, initial_strategy, bin_dir=BIN_DIR, config_manager=cm, tooltip_manager=tm, mpv_ready=mpv_ready, mpv_error_hint=mpv_hint if not mpv_ready else "")
+    MAIN_WINDOW_INSTANCE = ex
     try:
         if icon_path and os.path.exists(icon_path): ex.setWindowIcon(QIcon(icon_path))
         elif hasattr(app, "style"): ex.setWindowIcon(app.style().standardIcon(QStyle.SP_ComputerIcon))
     except: pass
-    ex.show(); QTimer.singleShot(100, lambda: ex.set_style())
+    ex.show(); STARTUP.mark("window_shown"); QTimer.singleShot(100, lambda: ex.set_style())
+    if splash is not None: splash.finish(ex)
+    def record_startup_profile():
+        STARTUP.mark("event_loop_ready"); STARTUP.shutdown(); STARTUP.write(os.path.join(BASE_DIR, "logs"), logger)
+    QTimer.singleShot(0, record_startup_profile)
     if not file_arg: QTimer.singleShot(250, lambda: ex._set_upload_hint_active(True))
     try:
         if hasattr(ex, "statusBar") and ex.statusBar(): ex.statusBar().showMessage(tr("ffmpeg_path_message").format(ffmpeg=ffmpeg_path), 8000)
@@ -565,6 +565,8 @@ class CropAppHandlers:
             self.placeholders_group = []
             if hasattr(self, 'modified_roles'):
                 self.modified_roles.clear()
+            if hasattr(self, '_item_edit_cache'):
+                self._item_edit_cache.clear()
         if hasattr(self, 'background_item') and self.background_item:
             if self.background_item.scene():
                 self.background_item.scene().removeItem(self.background_item)
@@ -809,7 +811,8 @@ class CropAppHandlers:
 
     def _show_draw_view(self):
         try:
-            snapshot_pixmap = QPixmap(self.snapshot_path)
+            frame = self.media_processor.snapshot_image(self.snapshot_path) if hasattr(self.media_processor, 'snapshot_image') else None
+            snapshot_pixmap = QPixmap.fromImage(frame) if frame is not None else QPixmap(self.snapshot_path)
             if snapshot_pixmap.isNull():
                 self.logger.error("Failed to load snapshot pixmap")
                 self._reset_snapshot_ui()
@@ -818,7 +821,7 @@ class CropAppHandlers:
             self.set_background_image(snapshot_pixmap)
             self.view_stack.setCurrentWidget(self.draw_scroll_area)
             QApplication.processEvents()
-            self.draw_widget.setImage(self.snapshot_path)
+            self.draw_widget.setImage(snapshot_pixmap if frame is not None else self.snapshot_path)
             self.draw_widget.set_roles(self.hud_elements, self._get_configured_roles())
             next_element = self.get_next_element_to_configure()
             self.update_wizard_step(3, f"Draw a box around the {next_element}" if next_element else "Refine your selection")
@@ -176,6 +176,7 @@ class UI_BEHAVIOR:
     UNDO_COALESCE_WINDOW_MS = 400
     SELECTION_MIN_SIZE = 10
     KEYBOARD_NUDGE_STEP = 0.4
+    NUDGE_UNDO_COALESCE_MS = 1000
     MIN_SCALE_FACTOR = 0.0001
 Z_ORDER_MAP = {
     'main': 0,
@@ -11,6 +11,7 @@ import tempfile
 import shutil
 import time
 import copy
+import hashlib
 import threading
 import uuid
 try:
@@ -60,6 +61,9 @@ VALIDATION_SYSTEM_AVAILABLE = False
 _config_manager_instances: Dict[str, "ConfigManager"] = {}
 _config_manager_instances_lock = threading.Lock()
 
+def _content_digest(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
 class ConfigObserver(QObject):
     config_changed = pyqtSignal(str)
     config_deleted = pyqtSignal(str)
@@ -86,6 +90,7 @@ class ConfigManager:
             self._last_known_config = {}
         self._config_version = 0
         self._last_file_mtime = 0
+        self._digests: Dict[str, Any] = {}
         self._observer = ConfigObserver()
         self._lock_owner_token: Optional[str] = None
         self._validation_rules: Dict[str, Any] = {}
@@ -93,6 +98,43 @@ class ConfigManager:
     
     def get_observer(self) -> ConfigObserver:
         return self._observer
+
+    def content_digest(self, path: str) -> Optional[str]:
+        """sha256 of a config or backup file, hashed once per on-disk version (size + mtime)."""
+        try:
+            st = os.stat(path)
+        except OSError:
+            self._digests.pop(path, None)
+            return None
+        key = (st.st_size, st.st_mtime_ns)
+        cached = self._digests.get(path)
+        if cached and cached[0] == key:
+            return cached[1]
+        try:
+            with open(path, 'rb') as f:
+                digest = _content_digest(f.read())
+        except OSError:
+            return None
+        self._digests[path] = (key, digest)
+        return digest
+
+    def note_digest(self, path: str, digest: str) -> None:
+        """Records the digest of content this process just wrote, so nobody hashes it again."""
+        try:
+            st = os.stat(path)
+            self._digests[path] = ((st.st_size, st.st_mtime_ns), digest)
+        except OSError:
+            self._digests.pop(path, None)
+
+    def _history_backup(self, digest: str) -> str:
+        """Content-addressed copy of the current file: identical content is stored once and only re-dated."""
+        backup_path = f"{self.config_path}.backup.{digest[:16]}"
+        if not os.path.exists(backup_path):
+            shutil.copy2(self.config_path, backup_path)
+            self.note_digest(backup_path, digest)
+        os.utime(backup_path, None)
+        self.logger.debug(f"Created backup at {backup_path}")
+        return backup_path
     
     def _setup_validation_rules(self):
         self._validation_rules = {
@@ -323,7 +365,6 @@ class ConfigManager:
                 OperationType.CONFIG_SAVE,
                 f"Save config {self.config_path}"
             )
-            transaction.add_file_backup(self.config_path)
         except Exception as e:
             self.logger.warning(f"StateManager unavailable for config save: {e}")
         if not self._acquire_lock():
@@ -335,7 +376,18 @@ class ConfigManager:
             config = self._sanitize_config(config)
             if enforce_consistency:
                 self._enforce_cross_section_consistency(config)
+            payload = json.dumps(config, indent=4)
+            new_digest = _content_digest(payload.encode('utf-8'))
+            old_digest = self.content_digest(self.config_path)
+            if old_digest == new_digest:
+                self.logger.debug(f"Config unchanged; skipped writing {self.config_path}")
+                success = True
+                return True
             os.makedirs(os.path.dirname(self.config_path), exist_ok=True)
+            if old_digest:
+                backup_path = self._history_backup(old_digest)
+                if transaction:
+                    transaction.add_file_backup(self.config_path, digest=old_digest, backup_path=backup_path)
             temp_fd, temp_path = tempfile.mkstemp(
                 suffix='.tmp',
                 prefix=os.path.basename(self.config_path) + '.',
@@ -343,12 +395,9 @@ class ConfigManager:
             )
             try:
                 with os.fdopen(temp_fd, 'w', encoding='utf-8') as f:
-                    json.dump(config, f, indent=4)
-                if os.path.exists(self.config_path):
-                    backup_path = f"{self.config_path}.backup.{int(time.time())}"
-                    shutil.copy2(self.config_path, backup_path)
-                    self.logger.debug(f"Created backup at {backup_path}")
+                    f.write(payload)
                 os.replace(temp_path, self.config_path)
+                self.note_digest(self.config_path, new_digest)
                 if self.is_hud_config:
                     self.logger.info("=" * 80)
                     self.logger.info("CONFIGURATION SAVED SUCCESSFULLY")
@@ -281,11 +281,17 @@ class SaveConfigWorker(QObject):
         self.hud_config_path = hud_config_path
         self.item_payload = item_payload or {}
         self.logger = logger
+        self._manager = None
 
     def _create_rotation_backup(self):
         conf_path = self.hud_config_path
+        manager = self._manager
         if not os.path.exists(conf_path):
             return
+        digest = manager.content_digest(conf_path) if manager else None
+        if digest and digest == manager.content_digest(f"{conf_path}.bak1"):
+            if self.logger: self.logger.debug("Rotation backup skipped: .bak1 already holds this config.")
+            return
         try:
             for i in range(4, 0, -1):
                 old_b = f"{conf_path}.bak{i}"
@@ -296,28 +302,35 @@ class SaveConfigWorker(QObject):
 
             import shutil
             shutil.copy2(conf_path, f"{conf_path}.bak1")
+            if digest: manager.note_digest(f"{conf_path}.bak1", digest)
             if self.logger: self.logger.info(f"Rotation backup created: {conf_path}.bak1")
         except Exception as e:
             if self.logger: self.logger.error(f"Backup rotation failed: {e}")
 
     def run(self):
         try:
-            manager = get_config_manager(self.hud_config_path, self.logger)
+            manager = self._manager = get_config_manager(self.hud_config_path, self.logger)
             config = manager.load_config()
             existing_before = set(config.get("crops_1080p", {}).keys())
             saved_keys = set()
             configured = []
+            changed = []
             for tech_key, payload in self.item_payload.items():
                 for section in ["crops_1080p", "scales", "overlays", "z_orders"]:
                     if section not in config or not isinstance(config[section], dict):
                         config[section] = {}
-                config["crops_1080p"][tech_key] = payload["crop"]
-                config["scales"][tech_key] = payload["scale"]
-                config["overlays"][tech_key] = payload["overlay"]
-                config["z_orders"][tech_key] = payload["z"]
+                values = {"crops_1080p": payload["crop"], "scales": payload["scale"], "overlays": payload["overlay"], "z_orders": payload["z"]}
+                if any(config[section].get(tech_key) != value for section, value in values.items()):
+                    for section, value in values.items():
+                        config[section][tech_key] = value
+                    changed.append(tech_key)
                 configured.append(payload["display"])
                 saved_keys.add(tech_key)
             unchanged = [HUD_ELEMENT_MAPPINGS.get(k, k) for k in sorted(existing_before - saved_keys)]
+            if not changed and existing_before and os.path.exists(self.hud_config_path):
+                if self.logger: self.logger.info("HUD config unchanged; nothing written.")
+                self.finished.emit(True, configured, unchanged, "")
+                return
             try:
                 self._create_rotation_backup()
             except Exception as backup_err:
@@ -632,35 +645,68 @@ class CropApp(KeyboardShortcutMixin, PersistentWindowMixin, QWidget, CropAppHand
         for item in self.portrait_scene.items():
             if isinstance(item, ResizablePixmapItem) and item.assigned_role == role:
                 self.portrait_scene.removeItem(item)
+                self._item_edit_cache.pop(item, None)
         item = ResizablePixmapItem(pixmap, crop_rect)
         item.assigned_role = role
         item.setZValue(50)
         self.portrait_scene.addItem(item)
         item.setPos(100, 100)
         item.item_changed.connect(lambda: self._handle_item_changed(item))
+        self._item_edit_cache[item] = self._get_item_state(item)
         self._mark_dirty()
         self._refresh_layer_list()
         return item
 
     def _handle_item_changed(self, item):
-        if self._in_undo_redo: return
+        if self._in_undo_redo or self._suppress_undo_registration: return
         self._mark_dirty()
+        before = self._item_edit_cache.get(item)
+        if before is None:
+            self._item_edit_cache[item] = self._get_item_state(item); return
+        if item._is_nudging:
+            self.record_item_edit("Nudge", {item: before}, "portrait_nudge", UI_BEHAVIOR.NUDGE_UNDO_COALESCE_MS)
+            return
+        resizing = item.is_resizing_br or item.is_resizing_tl
+        self.record_item_edit("Resize" if resizing else "Move", {item: before}, "portrait_drag", None)
+        if not self._item_gesture_active(item): self.state_manager.seal_recent_undo()
+
+    def _item_gesture_active(self, item):
+        """True while any item of the current selection is still being dragged or resized; Qt moves the rest along with it."""
+        items = [item] + [i for i in self.portrait_scene.selectedItems() if i is not item]
+        return any(getattr(i, '_is_dragging', False) or getattr(i, 'is_resizing_br', False) or getattr(i, 'is_resizing_tl', False) for i in items)
+
+    def record_item_edit(self, desc, before, action_type="portrait_edit", coalesce_ms=0):
+        after = {item: self._get_item_state(item) for item in before}
+        self._item_edit_cache.update(after)
+        if self.state_manager.add_delta_action(action_type, desc, before, after, self._apply_item_fields, coalesce_ms):
+            self.update_undo_redo_buttons()
 
     def _get_item_state(self, item):
         p = item.scenePos()
         return {"x": float(p.x()), "y": float(p.y()), "width": float(item.current_width), "height": float(item.current_height), "z": item.zValue()}
 
+    def _apply_item_fields(self, item, fields):
+        if "x" in fields or "y" in fields:
+            p = item.scenePos()
+            item.setPos(fields.get("x", p.x()), fields.get("y", p.y()))
+        if "z" in fields: item.setZValue(fields["z"])
+        if "width" in fields or "height" in fields:
+            item.current_width = fields.get("width", item.current_width)
+            item.current_height = fields.get("height", item.current_height)
+            item.update_handle_positions()
+        item.update()
+        self._item_edit_cache[item] = self._get_item_state(item)
+        return True
+
     def _apply_item_state(self, item, state):
-        item.setPos(state["x"], state["y"])
-        item.setZValue(state["z"])
-        item.current_width, item.current_height = state["width"], state["height"]
-        item.update_handle_positions(); item.update()
+        self._apply_item_fields(item, state)
         self._refresh_layer_list(); return True
 
     def delete_selected(self):
         for item in self.portrait_scene.selectedItems():
             if isinstance(item, ResizablePixmapItem):
                 self.portrait_scene.removeItem(item)
+                self._item_edit_cache.pop(item, None)
         self._mark_dirty()
         self._refresh_layer_list()
 
@@ -218,7 +218,7 @@ class DrawWidget(QWidget):
 
     def setImage(self, image_path):
         if image_path:
-            self.pixmap = QPixmap(image_path)
+            self.pixmap = image_path if isinstance(image_path, QPixmap) else QPixmap(image_path)
             self.zoom = 1.0
             self.setCursor(Qt.CrossCursor)
             self._user_zoomed = False
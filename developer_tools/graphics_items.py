@@ -10,6 +10,41 @@ from PyQt5.QtGui import QBrush, QColor, QPen, QFont
 from config import UI_LAYOUT, UI_BEHAVIOR, UI_COLORS
 from coordinate_math import TARGET_W, TARGET_H, CONTENT_W, CONTENT_H, BACKEND_SCALE, scale_round
 import time
+from bisect import bisect_left
+
+def _canvas_snap_targets():
+    targets_x = [(0, "Canvas Left"), (UI_LAYOUT.PORTRAIT_BASE_WIDTH / 2, "Canvas Center"), (UI_LAYOUT.PORTRAIT_BASE_WIDTH, "Canvas Right")]
+    targets_y = [
+        (UI_LAYOUT.PORTRAIT_TOP_BAR_HEIGHT, "Content Top"), 
+        (UI_LAYOUT.PORTRAIT_BASE_HEIGHT / 2, "Canvas Center"), 
+        (UI_LAYOUT.PORTRAIT_BASE_HEIGHT - UI_LAYOUT.PORTRAIT_BOTTOM_PADDING, "Content Bottom")
+    ]
+    return targets_x, targets_y
+
+class SnapTargetIndex:
+    """Snap targets sorted by coordinate, so the nearest one is found with a bisect instead of a scan."""
+
+    def __init__(self, targets):
+        ordered = sorted(targets, key=lambda t: t[0])
+        self.values = [float(v) for v, _ in ordered]
+        self.labels = [lab for _, lab in ordered]
+
+    def __len__(self):
+        return len(self.values)
+
+    def __iter__(self):
+        return iter(zip(self.values, self.labels))
+
+    def nearest(self, value):
+        """Returns (target, label, distance) for the closest target, or None when the index is empty."""
+        i = bisect_left(self.values, value)
+        best = None
+        for j in (i - 1, i):
+            if 0 <= j < len(self.values):
+                d = abs(value - self.values[j])
+                if best is None or d < best[2]:
+                    best = (self.values[j], self.labels[j], d)
+        return best
 
 class MagneticSnapper:
     """Helper class to manage professional magnetic snapping with velocity gating and Tired Magnet logic."""
@@ -105,24 +140,14 @@ class MagneticSnapper:
         return pos
 
     def _find_best_snap(self, pos, dim, targets, threshold, center_thresh):
-        my_start = pos
-        my_center = pos + dim / 2
-        my_end = pos + dim
+        index = targets if isinstance(targets, SnapTargetIndex) else SnapTargetIndex(targets)
         best = None
         min_d = threshold + 1
-        for t_val, t_lab in targets:
-            d = abs(my_start - t_val)
-            if d < min_d:
-                min_d = d
-                best = (t_val, 'start', t_lab)
-            d = abs(my_end - t_val)
-            if d < min_d:
-                min_d = d
-                best = (t_val, 'end', t_lab)
-            d = abs(my_center - t_val)
-            if d < min_d and d < center_thresh:
-                min_d = d
-                best = (t_val, 'center', t_lab)
+        for offset_type, value in (('start', pos), ('end', pos + dim), ('center', pos + dim / 2)):
+            hit = index.nearest(value)
+            if hit and hit[2] < min_d and (offset_type != 'center' or hit[2] < center_thresh):
+                min_d = hit[2]
+                best = (hit[0], offset_type, hit[1])
         return best
 
 class ResizablePixmapItem(QGraphicsObject):
@@ -133,6 +158,8 @@ class ResizablePixmapItem(QGraphicsObject):
         self.original_pixmap = pixmap 
         self.crop_rect = crop_rect
         self.assigned_role = None 
+        self._snap_index = None
+        self._snap_own_changes = 0
         self.current_width = float(pixmap.width())
         self.current_height = float(pixmap.height())
         self._cached_scaled_pix = None
@@ -161,8 +188,6 @@ class ResizablePixmapItem(QGraphicsObject):
         self._snap_active = False
         self._is_nudging = False
         self._is_dragging = False
-        self._targets_cache_x = None
-        self._targets_cache_y = None
         self._nudge_timer = QTimer(self)
         self._nudge_timer.setSingleShot(True)
         self._nudge_timer.timeout.connect(self._clear_nudge_feedback)
@@ -304,8 +329,33 @@ class ResizablePixmapItem(QGraphicsObject):
                     role_key = k
                     break
             self.setZValue(Z_ORDER_MAP.get(role_key, 50))
+        self._mark_snap_geometry()
         self.update()
 
+    def _mark_snap_geometry(self, scene=None):
+        """Tells the other items' snap indexes that this item's edges or label changed."""
+        scene = scene or self.scene()
+        if scene is None: return
+        scene._snap_version = getattr(scene, '_snap_version', 0) + 1
+        self._snap_own_changes += 1
+
+    def _snap_targets(self):
+        """This item's (x, y) snap indexes; rebuilt only after some other item in the scene changed."""
+        scene = self.scene()
+        if scene is None:
+            return None
+        others_version = getattr(scene, '_snap_version', 0) - self._snap_own_changes
+        if self._snap_index is None or self._snap_index[0] != others_version:
+            targets_x, targets_y = _canvas_snap_targets()
+            for item in scene.items():
+                if isinstance(item, ResizablePixmapItem) and item != self and item.isVisible():
+                    r = item.content_scene_rect()
+                    role = item.assigned_role or "Item"
+                    targets_x.extend([(r.left(), f"{role} Left"), (r.center().x(), f"{role} Center"), (r.right(), f"{role} Right")])
+                    targets_y.extend([(r.top(), f"{role} Top"), (r.center().y(), f"{role} Center"), (r.bottom(), f"{role} Bottom")])
+            self._snap_index = (others_version, SnapTargetIndex(targets_x), SnapTargetIndex(targets_y))
+        return self._snap_index[1], self._snap_index[2]
+
     def update_handle_positions(self):
         """[FIX Explosive Scaling] Use fixed-size handles for consistent UX."""
         self.handle_size = 18.0
@@ -318,6 +368,7 @@ class ResizablePixmapItem(QGraphicsObject):
         self.handle_tl.setRect(0, 0, self.handle_size, self.handle_size)
         self.handle_br.setPos(self.current_width - offset, self.current_height - offset)
         self.handle_tl.setPos(-offset, -offset)
+        self._mark_snap_geometry()
 
     def _is_on_handle(self, pos, handle):
         """Helper to detect if a position is within the enlarged hit area of a handle."""
@@ -348,19 +399,7 @@ class ResizablePixmapItem(QGraphicsObject):
         else:
             self.setCursor(Qt.ClosedHandCursor)
             self._is_dragging = True
-            self._targets_cache_x = [(0, "Canvas Left"), (UI_LAYOUT.PORTRAIT_BASE_WIDTH / 2, "Canvas Center"), (UI_LAYOUT.PORTRAIT_BASE_WIDTH, "Canvas Right")]
-            self._targets_cache_y = [
-                (UI_LAYOUT.PORTRAIT_TOP_BAR_HEIGHT, "Content Top"), 
-                (UI_LAYOUT.PORTRAIT_BASE_HEIGHT / 2, "Canvas Center"), 
-                (UI_LAYOUT.PORTRAIT_BASE_HEIGHT - UI_LAYOUT.PORTRAIT_BOTTOM_PADDING, "Content Bottom")
-            ]
-            if self.scene():
-                for item in self.scene().items():
-                    if isinstance(item, ResizablePixmapItem) and item != self and item.isVisible():
-                        r = item.content_scene_rect()
-                        role = item.assigned_role or "Item"
-                        self._targets_cache_x.extend([(r.left(), f"{role} Left"), (r.center().x(), f"{role} Center"), (r.right(), f"{role} Right")])
-                        self._targets_cache_y.extend([(r.top(), f"{role} Top"), (r.center().y(), f"{role} Center"), (r.bottom(), f"{role} Bottom")])
+            self._snap_targets()
             super(ResizablePixmapItem, self).mousePressEvent(event)
 
     def mouseMoveEvent(self, event):
@@ -371,27 +410,23 @@ class ResizablePixmapItem(QGraphicsObject):
             new_width = max(UI_LAYOUT.GRAPHICS_ITEM_MIN_SIZE, self.start_width + delta.x())
             proposed_right = self.pos().x() + new_width
             proposed_bottom = self.pos().y() + (new_width * (self.original_pixmap.height() / self.original_pixmap.width()))
-            targets_x = [(0, "Canvas Left"), (UI_LAYOUT.PORTRAIT_BASE_WIDTH / 2, "Canvas Center"), (UI_LAYOUT.PORTRAIT_BASE_WIDTH, "Canvas Right")]
-            targets_y = [(UI_LAYOUT.PORTRAIT_TOP_BAR_HEIGHT, "Content Top"), (UI_LAYOUT.PORTRAIT_BASE_HEIGHT / 2, "Canvas Center"), (UI_LAYOUT.PORTRAIT_BASE_HEIGHT - UI_LAYOUT.PORTRAIT_BOTTOM_PADDING, "Content Bottom")]
-            for item in self.scene().items():
-                if isinstance(item, ResizablePixmapItem) and item != self and item.isVisible():
-                    r = item.content_scene_rect(); role = item.assigned_role or "Item"
-                    targets_x.extend([(r.left(), f"{role} Left"), (r.center().x(), f"{role} Center"), (r.right(), f"{role} Right")])
-                    targets_y.extend([(r.top(), f"{role} Top"), (r.center().y(), f"{role} Center"), (r.bottom(), f"{role} Bottom")])
+            targets_x, targets_y = self._snap_targets()
             active_x, active_y = None, None
-            for t_val, t_lab in targets_x:
-                if abs(proposed_right - t_val) < 10:
-                    if snap_enabled: new_width = t_val - self.pos().x()
-                    active_x = (t_val, "end", t_lab); break
+            hit = targets_x.nearest(proposed_right)
+            if hit and hit[2] < 10:
+                t_val, t_lab = hit[0], hit[1]
+                if snap_enabled: new_width = t_val - self.pos().x()
+                active_x = (t_val, "end", t_lab)
             aspect = self.original_pixmap.height() / self.original_pixmap.width() if self.original_pixmap.width() > 0 else 0
             new_height = new_width * aspect
             proposed_bottom = self.pos().y() + new_height
-            for t_val, t_lab in targets_y:
-                if abs(proposed_bottom - t_val) < 10:
-                    if snap_enabled: 
-                        new_height = t_val - self.pos().y()
-                        new_width = new_height / aspect if aspect > 0 else 0
-                    active_y = (t_val, "end", t_lab); break
+            hit = targets_y.nearest(proposed_bottom)
+            if hit and hit[2] < 10:
+                t_val, t_lab = hit[0], hit[1]
+                if snap_enabled: 
+                    new_height = t_val - self.pos().y()
+                    new_width = new_height / aspect if aspect > 0 else 0
+                active_y = (t_val, "end", t_lab)
             if active_x or active_y: self._draw_smart_guides(active_x, active_y, self.pos())
             else: self.clear_guides()
             if self.scene():
@@ -408,30 +443,26 @@ class ResizablePixmapItem(QGraphicsObject):
             start_right = self.start_pos.x() + self.start_width
             start_bottom = self.start_pos.y() + self.start_height
             new_pos_x = self.start_pos.x() + delta.x()
-            targets_x = [(0, "Canvas Left"), (UI_LAYOUT.PORTRAIT_BASE_WIDTH / 2, "Canvas Center"), (UI_LAYOUT.PORTRAIT_BASE_WIDTH, "Canvas Right")]
-            targets_y = [(UI_LAYOUT.PORTRAIT_TOP_BAR_HEIGHT, "Content Top"), (UI_LAYOUT.PORTRAIT_BASE_HEIGHT / 2, "Canvas Center"), (UI_LAYOUT.PORTRAIT_BASE_HEIGHT - UI_LAYOUT.PORTRAIT_BOTTOM_PADDING, "Content Bottom")]
-            for item in self.scene().items():
-                if isinstance(item, ResizablePixmapItem) and item != self and item.isVisible():
-                    r = item.content_scene_rect(); role = item.assigned_role or "Item"
-                    targets_x.extend([(r.left(), f"{role} Left"), (r.center().x(), f"{role} Center"), (r.right(), f"{role} Right")])
-                    targets_y.extend([(r.top(), f"{role} Top"), (r.center().y(), f"{role} Center"), (r.bottom(), f"{role} Bottom")])
+            targets_x, targets_y = self._snap_targets()
             active_x, active_y = None, None
-            for t_val, t_lab in targets_x:
-                if abs(new_pos_x - t_val) < 10:
-                    if snap_enabled: new_pos_x = t_val
-                    active_x = (t_val, "start", t_lab); break
+            hit = targets_x.nearest(new_pos_x)
+            if hit and hit[2] < 10:
+                t_val, t_lab = hit[0], hit[1]
+                if snap_enabled: new_pos_x = t_val
+                active_x = (t_val, "start", t_lab)
             new_width = max(UI_LAYOUT.GRAPHICS_ITEM_MIN_SIZE, start_right - new_pos_x)
             aspect = self.original_pixmap.height() / self.original_pixmap.width() if self.original_pixmap.width() > 0 else 0
             new_height = new_width * aspect
             new_pos_y = start_bottom - new_height
-            for t_val, t_lab in targets_y:
-                if abs(new_pos_y - t_val) < 10:
-                    if snap_enabled:
-                        new_pos_y = t_val
-                        new_height = start_bottom - new_pos_y
-                        new_width = new_height / aspect if aspect > 0 else 0
-                        new_pos_x = start_right - new_width
-                    active_y = (t_val, "start", t_lab); break
+            hit = targets_y.nearest(new_pos_y)
+            if hit and hit[2] < 10:
+                t_val, t_lab = hit[0], hit[1]
+                if snap_enabled:
+                    new_pos_y = t_val
+                    new_height = start_bottom - new_pos_y
+                    new_width = new_height / aspect if aspect > 0 else 0
+                    new_pos_x = start_right - new_width
+                active_y = (t_val, "start", t_lab)
             if active_x or active_y: self._draw_smart_guides(active_x, active_y, QPointF(new_pos_x, new_pos_y))
             else: self.clear_guides()
             if self.scene():
@@ -455,8 +486,6 @@ class ResizablePixmapItem(QGraphicsObject):
         self.is_resizing_br = False
         self.is_resizing_tl = False
         self._is_dragging = False
-        self._targets_cache_x = None
-        self._targets_cache_y = None
         self._update_render_cache()
         self.clear_guides()
         self._snapper.reset()
@@ -524,7 +553,13 @@ class ResizablePixmapItem(QGraphicsObject):
             self.scene()._hud_cache_dirty = True
 
     def itemChange(self, change, value):
-        if change == QGraphicsItem.ItemSceneHasChanged:
+        if change == QGraphicsItem.ItemSceneChange:
+            self._mark_snap_geometry()
+            self._snap_index = None
+        elif change == QGraphicsItem.ItemVisibleHasChanged:
+            self._mark_snap_geometry()
+        elif change == QGraphicsItem.ItemSceneHasChanged:
+            self._mark_snap_geometry()
             if self.scene():
                 self.scene()._hud_cache_dirty = True
         elif change == QGraphicsItem.ItemPositionChange and self.scene():
@@ -532,21 +567,7 @@ class ResizablePixmapItem(QGraphicsObject):
             view = self.scene().views()[0] if self.scene().views() else None
             snap_enabled = getattr(view, 'snap_enabled', True) if view else True
             if self.isSelected() and not self.is_resizing_br and not self.is_resizing_tl:
-                if self._is_dragging:
-                    tx, ty = self._targets_cache_x, self._targets_cache_y
-                else:
-                    tx = [(0, "Canvas Left"), (UI_LAYOUT.PORTRAIT_BASE_WIDTH / 2, "Canvas Center"), (UI_LAYOUT.PORTRAIT_BASE_WIDTH, "Canvas Right")]
-                    ty = [
-                        (UI_LAYOUT.PORTRAIT_TOP_BAR_HEIGHT, "Content Top"), 
-                        (UI_LAYOUT.PORTRAIT_BASE_HEIGHT / 2, "Canvas Center"), 
-                        (UI_LAYOUT.PORTRAIT_BASE_HEIGHT - UI_LAYOUT.PORTRAIT_BOTTOM_PADDING, "Content Bottom")
-                    ]
-                    for item in self.scene().items():
-                        if isinstance(item, ResizablePixmapItem) and item != self and item.isVisible():
-                            r = item.content_scene_rect()
-                            role = item.assigned_role or "Item"
-                            tx.extend([(r.left(), f"{role} Left"), (r.center().x(), f"{role} Center"), (r.right(), f"{role} Right")])
-                            ty.extend([(r.top(), f"{role} Top"), (r.center().y(), f"{role} Center"), (r.bottom(), f"{role} Bottom")])
+                tx, ty = self._snap_targets()
                 if tx and ty:
                     res_pos, snap_x, snap_y = self._snapper.calculate(new_pos, self.pos(), self.current_width, self.current_height, tx, ty)
                     if snap_enabled and not self._is_nudging:
@@ -566,6 +587,7 @@ class ResizablePixmapItem(QGraphicsObject):
                 self.scene().update()
             return corrected_pos
         elif change == QGraphicsItem.ItemPositionHasChanged:
+            self._mark_snap_geometry()
             if self.scene():
                 self.scene().update()
             self.item_changed.emit()
@@ -15,7 +15,10 @@ import atexit
 import threading
 import shutil
 import json
+import queue
+from collections import OrderedDict
 from PyQt5.QtCore import QObject, pyqtSignal, QMetaObject, Qt, Q_ARG
+from PyQt5.QtGui import QImage
 try:
     from PyQt5.QtCore import pyqtSlot
 except ImportError:
@@ -24,12 +27,154 @@ except ImportError:
             return func
         return decorator
 
-from system import diagnostic_runtime
+from system import diagnostic_runtime, probe_flight
 try:
     import mpv
 except Exception:
     mpv = None
 logger = logging.getLogger(__name__)
+FRAME_CACHE_SIZE = 12
+FRAME_STEP_WINDOW_SEC = 3.0
+FRAME_READ_AHEAD = 2
+FRAME_READ_TIMEOUT_SEC = 10.0
+
+def _parse_rate(value, default=30.0):
+    try:
+        num, _, den = str(value or "").partition("/")
+        rate = float(num) / float(den or 1.0)
+        return rate if rate > 0 else default
+    except (TypeError, ValueError, ZeroDivisionError):
+        return default
+
+def _parse_rotation(stream):
+    """Display rotation in degrees from the display-matrix side data or the legacy rotate tag."""
+    for side in stream.get('side_data_list') or []:
+        if 'rotation' in side:
+            try: return int(round(float(side['rotation']))) % 360
+            except (TypeError, ValueError): pass
+    try: return int(round(float((stream.get('tags') or {}).get('rotate', 0)))) % 360
+    except (TypeError, ValueError): return 0
+
+class FrameServer:
+    """
+    One long-lived rawvideo decoder for the loaded clip. Forward steps within a few seconds read on from the
+    running pipe instead of launching ffmpeg again; recently decoded frames are kept as QImages in a small LRU.
+    """
+
+    def __init__(self, ffmpeg_path, file_path, width, height, fps=30.0, cache_size=FRAME_CACHE_SIZE):
+        self.ffmpeg_path = ffmpeg_path
+        self.file_path = file_path
+        self.width, self.height = int(width), int(height)
+        self.fps = float(fps) if fps and fps > 0 else 30.0
+        self.cache_size = max(1, int(cache_size))
+        self._frame_bytes = self.width * self.height * 3
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+        self._proc = None
+        self._frames = None
+        self._reader_stop = None
+        self._next_index = -1
+        self.launches = 0
+
+    def frame_index(self, time_sec):
+        return max(0, int(round(float(time_sec) * self.fps)))
+
+    def frame_at(self, time_sec):
+        """
+        Returns the frame shown at time_sec as an RGB888 QImage, or None past the end of the clip. A decoder that
+        delivers nothing within FRAME_READ_TIMEOUT_SEC is killed and the next call starts a fresh one.
+        """
+        idx = self.frame_index(time_sec)
+        deadline = time.monotonic() + FRAME_READ_TIMEOUT_SEC
+        with self._lock:
+            image = self._cache.get(idx)
+            if image is not None:
+                self._cache.move_to_end(idx)
+                return image
+            if self._proc is None or not (0 <= idx - self._next_index <= FRAME_STEP_WINDOW_SEC * self.fps):
+                self._start(idx)
+            while self._next_index < idx:
+                if self._read_raw(deadline) is None: return None
+            raw = self._read_raw(deadline)
+            if raw is None: return None
+            image = QImage(raw, self.width, self.height, self.width * 3, QImage.Format_RGB888).copy()
+            self._cache[idx] = image
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+            return image
+
+    def _start(self, idx):
+        self._stop()
+        cmd = [
+            self.ffmpeg_path, '-hide_banner', '-loglevel', 'error', '-nostdin',
+            '-ss', f"{idx / self.fps:.6f}", '-i', self.file_path,
+            '-an', '-sn', '-dn', '-s', f"{self.width}x{self.height}", '-f', 'rawvideo', '-pix_fmt', 'rgb24', 'pipe:1'
+        ]
+        self._proc = subprocess.Popen(
+            cmd, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, stdin=subprocess.DEVNULL,
+            bufsize=self._frame_bytes,
+            creationflags=(subprocess.CREATE_NO_WINDOW if sys.platform == "win32" else 0)
+        )
+        self._next_index = idx
+        self.launches += 1
+        self._frames, self._reader_stop = queue.Queue(maxsize=FRAME_READ_AHEAD), threading.Event()
+        threading.Thread(
+            target=self._pump, args=(self._proc, self._frames, self._reader_stop, self._frame_bytes),
+            name="frame-server-reader", daemon=True,
+        ).start()
+
+    @staticmethod
+    def _pump(proc, frames, stop, frame_bytes):
+        """Reads whole frames off the pipe so the caller can wait on them with a deadline; None marks the end."""
+        while not stop.is_set():
+            chunks, need = [], frame_bytes
+            try:
+                while need > 0:
+                    chunk = proc.stdout.read(need)
+                    if not chunk: break
+                    chunks.append(chunk); need -= len(chunk)
+            except Exception:
+                pass
+            raw = b"".join(chunks) if need == 0 else None
+            while not stop.is_set():
+                try:
+                    frames.put(raw, timeout=0.1); break
+                except queue.Full:
+                    continue
+            if raw is None: return
+
+    def _read_raw(self, deadline):
+        try:
+            raw = self._frames.get(timeout=max(0.0, deadline - time.monotonic()))
+        except queue.Empty:
+            logger.warning(f"Frame server stalled for {FRAME_READ_TIMEOUT_SEC:.0f}s on {os.path.basename(self.file_path)}; killing the decoder.")
+            raw = None
+        if raw is None:
+            self._stop()
+            return None
+        self._next_index += 1
+        return raw
+
+    def _stop(self):
+        proc, self._proc = self._proc, None
+        self._next_index = -1
+        if self._reader_stop is not None:
+            self._reader_stop.set()
+        self._frames = self._reader_stop = None
+        if proc is None: return
+        try:
+            if proc.poll() is None:
+                proc.kill()
+            proc.wait(timeout=1.0)
+        except Exception:
+            pass
+        try: proc.stdout.close()
+        except Exception: pass
+
+    def close(self):
+        with self._lock:
+            self._stop()
+            self._cache.clear()
 
 class MediaProcessor(QObject):
     info_retrieved = pyqtSignal(str)
@@ -80,6 +225,10 @@ class MediaProcessor(QObject):
         self.input_file_path = None
         self._ffprobe_procs = []
         self._last_seek_time = 0
+        self._stream_fps = 30.0
+        self._stream_rotation = 0
+        self._frame_server = None
+        self._last_snapshot = None
 
     def attach_wid(self, wid):
         """Safely attaches a Window ID to the existing MPV player and enables GPU rendering."""
@@ -137,6 +286,7 @@ class MediaProcessor(QObject):
             return False
         try:
             self._kill_ffprobe_procs()
+            self._close_frame_server()
             self.input_file_path = file_path
             if video_frame_winId:
                 new_wid = int(video_frame_winId)
@@ -223,6 +373,7 @@ class MediaProcessor(QObject):
     def shutdown(self):
         """[FIX #12] Formal shutdown of media engine and all child processes."""
         self._kill_ffprobe_procs()
+        self._close_frame_server()
         if self.player:
             logger.info("Shutting down media player core...")
             try:
@@ -243,6 +394,7 @@ class MediaProcessor(QObject):
         """[FIX] Unloads media and clears the screen to a black void without breaking WID link."""
         logger.info("Unloading media and clearing video output.")
         self._kill_ffprobe_procs()
+        self._close_frame_server()
         if self.player:
             try:
                 self.player.command("stop")
@@ -257,56 +409,45 @@ class MediaProcessor(QObject):
             logger.warning(f"get_video_info failed: file path not provided or does not exist: {file_path}")
             return None
         self._kill_ffprobe_procs()
+        self._stream_fps = 30.0
+        self._stream_rotation = 0
         ffprobe_path = self._get_binary_path('ffprobe')
         creation_flags = 0x08000000 if sys.platform == "win32" else 0
         cmd_json = [
             ffprobe_path, '-v', 'error', '-select_streams', 'v:0',
-            '-show_entries', 'stream=width,height', '-of', 'json',
+            '-show_entries', 'stream=width,height,r_frame_rate:stream_tags=rotate:stream_side_data=rotation', '-of', 'json',
             file_path
         ]
         try:
             logger.info("Starting ffprobe detection...")
-            proc_json = subprocess.Popen(
-                cmd_json,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                text=True,
-                creationflags=creation_flags
-            )
-            with self._ffprobe_lock:
-                self._ffprobe_procs = [proc_json]
-            try:
-                out, _ = proc_json.communicate(timeout=3.0)
-            except subprocess.TimeoutExpired:
-                proc_json.kill()
-                out, _ = proc_json.communicate()
+
+            def _probe():
+                proc_json = subprocess.Popen(
+                    cmd_json,
+                    stdout=subprocess.PIPE,
+                    stderr=subprocess.PIPE,
+                    text=True,
+                    creationflags=creation_flags
+                )
+                with self._ffprobe_lock:
+                    self._ffprobe_procs = [proc_json]
+                try:
+                    out, _ = proc_json.communicate(timeout=3.0)
+                except subprocess.TimeoutExpired:
+                    proc_json.kill()
+                    out, _ = proc_json.communicate()
+                return [proc_json.returncode, out]
+            returncode, out = probe_flight.shared(cmd_json, _probe, 3.0)
             res_to_emit = None
-            if proc_json.returncode == 0 and out:
+            if returncode == 0 and out:
                 try:
-                    data = json.loads(out)
-                    w = data['streams'][0]['width']
-                    h = data['streams'][0]['height']
-                    res_to_emit = f"{w}x{h}"
-                    logger.info(f"ffprobe (JSON) resolution: {res_to_emit}")
+                    stream = json.loads(out)['streams'][0]
+                    res_to_emit = f"{stream['width']}x{stream['height']}"
+                    self._stream_fps = _parse_rate(stream.get('r_frame_rate'))
+                    self._stream_rotation = _parse_rotation(stream)
+                    logger.info(f"ffprobe (JSON) resolution: {res_to_emit} @ {self._stream_fps:.3f} fps")
                 except Exception as e:
                     logger.warning(f"Failed to parse ffprobe JSON: {e}")
-            if not res_to_emit:
-                cmd_csv = [
-                    ffprobe_path, '-v', 'error', '-select_streams', 'v:0',
-                    '-show_entries', 'stream=width,height', '-of', 'csv=p=0:s=x',
-                    file_path
-                ]
-                proc_csv = subprocess.run(
-                    cmd_csv,
-                    capture_output=True,
-                    text=True,
-                    creationflags=creation_flags,
-                    timeout=3.0
-                )
-                if proc_csv.returncode == 0:
-                    res_to_emit = proc_csv.stdout.strip()
-                    if res_to_emit:
-                        logger.info(f"ffprobe (CSV) fallback resolution: {res_to_emit}")
             if res_to_emit:
                 self.original_resolution = res_to_emit
                 QMetaObject.invokeMethod(self, "info_retrieved_emit_wrapper", 
@@ -338,6 +479,48 @@ class MediaProcessor(QObject):
             logger.warning("All automated resolution detection failed.")
             self.info_retrieved.emit("UNKNOWN")
 
+    def _close_frame_server(self):
+        server, self._frame_server = getattr(self, '_frame_server', None), None
+        self._last_snapshot = None
+        if server:
+            server.close()
+
+    def frame_server(self):
+        """The decoder for the loaded clip, started on first use once its resolution is known."""
+        path, res = self.input_file_path, self.original_resolution
+        server = self._frame_server
+        if server and server.file_path == path:
+            return server
+        try:
+            w, h = (int(v) for v in str(res).lower().split('x', 1))
+        except (TypeError, ValueError):
+            return None
+        if not path or w <= 0 or h <= 0:
+            return None
+        if self._stream_rotation in (90, 270):
+            w, h = h, w
+        self._close_frame_server()
+        self._frame_server = FrameServer(self._get_binary_path('ffmpeg'), path, w, h, self._stream_fps)
+        return self._frame_server
+
+    def grab_frame(self, time_sec):
+        server = self.frame_server()
+        if server is None:
+            return None
+        try:
+            return server.frame_at(max(0.0, float(time_sec)))
+        except Exception as e:
+            logger.warning(f"Frame server failed at {time_sec:.3f}s: {e}")
+            server.close()
+            return None
+
+    def snapshot_image(self, snapshot_path):
+        """The in-memory frame behind the last snapshot written to snapshot_path, if it is still current."""
+        last = self._last_snapshot
+        if last and os.path.abspath(last[0]) == os.path.abspath(str(snapshot_path or "")):
+            return last[1]
+        return None
+
     def take_snapshot(self, snapshot_path, preferred_time=None):
         """[FIX #8, #11] Reliable snapshot with atomic overwrite."""
         if self.is_playing():
@@ -345,11 +528,17 @@ class MediaProcessor(QObject):
         if not self.media or not self.input_file_path:
             return False, "No media loaded."
         temp_path = None
+        self._last_snapshot = None
         try:
             ffmpeg_path = self._get_binary_path('ffmpeg')
             curr_time = max(0, preferred_time if preferred_time is not None else self.get_time() / 1000.0)
             temp_fd, temp_path = tempfile.mkstemp(suffix=".png")
             os.close(temp_fd)
+            image = self.grab_frame(curr_time)
+            if image is not None and not image.isNull() and image.save(temp_path, "PNG"):
+                os.replace(temp_path, snapshot_path)
+                self._last_snapshot = (snapshot_path, image)
+                return True, "Snapshot created."
             cmd = [
                 ffmpeg_path, '-ss', f"{curr_time:.3f}", '-i', self.input_file_path,
                 '-frames:v', '1', '-q:v', '2', '-y', temp_path
@@ -164,42 +164,37 @@ class PortraitView(QGraphicsView):
         """Advanced boundary-aware algorithm to push overlapping items apart safely."""
         if len(items) < 2: return
         app = self.window()
-        if not hasattr(app, '_get_item_state'): return
+        if not hasattr(app, 'record_item_edit'): return
         states_before = {item: app._get_item_state(item) for item in items}
         modified_items = set()
         items.sort(key=lambda i: i.scenePos().y())
         TOP_LIMIT = 150.0
         BOTTOM_LIMIT = 1920.0 - 20.0
         GAP = 15.0
-        for i in range(len(items)):
-            for j in range(i + 1, len(items)):
-                item_a = items[i]
-                item_b = items[j]
-                rect_a = item_a.sceneBoundingRect()
-                rect_b = item_b.sceneBoundingRect()
-                if rect_a.intersects(rect_b):
-                    overlap_v = rect_a.bottom() - rect_b.top()
-                    new_y_b = item_b.pos().y() + overlap_v + GAP
-                    if (new_y_b + item_b.current_height) <= BOTTOM_LIMIT:
-                        item_b.setY(new_y_b)
-                        modified_items.add(item_b)
-                    else:
-                        overlap_v_up = rect_a.bottom() - rect_b.top()
-                        new_y_a = item_a.pos().y() - (overlap_v_up + GAP)
-                        if new_y_a >= TOP_LIMIT:
-                            item_a.setY(new_y_a)
-                            modified_items.add(item_a)
-        if modified_items and hasattr(app, 'register_undo_action'):
-            states_after = {item: app._get_item_state(item) for item in items}
-
-            def undo_autospace(states=states_before):
-                 for item, state in states.items(): app._apply_item_state(item, state)
-                 app._mark_dirty(); return True
-
-            def redo_autospace(states=states_after):
-                 for item, state in states.items(): app._apply_item_state(item, state)
-                 app._mark_dirty(); return True
-            app.register_undo_action("Autospace Overlaps", undo_autospace, redo_autospace)
+        app._suppress_undo_registration = True
+        try:
+            for i in range(len(items)):
+                for j in range(i + 1, len(items)):
+                    item_a = items[i]
+                    item_b = items[j]
+                    rect_a = item_a.sceneBoundingRect()
+                    rect_b = item_b.sceneBoundingRect()
+                    if rect_a.intersects(rect_b):
+                        overlap_v = rect_a.bottom() - rect_b.top()
+                        new_y_b = item_b.pos().y() + overlap_v + GAP
+                        if (new_y_b + item_b.current_height) <= BOTTOM_LIMIT:
+                            item_b.setY(new_y_b)
+                            modified_items.add(item_b)
+                        else:
+                            overlap_v_up = rect_a.bottom() - rect_b.top()
+                            new_y_a = item_a.pos().y() - (overlap_v_up + GAP)
+                            if new_y_a >= TOP_LIMIT:
+                                item_a.setY(new_y_a)
+                                modified_items.add(item_a)
+        finally:
+            app._suppress_undo_registration = False
+        if modified_items:
+            app.record_item_edit("Autospace Overlaps", {item: states_before[item] for item in modified_items})
             for item in modified_items:
                 if item.assigned_role: app.modified_roles.add(item.assigned_role)
             app._mark_dirty()
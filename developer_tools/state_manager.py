@@ -37,6 +37,7 @@ class TransactionState:
         self.created_at = time.time()
         self.transaction_id = f"{operation_type.value}_{int(time.time() * 1000)}"
         self.backup_files: Dict[str, str] = {}
+        self.shared_backups: set = set()
         self.rollback_actions: List[Callable[[], bool]] = []
         self.state_snapshots: Dict[str, Any] = {}
         self.content_hashes: Dict[str, str] = {}
@@ -47,21 +48,30 @@ class TransactionState:
             'description': description
         }
         
-    def add_file_backup(self, file_path: str) -> bool:
-        """Create a backup of a file for rollback with content hash."""
+    def add_file_backup(self, file_path: str, digest: Optional[str] = None, backup_path: Optional[str] = None) -> bool:
+        """
+        Create a backup of a file for rollback with content hash.
+        A caller that already holds a content-addressed copy passes it with its digest; it is reused, not copied, and survives cleanup.
+        """
         try:
+            if backup_path and digest and os.path.exists(backup_path):
+                self.backup_files[file_path] = backup_path
+                self.shared_backups.add(backup_path)
+                self.content_hashes[file_path] = digest
+                return True
             if os.path.exists(file_path):
+                with open(file_path, 'rb') as f:
+                    content = f.read()
                 backup_dir = tempfile.gettempdir()
                 timestamp = int(time.time() * 1000)
                 backup_filename = f"{os.path.basename(file_path)}.backup.{timestamp}"
                 backup_path = os.path.join(backup_dir, backup_filename)
-                shutil.copy2(file_path, backup_path)
-                self.backup_files[file_path] = backup_path
+                with open(backup_path, 'wb') as f:
+                    f.write(content)
 
                 import hashlib
-                with open(file_path, 'rb') as f:
-                    file_hash = hashlib.sha256(f.read()).hexdigest()
-                self.content_hashes[file_path] = file_hash
+                self.backup_files[file_path] = backup_path
+                self.content_hashes[file_path] = digest or hashlib.sha256(content).hexdigest()
                 return True
         except Exception as e:
             logging.error(f"Failed to backup file {file_path}: {e}")
@@ -115,6 +125,8 @@ class TransactionState:
     def cleanup(self):
         """Clean up backup files after successful completion."""
         for backup_path in self.backup_files.values():
+            if backup_path in self.shared_backups:
+                continue
             try:
                 if os.path.exists(backup_path):
                     os.unlink(backup_path)
@@ -135,6 +147,10 @@ class UndoAction:
         self.redo_func = redo_func
         self.timestamp = time.time()
     
+    def cost(self) -> int:
+        """Rough bytes held by this entry; closures keep whole item states alive."""
+        return 4096
+
     def undo(self) -> bool:
         """Execute undo for this action."""
         try:
@@ -151,6 +167,58 @@ class UndoAction:
             logging.error(f"Redo action failed: {e}")
             return False
 
+class DeltaUndoAction(UndoAction):
+    """Undoable edit stored as changed fields only: {key: {field: (before, after)}}, applied through one shared callback."""
+    BASE_COST = 160
+    FIELD_COST = 48
+
+    def __init__(self, action_type: str, description: str, deltas: Dict[Any, Dict[str, tuple]], apply_func: Callable[[Any, Dict[str, Any]], bool]):
+        super().__init__(action_type, description, self._revert, self._reapply)
+        self.deltas = deltas
+        self.apply_func = apply_func
+        self.sealed = False
+
+    def _apply(self, side: int) -> bool:
+        ok = True
+        for key, fields in self.deltas.items():
+            if not self.apply_func(key, {name: pair[side] for name, pair in fields.items()}):
+                ok = False
+        return ok
+
+    def _revert(self) -> bool:
+        return self._apply(0)
+
+    def _reapply(self) -> bool:
+        return self._apply(1)
+
+    def merge(self, deltas: Dict[Any, Dict[str, tuple]]) -> None:
+        """Folds a follow-up delta in, keeping the oldest 'before' and the newest 'after'; fields that return to their start drop out."""
+        for key, fields in deltas.items():
+            current = self.deltas.setdefault(key, {})
+            for name, (before, after) in fields.items():
+                start = current[name][0] if name in current else before
+                if start == after:
+                    current.pop(name, None)
+                else:
+                    current[name] = (start, after)
+            if not current:
+                del self.deltas[key]
+
+    def cost(self) -> int:
+        return self.BASE_COST + sum(self.FIELD_COST * (1 + len(fields)) for fields in self.deltas.values())
+
+def diff_states(before: Dict[Any, Dict[str, Any]], after: Dict[Any, Dict[str, Any]]) -> Dict[Any, Dict[str, tuple]]:
+    """Per-key field changes between two {key: {field: value}} snapshots; unchanged keys and fields are left out."""
+    deltas = {}
+    for key, old in before.items():
+        new = after.get(key)
+        if new is None:
+            continue
+        fields = {name: (old.get(name), value) for name, value in new.items() if old.get(name) != value}
+        if fields:
+            deltas[key] = fields
+    return deltas
+
 class StateManager:
     """Manages application state with transaction support and undo/redo stack."""
     
@@ -161,7 +229,8 @@ class StateManager:
         self.max_history_size = 10
         self.undo_stack: List[UndoAction] = []
         self.redo_stack: List[UndoAction] = []
-        self.max_undo_stack_size = 50
+        self.max_undo_stack_size = 200
+        self.max_undo_bytes = 512 * 1024
         
     def begin_transaction(self, operation_type: OperationType, description: str) -> TransactionState:
         """Begin a new transaction."""
@@ -249,12 +318,56 @@ class StateManager:
     
     def add_undo_action(self, action_type: str, description: str, undo_func: Callable[[], bool], redo_func: Callable[[], bool]) -> None:
         """Add an undoable action to the undo stack."""
-        action = UndoAction(action_type, description, undo_func, redo_func)
+        self._push_undo(UndoAction(action_type, description, undo_func, redo_func))
+        self.logger.debug(f"Added undo action: {description} ({action_type})")
+
+    def _push_undo(self, action: UndoAction) -> None:
+        """Pushes an entry and trims the oldest ones past the entry cap or the byte budget."""
         self.undo_stack.append(action)
         self.redo_stack.clear()
         if len(self.undo_stack) > self.max_undo_stack_size:
             self.undo_stack = self.undo_stack[-self.max_undo_stack_size:]
-        self.logger.debug(f"Added undo action: {description} ({action_type})")
+        total = self.undo_bytes()
+        drop = 0
+        while total > self.max_undo_bytes and drop < len(self.undo_stack) - 1:
+            total -= self.undo_stack[drop].cost()
+            drop += 1
+        if drop:
+            del self.undo_stack[:drop]
+
+    def undo_bytes(self) -> int:
+        """Estimated memory held by the undo stack."""
+        return sum(action.cost() for action in self.undo_stack)
+
+    def add_delta_action(self, action_type: str, description: str, before: Dict[Any, Dict[str, Any]], after: Dict[Any, Dict[str, Any]], apply_func: Callable[[Any, Dict[str, Any]], bool], coalesce_ms: Optional[int] = 0) -> bool:
+        """
+        Records only the fields that changed between two snapshots. An open entry of the same type absorbs the change
+        when it is younger than coalesce_ms (None: until sealed), so a drag or a burst of nudges becomes one step.
+        Returns False when nothing changed.
+        """
+        deltas = diff_states(before, after)
+        if not deltas:
+            return False
+        now = time.time()
+        last = self.undo_stack[-1] if self.undo_stack else None
+        if (coalesce_ms != 0 and isinstance(last, DeltaUndoAction) and not last.sealed and last.action_type == action_type
+                and last.apply_func == apply_func and (coalesce_ms is None or (now - last.timestamp) * 1000 < coalesce_ms)):
+            last.merge(deltas)
+            last.description = description
+            last.timestamp = now
+            self.redo_stack.clear()
+            if not last.deltas:
+                self.undo_stack.pop()
+            self.logger.debug(f"Coalesced undo action: {description}")
+            return True
+        self._push_undo(DeltaUndoAction(action_type, description, deltas, apply_func))
+        self.logger.debug(f"Added delta undo action: {description} ({action_type})")
+        return True
+
+    def seal_recent_undo(self) -> None:
+        """Closes the newest delta entry so the next edit starts a new undo step."""
+        if self.undo_stack and isinstance(self.undo_stack[-1], DeltaUndoAction):
+            self.undo_stack[-1].sealed = True
 
     def add_or_update_recent_undo(self, action_type: str, description: str, undo_func: Callable[[], bool], redo_func: Callable[[], bool], window_ms: int = 1000) -> None:
         """
@@ -310,6 +423,8 @@ class StateManager:
         self.logger.info(f"Redoing: {action.description}")
         try:
             if action.redo():
+                if isinstance(action, DeltaUndoAction):
+                    action.sealed = True
                 self.undo_stack.append(action)
                 self.logger.info(f"Successfully redone: {action.description}")
                 return True
@@ -404,6 +519,7 @@ class StateManager:
             'last_operation': self.state_history[-1] if self.state_history else None,
             'undo_stack_size': len(self.undo_stack),
             'redo_stack_size': len(self.redo_stack),
+            'undo_bytes': self.undo_bytes(),
             'can_undo': self.can_undo(),
             'can_redo': self.can_redo()
         }
@@ -2,8 +2,6 @@ import os
 import sys
 import tempfile
 import shutil
-from typing import Dict, Any, Optional, List
-from PyQt5.QtCore import QObject, pyqtSignal
 
 os.environ['PYTHONDONTWRITEBYTECODE'] = '1'
 os.environ['PYTHONPYCACHEPREFIX'] = os.path.join(tempfile.gettempdir(), 'pycache_disabled')
@@ -22,10 +20,24 @@ def cleanup_pycache():
 
 cleanup_pycache()
 
-from .config_data import VideoConfig; from .media_utils import MediaProber; from .filter_builder import FilterBuilder
-from .encoders import EncoderManager; from .text_ops import TextWrapper, fix_hebrew_text, apply_bidi_formatting
-from .system_utils import create_subprocess, monitor_ffmpeg_progress, kill_process_tree
-from .worker import ProcessThread
+_LAZY_EXPORTS = {
+    'VideoConfig': 'config_data', 'MediaProber': 'media_utils', 'FilterBuilder': 'filter_builder',
+    'EncoderManager': 'encoders', 'TextWrapper': 'text_ops', 'fix_hebrew_text': 'text_ops', 'apply_bidi_formatting': 'text_ops',
+    'create_subprocess': 'system_utils', 'monitor_ffmpeg_progress': 'system_utils', 'kill_process_tree': 'system_utils',
+    'ProcessThread': 'worker',
+}
+
+def __getattr__(name):
+    module_name = _LAZY_EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    import importlib
+    value = getattr(importlib.import_module(f".{module_name}", __name__), name)
+    globals()[name] = value
+    return value
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_EXPORTS))
 
 __all__ = [
     'VideoConfig',
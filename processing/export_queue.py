@@ -0,0 +1,371 @@
+﻿import os
+import time
+import uuid
+from typing import Any, Callable, Dict, List, Optional
+import psutil
+from PyQt5.QtCore import QObject, pyqtSignal
+from .worker import ProcessThread
+ENCODER_SESSION_LIMITS = {"NVIDIA": 3, "AMD": 2, "INTEL": 2}
+CPU_CORES_PER_SOFTWARE_JOB = 8
+CPU_CORES_PER_HARDWARE_JOB = 4
+MIN_FREE_GB_RESERVE = 2.0
+QUEUE_SCHEMA_VERSION = 1
+JOB_QUEUED = "queued"
+JOB_RUNNING = "running"
+JOB_DONE = "done"
+JOB_FAILED = "failed"
+JOB_CANCELED = "canceled"
+PERSISTED_JOB_PARAMS = (
+    "input_path", "start_time_ms", "end_time_ms", "original_resolution", "is_mobile_format",
+    "speed_factor", "is_boss_hp", "show_teammates_overlay", "show_spectating_overlay",
+    "quality_level", "bg_music_path", "bg_music_volume", "bg_music_offset_ms",
+    "original_total_duration_ms", "disable_fades", "intro_still_sec", "intro_from_midpoint",
+    "intro_abs_time_ms", "portrait_text", "music_config", "speed_segments",
+    "hardware_strategy", "music_tracks", "target_mb_override", "volume_normalize_db",
+)
+
+def encoder_family(hardware_strategy: Optional[str]) -> str:
+    family = str(hardware_strategy or "CPU").upper()
+    return family if family in ENCODER_SESSION_LIMITS else "CPU"
+
+def estimate_job_disk_gb(target_mb: Optional[float]) -> float:
+    if target_mb is None:
+        return 4.0
+    return max(0.5, float(target_mb) * 3.0 / 1024.0)
+
+def session_limit_for(family: str, cpu_count: int) -> int:
+    if family in ENCODER_SESSION_LIMITS:
+        return ENCODER_SESSION_LIMITS[family]
+    return max(1, int(cpu_count) // CPU_CORES_PER_SOFTWARE_JOB)
+
+def total_job_limit(cpu_count: int) -> int:
+    return max(1, int(cpu_count) // CPU_CORES_PER_HARDWARE_JOB)
+
+def sanitize_job_params(params: Dict[str, Any]) -> Dict[str, Any]:
+    clean = {}
+    for key in PERSISTED_JOB_PARAMS:
+        if key not in params:
+            continue
+        value = params[key]
+        if key == "music_tracks":
+            value = [list(t) if isinstance(t, (list, tuple)) else t for t in (value or [])]
+        elif key in ("music_config",):
+            value = dict(value or {})
+        elif key == "speed_segments":
+            value = [dict(s) for s in (value or []) if isinstance(s, dict)]
+        clean[key] = value
+    return clean
+
+class ExportQueue(QObject):
+    """
+    Persistent batch export queue.
+    Runs configured ProcessThread jobs one after another, or concurrently when the
+    encoder session limits, CPU cores and free output-disk space allow it.
+    """
+    queue_changed = pyqtSignal()
+    job_progress = pyqtSignal(str, int)
+    job_status = pyqtSignal(str, str)
+    job_finished = pyqtSignal(str, bool, str)
+    queue_blocked = pyqtSignal(str)
+    queue_drained = pyqtSignal()
+    _thread_progress = pyqtSignal(str, int)
+    _thread_status = pyqtSignal(str, str)
+    _thread_finished = pyqtSignal(str, bool, str)
+
+    def __init__(self, base_dir: str, logger=None, store=None, output_dir: Optional[str] = None,
+                 thread_factory: Optional[Callable[..., Any]] = None, cpu_count: Optional[int] = None,
+                 free_gb_probe: Optional[Callable[[str], float]] = None, foreground_busy: Optional[Callable[[], bool]] = None):
+        super().__init__()
+        self.base_dir = base_dir
+        self.logger = logger
+        self.store = store
+        self.output_dir = output_dir or os.path.join(os.path.expanduser("~"), "Downloads")
+        self.thread_factory = thread_factory or ProcessThread
+        self.cpu_count = int(cpu_count or psutil.cpu_count(logical=True) or 1)
+        self.free_gb_probe = free_gb_probe or self._probe_free_gb
+        self.foreground_busy = foreground_busy or (lambda: False)
+        self.jobs: List[Dict[str, Any]] = []
+        self.concurrent = True
+        self.is_running = False
+        self.resume_requested = False
+        self._threads: Dict[str, Any] = {}
+        self._cancel_requested: set = set()
+        self._thread_progress.connect(self._on_thread_progress)
+        self._thread_status.connect(self._on_thread_status)
+        self._thread_finished.connect(self._on_thread_finished)
+
+    def _log(self, level: str, msg: str, *args):
+        if self.logger:
+            try:
+                getattr(self.logger, level)(msg, *args)
+            except Exception:
+                pass
+
+    @staticmethod
+    def _probe_free_gb(path: str) -> float:
+        try:
+            target = path if os.path.exists(path) else os.path.dirname(os.path.abspath(path))
+            return psutil.disk_usage(target).free / (1024 ** 3)
+        except Exception:
+            return float("inf")
+
+    def get_job(self, job_id: str) -> Optional[Dict[str, Any]]:
+        for job in self.jobs:
+            if job["job_id"] == job_id:
+                return job
+        return None
+
+    def pending_jobs(self) -> List[Dict[str, Any]]:
+        return [j for j in self.jobs if j["state"] == JOB_QUEUED]
+
+    def running_jobs(self) -> List[Dict[str, Any]]:
+        return [j for j in self.jobs if j["state"] == JOB_RUNNING]
+
+    def add_job(self, params: Dict[str, Any], label: Optional[str] = None) -> str:
+        clean = sanitize_job_params(params)
+        job_id = uuid.uuid4().hex[:10]
+        self.jobs.append({
+            "job_id": job_id,
+            "label": label or os.path.basename(str(clean.get("input_path") or "")),
+            "state": JOB_QUEUED,
+            "params": clean,
+            "created_ts": time.time(),
+            "progress": 0,
+            "output_path": None,
+            "message": "",
+        })
+        self._log("info", "EXPORT_QUEUE: added job %s (%s), queued=%d", job_id, label, len(self.pending_jobs()))
+        self._persist()
+        self.queue_changed.emit()
+        if self.is_running:
+            self._pump()
+        return job_id
+
+    def remove_job(self, job_id: str) -> bool:
+        job = self.get_job(job_id)
+        if not job or job["state"] == JOB_RUNNING:
+            return False
+        self.jobs.remove(job)
+        self._persist()
+        self.queue_changed.emit()
+        return True
+
+    def cancel_job(self, job_id: str) -> bool:
+        job = self.get_job(job_id)
+        if not job:
+            return False
+        if job["state"] == JOB_RUNNING:
+            th = self._threads.get(job_id)
+            self._cancel_requested.add(job_id)
+            if th is not None:
+                try:
+                    th.cancel()
+                except Exception as e:
+                    self._log("warning", "EXPORT_QUEUE: cancel failed for %s: %s", job_id, e)
+            return True
+        if job["state"] == JOB_QUEUED:
+            job["state"] = JOB_CANCELED
+            job["message"] = "Canceled before start."
+            self._persist()
+            self.queue_changed.emit()
+            return True
+        return False
+
+    def clear_finished(self):
+        self.jobs = [j for j in self.jobs if j["state"] in (JOB_QUEUED, JOB_RUNNING)]
+        self._persist()
+        self.queue_changed.emit()
+
+    def start(self, concurrent: Optional[bool] = None):
+        if concurrent is not None:
+            self.concurrent = bool(concurrent)
+        self.is_running = True
+        self._log("info", "EXPORT_QUEUE: started (concurrent=%s, cpu=%d)", self.concurrent, self.cpu_count)
+        self._persist()
+        self._pump()
+
+    def pause(self):
+        self.is_running = False
+        self._log("info", "EXPORT_QUEUE: paused; running jobs finish, no new jobs start.")
+        self._persist()
+
+    def shutdown(self, wait_ms: int = 5000):
+        self.is_running = False
+        for job_id, th in list(self._threads.items()):
+            try:
+                th.cancel()
+                if hasattr(th, "wait"):
+                    th.wait(wait_ms)
+            except Exception:
+                pass
+            job = self.get_job(job_id)
+            if job and job["state"] == JOB_RUNNING:
+                job["state"] = JOB_QUEUED
+                job["progress"] = 0
+        self._threads.clear()
+        self._persist(durable=True)
+
+    def _reserved_disk_gb(self) -> float:
+        return sum(estimate_job_disk_gb(j["params"].get("target_mb_override")) for j in self.running_jobs())
+
+    def launch_block_reason(self, job: Dict[str, Any]) -> Optional[str]:
+        if self.foreground_busy():
+            return "foreground"
+        running = self.running_jobs()
+        if running and not self.concurrent:
+            return "sequential"
+        if len(running) >= total_job_limit(self.cpu_count):
+            return "cpu"
+        family = encoder_family(job["params"].get("hardware_strategy"))
+        same_family = sum(1 for j in running if encoder_family(j["params"].get("hardware_strategy")) == family)
+        if same_family >= session_limit_for(family, self.cpu_count):
+            return "sessions"
+        need_gb = estimate_job_disk_gb(job["params"].get("target_mb_override"))
+        free_gb = self.free_gb_probe(self.output_dir) - self._reserved_disk_gb()
+        if free_gb - need_gb < MIN_FREE_GB_RESERVE:
+            return "disk"
+        return None
+
+    def _pump(self):
+        if not self.is_running:
+            return
+        for job in self.pending_jobs():
+            reason = self.launch_block_reason(job)
+            if reason is None:
+                self._launch(job)
+                continue
+            if reason == "disk" and not self.running_jobs():
+                self.is_running = False
+                msg = "Export queue paused: not enough free disk space on the output drive."
+                self._log("warning", "EXPORT_QUEUE: %s", msg)
+                self.queue_blocked.emit(msg)
+                return
+            if reason in ("foreground", "sequential", "cpu", "disk"):
+                break
+        if not self.running_jobs() and not self.pending_jobs():
+            self.is_running = False
+            self._log("info", "EXPORT_QUEUE: drained.")
+            self.queue_drained.emit()
+
+    def reschedule(self):
+        """Starts whatever became launchable after an outside blocker (the foreground export) cleared."""
+        self._pump()
+
+    def _launch(self, job: Dict[str, Any]):
+        job_id = job["job_id"]
+        params = dict(job["params"])
+        if not params.get("input_path") or not os.path.exists(params["input_path"]):
+            job["state"] = JOB_FAILED
+            job["message"] = f"Source file missing: {params.get('input_path')}"
+            self._persist()
+            self.job_finished.emit(job_id, False, job["message"])
+            self.queue_changed.emit()
+            return
+        params["music_tracks"] = [tuple(t) for t in (params.get("music_tracks") or [])]
+        job["state"] = JOB_RUNNING
+        job["progress"] = 0
+        job["started_ts"] = time.time()
+        try:
+            th = self.thread_factory(
+                base_dir=self.base_dir, logger=self.logger,
+                progress_signal=lambda v, jid=job_id: self._thread_progress.emit(jid, int(v)),
+                status_signal=lambda m, jid=job_id: self._thread_status.emit(jid, str(m)),
+                finished_signal=lambda ok, m, jid=job_id: self._thread_finished.emit(jid, bool(ok), str(m)),
+                **params,
+            )
+            self._threads[job_id] = th
+            th.start()
+        except Exception as e:
+            self._threads.pop(job_id, None)
+            job["state"] = JOB_FAILED
+            job["message"] = f"Could not start export: {e}"
+            self._log("error", "EXPORT_QUEUE: launch failed for %s: %s", job_id, e)
+            self._persist()
+            self.job_finished.emit(job_id, False, job["message"])
+            self.queue_changed.emit()
+            return
+        self._log("info", "EXPORT_QUEUE: launched job %s (%s), running=%d", job_id, encoder_family(params.get("hardware_strategy")), len(self.running_jobs()))
+        self._persist()
+        self.queue_changed.emit()
+
+    def _on_thread_progress(self, job_id: str, value: int):
+        job = self.get_job(job_id)
+        if job is None:
+            return
+        job["progress"] = int(value)
+        self.job_progress.emit(job_id, int(value))
+
+    def _on_thread_status(self, job_id: str, message: str):
+        if self.get_job(job_id) is not None:
+            self.job_status.emit(job_id, message)
+
+    def _on_thread_finished(self, job_id: str, success: bool, message: str):
+        job = self.get_job(job_id)
+        if job is None or job["state"] != JOB_RUNNING:
+            return
+        th = self._threads.pop(job_id, None)
+        canceled = job_id in self._cancel_requested or bool(getattr(th, "is_canceled", False))
+        self._cancel_requested.discard(job_id)
+        if success:
+            job["state"] = JOB_DONE
+            job["output_path"] = message
+            job["progress"] = 100
+        else:
+            job["state"] = JOB_CANCELED if canceled else JOB_FAILED
+        job["message"] = message
+        job["finished_ts"] = time.time()
+        self._log("info", "EXPORT_QUEUE: job %s finished success=%s: %s", job_id, success, message)
+        self._persist()
+        self.job_finished.emit(job_id, bool(success), str(message))
+        self.queue_changed.emit()
+        self._pump()
+
+    def snapshot(self) -> Dict[str, Any]:
+        jobs = []
+        for job in self.jobs:
+            entry = dict(job)
+            if entry["state"] == JOB_RUNNING:
+                entry["state"] = JOB_QUEUED
+                entry["progress"] = 0
+            jobs.append(entry)
+        return {"version": QUEUE_SCHEMA_VERSION, "concurrent": self.concurrent, "running": self.is_running, "jobs": jobs}
+
+    def _persist(self, durable: bool = False):
+        """Queue mutations hand the snapshot to the recovery writer thread; shutdown writes it durably before returning."""
+        if self.store is None:
+            return
+        try:
+            if any(j["state"] in (JOB_QUEUED, JOB_RUNNING) for j in self.jobs):
+                if durable:
+                    self.store.save_state(self.snapshot())
+                else:
+                    self.store.save_state_async(self.snapshot())
+            else:
+                self.store.clear_state()
+        except Exception as e:
+            self._log("error", "EXPORT_QUEUE: persist failed: %s", e)
+
+    def restore(self) -> int:
+        if self.store is None:
+            return 0
+        state = self.store.load_state() or {}
+        if int(state.get("version", 0) or 0) != QUEUE_SCHEMA_VERSION:
+            return 0
+        restored = 0
+        known = {j["job_id"] for j in self.jobs}
+        for entry in state.get("jobs", []):
+            if not isinstance(entry, dict) or entry.get("job_id") in known:
+                continue
+            if entry.get("state") not in (JOB_QUEUED, JOB_RUNNING):
+                continue
+            entry["state"] = JOB_QUEUED
+            entry["progress"] = 0
+            entry["params"] = sanitize_job_params(entry.get("params") or {})
+            self.jobs.append(entry)
+            restored += 1
+        self.concurrent = bool(state.get("concurrent", self.concurrent))
+        self.resume_requested = bool(restored and state.get("running"))
+        if restored:
+            self._log("info", "EXPORT_QUEUE: restored %d pending job(s) from previous session.", restored)
+            self.queue_changed.emit()
+        return restored
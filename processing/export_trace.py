@@ -0,0 +1,119 @@
+﻿import os
+import re
+import json
+import time
+import threading
+from contextlib import contextmanager
+from typing import Any, Dict, List, Optional
+try:
+    import resource
+except ImportError:
+    resource = None
+TRACE_SCHEMA_VERSION = 1
+TRACE_KEEP_FILES = 25
+_BENCH_RE = re.compile(r"bench:\s*utime=([\d.]+)s\s+stime=([\d.]+)s\s+rtime=([\d.]+)s")
+
+def parse_ffmpeg_bench_line(line: str) -> Optional[Dict[str, float]]:
+    m = _BENCH_RE.search(str(line or ""))
+    if not m:
+        return None
+    return {"utime_sec": float(m.group(1)), "stime_sec": float(m.group(2)), "rtime_sec": float(m.group(3))}
+
+def _children_cpu_sec() -> Optional[float]:
+    if resource is None:
+        return None
+    try:
+        ru = resource.getrusage(resource.RUSAGE_CHILDREN)
+        return float(ru.ru_utime + ru.ru_stime)
+    except Exception:
+        return None
+
+class ExportTrace:
+    """Collects nested wall/CPU spans for one export and writes them as a JSON trace file."""
+
+    def __init__(self, job_id: str, trace_dir: Optional[str] = None, logger=None, meta: Optional[Dict[str, Any]] = None):
+        self.job_id = str(job_id)
+        self.trace_dir = trace_dir
+        self.logger = logger
+        self.meta = dict(meta or {})
+        self.spans: List[Dict[str, Any]] = []
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._t0 = time.perf_counter()
+        self._cpu0 = time.process_time()
+        self._started_at = time.time()
+        self.path = os.path.join(trace_dir, f"export_{self.job_id}.trace.json") if trace_dir else None
+
+    def _stack(self) -> List[Dict[str, Any]]:
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    @contextmanager
+    def span(self, name: str, **attrs):
+        stack = self._stack()
+        record = {
+            "name": str(name), "parent": stack[-1]["name"] if stack else None, "depth": len(stack),
+            "start_sec": round(time.perf_counter() - self._t0, 6), "status": "ok", "attrs": dict(attrs),
+        }
+        wall0, cpu0, child0 = time.perf_counter(), time.thread_time(), _children_cpu_sec()
+        stack.append(record)
+        try:
+            yield record
+        except BaseException as e:
+            record["status"] = "error"
+            record["error"] = f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            stack.pop()
+            record["wall_sec"] = round(time.perf_counter() - wall0, 6)
+            record["cpu_sec"] = round(time.thread_time() - cpu0, 6)
+            child1 = _children_cpu_sec()
+            if child0 is not None and child1 is not None and child1 > child0:
+                record.setdefault("child_cpu_sec", round(child1 - child0, 6))
+            with self._lock:
+                self.spans.append(record)
+
+    def summary(self) -> Dict[str, Any]:
+        top: Dict[str, float] = {}
+        for s in self.spans:
+            if s["depth"] == 0:
+                top[s["name"]] = round(top.get(s["name"], 0.0) + s.get("wall_sec", 0.0), 6)
+        slowest = max(self.spans, key=lambda s: s.get("wall_sec", 0.0), default=None)
+        return {"stage_wall_sec": top, "slowest_span": slowest["name"] if slowest else None}
+
+    def finish(self, status: str, **attrs) -> Optional[str]:
+        with self._lock:
+            spans = sorted(self.spans, key=lambda s: s["start_sec"])
+        payload = {
+            "schema_version": TRACE_SCHEMA_VERSION, "job_id": self.job_id, "started_at": self._started_at,
+            "status": str(status), "total_wall_sec": round(time.perf_counter() - self._t0, 6),
+            "process_cpu_sec": round(time.process_time() - self._cpu0, 6), "meta": self.meta,
+            "result": dict(attrs), "summary": self.summary(), "spans": spans,
+        }
+        if not self.path:
+            return None
+        try:
+            os.makedirs(self.trace_dir, exist_ok=True)
+            tmp = f"{self.path}.tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(payload, f, ensure_ascii=False, separators=(",", ":"), default=str)
+            os.replace(tmp, self.path)
+            self._prune()
+            if self.logger:
+                self.logger.info(f"TRACE: export {self.job_id} {status} in {payload['total_wall_sec']:.2f}s -> {self.path}")
+            return self.path
+        except Exception as e:
+            if self.logger:
+                self.logger.warning(f"TRACE: could not write trace for {self.job_id}: {e}")
+            return None
+
+    def _prune(self):
+        try:
+            traces = [os.path.join(self.trace_dir, n) for n in os.listdir(self.trace_dir) if n.endswith(".trace.json")]
+            traces.sort(key=os.path.getmtime, reverse=True)
+            for stale in traces[TRACE_KEEP_FILES:]:
+                os.remove(stale)
+        except Exception:
+            pass
@@ -2,7 +2,9 @@
 import sys
 import subprocess
 import json
+from contextlib import nullcontext
 from fractions import Fraction
+from system import probe_flight
 
 class MediaProber:
     def __init__(self, bin_dir, input_path):
@@ -10,6 +12,19 @@ class MediaProber:
         self.input_path = input_path
         self.ffprobe_path = os.path.join(self.bin_dir, 'ffprobe.exe')
         self.probe_timeout = 8.0
+        self.trace = None
+
+    def _subprocess_run(self, full_cmd, **kwargs):
+        trace = getattr(self, "trace", None)
+        span = trace.span("ffprobe", args=" ".join(full_cmd[5:-1]), target=os.path.basename(str(self.input_path))) if trace else nullcontext({"attrs": {}})
+        with span as rec:
+            try:
+                result = probe_flight.run(full_cmd, subprocess.run, **kwargs)
+            except subprocess.CalledProcessError as e:
+                rec["attrs"]["exit_code"] = e.returncode; rec["status"] = "error"
+                raise
+            rec["attrs"]["exit_code"] = getattr(result, "returncode", 0)
+            return result
 
     def _run_command(self, args):
         try:
@@ -17,7 +32,7 @@ class MediaProber:
             creationflags = 0
             if sys.platform == "win32":
                 creationflags = subprocess.CREATE_NO_WINDOW
-            result = subprocess.run(
+            result = self._subprocess_run(
                 full_cmd, 
                 capture_output=True, 
                 text=True, 
@@ -37,7 +52,7 @@ class MediaProber:
             creationflags = 0
             if sys.platform == "win32":
                 creationflags = subprocess.CREATE_NO_WINDOW
-            result = subprocess.run(
+            result = self._subprocess_run(
                 full_cmd,
                 capture_output=True,
                 text=True,
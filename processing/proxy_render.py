@@ -0,0 +1,166 @@
+﻿import os
+import json
+import shutil
+import hashlib
+import tempfile
+from typing import Any, Dict, List, Optional, Tuple
+from .worker import ProcessThread
+from .filter_builder import FilterBuilder
+PROXY_FPS_EXPR = "30"
+PROXY_DOWNSCALE = 3
+PROXY_WINDOW_MS = 6000
+PROXY_MIN_WINDOW_MS = 500
+PROXY_CRF = 30
+PROXY_AUDIO_KBPS = 96
+PROXY_CACHE_MAX_FILES = 12
+PROXY_CACHE_DIRNAME = "fvs_proxy_cache"
+PROXY_KEY_PARAMS = (
+    "input_path", "start_time_ms", "end_time_ms", "original_resolution", "is_mobile_format",
+    "speed_factor", "is_boss_hp", "show_teammates_overlay", "show_spectating_overlay",
+    "bg_music_path", "bg_music_volume", "bg_music_offset_ms", "disable_fades", "intro_still_sec",
+    "intro_abs_time_ms", "portrait_text", "music_config", "speed_segments", "music_tracks",
+    "volume_normalize_db",
+)
+
+def proxy_cache_dir() -> str:
+    return os.path.join(tempfile.gettempdir(), PROXY_CACHE_DIRNAME)
+
+def resolve_proxy_window(trim_start_ms, trim_end_ms, window_start_ms=None, window_ms=PROXY_WINDOW_MS) -> Tuple[int, int]:
+    lo, hi = int(trim_start_ms), max(int(trim_start_ms) + 1, int(trim_end_ms))
+    start = lo if window_start_ms is None else min(max(lo, int(window_start_ms)), max(lo, hi - PROXY_MIN_WINDOW_MS))
+    return start, min(hi, start + max(PROXY_MIN_WINDOW_MS, int(window_ms or PROXY_WINDOW_MS)))
+
+def output_offset_sec(trim_start_ms, trim_end_ms, window_start_ms, speed_factor, speed_segments=None) -> float:
+    skipped_ms = max(0, int(window_start_ms) - int(trim_start_ms))
+    if skipped_ms <= 0:
+        return 0.0
+    speed = float(speed_factor or 1.0) or 1.0
+    if speed_segments:
+        try:
+            _, _, _, _, mapper = FilterBuilder().build_granular_speed_chain(
+                None, int(trim_end_ms) - int(trim_start_ms), list(speed_segments), speed, source_cut_start_ms=int(trim_start_ms)
+            )
+            return float(mapper(int(window_start_ms) / 1000.0))
+        except Exception:
+            pass
+    return skipped_ms / 1000.0 / speed
+
+def shift_music_timeline(music_tracks, music_config, skip_sec) -> Tuple[List[tuple], Dict[str, Any]]:
+    tracks, cfg = list(music_tracks or []), dict(music_config or {})
+    if skip_sec <= 0.001:
+        return tracks, cfg
+    try:
+        m_start = float(cfg.get("timeline_start_sec", 0.0) or 0.0)
+        m_end = float(cfg.get("timeline_end_sec", 0.0) or 0.0)
+    except Exception:
+        m_start, m_end = 0.0, 0.0
+    if m_end > m_start:
+        if m_end - skip_sec <= 0.001:
+            cfg.pop("path", None)
+            return [], cfg
+        cfg["timeline_end_sec"] = m_end - skip_sec
+    cfg["timeline_start_sec"] = max(0.0, m_start - skip_sec)
+    consumed = max(0.0, skip_sec - m_start)
+    if not tracks and cfg.get("path"):
+        cfg["file_offset_sec"] = float(cfg.get("file_offset_sec", 0.0) or 0.0) + consumed
+    shifted = []
+    for path, offset, dur in tracks:
+        if consumed >= dur:
+            consumed -= dur
+            continue
+        shifted.append((path, offset + consumed, dur - consumed))
+        consumed = 0.0
+    return shifted, cfg
+
+def _file_signature(path) -> List[Any]:
+    try:
+        st = os.stat(path)
+        return [str(path), int(st.st_size), int(st.st_mtime_ns)]
+    except Exception:
+        return [str(path), None, None]
+
+def prune_proxy_cache(cache_dir: str, keep: int = PROXY_CACHE_MAX_FILES, logger=None) -> int:
+    try:
+        entries = [os.path.join(cache_dir, n) for n in os.listdir(cache_dir) if n.endswith(".mp4")]
+        entries.sort(key=lambda p: os.path.getmtime(p), reverse=True)
+    except Exception:
+        return 0
+    removed = 0
+    for stale in entries[max(0, int(keep)):]:
+        try:
+            os.remove(stale); removed += 1
+        except Exception as e:
+            if logger: logger.debug(f"PROXY: could not prune {stale}: {e}")
+    return removed
+
+class ProxyRenderThread(ProcessThread):
+    render_fps_expr = PROXY_FPS_EXPR
+
+    def __init__(self, window_start_ms=None, window_ms=PROXY_WINDOW_MS, downscale=PROXY_DOWNSCALE, cache_dir=None, **params):
+        trim_start, trim_end = int(params["start_time_ms"]), int(params["end_time_ms"])
+        win_start, win_end = resolve_proxy_window(trim_start, trim_end, window_start_ms, window_ms)
+        skip_sec = output_offset_sec(trim_start, trim_end, win_start, params.get("speed_factor", 1.0), params.get("speed_segments"))
+        params = dict(params, start_time_ms=win_start, end_time_ms=win_end, hardware_strategy="CPU", quality_level=20, target_mb_override=None)
+        if win_start > trim_start:
+            params["intro_still_sec"] = 0
+            if params.get("bg_music_path"):
+                params["bg_music_offset_ms"] = int(params.get("bg_music_offset_ms") or 0) + int(round(skip_sec * 1000))
+        super().__init__(**params)
+        shifted, self.music_config = shift_music_timeline(self.music_tracks, self.music_config, skip_sec)
+        if self.music_tracks and not shifted:
+            self.bg_music_path = None
+        self.music_tracks = shifted
+        self.window_start_ms, self.window_end_ms = win_start, win_end
+        self.downscale = max(1, int(downscale or 1))
+        self.cache_dir = cache_dir or proxy_cache_dir()
+        self._output_dir = self.cache_dir
+        self.cache_key = self._compute_cache_key(params)
+        self.cache_path = os.path.join(self.cache_dir, f"proxy_{self.cache_key}.mp4")
+
+    def _compute_cache_key(self, params) -> str:
+        payload = {k: params.get(k) for k in PROXY_KEY_PARAMS}
+        payload["render"] = [self.render_fps_expr, self.downscale, PROXY_CRF]
+        payload["input"] = _file_signature(self.input_path)
+        payload["music_files"] = [_file_signature(t[0]) for t in self.music_tracks]
+        payload["music_state"] = [self.music_tracks, self.music_config]
+        if self.is_mobile_format:
+            try:
+                payload["mobile_coords"] = self.config.get_mobile_coordinates(self.logger)
+            except Exception:
+                payload["mobile_coords"] = None
+        raw = json.dumps(payload, sort_keys=True, default=str, separators=(",", ":"))
+        return hashlib.sha1(raw.encode("utf-8")).hexdigest()[:20]
+
+    def cached_output(self) -> Optional[str]:
+        return self.cache_path if os.path.isfile(self.cache_path) and os.path.getsize(self.cache_path) > 0 else None
+
+    def _choose_audio_bitrate(self, source_audio_kbps, duration_sec):
+        return PROXY_AUDIO_KBPS
+
+    def _video_codec_flags(self, encoder_name, requested_bitrate_kbps, duration_sec, target_fps_expr):
+        return ['-c:v', 'libx264', '-preset', 'ultrafast', '-tune', 'fastdecode', '-crf', str(PROXY_CRF), '-pix_fmt', 'yuv420p', '-g', str(PROXY_FPS_EXPR)], f"PROXY libx264 (ultrafast/CRF{PROXY_CRF})"
+
+    def _output_scale_filter(self):
+        if self.downscale <= 1:
+            return ""
+        d = self.downscale
+        return f"scale=trunc(iw/{d}/2)*2:trunc(ih/{d}/2)*2:flags=fast_bilinear,"
+
+    def _finalize_output(self, core_path):
+        os.makedirs(self.cache_dir, exist_ok=True)
+        staging = f"{self.cache_path}.{self.job_id}.part"
+        shutil.move(core_path, staging)
+        os.replace(staging, self.cache_path)
+        prune_proxy_cache(self.cache_dir, logger=self.logger)
+        return self.cache_path
+
+    def run(self):
+        cached = self.cached_output()
+        if cached:
+            try: os.utime(cached, None)
+            except Exception: pass
+            if self.logger: self.logger.info(f"PROXY: cache hit {os.path.basename(cached)}")
+            self._emit_progress(100)
+            self._emit_finished(True, cached)
+            return
+        super().run()
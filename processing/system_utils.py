@@ -6,6 +6,10 @@ import os
 import time
 import queue
 import threading
+try:
+    from system.child_registry import register_child, unregister_child
+except ImportError:
+    register_child = unregister_child = None
 _job_handle = None
 if sys.platform == "win32":
     try:
@@ -71,6 +75,25 @@ def parse_time_to_seconds(time_str: str) -> float:
         return 0.0
     return 0.0
 
+class _RegisteredPopen(subprocess.Popen):
+    """Popen that leaves the child registry once the exit status has been collected (poll, wait or communicate)."""
+    _registered = False
+
+    def poll(self):
+        rc = super().poll()
+        if rc is not None: self._leave_registry()
+        return rc
+
+    def wait(self, timeout=None):
+        rc = super().wait(timeout=timeout)
+        self._leave_registry()
+        return rc
+
+    def _leave_registry(self):
+        if self._registered:
+            self._registered = False
+            unregister_child(self.pid)
+
 def create_subprocess(cmd, logger=None):
     if logger:
         clean_cmd = [os.path.basename(cmd[0])] + cmd[1:]
@@ -81,7 +104,7 @@ def create_subprocess(cmd, logger=None):
         startupinfo = subprocess.STARTUPINFO()
         startupinfo.dwFlags |= subprocess.STARTF_USESHOWWINDOW
         creationflags = subprocess.CREATE_NO_WINDOW | 0x00000200
-    proc = subprocess.Popen(
+    proc = _RegisteredPopen(
         cmd,
         stdout=subprocess.PIPE,
         stderr=subprocess.STDOUT,
@@ -92,6 +115,7 @@ def create_subprocess(cmd, logger=None):
         encoding="utf-8",
         errors="replace"
     )
+    if register_child: proc._registered = bool(register_child(proc.pid, os.path.basename(cmd[0])))
     if _job_handle and sys.platform == "win32":
         try:
             import ctypes
@@ -2,6 +2,7 @@
 import tempfile
 import uuid
 import shutil
+import threading
 from fractions import Fraction
 from typing import Tuple, Dict, Any, Optional, List
 from PyQt5.QtCore import QThread, pyqtSignal
@@ -9,13 +10,16 @@ from .system_utils import create_subprocess, kill_process_tree, check_disk_space
 from .filter_builder import FilterBuilder
 from .encoders import EncoderManager
 from .media_utils import MediaProber, calculate_video_bitrate, choose_audio_bitrate
+from .export_trace import ExportTrace, parse_ffmpeg_bench_line
 from .processing_utils import ProgressScaler, generate_text_overlay_png
 from .config_data import VideoConfig
+_OUTPUT_PATH_LOCK = threading.Lock()
 
 class ProcessThread(QThread):
     progress_update_signal = pyqtSignal(int)
     status_update_signal = pyqtSignal(str)
     finished_signal = pyqtSignal(bool, str)
+    render_fps_expr = "60"
 
     def __init__(self, 
                  input_path, start_time_ms, end_time_ms, original_resolution,
@@ -174,10 +178,11 @@ class ProcessThread(QThread):
         if critical:
             return False, f"Critical errors in log: {critical[0]}"
         out_probe = MediaProber(os.path.join(self.base_dir, 'binaries'), path)
+        out_probe.trace = getattr(self, "trace", None)
         fps_expr = out_probe.get_video_fps_expr(target_fps_expr)
         try: fps_q = Fraction(str(fps_expr))
         except Exception: fps_q = Fraction(0, 1)
-        if fps_q <= 0 or abs(fps_q - Fraction(60, 1)) > Fraction(1, 100): return False, f"FPS mismatch: {float(fps_q)}"
+        if fps_q <= 0 or abs(fps_q - Fraction(str(self.render_fps_expr))) > Fraction(1, 100): return False, f"FPS mismatch: {float(fps_q)}"
         duration = out_probe.get_duration()
         if duration > 0 and abs(duration - expected_duration_sec) > 0.5: return False, "Duration mismatch."
         return True, "OK"
@@ -207,6 +212,18 @@ class ProcessThread(QThread):
         self._finish_emitted = True
         self._emit_signal_or_callback(self.finished_signal, bool(success), str(message))
 
+    def _video_codec_flags(self, encoder_name, requested_bitrate_kbps, duration_sec, target_fps_expr):
+        return self.encoder_mgr.get_codec_flags(encoder_name, requested_bitrate_kbps, duration_sec, target_fps_expr, quality_level=self.quality_level, size_locked=bool(self.target_mb))
+
+    def _output_scale_filter(self):
+        return ""
+
+    def _finalize_output(self, core_path):
+        with _OUTPUT_PATH_LOCK:
+            final_output = self._resolve_final_output_path()
+            shutil.move(core_path, final_output)
+        return final_output
+
     def _resolve_final_output_path(self):
         idx = 1
         while True:
@@ -214,46 +231,63 @@ class ProcessThread(QThread):
             if not os.path.exists(target_path): return target_path
             idx += 1
 
+    def _open_trace(self):
+        trace_dir = os.path.join(self.base_dir, "logs", "export_traces") if self.base_dir else None
+        meta = {"kind": type(self).__name__, "input": os.path.basename(str(self.input_path)), "trim_ms": [self.start_time_ms, self.end_time_ms], "speed": self.speed_factor, "mobile": bool(self.is_mobile_format), "hardware_strategy": self.hardware_strategy, "quality_level": self.quality_level, "target_mb": self.target_mb, "speed_segments": len(self.speed_segments), "music_tracks": len(self.music_tracks)}
+        self.trace = ExportTrace(self.job_id, trace_dir, self.logger, meta)
+        self.prober.trace = self.trace
+        return self.trace
+
     def run(self):
+        self.job_id = str(uuid.uuid4())[:8]
+        trace = self._open_trace()
+        status, result = "failed", {}
         try:
-            pre_err = self.encoder_mgr.get_encoder_preflight_error()
+            with trace.span("preflight"):
+                pre_err = self.encoder_mgr.get_encoder_preflight_error()
             if pre_err:
+                result = {"error": pre_err}
                 self._emit_finished(False, pre_err)
                 return
-            self.job_id = str(uuid.uuid4())[:8]
             self.temp_job_dir = os.path.join(tempfile.gettempdir(), f"fvs_job_{self.job_id}")
             os.makedirs(self.temp_job_dir, exist_ok=True)
             scaler_core = ProgressScaler(self.progress_update_signal, 0, 100)
-            source_has_audio = self.prober.has_audio()
-            source_audio_kbps = self.prober.get_audio_bitrate() or 192
-            target_fps_expr = "60"
+            with trace.span("probe_source"):
+                source_has_audio = self.prober.has_audio()
+                source_audio_kbps = self.prober.get_audio_bitrate() or 192
+            target_fps_expr = self.render_fps_expr
             text_png_path = None
             if self.portrait_text:
                 text_png_path = os.path.join(self.temp_job_dir, "portrait_text.png")
-                try:
-                    from .text_ops import TextWrapper
-                    wrapper = TextWrapper(self.config)
-                    _, wrapped = wrapper.fit_and_wrap(self.portrait_text, 1000, self.logger)
+                with trace.span("text_overlay") as sp:
+                    try:
+                        from .text_ops import TextWrapper
+                        wrapper = TextWrapper(self.config)
+                        _, wrapped = wrapper.fit_and_wrap(self.portrait_text, 1000, self.logger)
 
-                    from .processing_utils import generate_text_overlay_png
-                    generate_text_overlay_png("\n".join(wrapped), 1080, 150, 40, 10, text_png_path, self.config, self.logger)
-                except Exception: text_png_path = None
+                        from .processing_utils import generate_text_overlay_png
+                        generate_text_overlay_png("\n".join(wrapped), 1080, 150, 40, 10, text_png_path, self.config, self.logger)
+                    except Exception as e:
+                        text_png_path = None; sp["status"] = "error"; sp["error"] = str(e)
             music_cfg = self.music_config or {}
             g_v, g_a, g_dur = None, None, self.duration_corrected_sec
             granular_v_a_filters = ""
             if self.speed_segments:
-                granular_v_a_filters, g_v, g_a, g_dur, _ = self.filter_builder.build_granular_speed_chain(
-                    self.input_path, (self.end_time_ms - self.start_time_ms), self.speed_segments, self.speed_factor,
-                    source_cut_start_ms=self.start_time_ms, input_v_label="[0:v]", input_a_label="[0:a]" if source_has_audio else None,
-                    target_fps=target_fps_expr
-                )
-            audio_kbps = self._choose_audio_bitrate(source_audio_kbps, g_dur)
-            if self.keep_highest_res and self.quality_level >= 20 and self.target_mb is None:
-                video_bitrate_kbps = None
-                if self.logger:
-                    self.logger.info("BITRATE: Max quality CQ mode active; file-size targeting disabled.")
-            else:
-                video_bitrate_kbps = calculate_video_bitrate(self.input_path, g_dur, audio_kbps, self.target_mb, self.keep_highest_res, self.logger, self._output_resolution_for_bitrate(), target_fps_expr, self.quality_level, self.prober)
+                with trace.span("granular_chain", segments=len(self.speed_segments)):
+                    granular_v_a_filters, g_v, g_a, g_dur, _ = self.filter_builder.build_granular_speed_chain(
+                        self.input_path, (self.end_time_ms - self.start_time_ms), self.speed_segments, self.speed_factor,
+                        source_cut_start_ms=self.start_time_ms, input_v_label="[0:v]", input_a_label="[0:a]" if source_has_audio else None,
+                        target_fps=target_fps_expr
+                    )
+            with trace.span("bitrate_plan") as sp:
+                audio_kbps = self._choose_audio_bitrate(source_audio_kbps, g_dur)
+                if self.keep_highest_res and self.quality_level >= 20 and self.target_mb is None:
+                    video_bitrate_kbps = None
+                    if self.logger:
+                        self.logger.info("BITRATE: Max quality CQ mode active; file-size targeting disabled.")
+                else:
+                    video_bitrate_kbps = calculate_video_bitrate(self.input_path, g_dur, audio_kbps, self.target_mb, self.keep_highest_res, self.logger, self._output_resolution_for_bitrate(), target_fps_expr, self.quality_level, self.prober)
+                sp["attrs"].update(audio_kbps=audio_kbps, video_kbps=video_bitrate_kbps)
             if self.bg_music_path and not self.music_tracks:
                  self.music_tracks = [(self.bg_music_path, self.bg_music_offset_ms/1000.0, g_dur)]
             intro_duration_sec = max(0.0, float(self.intro_still_sec or 0.0))
@@ -264,7 +298,8 @@ class ProcessThread(QThread):
             render_duration_sec = g_dur + intro_duration_sec
             if self.logger:
                 self.logger.info(f"INTRO_FRAME_STATE: duration={intro_duration_sec:.3f}s input_index={intro_input_index} text_label={text_input_label}")
-            audio_chains, final_a_label = self.filter_builder.build_audio_chain(music_cfg, self.start_time_ms/1000.0, self.end_time_ms/1000.0, self.speed_factor, self.disable_fades, 0.5 if not self.disable_fades else 0, "", 48000, self.music_tracks, 1, g_dur, volume_normalize_db=self.volume_normalize_db)
+            with trace.span("audio_chain", tracks=len(self.music_tracks)):
+                audio_chains, final_a_label = self.filter_builder.build_audio_chain(music_cfg, self.start_time_ms/1000.0, self.end_time_ms/1000.0, self.speed_factor, self.disable_fades, 0.5 if not self.disable_fades else 0, "", 48000, self.music_tracks, 1, g_dur, volume_normalize_db=self.volume_normalize_db)
             core_path = os.path.normpath(os.path.join(self.temp_job_dir, "core.mp4"))
             last_error = "Render failed."
 
@@ -272,78 +307,99 @@ class ProcessThread(QThread):
                 nonlocal last_error
                 current_encoder = self.encoder_mgr.get_initial_encoder() if use_cuda else 'libx264'
                 while True:
-                    vcodec, rc_label = self.encoder_mgr.get_codec_flags(current_encoder, requested_bitrate_kbps, g_dur, target_fps_expr, quality_level=self.quality_level, size_locked=bool(self.target_mb))
-                    v_label, working_duration_sec, cfr_filter = "[0:v]", g_dur, f"fps={target_fps_expr}:round=near"
-                    attempt_core_filters = [granular_v_a_filters] if granular_v_a_filters else []
-                    v_stabilized_pad, a_prepared_pad = g_v, g_a
-                    if not granular_v_a_filters:
-                        attempt_core_filters.extend([f"{v_label}setpts='(PTS-STARTPTS)/{self.speed_factor:.4f}',{cfr_filter}[v_stabilized]", f"[0:a]asetpts=PTS-STARTPTS,atempo={self.speed_factor:.4f},aresample=48000:async=1[a_prepared_base]" if source_has_audio else f"anullsrc=r=48000:cl=stereo,atrim=duration={working_duration_sec:.4f},asetpts=PTS-STARTPTS[a_prepared_base]"])
-                        v_stabilized_pad, a_prepared_pad = "[v_stabilized]", "[a_prepared_base]"
-                    if intro_duration_sec > 0.0 and intro_input_index is not None:
-                        intro_frames = max(1, int(round(intro_duration_sec * 60.0)))
-                        loop_frames = max(0, intro_frames - 1)
-                        attempt_core_filters.append(f"[{intro_input_index}:v]trim=duration={max(0.2, intro_duration_sec + 0.1):.4f},setpts=PTS-STARTPTS,select='eq(n\\,0)',setsar=1,loop=loop={loop_frames}:size=1:start=0,fps={target_fps_expr}:round=near,trim=duration={intro_duration_sec:.4f},setpts=PTS-STARTPTS[v_intro_same_frame]")
-                        attempt_core_filters.append(f"{v_stabilized_pad}setsar=1[v_main_after_intro]")
-                        attempt_core_filters.append("[v_intro_same_frame][v_main_after_intro]concat=n=2:v=1:a=0[v_with_intro]")
-                        v_stabilized_pad = "[v_with_intro]"
-                    if self.is_mobile_format:
-                        v_mobile, v_mobile_out = self.filter_builder.build_mobile_filter_chain(v_stabilized_pad, self.config.get_mobile_coordinates(self.logger), self.is_boss_hp, self.show_teammates_overlay, self.show_spectating_overlay, text_input_label, False, self.original_resolution)
-                        attempt_core_filters.append(v_mobile); v_output_pad = v_mobile_out
-                    else: v_output_pad = v_stabilized_pad
-                    attempt_final_a_label = final_a_label
-                    for part in audio_chains: attempt_core_filters.append(part.replace("[0:a]", a_prepared_pad))
-                    if intro_duration_sec > 0.0:
-                        attempt_core_filters.append(f"anullsrc=r=48000:cl=stereo,atrim=duration={intro_duration_sec:.4f},asetpts=PTS-STARTPTS[a_intro_silence]")
-                        attempt_core_filters.append(f"[a_intro_silence]{attempt_final_a_label}concat=n=2:v=0:a=1[a_with_intro]")
-                        attempt_final_a_label = "[a_with_intro]"
-                    attempt_core_filters.append(f"{v_output_pad}fps={target_fps_expr}:round=near,setpts=N/({target_fps_expr})/TB[v_render_out]")
-                    filter_script_path = os.path.join(self.temp_job_dir, "filter_complex.txt")
-                    with open(filter_script_path, 'w', encoding='utf-8') as f: f.write(";".join([p for p in attempt_core_filters if p]))
-                    ffmpeg_inputs = self._hardware_decode_flags(current_encoder) + ['-ss', f"{self.start_time_ms/1000.0:.3f}", '-t', f"{(self.end_time_ms-self.start_time_ms)/1000.0:.3f}", '-i', self.input_path]
-                    for t, _, _ in self.music_tracks: ffmpeg_inputs += ['-i', t]
-                    if intro_input_index is not None:
-                        source_duration_sec = self.prober.get_duration()
-                        intro_abs_sec = (float(self.intro_abs_time_ms) / 1000.0) if self.intro_abs_time_ms is not None else (float(self.start_time_ms) / 1000.0)
-                        if source_duration_sec and source_duration_sec > 0.25:
-                            intro_abs_sec = min(max(0.0, intro_abs_sec), max(0.0, source_duration_sec - 0.2))
-                        ffmpeg_inputs += self._hardware_decode_flags(current_encoder) + ['-ss', f"{intro_abs_sec:.3f}", '-t', f"{max(0.2, intro_duration_sec + 0.1):.3f}", '-i', self.input_path]
-                    if text_png_path: ffmpeg_inputs += ['-loop', '1', '-i', text_png_path]
-                    ffmpeg_cmd = [self.ffmpeg_path, '-y', '-hide_banner', '-progress', 'pipe:1'] + ffmpeg_inputs + ['-filter_complex_script', filter_script_path, '-map', '[v_render_out]', '-map', attempt_final_a_label, '-c:v', vcodec[1]] + vcodec[2:] + ['-c:a', 'aac', '-b:a', f"{audio_kbps}k", '-t', f"{render_duration_sec:.3f}", '-movflags', '+faststart', core_path]
-                    if self.logger:
-                        bitrate_label = f"{int(requested_bitrate_kbps)}k" if requested_bitrate_kbps else "CQ"
-                        self.logger.info(f"FFMPEG CMD (Encoder: {current_encoder}, RC: {rc_label}, Bitrate: {bitrate_label}): {' '.join(ffmpeg_cmd)}")
-                    self.current_process = create_subprocess(ffmpeg_cmd)
-                    monitor_stats = monitor_ffmpeg_progress(self.current_process, render_duration_sec, scaler_core, self._monitor_disk_space, self.logger)
-                    if self.current_process.wait() == 0:
-                        valid, err_msg = self._validate_render_output(core_path, render_duration_sec, target_fps_expr, monitor_stats)
-                        if valid: return True, render_duration_sec, monitor_stats
-                        last_error = err_msg
-                    else:
-                        last_error = f"FFmpeg exited with code {self.current_process.returncode}."
-                    if use_cuda and not self.is_canceled:
-                        fallbacks = self.encoder_mgr.get_fallback_list(current_encoder, False)
-                        if fallbacks: 
-                            if self.logger: self.logger.warning(f"FFmpeg failed with {current_encoder}, falling back to {fallbacks[0]}")
-                            current_encoder = fallbacks[0]; continue
-                    return False, g_dur, {}
+                    with trace.span("encode_attempt", encoder=current_encoder, bitrate_kbps=requested_bitrate_kbps) as attempt_span:
+                        vcodec, rc_label = self._video_codec_flags(current_encoder, requested_bitrate_kbps, g_dur, target_fps_expr)
+                        attempt_span["attrs"]["rc"] = rc_label
+                        with trace.span("filter_graph"):
+                            v_label, working_duration_sec, cfr_filter = "[0:v]", g_dur, f"fps={target_fps_expr}:round=near"
+                            attempt_core_filters = [granular_v_a_filters] if granular_v_a_filters else []
+                            v_stabilized_pad, a_prepared_pad = g_v, g_a
+                            if not granular_v_a_filters:
+                                attempt_core_filters.extend([f"{v_label}setpts='(PTS-STARTPTS)/{self.speed_factor:.4f}',{cfr_filter}[v_stabilized]", f"[0:a]asetpts=PTS-STARTPTS,atempo={self.speed_factor:.4f},aresample=48000:async=1[a_prepared_base]" if source_has_audio else f"anullsrc=r=48000:cl=stereo,atrim=duration={working_duration_sec:.4f},asetpts=PTS-STARTPTS[a_prepared_base]"])
+                                v_stabilized_pad, a_prepared_pad = "[v_stabilized]", "[a_prepared_base]"
+                            if intro_duration_sec > 0.0 and intro_input_index is not None:
+                                intro_frames = max(1, int(round(intro_duration_sec * float(Fraction(str(target_fps_expr))))))
+                                loop_frames = max(0, intro_frames - 1)
+                                attempt_core_filters.append(f"[{intro_input_index}:v]trim=duration={max(0.2, intro_duration_sec + 0.1):.4f},setpts=PTS-STARTPTS,select='eq(n\\,0)',setsar=1,loop=loop={loop_frames}:size=1:start=0,fps={target_fps_expr}:round=near,trim=duration={intro_duration_sec:.4f},setpts=PTS-STARTPTS[v_intro_same_frame]")
+                                attempt_core_filters.append(f"{v_stabilized_pad}setsar=1[v_main_after_intro]")
+                                attempt_core_filters.append("[v_intro_same_frame][v_main_after_intro]concat=n=2:v=1:a=0[v_with_intro]")
+                                v_stabilized_pad = "[v_with_intro]"
+                            if self.is_mobile_format:
+                                v_mobile, v_mobile_out = self.filter_builder.build_mobile_filter_chain(v_stabilized_pad, self.config.get_mobile_coordinates(self.logger), self.is_boss_hp, self.show_teammates_overlay, self.show_spectating_overlay, text_input_label, False, self.original_resolution)
+                                attempt_core_filters.append(v_mobile); v_output_pad = v_mobile_out
+                            else: v_output_pad = v_stabilized_pad
+                            attempt_final_a_label = final_a_label
+                            for part in audio_chains: attempt_core_filters.append(part.replace("[0:a]", a_prepared_pad))
+                            if intro_duration_sec > 0.0:
+                                attempt_core_filters.append(f"anullsrc=r=48000:cl=stereo,atrim=duration={intro_duration_sec:.4f},asetpts=PTS-STARTPTS[a_intro_silence]")
+                                attempt_core_filters.append(f"[a_intro_silence]{attempt_final_a_label}concat=n=2:v=0:a=1[a_with_intro]")
+                                attempt_final_a_label = "[a_with_intro]"
+                            attempt_core_filters.append(f"{v_output_pad}{self._output_scale_filter()}fps={target_fps_expr}:round=near,setpts=N/({target_fps_expr})/TB[v_render_out]")
+                            filter_script_path = os.path.join(self.temp_job_dir, "filter_complex.txt")
+                            with open(filter_script_path, 'w', encoding='utf-8') as f: f.write(";".join([p for p in attempt_core_filters if p]))
+                        ffmpeg_inputs = self._hardware_decode_flags(current_encoder) + ['-ss', f"{self.start_time_ms/1000.0:.3f}", '-t', f"{(self.end_time_ms-self.start_time_ms)/1000.0:.3f}", '-i', self.input_path]
+                        for t, _, _ in self.music_tracks: ffmpeg_inputs += ['-i', t]
+                        if intro_input_index is not None:
+                            source_duration_sec = self.prober.get_duration()
+                            intro_abs_sec = (float(self.intro_abs_time_ms) / 1000.0) if self.intro_abs_time_ms is not None else (float(self.start_time_ms) / 1000.0)
+                            if source_duration_sec and source_duration_sec > 0.25:
+                                intro_abs_sec = min(max(0.0, intro_abs_sec), max(0.0, source_duration_sec - 0.2))
+                            ffmpeg_inputs += self._hardware_decode_flags(current_encoder) + ['-ss', f"{intro_abs_sec:.3f}", '-t', f"{max(0.2, intro_duration_sec + 0.1):.3f}", '-i', self.input_path]
+                        if text_png_path: ffmpeg_inputs += ['-loop', '1', '-i', text_png_path]
+                        ffmpeg_cmd = [self.ffmpeg_path, '-y', '-hide_banner', '-benchmark', '-progress', 'pipe:1'] + ffmpeg_inputs + ['-filter_complex_script', filter_script_path, '-map', '[v_render_out]', '-map', attempt_final_a_label, '-c:v', vcodec[1]] + vcodec[2:] + ['-c:a', 'aac', '-b:a', f"{audio_kbps}k", '-t', f"{render_duration_sec:.3f}", '-movflags', '+faststart', core_path]
+                        if self.logger:
+                            bitrate_label = f"{int(requested_bitrate_kbps)}k" if requested_bitrate_kbps else "CQ"
+                            self.logger.info(f"FFMPEG CMD (Encoder: {current_encoder}, RC: {rc_label}, Bitrate: {bitrate_label}): {' '.join(ffmpeg_cmd)}")
+                        with trace.span("ffmpeg", encoder=current_encoder) as ff_span:
+                            bench = {}
+                            self.current_process = create_subprocess(ffmpeg_cmd)
+                            monitor_stats = monitor_ffmpeg_progress(self.current_process, render_duration_sec, scaler_core, self._monitor_disk_space, self.logger, on_output_line=lambda line: bench.update(parse_ffmpeg_bench_line(line) or {}))
+                            exit_code = self.current_process.wait()
+                            ff_span["attrs"].update(exit_code=exit_code, pid=getattr(self.current_process, "pid", None), **bench)
+                            if exit_code != 0: ff_span["status"] = "error"
+                        if exit_code == 0:
+                            with trace.span("validate") as val_span:
+                                valid, err_msg = self._validate_render_output(core_path, render_duration_sec, target_fps_expr, monitor_stats)
+                                if not valid: val_span["status"] = "error"; val_span["error"] = err_msg
+                            if valid: return True, render_duration_sec, monitor_stats
+                            last_error = err_msg
+                        else:
+                            last_error = f"FFmpeg exited with code {self.current_process.returncode}."
+                        attempt_span["status"] = "error"; attempt_span["error"] = last_error
+                        if use_cuda and not self.is_canceled:
+                            fallbacks = self.encoder_mgr.get_fallback_list(current_encoder, False)
+                            if fallbacks: 
+                                if self.logger: self.logger.warning(f"FFmpeg failed with {current_encoder}, falling back to {fallbacks[0]}")
+                                current_encoder = fallbacks[0]; continue
+                        return False, g_dur, {}
             size_bounds = self._target_size_bounds()
             current_bitrate = int(video_bitrate_kbps) if video_bitrate_kbps else None
             for attempt in range(1, 3):
-                if os.path.exists(core_path): os.remove(core_path)
-                success, _, monitor_stats = run_ffmpeg(self.hardware_strategy != 'CPU', current_bitrate)
-                if not success or not size_bounds: break
-                actual = os.path.getsize(core_path)
-                if size_bounds[0] <= actual <= size_bounds[1]: break
-                current_bitrate = int(current_bitrate * (Fraction(size_bounds[1]) / Fraction(actual)))
+                with trace.span("size_pass", attempt=attempt, bitrate_kbps=current_bitrate) as pass_span:
+                    if os.path.exists(core_path): os.remove(core_path)
+                    success, _, monitor_stats = run_ffmpeg(self.hardware_strategy != 'CPU', current_bitrate)
+                    if not success:
+                        pass_span["status"] = "error"
+                        break
+                    if not size_bounds: break
+                    actual = os.path.getsize(core_path)
+                    pass_span["attrs"]["output_bytes"] = actual
+                    if size_bounds[0] <= actual <= size_bounds[1]: break
+                    current_bitrate = int(current_bitrate * (Fraction(size_bounds[1]) / Fraction(actual)))
             if not success:
+                result = {"error": last_error}
                 self._emit_finished(False, last_error)
                 return
-            final_output = self._resolve_final_output_path()
-            shutil.move(core_path, final_output)
+            with trace.span("finalize_output"):
+                final_output = self._finalize_output(core_path)
+            status, result = "ok", {"output": final_output}
             self._emit_progress(100)
             self._emit_finished(True, final_output)
         except Exception as e:
             if self.logger: self.logger.exception(f"FATAL: {e}")
+            result = {"error": str(e)}
             self._emit_finished(False, str(e))
         finally:
+            if self.is_canceled: status = "canceled"
             if hasattr(self, 'temp_job_dir'): shutil.rmtree(self.temp_job_dir, ignore_errors=True)
+            trace.finish(status, **result)
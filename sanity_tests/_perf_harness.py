@@ -0,0 +1,184 @@
+﻿from __future__ import annotations
+import json
+import os
+import statistics
+import stat
+import sys
+import threading
+import time
+import types
+from pathlib import Path
+from typing import Callable
+BASELINE_PATH = Path(__file__).with_name("perf_baselines.json")
+DEFAULT_TOLERANCE = 3.0
+MIN_COMPARABLE_SEC = 0.005
+_CALIBRATION: float | None = None
+_BASELINE_LOCK = threading.Lock()
+FAKE_FFPROBE = r'''
+import json, sys
+args = sys.argv[1:]
+entries = args[args.index("-show_entries") + 1] if "-show_entries" in args else ""
+selected = args[args.index("-select_streams") + 1] if "-select_streams" in args else ""
+if "json" in args:
+    print(json.dumps({
+        "streams": [{"avg_frame_rate": "60/1", "r_frame_rate": "60/1", "nb_frames": "600", "duration": "10.000000", "width": 1920, "height": 1080}],
+        "format": {"duration": "10.000000"},
+    }))
+    sys.exit(0)
+answers = {
+    "stream=index": "1",
+    "stream=sample_rate": "48000",
+    "stream=width": "1920",
+    "stream=height": "1080",
+    "format=duration": "10.000000",
+    "format=bit_rate": "8200000",
+    "stream=bit_rate": "192000" if selected.startswith("a") else "8000000",
+}
+print(answers.get(entries, ""))
+'''
+FAKE_FFMPEG = r'''
+import sys
+args = sys.argv[1:]
+if "-encoders" in args:
+    print(" V....D libx264              libx264 H.264 / AVC / MPEG-4 AVC")
+    sys.exit(0)
+if any("volumedetect" in a for a in args):
+    sys.stderr.write("[Parsed_volumedetect_0] mean_volume: -20.5 dB\n[Parsed_volumedetect_0] max_volume: -1.2 dB\n")
+    sys.exit(0)
+if args and not args[-1].startswith("-") and args[-1] != "-":
+    with open(args[-1], "wb") as fh:
+        fh.write(b"\x00" * 1024)
+print("out_time_ms=10000000")
+print("progress=end")
+'''
+FAKE_MPV = r'''
+import time
+time.sleep(3600)
+'''
+
+def _write_tool(path: Path, body: str) -> Path:
+    path.write_text(f"#!{sys.executable} -S\n{body.lstrip()}", encoding="utf-8")
+    path.chmod(path.stat().st_mode | stat.S_IXUSR | stat.S_IXGRP | stat.S_IXOTH)
+    return path
+
+def install_fake_media_tools(bin_dir: Path) -> dict[str, Path]:
+    bin_dir.mkdir(parents=True, exist_ok=True)
+    tools = {}
+    for name, body in (("ffprobe", FAKE_FFPROBE), ("ffmpeg", FAKE_FFMPEG), ("mpv", FAKE_MPV)):
+        tools[name] = _write_tool(bin_dir / name, body)
+        _write_tool(bin_dir / f"{name}.exe", body)
+    return tools
+
+class ScriptedMpvPipe:
+    """In-memory stand-in for mpv's JSON IPC pipe: answers get/set_property like a live player."""
+
+    def __init__(self, properties: dict | None = None):
+        self.properties = {"idle-active": True, "time-pos": 0.0, "duration": 10.0, "pause": True}
+        self.properties.update(properties or {})
+        self.received = 0
+        self._out = bytearray()
+        self._lock = threading.Lock()
+
+    def write(self, data: bytes) -> None:
+        for line in bytes(data).splitlines():
+            if not line.strip():
+                continue
+            obj = json.loads(line.decode("utf-8"))
+            cmd = obj.get("command") or []
+            reply = None
+            if cmd and cmd[0] == "set_property" and len(cmd) >= 3:
+                self.properties[cmd[1]] = cmd[2]
+            if "request_id" in obj:
+                data_value = self.properties.get(cmd[1]) if cmd and cmd[0] == "get_property" and len(cmd) >= 2 else None
+                reply = {"request_id": obj["request_id"], "error": "success", "data": data_value}
+            with self._lock:
+                self.received += 1
+                if reply is not None:
+                    self._out += (json.dumps(reply) + "\n").encode("utf-8")
+
+    def available(self) -> int:
+        with self._lock:
+            return len(self._out)
+
+    def read(self, size: int) -> bytes:
+        with self._lock:
+            chunk = bytes(self._out[:size])
+            del self._out[:size]
+            return chunk
+
+def install_scripted_mpv_ipc(monkeypatch, mpv_exe: Path, pipe: ScriptedMpvPipe) -> None:
+    fake_file = types.SimpleNamespace(
+        WriteFile=lambda handle, data: handle.write(data),
+        ReadFile=lambda handle, size: (0, handle.read(size)),
+        CloseHandle=lambda handle: None,
+    )
+    fake_pipe = types.SimpleNamespace(PeekNamedPipe=lambda handle, size: (b"", handle.available(), 0))
+    monkeypatch.setattr("system.mpv_process_manager.win32file", fake_file)
+    monkeypatch.setattr("system.mpv_process_manager.win32pipe", fake_pipe)
+    monkeypatch.setattr("system.mpv_process_manager._resolve_mpv_executable", lambda: str(mpv_exe))
+    monkeypatch.setattr("system.mpv_process_manager._connect_named_pipe", lambda name, timeout=6.0: pipe)
+
+def _calibration_workload() -> int:
+    payload = [{"k": i, "v": str(i) * 3, "f": i / 7.0} for i in range(400)]
+    total = 0
+    for _ in range(20):
+        total += len(json.dumps(sorted(payload, key=lambda d: -d["f"])))
+    return total
+
+def measure(fn: Callable[[], object], repeat: int = 5, warmup: int = 1) -> float:
+    for _ in range(max(0, warmup)):
+        fn()
+    samples = []
+    for _ in range(max(1, repeat)):
+        t0 = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - t0)
+    return statistics.median(samples)
+
+def calibration_seconds() -> float:
+    global _CALIBRATION
+    if _CALIBRATION is None:
+        _CALIBRATION = max(1e-6, measure(_calibration_workload, repeat=7, warmup=2))
+    return _CALIBRATION
+
+def _load_baselines() -> dict:
+    try:
+        data = json.loads(BASELINE_PATH.read_text(encoding="utf-8"))
+        if isinstance(data, dict):
+            return data
+    except Exception:
+        pass
+    return {"schema": 1, "benchmarks": {}}
+
+def _tolerance(entry: dict) -> float:
+    try:
+        return float(os.environ.get("FVS_PERF_TOLERANCE") or entry.get("tolerance") or DEFAULT_TOLERANCE)
+    except ValueError:
+        return DEFAULT_TOLERANCE
+
+def check_benchmark(name: str, seconds: float) -> dict:
+    """Compare a timing against the stored baseline; only FVS_PERF_UPDATE=1 writes baselines."""
+    calib = calibration_seconds()
+    ratio = seconds / calib
+    result = {"name": name, "seconds": round(seconds, 6), "ratio": round(ratio, 4)}
+    with _BASELINE_LOCK:
+        data = _load_baselines()
+        benches = data.setdefault("benchmarks", {})
+        entry = benches.get(name)
+        if os.environ.get("FVS_PERF_UPDATE") != "1":
+            assert entry is not None, (
+                f"PERF BASELINE MISSING {name}: run the perf tests once with FVS_PERF_UPDATE=1 and commit {BASELINE_PATH.name}"
+            )
+        else:
+            benches[name] = {"ratio": round(ratio, 4), "seconds": round(seconds, 6), **({"tolerance": entry["tolerance"]} if entry and "tolerance" in entry else {})}
+            BASELINE_PATH.write_text(json.dumps(data, indent=4, sort_keys=True) + "\n", encoding="utf-8")
+            result["recorded"] = True
+            return result
+    limit = float(entry["ratio"]) * _tolerance(entry)
+    result.update(baseline_ratio=entry["ratio"], limit_ratio=round(limit, 4))
+    if seconds >= MIN_COMPARABLE_SEC:
+        assert ratio <= limit, (
+            f"PERF REGRESSION {name}: {seconds * 1000:.2f} ms ({ratio:.2f}x calibration) exceeds "
+            f"baseline {entry['ratio']:.2f}x by more than {_tolerance(entry):.1f}x"
+        )
+    return result
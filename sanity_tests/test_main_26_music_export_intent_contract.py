@@ -142,3 +142,25 @@ def test_main_selected_music_missing_fails_before_silent_no_music_export(monkeyp
     assert host.messages
     assert host.messages[-1][0] == "Music unavailable"
     assert "reselect the music" in host.messages[-1][1]
+
+def test_main_request_builder_leaves_running_export_state_alone(monkeypatch, tmp_path: Path) -> None:
+    from ui.parts.ffmpeg_mixin import ProcessRequestError
+    video = tmp_path / "source.mp4"
+    video.write_bytes(b"video")
+    monkeypatch.setattr("processing.system_utils.check_disk_space", lambda *a, **k: True)
+    host = _Host(video, [], granular_checked=False)
+    host.is_processing = True
+    host.process_button.setEnabled(False)
+    host.trim_start_ms, host.trim_end_ms = 59_900, 70_000
+    host.speed_spinbox = DummySpinBox(9.0)
+    try:
+        host._build_process_request()
+        raise AssertionError("invalid speed must not build a request")
+    except ProcessRequestError as e:
+        assert e.title == "Invalid Speed"
+    host.speed_spinbox = DummySpinBox(1.0)
+    request = host._build_process_request()
+    assert (request["start_time_ms"], request["end_time_ms"]) == (59_500, 60_000)
+    assert host.is_processing is True and host.process_button.isEnabled() is False
+    assert (host.trim_start_ms, host.trim_end_ms) == (59_900, 70_000)
+    assert host.granular_checkbox.isChecked() is False and host.messages == []
@@ -0,0 +1,145 @@
+﻿from __future__ import annotations
+from pathlib import Path
+from sanity_tests._real_sanity_harness import DummyLogger, install_qt_mpv_stubs
+install_qt_mpv_stubs()
+
+from processing.export_queue import (
+    JOB_DONE,
+    JOB_QUEUED,
+    JOB_RUNNING,
+    ExportQueue,
+    estimate_job_disk_gb,
+)
+from system.recovery_manager import RecoveryManager
+
+class _FakeThread:
+    instances: list["_FakeThread"] = []
+
+    def __init__(self, **kwargs):
+        self.kwargs = kwargs
+        self.started = False
+        self.canceled = False
+        _FakeThread.instances.append(self)
+
+    def start(self):
+        self.started = True
+
+    def cancel(self):
+        self.canceled = True
+
+    def finish(self, ok=True, message="out.mp4"):
+        self.kwargs["finished_signal"](ok, message)
+
+def _make_queue(tmp_path: Path, *, cpu=16, free_gb=500.0, store=None, foreground_busy=None) -> ExportQueue:
+    _FakeThread.instances = []
+    return ExportQueue(
+        str(tmp_path), logger=DummyLogger(), store=store, output_dir=str(tmp_path),
+        thread_factory=_FakeThread, cpu_count=cpu, free_gb_probe=lambda _p: free_gb, foreground_busy=foreground_busy,
+    )
+
+def _params(video: Path, strategy="NVIDIA", target_mb=40.0) -> dict:
+    return {
+        "input_path": str(video), "start_time_ms": 0, "end_time_ms": 5000, "speed_factor": 1.1,
+        "is_mobile_format": True, "quality_level": 7, "hardware_strategy": strategy,
+        "target_mb_override": target_mb, "music_tracks": [("song.mp3", 1.0, 4.0)],
+        "speed_segments": [{"start_ms": 0, "end_ms": 1000, "speed": 2.0}],
+    }
+
+def test_export_queue_respects_encoder_session_limit(tmp_path: Path) -> None:
+    video = tmp_path / "clip.mp4"
+    video.write_bytes(b"v")
+    q = _make_queue(tmp_path, cpu=32)
+    for _ in range(5):
+        q.add_job(_params(video, "NVIDIA"))
+    q.start(concurrent=True)
+    assert len(q.running_jobs()) == 3
+    assert len(q.pending_jobs()) == 2
+    _FakeThread.instances[0].finish(True, str(tmp_path / "Fortnite-Video-1.mp4"))
+    assert len(q.running_jobs()) == 3
+    assert q.jobs[0]["state"] == JOB_DONE
+
+def test_export_queue_limits_cpu_jobs_by_core_count(tmp_path: Path) -> None:
+    video = tmp_path / "clip.mp4"
+    video.write_bytes(b"v")
+    q = _make_queue(tmp_path, cpu=16)
+    for _ in range(4):
+        q.add_job(_params(video, "CPU"))
+    q.start(concurrent=True)
+    assert len(q.running_jobs()) == 2
+    assert all(t.kwargs["music_tracks"] == [("song.mp3", 1.0, 4.0)] for t in _FakeThread.instances)
+
+def test_export_queue_sequential_mode_runs_one_after_another(tmp_path: Path) -> None:
+    video = tmp_path / "clip.mp4"
+    video.write_bytes(b"v")
+    q = _make_queue(tmp_path)
+    ids = [q.add_job(_params(video)) for _ in range(3)]
+    q.start(concurrent=False)
+    assert [j["state"] for j in q.jobs] == [JOB_RUNNING, JOB_QUEUED, JOB_QUEUED]
+    _FakeThread.instances[0].finish()
+    assert q.get_job(ids[1])["state"] == JOB_RUNNING
+    _FakeThread.instances[1].finish()
+    _FakeThread.instances[2].finish()
+    assert not q.is_running
+    assert all(j["state"] == JOB_DONE for j in q.jobs)
+
+def test_export_queue_pauses_when_output_disk_is_full(tmp_path: Path) -> None:
+    video = tmp_path / "clip.mp4"
+    video.write_bytes(b"v")
+    q = _make_queue(tmp_path, free_gb=2.0 + estimate_job_disk_gb(40.0) / 2)
+    blocked = []
+    q.queue_blocked.connect(blocked.append)
+    q.add_job(_params(video))
+    q.start()
+    assert not q.running_jobs()
+    assert q.is_running is False
+    assert blocked
+
+def test_export_queue_survives_restart_through_recovery_store(tmp_path: Path) -> None:
+    video = tmp_path / "clip.mp4"
+    video.write_bytes(b"v")
+    store = RecoveryManager("sanity_export_queue", DummyLogger())
+    store.state_file = tmp_path / "queue_state.json"
+    store.temp_dir = tmp_path
+    q = _make_queue(tmp_path, store=store)
+    q.add_job(_params(video))
+    q.add_job(_params(video))
+    q.start(concurrent=False)
+    assert store.flush() and store.state_file.exists()
+    revived = _make_queue(tmp_path, store=store)
+    assert revived.restore() == 2
+    assert [j["state"] for j in revived.jobs] == [JOB_QUEUED, JOB_QUEUED]
+    assert revived.resume_requested is True
+    assert revived.jobs[0]["params"]["speed_segments"] == [{"start_ms": 0, "end_ms": 1000, "speed": 2.0}]
+    revived.start()
+    _FakeThread.instances[0].finish()
+    _FakeThread.instances[1].finish()
+    assert all(j["state"] == JOB_DONE for j in revived.jobs)
+    assert not store.state_file.exists()
+
+def test_export_queue_cancel_state_comes_from_the_request_not_the_message(tmp_path: Path) -> None:
+    from processing.export_queue import JOB_CANCELED, JOB_FAILED
+    video = tmp_path / "clip.mp4"
+    video.write_bytes(b"v")
+    q = _make_queue(tmp_path, cpu=32)
+    for _ in range(2):
+        q.add_job(_params(video, "NVIDIA"))
+    q.start(concurrent=True)
+    first, second = q.jobs
+    _FakeThread.instances[0].finish(False, "Error: operation cancelled by filter graph")
+    assert first["state"] == JOB_FAILED
+    assert q.cancel_job(second["job_id"])
+    _FakeThread.instances[1].finish(False, "ffmpeg exited with code 1")
+    assert _FakeThread.instances[1].canceled and second["state"] == JOB_CANCELED
+
+def test_export_queue_waits_for_the_foreground_export(tmp_path: Path) -> None:
+    video = tmp_path / "clip.mp4"
+    video.write_bytes(b"v")
+    busy = [True]
+    q = _make_queue(tmp_path, cpu=32, foreground_busy=lambda: busy[0])
+    q.add_job(_params(video))
+    q.start()
+    assert not _FakeThread.instances and q.is_running and len(q.pending_jobs()) == 1
+    busy[0] = False
+    q.reschedule()
+    assert len(q.running_jobs()) == 1
+    assert estimate_job_disk_gb(400.0) == 1.171875 and estimate_job_disk_gb(10.0) == 0.5 and estimate_job_disk_gb(None) == 4.0
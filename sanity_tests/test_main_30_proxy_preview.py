@@ -0,0 +1,137 @@
+﻿from __future__ import annotations
+from pathlib import Path
+from sanity_tests._real_sanity_harness import DummyLogger, DummySignal, install_qt_mpv_stubs
+install_qt_mpv_stubs()
+
+from processing.proxy_render import ProxyRenderThread, resolve_proxy_window, shift_music_timeline
+
+class _FakeEncoderManager:
+    def __init__(self, *args, **kwargs):
+        return None
+
+    def get_initial_encoder(self):
+        return "libx264"
+
+    def get_codec_flags(self, *args, **kwargs):
+        raise AssertionError("proxy render must not use the export encoder settings")
+
+    def get_fallback_list(self, *args, **kwargs):
+        return []
+
+    def get_encoder_preflight_error(self):
+        return None
+
+class _Proc:
+    pid = 123
+    returncode = 0
+
+    def wait(self, timeout=None):
+        return 0
+
+def _patch_pipeline(monkeypatch, commands, scripts):
+    def fake_create_subprocess(cmd, logger=None):
+        commands.append(list(cmd))
+        scripts.append(Path(cmd[cmd.index("-filter_complex_script") + 1]).read_text(encoding="utf-8"))
+        Path(cmd[-1]).write_bytes(b"proxy")
+        return _Proc()
+    monkeypatch.setattr("processing.worker.EncoderManager", _FakeEncoderManager)
+    monkeypatch.setattr("processing.worker.create_subprocess", fake_create_subprocess)
+    monkeypatch.setattr("processing.worker.monitor_ffmpeg_progress", lambda *a, **k: {"critical_lines": []})
+    monkeypatch.setattr("processing.worker.check_disk_space", lambda *a, **k: True)
+    monkeypatch.setattr("processing.worker.calculate_video_bitrate", lambda *a, **k: 1200)
+    monkeypatch.setattr("processing.worker.MediaProber.has_audio", lambda self: True)
+    monkeypatch.setattr("processing.worker.MediaProber.get_audio_bitrate", lambda self: 128)
+    monkeypatch.setattr("processing.worker.ProcessThread._validate_render_output", lambda *a, **k: (True, "OK"))
+
+def _make_thread(tmp_path: Path, source: Path, **overrides) -> ProxyRenderThread:
+    params = dict(
+        input_path=str(source), start_time_ms=10000, end_time_ms=30000, original_resolution="1920x1080",
+        is_mobile_format=False, speed_factor=1.0, script_dir=str(tmp_path), finished_signal=DummySignal(),
+        logger=DummyLogger(), hardware_strategy="NVIDIA", quality_level=5,
+        speed_segments=[{"start_ms": 12000, "end_ms": 14000, "speed": 2.0}],
+    )
+    params.update(overrides)
+    return ProxyRenderThread(window_start_ms=15000, window_ms=4000, cache_dir=str(tmp_path / "cache"), **params)
+
+def test_proxy_window_is_clamped_inside_trim() -> None:
+    assert resolve_proxy_window(1000, 9000, None, 6000) == (1000, 7000)
+    assert resolve_proxy_window(1000, 9000, 8900, 6000) == (8500, 9000)
+    assert resolve_proxy_window(1000, 9000, 0, 60000) == (1000, 9000)
+
+def test_shift_music_timeline_skips_elapsed_music() -> None:
+    tracks, cfg = shift_music_timeline([("a.mp3", 1.0, 3.0), ("b.mp3", 0.0, 10.0)], {"timeline_start_sec": 1.0, "timeline_end_sec": 14.0}, 5.0)
+    assert tracks == [("b.mp3", 1.0, 9.0)]
+    assert cfg["timeline_start_sec"] == 0.0 and cfg["timeline_end_sec"] == 9.0
+    tracks, _ = shift_music_timeline([("a.mp3", 0.0, 3.0)], {"timeline_start_sec": 0.0, "timeline_end_sec": 3.0}, 5.0)
+    assert tracks == []
+
+def test_proxy_render_reuses_pipeline_at_low_res_and_caches(monkeypatch, tmp_path: Path) -> None:
+    commands, scripts = [], []
+    _patch_pipeline(monkeypatch, commands, scripts)
+    source = tmp_path / "source.mp4"
+    source.write_bytes(b"video")
+    thread = _make_thread(tmp_path, source)
+    results = []
+    thread.finished_signal.connect(lambda ok, msg: results.append((ok, msg)))
+    thread.run()
+    assert results and results[-1] == (True, thread.cache_path)
+    assert Path(thread.cache_path).read_bytes() == b"proxy"
+    cmd = commands[0]
+    assert cmd[cmd.index("-ss") + 1] == "15.000" and cmd[cmd.index("-ss") + 3] == "4.000"
+    assert cmd[cmd.index("-preset") + 1] == "ultrafast"
+    assert "scale=trunc(iw/3/2)*2:trunc(ih/3/2)*2" in scripts[0]
+    assert "fps=30:round=near" in scripts[0]
+    again = _make_thread(tmp_path, source)
+    again.finished_signal = DummySignal()
+    assert again.cache_path == thread.cache_path and again.cached_output()
+    again.run()
+    assert len(commands) == 1
+
+def test_proxy_cache_key_tracks_layout_inputs(monkeypatch, tmp_path: Path) -> None:
+    _patch_pipeline(monkeypatch, [], [])
+    source = tmp_path / "source.mp4"
+    source.write_bytes(b"video")
+    base = _make_thread(tmp_path, source)
+    assert _make_thread(tmp_path, source, speed_factor=1.5).cache_key != base.cache_key
+    assert _make_thread(tmp_path, source, show_teammates_overlay=True).cache_key != base.cache_key
+    source.write_bytes(b"re-recorded video")
+    assert _make_thread(tmp_path, source).cache_key != base.cache_key
+
+def test_restarting_preview_keeps_cancelled_render_alive_and_ignores_its_result(monkeypatch) -> None:
+    import types
+    from ui.parts import proxy_preview_mixin
+    from ui.parts.proxy_preview_mixin import ProxyPreviewMixin
+
+    class FakeThread:
+        def __init__(self, **kwargs):
+            self.is_canceled = False
+            self.window_start_ms, self.window_end_ms = 0, 1000
+            self.exit_callbacks = []
+            self.finished = types.SimpleNamespace(connect=self.exit_callbacks.append)
+
+        def cached_output(self): return None
+        def start(self): pass
+        def cancel(self): self.is_canceled = True
+        def exit(self):
+            for cb in self.exit_callbacks: cb()
+    monkeypatch.setattr(proxy_preview_mixin, "ProxyRenderThread", FakeThread)
+    statuses = []
+    host = types.SimpleNamespace(
+        base_dir=".", logger=DummyLogger(), trim_start_ms=0, trim_end_ms=5000,
+        _build_process_request=lambda: {}, _safe_mpv_get=lambda *a: 0,
+        status_update_signal=types.SimpleNamespace(emit=statuses.append),
+    )
+    host.proxy_preview_finished_signal = types.SimpleNamespace(emit=lambda t, ok, msg: host._on_proxy_preview_finished(t, ok, msg))
+    for name in ("start_proxy_preview", "_proxy_window_start_ms", "_keep_proxy_thread", "_release_proxy_thread", "_on_proxy_preview_finished"):
+        setattr(host, name, types.MethodType(getattr(ProxyPreviewMixin, name), host))
+    first = host.start_proxy_preview()
+    second = host.start_proxy_preview()
+    assert first.is_canceled and host._proxy_threads == [first, second]
+    first.finished_signal(False, "ffmpeg was cancelled")
+    assert host._proxy_thread is second and not any("failed" in s for s in statuses)
+    first.exit()
+    assert host._proxy_threads == [second]
+    second.cancel(); second.finished_signal(False, "killed")
+    assert host._proxy_thread is None and statuses[-1] == "Preview render cancelled."
+    second.exit()
+    assert host._proxy_threads == []
@@ -0,0 +1,91 @@
+﻿from __future__ import annotations
+import json
+from pathlib import Path
+from sanity_tests._real_sanity_harness import DummyLogger
+from system.recovery_manager import RecoveryManager
+
+def _manager(tmp_path: Path) -> RecoveryManager:
+    rm = RecoveryManager("sanity_recovery_writer", DummyLogger())
+    rm.temp_dir = tmp_path
+    rm.state_file = tmp_path / "state.json"
+    return rm
+
+def _count_fsync(monkeypatch) -> list:
+    calls = []
+    real = __import__("os").fsync
+    monkeypatch.setattr("system.recovery_manager.os.fsync", lambda fd: calls.append(fd) or real(fd))
+    return calls
+
+def test_writer_coalesces_queued_snapshots_into_one_thread(tmp_path: Path) -> None:
+    rm = _manager(tmp_path)
+    rm._save_lock.acquire()
+    try:
+        rm.save_state_async({"slider": 0})
+        writer = rm._writer_thread
+        for value in range(1, 30):
+            rm.save_state_async({"slider": value})
+        assert rm._writer_thread is writer
+    finally:
+        rm._save_lock.release()
+    assert rm.flush(5.0)
+    assert json.loads(rm.state_file.read_text(encoding="utf-8"))["slider"] == 29
+    assert rm._writer_thread is writer and writer.is_alive()
+    rm.stop_writer()
+    assert not writer.is_alive()
+
+def test_unchanged_state_is_not_rewritten_and_file_is_compact(tmp_path: Path) -> None:
+    rm = _manager(tmp_path)
+    assert rm.save_state({"assets": {"input_file_path": "a.mp4"}, "n": 1}) is True
+    text = rm.state_file.read_text(encoding="utf-8")
+    assert "\n" not in text and ": " not in text
+    mtime = rm.state_file.stat().st_mtime_ns
+    assert rm.save_state({"n": 1, "assets": {"input_file_path": "a.mp4"}}) is False
+    assert rm.state_file.stat().st_mtime_ns == mtime
+    rm.state_file.unlink()
+    assert rm.save_state({"n": 1, "assets": {"input_file_path": "a.mp4"}}) is True
+
+def test_fsync_only_on_first_write_and_durable_saves(tmp_path: Path, monkeypatch) -> None:
+    calls = _count_fsync(monkeypatch)
+    rm = _manager(tmp_path)
+    rm.save_state_async({"n": 1})
+    assert rm.flush(5.0) and len(calls) == 1
+    rm.save_state_async({"n": 2})
+    assert rm.flush(5.0) and len(calls) == 1
+    rm.save_state_async({"n": 3}, durable=True)
+    assert rm.flush(5.0) and len(calls) == 2
+    assert rm.load_state()["n"] == 3
+    rm.stop_writer()
+
+def test_clear_state_discards_pending_snapshot(tmp_path: Path) -> None:
+    rm = _manager(tmp_path)
+    rm.save_state({"n": 1})
+    rm._save_lock.acquire()
+    try:
+        rm.save_state_async({"n": 2})
+        rm.save_state_async({"n": 3})
+    finally:
+        rm._save_lock.release()
+    rm.clear_state()
+    assert rm.flush(5.0)
+    assert not rm.state_file.exists()
+    rm.save_state({"n": 1})
+    assert rm.load_state()["n"] == 1
+    rm.stop_writer()
+
+def test_shutdown_writes_final_snapshot_synchronously_and_stops_writer(tmp_path: Path) -> None:
+    import types
+    from ui.main_window import FortniteVideoSoftware
+    rm = _manager(tmp_path)
+    stopped, calls = [], []
+    timer = types.SimpleNamespace(stop=lambda: stopped.append(True))
+    host = types.SimpleNamespace(recovery_manager=rm, recovery_timer=timer, recovery_debounce_timer=timer)
+    host._save_recovery_state = lambda sync=False, blocking=False: calls.append((sync, blocking)) or rm.save_state({"n": "final"})
+    rm._save_lock.acquire()
+    try:
+        rm.save_state_async({"n": "queued"})
+    finally:
+        rm._save_lock.release()
+    FortniteVideoSoftware._shutdown_recovery_writer(host)
+    assert calls == [(True, True)] and len(stopped) == 2
+    assert rm.load_state()["n"] == "final"
+    assert not rm._writer_thread.is_alive()
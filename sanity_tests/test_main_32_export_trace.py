@@ -0,0 +1,128 @@
+from __future__ import annotations
+import json
+import subprocess
+import types
+from pathlib import Path
+from sanity_tests._real_sanity_harness import DummyLogger, DummySignal, install_qt_mpv_stubs
+install_qt_mpv_stubs()
+
+from processing.export_trace import ExportTrace, parse_ffmpeg_bench_line
+from processing.media_utils import MediaProber
+from processing.worker import ProcessThread
+
+class _FakeEncoderManager:
+    def __init__(self, *args, **kwargs):
+        return None
+
+    def get_initial_encoder(self):
+        return "h264_nvenc"
+
+    def get_codec_flags(self, encoder, *args, **kwargs):
+        return ["-c:v", encoder], "VBR"
+
+    def get_fallback_list(self, encoder, *args, **kwargs):
+        return ["libx264"] if encoder != "libx264" else []
+
+    def get_encoder_preflight_error(self):
+        return None
+
+class _Proc:
+    pid = 4321
+
+    def __init__(self, returncode):
+        self.returncode = returncode
+
+    def wait(self, timeout=None):
+        return self.returncode
+
+def _patch_pipeline(monkeypatch, commands):
+    def fake_create_subprocess(cmd, logger=None):
+        commands.append(list(cmd))
+        failing = "h264_nvenc" in cmd
+        if not failing:
+            Path(cmd[-1]).write_bytes(b"core")
+        return _Proc(1 if failing else 0)
+
+    def fake_monitor(proc, *args, on_output_line=None, **kwargs):
+        if on_output_line:
+            on_output_line("bench: utime=1.250s stime=0.125s rtime=2.000s")
+        return {"critical_lines": []}
+    monkeypatch.setattr("processing.worker.EncoderManager", _FakeEncoderManager)
+    monkeypatch.setattr("processing.worker.create_subprocess", fake_create_subprocess)
+    monkeypatch.setattr("processing.worker.monitor_ffmpeg_progress", fake_monitor)
+    monkeypatch.setattr("processing.worker.check_disk_space", lambda *a, **k: True)
+    monkeypatch.setattr("processing.worker.calculate_video_bitrate", lambda *a, **k: 2500)
+    monkeypatch.setattr("processing.worker.MediaProber.has_audio", lambda self: True)
+    monkeypatch.setattr("processing.worker.MediaProber.get_audio_bitrate", lambda self: 160)
+    monkeypatch.setattr("processing.worker.ProcessThread._validate_render_output", lambda *a, **k: (True, "OK"))
+
+def _make_thread(tmp_path: Path) -> ProcessThread:
+    source = tmp_path / "source.mp4"
+    source.write_bytes(b"video")
+    return ProcessThread(
+        input_path=str(source), start_time_ms=1000, end_time_ms=9000, original_resolution="1920x1080",
+        is_mobile_format=False, speed_factor=1.0, script_dir=str(tmp_path), progress_signal=DummySignal(),
+        status_signal=DummySignal(), finished_signal=DummySignal(), logger=DummyLogger(),
+        hardware_strategy="NVIDIA", quality_level=5,
+    )
+
+def test_parse_ffmpeg_bench_line() -> None:
+    assert parse_ffmpeg_bench_line("bench: utime=3.500s stime=0.250s rtime=4.000s") == {"utime_sec": 3.5, "stime_sec": 0.25, "rtime_sec": 4.0}
+    assert parse_ffmpeg_bench_line("frame=  120 fps= 60") is None
+
+def test_span_nesting_and_error_status(tmp_path: Path) -> None:
+    trace = ExportTrace("unit", str(tmp_path), DummyLogger())
+    with trace.span("outer", k=1):
+        with trace.span("inner"):
+            pass
+    try:
+        with trace.span("boom"):
+            raise ValueError("bad")
+    except ValueError:
+        pass
+    path = trace.finish("failed", error="bad")
+    data = json.loads(Path(path).read_text(encoding="utf-8"))
+    spans = {s["name"]: s for s in data["spans"]}
+    assert spans["inner"]["parent"] == "outer" and spans["inner"]["depth"] == 1
+    assert spans["outer"]["attrs"] == {"k": 1}
+    assert spans["boom"]["status"] == "error" and "ValueError" in spans["boom"]["error"]
+    assert data["status"] == "failed" and data["result"] == {"error": "bad"}
+    assert all("wall_sec" in s and "cpu_sec" in s for s in data["spans"])
+
+def test_export_writes_per_stage_trace(monkeypatch, tmp_path: Path) -> None:
+    commands = []
+    _patch_pipeline(monkeypatch, commands)
+    thread = _make_thread(tmp_path)
+    results = []
+    thread.finished_signal.connect(lambda ok, msg: results.append((ok, msg)))
+    thread.run()
+    assert results and results[-1][0] is True
+    assert all("-benchmark" in cmd for cmd in commands)
+    trace_path = tmp_path / "logs" / "export_traces" / f"export_{thread.job_id}.trace.json"
+    data = json.loads(trace_path.read_text(encoding="utf-8"))
+    assert data["status"] == "ok" and data["meta"]["kind"] == "ProcessThread"
+    names = [s["name"] for s in data["spans"]]
+    for stage in ("preflight", "probe_source", "bitrate_plan", "audio_chain", "size_pass", "encode_attempt", "filter_graph", "ffmpeg", "validate", "finalize_output"):
+        assert stage in names, stage
+    ffmpeg_spans = [s for s in data["spans"] if s["name"] == "ffmpeg"]
+    assert [s["attrs"]["exit_code"] for s in ffmpeg_spans[:2]] == [1, 0]
+    assert ffmpeg_spans[0]["status"] == "error" and ffmpeg_spans[1]["attrs"]["utime_sec"] == 1.25
+    attempts = [s for s in data["spans"] if s["name"] == "encode_attempt"]
+    assert [s["attrs"]["encoder"] for s in attempts[:2]] == ["h264_nvenc", "libx264"]
+    assert all(s["parent"] == "size_pass" for s in attempts)
+    assert all(s["parent"] == "encode_attempt" for s in ffmpeg_spans)
+    assert set(data["summary"]["stage_wall_sec"]) >= {"preflight", "size_pass"}
+
+def test_prober_records_ffprobe_spans(monkeypatch, tmp_path: Path) -> None:
+    def fake_run(cmd, **kwargs):
+        if "-show_entries" in cmd and "format=duration" in cmd:
+            return types.SimpleNamespace(returncode=0, stdout="12.5\n")
+        raise subprocess.CalledProcessError(1, cmd)
+    monkeypatch.setattr("processing.media_utils.subprocess.run", fake_run)
+    prober = MediaProber(str(tmp_path), str(tmp_path / "in.mp4"))
+    prober.trace = ExportTrace("probe", None)
+    assert prober._run_command(["-show_entries", "format=duration"]) == "12.5"
+    assert prober._run_json(["-show_streams"]) == {}
+    spans = prober.trace.spans
+    assert [s["name"] for s in spans] == ["ffprobe", "ffprobe"]
+    assert spans[0]["attrs"]["exit_code"] == 0 and spans[1]["status"] == "error"
@@ -0,0 +1,78 @@
+from __future__ import annotations
+import json
+import subprocess
+import sys
+from pathlib import Path
+from sanity_tests._ai_sanity_helpers import read_source
+from system.startup_profile import HISTORY_KEEP, StartupProfile
+
+ROOT = Path(__file__).resolve().parents[1]
+
+def test_stages_record_wall_time_and_new_modules() -> None:
+    profile = StartupProfile("sanity")
+    with profile.stage("import_stdlib"):
+        import wave  # noqa: F401
+    future = profile.submit("background", lambda: 41 + 1)
+    assert future.result(5) == 42
+    profile.shutdown()
+    profile.mark("window_shown")
+    snap = profile.snapshot()
+    stages = {s["name"]: s for s in snap["stages"]}
+    assert stages["import_stdlib"]["wall_sec"] >= 0 and "new_modules" in stages["import_stdlib"]
+    assert stages["background"]["background"] is True and stages["background"]["thread"].startswith("fvs_boot")
+    assert snap["marks"][0]["name"] == "window_shown"
+
+def test_failed_stage_is_recorded() -> None:
+    profile = StartupProfile("sanity")
+    try:
+        with profile.stage("boom"):
+            raise RuntimeError("nope")
+    except RuntimeError:
+        pass
+    assert profile.stages[0]["status"] == "error" and "RuntimeError" in profile.stages[0]["error"]
+
+def test_write_profile_and_bounded_history(tmp_path: Path) -> None:
+    for _ in range(HISTORY_KEEP + 5):
+        profile = StartupProfile("sanity")
+        with profile.stage("boot"):
+            pass
+        path = profile.write(str(tmp_path))
+    data = json.loads(Path(path).read_text(encoding="utf-8"))
+    assert data["app"] == "sanity" and data["stages"][0]["name"] == "boot"
+    history = (tmp_path / "startup_history_sanity.jsonl").read_text(encoding="utf-8").splitlines()
+    assert len(history) == HISTORY_KEEP and "boot" in json.loads(history[-1])["stages"]
+
+def test_processing_package_import_is_lazy() -> None:
+    code = "import sys, processing; assert 'processing.worker' not in sys.modules; from processing import MediaProber; assert MediaProber.__name__ == 'MediaProber'; print('ok')"
+    out = subprocess.run([sys.executable, "-c", code], cwd=str(ROOT), capture_output=True, text=True, timeout=60)
+    assert out.returncode == 0 and "ok" in out.stdout, out.stderr
+
+def test_app_defers_encoder_probe_import_and_runs_checks_in_background() -> None:
+    src = read_source("app.py")
+    assert "\nfrom processing.media_utils import check_encoder_capability" not in src
+    assert 'STARTUP.submit("verify_ffmpeg", verify_ffmpeg_core)' in src
+    assert 'STARTUP.submit("probe_mpv", probe_mpv_dependencies)' in src
+    assert 'with STARTUP.stage("import_main_window"):' in src
+
+def test_background_imports_are_not_credited_to_a_foreground_stage(monkeypatch) -> None:
+    import threading
+    from system import startup_profile
+    monkeypatch.setattr(startup_profile, "HEAVY_MODULES", ("tabnanny", "pickletools"))
+    for name in startup_profile.HEAVY_MODULES:
+        monkeypatch.delitem(sys.modules, name, raising=False)
+    profile = StartupProfile("sanity")
+    entered, imported = threading.Event(), threading.Event()
+
+    def background():
+        entered.wait(5)
+        import tabnanny  # noqa: F401
+        imported.set()
+    worker = threading.Thread(target=background)
+    worker.start()
+    with profile.stage("foreground"):
+        entered.set()
+        assert imported.wait(5)
+        import pickletools  # noqa: F401
+    worker.join(5)
+    assert profile.stages[0]["heavy_modules"] == ["pickletools"]
+    assert startup_profile._IMPORTS not in sys.meta_path
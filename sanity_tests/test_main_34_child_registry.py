@@ -0,0 +1,101 @@
+﻿from __future__ import annotations
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+import psutil
+import pytest
+from system import child_registry
+from system.child_registry import ChildProcessRegistry
+from system.utils import ProcessManager
+
+SLEEPER = [sys.executable, "-c", "import time; time.sleep(60)"]
+
+@pytest.fixture
+def registry(monkeypatch, tmp_path: Path):
+    monkeypatch.setattr(ChildProcessRegistry, "directory", str(tmp_path / "child_pids"))
+    monkeypatch.setattr(ChildProcessRegistry, "_entries", {})
+    monkeypatch.setattr(ChildProcessRegistry, "_dirty", False)
+    monkeypatch.setattr(ChildProcessRegistry, "_flush_timer", None)
+    yield ChildProcessRegistry
+    if ChildProcessRegistry._flush_timer is not None:
+        ChildProcessRegistry._flush_timer.cancel()
+    ChildProcessRegistry._entries.clear()
+
+def _dead_pid() -> tuple[int, float]:
+    proc = subprocess.Popen([sys.executable, "-c", "pass"])
+    create_time = psutil.Process(proc.pid).create_time()
+    proc.wait()
+    return proc.pid, create_time
+
+def _write_owner(registry, owner_pid: int, owner_ct: float, children: list) -> Path:
+    os.makedirs(registry.directory, exist_ok=True)
+    path = Path(registry.directory) / f"{owner_pid}.json"
+    path.write_text(json.dumps({"owner_pid": owner_pid, "owner_create_time": owner_ct, "children": children}), encoding="utf-8")
+    return path
+
+def test_create_subprocess_registers_and_own_children_are_reaped(registry) -> None:
+    from processing.system_utils import create_subprocess
+    proc = create_subprocess(SLEEPER)
+    try:
+        assert registry.flush()
+        own_file = Path(registry.directory) / f"{os.getpid()}.json"
+        children = json.loads(own_file.read_text(encoding="utf-8"))["children"]
+        assert [c["pid"] for c in children] == [proc.pid]
+        assert registry.reap(include_self=False) == (0, True) and proc.poll() is None
+        assert registry.reap(include_self=True) == (1, True)
+        proc.wait(10)
+        assert not own_file.exists()
+    finally:
+        if proc.poll() is None: proc.kill()
+
+def test_spawn_defers_the_write_and_reaped_children_leave_the_registry(registry, monkeypatch) -> None:
+    from processing.system_utils import create_subprocess
+    monkeypatch.setattr(child_registry, "FLUSH_DELAY_SEC", 60.0)
+    real_process = child_registry.psutil.Process
+    monkeypatch.setattr(child_registry.psutil, "Process", lambda *a: (_ for _ in ()).throw(AssertionError("no psutil lookup on spawn")))
+    proc = create_subprocess([sys.executable, "-c", "pass"])
+    own_file = Path(registry.directory) / f"{os.getpid()}.json"
+    assert [e["pid"] for e in registry.tracked()] == [proc.pid] and not own_file.exists()
+    proc.communicate(timeout=10)
+    assert registry.tracked() == []
+    monkeypatch.setattr(child_registry.psutil, "Process", real_process)
+    assert registry.flush() and not own_file.exists()
+
+def test_dead_owner_children_are_killed_with_name_and_pid_reuse_guards(registry) -> None:
+    live = subprocess.Popen(SLEEPER)
+    try:
+        owner_pid, owner_ct = _dead_pid()
+        ct = psutil.Process(live.pid).create_time()
+        stale = _write_owner(registry, owner_pid, owner_ct, [{"pid": live.pid, "create_time": ct - 100.0, "name": "python"}])
+        assert registry.reap(["python"]) == (0, True) and live.poll() is None and not stale.exists()
+        _write_owner(registry, owner_pid, owner_ct, [{"pid": live.pid, "create_time": ct, "name": "python"}])
+        assert registry.reap(["ffmpeg.exe", "mpv.exe"]) == (0, True) and live.poll() is None
+        _write_owner(registry, owner_pid, owner_ct, [{"pid": live.pid, "create_time": ct, "name": "python"}])
+        assert registry.reap(["python.exe"]) == (1, True)
+        live.wait(10)
+    finally:
+        if live.poll() is None: live.kill()
+
+def test_live_owner_children_are_left_alone(registry) -> None:
+    live = subprocess.Popen(SLEEPER)
+    try:
+        me = psutil.Process(os.getppid())
+        _write_owner(registry, me.pid, me.create_time(), [{"pid": live.pid, "create_time": psutil.Process(live.pid).create_time(), "name": "python"}])
+        assert registry.reap(["python"]) == (0, True) and live.poll() is None
+    finally:
+        live.kill()
+
+def test_kill_orphans_skips_process_scan_unless_registry_is_unusable(registry, monkeypatch) -> None:
+    scans = []
+    monkeypatch.setattr("system.utils.psutil.process_iter", lambda *a, **k: scans.append(1) or iter(()))
+    monkeypatch.delenv("FVS_ORPHAN_FULL_SCAN", raising=False)
+    ProcessManager.kill_orphans()
+    assert scans == []
+    ProcessManager.kill_orphans(full_scan=True)
+    assert scans == [1]
+    os.makedirs(registry.directory, exist_ok=True)
+    (Path(registry.directory) / "999999.json").write_text("{broken", encoding="utf-8")
+    ProcessManager.kill_orphans()
+    assert scans == [1, 1]
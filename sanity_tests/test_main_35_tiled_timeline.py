@@ -0,0 +1,50 @@
+from __future__ import annotations
+import os
+import subprocess
+import sys
+from pathlib import Path
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+SCRIPT = r'''
+import sys
+from PyQt5.QtWidgets import QApplication
+from PyQt5.QtGui import QPixmap, QColor
+from MODULE import MergerTimelineWidget, TIMELINE_TILE_W
+app = QApplication.instance() or QApplication([])
+calls = []
+
+def thumb(color):
+    pm = QPixmap(32, 18); pm.fill(QColor(color)); return pm
+w = MergerTimelineWidget()
+real = w._render_tile
+w._render_tile = lambda idx, *a: calls.append(idx) or real(idx, *a)
+w.resize(1024, 88)
+videos = [{"duration": 2.0, "thumbs": []}, {"duration": 2.0, "thumbs": []}]
+music = [{"duration": 4.0, "wave": QPixmap()}]
+w.set_data(4.0, videos, music)
+w.grab()
+assert sorted(calls) == [0, 1, 2, 3], calls
+calls.clear(); w.grab()
+assert calls == [], calls
+videos[1]["thumbs"] = [thumb("red"), thumb("blue")]
+w._needs_repaint = True; w.grab()
+assert sorted(calls) == [1, 2, 3], calls
+calls.clear(); videos[1]["thumbs"][0] = thumb("green")
+w._needs_repaint = True; w.grab()
+assert sorted(calls) == [1, 2, 3], calls
+incremental = w.grab().toImage()
+fresh = MergerTimelineWidget(); fresh.resize(1024, 88); fresh.set_data(4.0, videos, music)
+assert fresh.grab().toImage() == incremental
+calls.clear(); w.resize(700, 88); w.grab()
+assert calls == [] and w._tile_w == 1024, calls
+w._resize_settle.stop(); w._on_resize_settled(); w.grab()
+assert sorted(calls) == [0, 1, 2] and w._tile_w == 700, calls
+print("ok")
+'''
+
+@pytest.mark.parametrize("module", ["utilities.merger_timeline_widget", "ui.widgets.music_wizard_timeline_widget"])
+def test_timeline_tiles_invalidate_incrementally_and_rescale_on_resize(module: str) -> None:
+    env = dict(os.environ, QT_QPA_PLATFORM="offscreen")
+    out = subprocess.run([sys.executable, "-c", SCRIPT.replace("MODULE", module)], cwd=str(ROOT), env=env, capture_output=True, text=True, timeout=120)
+    assert out.returncode == 0 and "ok" in out.stdout, out.stderr[-2000:]
@@ -0,0 +1,42 @@
+from __future__ import annotations
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+SCRIPT = r'''
+from PyQt5.QtWidgets import QApplication
+from ui.widgets.granular_speed_editor import GranularTimelineSlider
+app = QApplication.instance() or QApplication([])
+builds = []
+s = GranularTimelineSlider()
+real = s._render_static_layer
+s._render_static_layer = lambda *a: builds.append(1) or real(*a)
+s.resize(900, 80); s.setRange(0, 600000)
+segments = [{"start": i * 1000, "end": i * 1000 + 600, "speed": 2.0} for i in range(400)] + [{"start": 500500, "end": 500500, "speed": 0.0}]
+s.set_segments(segments)
+s.grab()
+assert len(builds) == 1, builds
+s.set_pending_segment(450000, 452000, 1.5); s.start_ants()
+for _ in range(5):
+    s._update_ants(); s.setValue(s.value() + 250); s.grab()
+assert len(builds) == 1, builds
+segments[3]["speed"] = 0.5; s.set_segments(segments); s.grab()
+assert len(builds) == 2, builds
+s.set_view_range(100000, 110000); s.grab()
+assert len(builds) == 3, builds
+index = s._segment_index(s._segment_signature())
+visible = s._visible_spans(index, 100000, 110000)
+assert [i for _, _, i in visible] == list(range(100, 111)), visible
+assert s._visible_freezes(index, 500000, 501000) == [(500500, 400)]
+assert s._is_obscured(index, 3300) and not s._is_obscured(index, 3800)
+s.stop_ants(); s.grab()
+assert len(builds) == 3, builds
+print("ok")
+'''
+
+def test_static_layer_survives_ants_and_playhead_but_not_segment_or_zoom_edits() -> None:
+    env = dict(os.environ, QT_QPA_PLATFORM="offscreen")
+    out = subprocess.run([sys.executable, "-c", SCRIPT], cwd=str(ROOT), env=env, capture_output=True, text=True, timeout=120)
+    assert out.returncode == 0 and "ok" in out.stdout, out.stderr[-2000:]
@@ -0,0 +1,47 @@
+from __future__ import annotations
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+SCRIPT = r'''
+from PyQt5.QtWidgets import QApplication, QWidget
+from PyQt5.QtCore import Qt
+from PyQt5.QtTest import QTest
+from utilities.merger_draggable_list import MergerDraggableList
+app = QApplication.instance() or QApplication([])
+view = MergerDraggableList(); view.resize(700, 400)
+model = view.clip_model
+inserts = []
+model.rowsInserted.connect(lambda *a: inserts.append(a[1:]))
+probe = {"format": {"duration": "2.5"}}
+rows = model.insert_clips([{"path": f"/v/{i}.mp4", "f_hash": f"h{i}", "probe_data": probe, "clip_id": f"c{i}"} for i in range(1000)])
+assert rows == list(range(1000)) and inserts == [(0, 999)], inserts
+assert model.has_path("/v/7.mp4") and model.has_hash("h999") and model.total_duration() == 2500.0
+view.select_rows([5, 6])
+assert model.move_rows([5, 6], 0) and view.selected_rows() == [0, 1]
+assert model.ordered_paths()[:3] == ["/v/5.mp4", "/v/6.mp4", "/v/0.mp4"]
+removed = model.remove_clip_ids(["c5", "c900", "c901"])
+assert [e["row"] for e in removed] == [0, 900, 901] and not model.has_path("/v/900.mp4") and model.rowCount() == 997
+model.insert_clips([dict(e) for e in removed])
+assert model.ordered_paths()[0] == "/v/5.mp4" and model.ordered_paths()[901] == "/v/901.mp4" and model.total_duration() == 2500.0
+model.insert_clips([{"path": "/v/1.mp4", "f_hash": "h1", "clip_id": "dup"}])
+model.remove_clip_ids(["dup"])
+assert model.has_path("/v/1.mp4") and model.has_hash("h1")
+view.show(); view.grab()
+assert not [w for w in view.viewport().findChildren(QWidget)], "rows must be painted, not built from widgets"
+previews = []
+view.preview_requested.connect(previews.append)
+button = view.clip_delegate.row_rects(view.visualRect(model.index(1, 0)))[3]
+QTest.mouseClick(view.viewport(), Qt.LeftButton, Qt.NoModifier, button.center())
+assert previews == [model.entry(1)["path"]], previews
+model.clear_clips()
+assert model.rowCount() == 0 and not model.paths() and model.total_duration() == 0.0
+print("ok")
+'''
+
+def test_merger_clip_model_keeps_indexes_and_paints_rows_without_widgets() -> None:
+    env = dict(os.environ, QT_QPA_PLATFORM="offscreen")
+    out = subprocess.run([sys.executable, "-c", SCRIPT], cwd=str(ROOT), env=env, capture_output=True, text=True, timeout=120)
+    assert out.returncode == 0 and "ok" in out.stdout, out.stderr[-2000:]
@@ -0,0 +1,104 @@
+from __future__ import annotations
+import importlib
+import logging
+import sys
+import types
+import pytest
+
+class FakePlayer:
+    def __init__(self) -> None:
+        self.path = ""
+        self.seeks = []
+        self.loads = []
+
+    def command(self, name, path, *args) -> None:
+        self.loads.append(path); self.path = path
+
+    def seek(self, target, **kwargs) -> None:
+        self.seeks.append(round(target, 6))
+
+    def stop(self) -> None:
+        self.path = ""
+
+def _linear_video(segments, t):
+    elapsed = 0.0
+    for i, seg in enumerate(segments):
+        if elapsed + seg["duration"] > t: return i, elapsed
+        elapsed += seg["duration"]
+    return 0, elapsed
+
+def _linear_music(tracks, t):
+    elapsed = 0.0
+    for i, (_p, start_off, dur) in enumerate(tracks):
+        if elapsed + dur > t: return i, (t - elapsed) + start_off
+        elapsed += dur
+    return -1, 0.0
+
+def _linear_source_ms(segs, factor, trim_wall, project_sec):
+    target = (project_sec * 1000.0) + (trim_wall * 1000.0)
+    acc = segs[0]["start"] / factor
+    if target <= acc: return int(target * factor)
+    for i, seg in enumerate(segs):
+        dur = (seg["end"] - seg["start"]) / seg["speed"] if seg["speed"] >= 0.001 else seg["end"] - seg["start"]
+        if acc + dur >= target: return int(seg["start"] + (target - acc) * seg["speed"])
+        acc += dur
+        nxt = segs[i + 1]["start"] if i + 1 < len(segs) else float("inf")
+        gap = (nxt - seg["end"]) / factor
+        if acc + gap >= target: return int(seg["end"] + (target - acc) * factor)
+        acc += gap
+
+@pytest.fixture(params=["ui.widgets.music_wizard", "utilities.merger_music_wizard"])
+def wizard(request, monkeypatch):
+    monkeypatch.setitem(sys.modules, "mpv", types.SimpleNamespace(ShutdownError=RuntimeError))
+    timeline = importlib.import_module(f"{request.param}_timeline")
+    misc = importlib.import_module(f"{request.param}_misc")
+
+    class Host(timeline.MergerMusicWizardTimelineMixin, misc.MergerMusicWizardMiscMixin):
+        logger = logging.getLogger("test_main_38")
+        music_vol_slider = types.SimpleNamespace(value=lambda: 50)
+
+        def __init__(self) -> None:
+            self.path_reads = 0
+            self.player, self._music_player = FakePlayer(), FakePlayer()
+            self.video_segments = [{"path": f"/v/{i}.mp4", "duration": 1.5 + (i % 3) * 0.25} for i in range(40)]
+            self.selected_tracks = [(f"/m/{i}.mp3", 0.5 * i, 7.0 + i) for i in range(8)]
+            self.speed_segments = [{"start": 2000.0 + 3000.0 * i, "end": 3000.0 + 3000.0 * i, "speed": (0.5, 2.0, 0.0)[i % 3]} for i in range(30)]
+            self.speed_factor, self._wall_trim_start = 1.25, 0.4
+
+        def _safe_mpv_get(self, player, prop, default=None):
+            if prop == "path": self.path_reads += 1; return player.path
+            return False if prop == "pause" else default
+
+        def _safe_mpv_set(self, player, prop, value):
+            return True
+
+        def _scaled_vol(self, value):
+            return value
+    return timeline, Host()
+
+def test_lookups_match_linear_scan(wizard) -> None:
+    timeline, host = wizard
+    for step in range(0, 800):
+        t = step * 0.1
+        v_idx, elapsed = _linear_video(host.video_segments, t)
+        assert timeline._locate_video_segment(host, t) == (v_idx, elapsed)
+        assert timeline._locate_music_track(host, t) == _linear_music(host.selected_tracks, t)
+        assert host._project_time_to_source_ms(t) == _linear_source_ms(host.speed_segments, host.speed_factor, host._wall_trim_start, t)
+
+def test_index_follows_track_edits(wizard) -> None:
+    timeline, host = wizard
+    assert timeline._locate_music_track(host, 8.0)[0] == 1
+    host.selected_tracks.append(("/m/new.mp3", 0.0, 5.0))
+    assert timeline._locate_music_track(host, 95.0) == _linear_music(host.selected_tracks, 95.0)
+    host.selected_tracks[0] = ("/m/0.mp3", 0.0, 1.0); host._music_time_index = None
+    assert timeline._locate_music_track(host, 8.0) == _linear_music(host.selected_tracks, 8.0)
+
+def test_sync_reads_loaded_path_once_per_player(wizard) -> None:
+    timeline, host = wizard
+    for step in range(200):
+        host._sync_all_players_to_time(step * 0.05)
+    assert host.path_reads == 2
+    assert host.player.loads == [f"/v/{i}.mp4" for i in range(6)] and host._music_player.loads == ["/m/0.mp3", "/m/1.mp3"]
+    host._music_player.stop(); timeline._forget_loaded_media(host, host._music_player)
+    host._sync_all_players_to_time(1.0)
+    assert host.path_reads == 3 and host._music_player.loads[-1] == "/m/0.mp3"
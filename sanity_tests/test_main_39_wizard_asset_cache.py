@@ -0,0 +1,61 @@
+from __future__ import annotations
+from pathlib import Path
+import pytest
+from ui.widgets import music_wizard_workers as workers
+from utilities import merger_music_wizard_workers as merger_workers
+
+@pytest.fixture
+def cache_root(monkeypatch, tmp_path: Path) -> Path:
+    root = tmp_path / "fvs_timeline_cache"
+    monkeypatch.setattr(workers, "_CACHE_ROOT", root)
+    return root
+
+def test_both_wizards_share_one_engine() -> None:
+    for name in ("VideoFilmstripWorker", "MusicWaveformWorker", "SingleWaveformWorker", "ProcessRegistry"):
+        assert getattr(merger_workers, name) is getattr(workers, name)
+
+def test_filmstrip_rendered_once_is_reused_by_the_other_front_end(cache_root: Path, tmp_path: Path, monkeypatch) -> None:
+    clip = tmp_path / "clip.mp4"; clip.write_bytes(b"video")
+    renders = []
+
+    def fake_render(self, info):
+        renders.append(info[4])
+        return info[4], [f"thumb-{info[4]}-{n}".encode() for n in range(3)]
+    monkeypatch.setattr(workers.VideoFilmstripWorker, "_render_chunk", fake_render)
+    infos = [(str(clip), 4.0, 1000.0 * i, 1.0, i) for i in range(3)]
+    main_worker = workers.VideoFilmstripWorker(infos, str(tmp_path), stage="progressive")
+    first = {}
+    main_worker.asset_ready.connect(lambda idx, thumbs, stage: first.__setitem__(idx, thumbs))
+    main_worker.run()
+    assert sorted(renders) == [0, 1, 2] and len(first) == 3
+    merger_worker = merger_workers.VideoFilmstripWorker(infos, str(tmp_path), stage="progressive")
+    second = {}
+    merger_worker.asset_ready.connect(lambda idx, thumbs, stage: second.__setitem__(idx, thumbs))
+    merger_worker.run()
+    assert sorted(renders) == [0, 1, 2] and second == first
+    clip.write_bytes(b"re-encoded video")
+    workers.VideoFilmstripWorker(infos[:1], str(tmp_path), stage="progressive").run()
+    assert sorted(renders) == [0, 0, 1, 2]
+
+def test_step2_track_assets_are_handed_out_as_private_copies(cache_root: Path, tmp_path: Path) -> None:
+    track = tmp_path / "song.mp3"; track.write_bytes(b"mp3")
+    png, wav = tmp_path / "w.png", tmp_path / "s.wav"
+    png.write_bytes(b"png-bytes"); wav.write_bytes(b"wav-bytes")
+    assert workers.restore_track_assets(str(track)) is None
+    assert workers.store_track_assets(str(track), 93.5, str(png), str(wav))
+    png.unlink(); wav.unlink()
+    duration, png_copy, wav_copy = workers.restore_track_assets(str(track))
+    assert duration == 93.5 and Path(png_copy).read_bytes() == b"png-bytes" and Path(wav_copy).read_bytes() == b"wav-bytes"
+    Path(png_copy).unlink(); Path(wav_copy).unlink()
+    again = workers.restore_track_assets(str(track))
+    assert again is not None and Path(again[2]).read_bytes() == b"wav-bytes"
+    Path(again[1]).unlink(); Path(again[2]).unlink()
+
+def test_startup_temp_cleanup_keeps_the_shared_cache(monkeypatch, tmp_path: Path) -> None:
+    from system.utils import ProcessManager
+    (tmp_path / "fvs_timeline_cache" / "video").mkdir(parents=True)
+    (tmp_path / "fvs_sync_old.wav").write_bytes(b"x")
+    monkeypatch.setattr("system.utils.tempfile.gettempdir", lambda: str(tmp_path))
+    monkeypatch.setattr("system.utils.os.walk", lambda *a, **k: iter(()))
+    ProcessManager.cleanup_temp_files()
+    assert (tmp_path / "fvs_timeline_cache" / "video").is_dir() and not (tmp_path / "fvs_sync_old.wav").exists()
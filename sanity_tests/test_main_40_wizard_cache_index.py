@@ -0,0 +1,55 @@
+from __future__ import annotations
+import json
+import os
+import time
+from pathlib import Path
+from ui.widgets import music_wizard_workers as workers
+
+def _put(directory: Path, key: str, size: int) -> None:
+    directory.mkdir(parents=True, exist_ok=True)
+    (directory / key).write_bytes(b"x" * size)
+
+def test_byte_budget_evicts_least_recently_used(tmp_path: Path) -> None:
+    index = workers.AssetCacheIndex(tmp_path / "wave", byte_budget=1000)
+    for key in ("a", "b", "c"):
+        _put(index.directory, key, 300); index.record(key, f"src-{key}")
+    assert index.lookup("a", "src-a") is not None
+    _put(index.directory, "d", 300); index.record("d", "src-d")
+    assert index.lookup("b") is None and not (index.directory / "b").exists()
+    assert {k for k in ("a", "c", "d") if index.lookup(k)} == {"a", "c", "d"} and index.total_bytes() == 900
+    assert index.lookup("c", "src-changed") is None and not (index.directory / "c").exists()
+
+def test_fresh_manifest_loads_without_walking_the_directory(tmp_path: Path, monkeypatch) -> None:
+    index = workers.AssetCacheIndex(tmp_path / "video", byte_budget=10_000)
+    _put(index.directory, "k1", 10); index.record("k1")
+    assert index.flush()
+    walks = []
+    monkeypatch.setattr(workers.AssetCacheIndex, "reconcile", lambda self: walks.append(1))
+    reloaded = workers.AssetCacheIndex(tmp_path / "video", byte_budget=10_000)
+    assert walks == [] and len(reloaded) == 1 and reloaded.lookup("k1") is not None
+    data = json.loads((tmp_path / "video" / "index.json").read_text(encoding="utf-8"))
+    data["reconciled_at"] = time.time() - workers.CACHE_RECONCILE_INTERVAL_SEC - 5
+    (tmp_path / "video" / "index.json").write_text(json.dumps(data), encoding="utf-8")
+    workers.AssetCacheIndex(tmp_path / "video", byte_budget=10_000)
+    assert walks == [1]
+
+def test_two_processes_merge_their_entries(tmp_path: Path) -> None:
+    main_app = workers.AssetCacheIndex(tmp_path / "track", byte_budget=10_000)
+    merger = workers.AssetCacheIndex(tmp_path / "track", byte_budget=10_000)
+    _put(main_app.directory, "from-main", 5); main_app.record("from-main"); assert main_app.flush()
+    _put(merger.directory, "from-merger", 7); merger.record("from-merger")
+    assert merger.lookup("from-main") is not None and merger.flush()
+    main_app.discard("from-main"); assert main_app.flush()
+    final = workers.AssetCacheIndex(tmp_path / "track", byte_budget=10_000)
+    assert set(json.loads(final.manifest_path.read_text(encoding="utf-8"))["entries"]) == {"from-merger"}
+    assert final.lookup("from-main") is None and final.lookup("from-merger") is not None
+
+def test_missing_manifest_reconciles_once_and_drops_stale_temp_dirs(tmp_path: Path) -> None:
+    bucket = tmp_path / "video"
+    _put(bucket, "old", 40)
+    stale = bucket / ".half-written.abc"; stale.mkdir()
+    os.utime(stale, (time.time() - 7200, time.time() - 7200))
+    index = workers.AssetCacheIndex(bucket, byte_budget=10_000)
+    assert len(index) == 1 and index.total_bytes() == 40 and not stale.exists()
+    _put(bucket, "published-elsewhere", 3)
+    assert index.lookup("published-elsewhere") is not None and index.total_bytes() == 43
@@ -0,0 +1,83 @@
+from __future__ import annotations
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+SCRIPT = r'''
+import io, os, sys, tempfile
+from PyQt5.QtGui import QGuiApplication, QImage
+app = QGuiApplication.instance() or QGuiApplication([])
+from developer_tools import media_processor as mp
+W, H, FPS = 8, 4, 10.0
+launches = []
+
+class FakeDecoder:
+    def __init__(self, cmd, **kwargs):
+        start = round(float(cmd[cmd.index("-ss") + 1]) * FPS)
+        launches.append(start)
+        frames = b"".join(bytes([min(255, i)]) * (W * H * 3) for i in range(start, 60))
+        self.stdout = io.BytesIO(frames)
+    def poll(self): return None
+    def kill(self): pass
+    def wait(self, timeout=None): return 0
+mp.subprocess.Popen = FakeDecoder
+server = mp.FrameServer("ffmpeg", "clip.mp4", W, H, FPS, cache_size=4)
+for t in (1.0, 1.1, 1.2, 1.5, 2.0):
+    img = server.frame_at(t)
+    assert img.width() == W and QImage(img).pixelColor(0, 0).red() == round(t * FPS), t
+assert launches == [10], launches
+server.frame_at(1.0); assert launches == [10, 10], launches
+server.frame_at(1.5); assert launches == [10, 10], "cached frame must not relaunch"
+server.frame_at(5.0); assert launches == [10, 10, 50], launches
+assert server.frame_at(9.0) is None
+proc = mp.MediaProcessor.__new__(mp.MediaProcessor)
+proc.__dict__.update(player=None, media=True, bin_dir=".", _frame_server=None, _last_snapshot=None, _stream_fps=FPS, _stream_rotation=0)
+proc._state_lock = __import__("threading").RLock()
+proc._original_resolution, proc._input_file_path = f"{W}x{H}", "clip.mp4"
+mp.subprocess.run = lambda *a, **k: (_ for _ in ()).throw(AssertionError("one-shot ffmpeg should not run"))
+out = os.path.join(tempfile.mkdtemp(), "last_snapshot.png")
+ok, msg = proc.take_snapshot(out, 2.3)
+assert ok, msg
+assert QImage(out).pixelColor(0, 0).red() == 23 and proc.snapshot_image(out).pixelColor(0, 0).red() == 23
+assert proc.snapshot_image(out + ".other") is None
+cmds = []
+class RecordingDecoder(FakeDecoder):
+    def __init__(self, cmd, **kwargs):
+        cmds.append(cmd); super().__init__(cmd, **kwargs)
+mp.subprocess.Popen = RecordingDecoder
+assert mp._parse_rotation({"side_data_list": [{"rotation": -90}]}) == 270 and mp._parse_rotation({"tags": {"rotate": "180"}}) == 180
+proc._close_frame_server()
+proc._original_resolution, proc._stream_rotation = f"{H}x{W}", 270
+rotated = proc.frame_server()
+assert (rotated.width, rotated.height) == (W, H) and proc.grab_frame(1.0).width() == W
+assert cmds[-1][cmds[-1].index("-s") + 1] == f"{W}x{H}"
+import threading, time
+release = threading.Event()
+class StalledPipe:
+    def read(self, n):
+        release.wait(5); return b""
+    def close(self): release.set()
+class StalledDecoder(FakeDecoder):
+    def __init__(self, cmd, **kwargs):
+        super().__init__(cmd, **kwargs); self.stdout = StalledPipe()
+mp.subprocess.Popen = StalledDecoder
+mp.FRAME_READ_TIMEOUT_SEC = 0.2
+stalled = mp.FrameServer("ffmpeg", "clip.mp4", W, H, FPS)
+started = time.monotonic()
+assert stalled.frame_at(1.0) is None and time.monotonic() - started < 2.0
+assert stalled._proc is None and stalled.launches == 1
+mp.subprocess.Popen = FakeDecoder
+assert stalled.frame_at(1.0).width() == W and stalled.launches == 2
+fresh = mp.MediaProcessor(".")
+fresh._stream_fps, fresh._stream_rotation = 60.0, 90
+mp.probe_flight.shared = lambda cmd, fn, timeout: [1, ""]
+assert fresh.get_video_info(out) is None and (fresh._stream_fps, fresh._stream_rotation) == (30.0, 0)
+print("ok")
+'''
+
+def test_crop_snapshots_come_from_one_long_lived_decoder() -> None:
+    env = dict(os.environ, QT_QPA_PLATFORM="offscreen")
+    out = subprocess.run([sys.executable, "-c", SCRIPT], cwd=str(ROOT), env=env, capture_output=True, text=True, timeout=120)
+    assert out.returncode == 0 and "ok" in out.stdout, out.stderr[-2000:]
@@ -0,0 +1,63 @@
+from __future__ import annotations
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+SCRIPT = r'''
+import random, sys
+sys.path.insert(0, "developer_tools")
+from PyQt5.QtWidgets import QApplication, QGraphicsScene
+from PyQt5.QtGui import QPixmap
+from PyQt5.QtCore import QRectF, QPointF
+app = QApplication.instance() or QApplication([])
+from graphics_items import ResizablePixmapItem, MagneticSnapper, SnapTargetIndex
+
+def linear_best(pos, dim, targets, threshold, center_thresh):
+    best, min_d = None, threshold + 1
+    for t_val, t_lab in targets:
+        for kind, mine in (("start", pos), ("end", pos + dim), ("center", pos + dim / 2)):
+            d = abs(mine - t_val)
+            if d < min_d and (kind != "center" or d < center_thresh):
+                min_d, best = d, (t_val, kind, t_lab)
+    return min_d if best else None
+rng = random.Random(7)
+targets = [(rng.uniform(0, 1080), f"t{i}") for i in range(150)]
+index, snapper = SnapTargetIndex(targets), MagneticSnapper()
+for _ in range(2000):
+    pos, dim = rng.uniform(-50, 1100), rng.uniform(5, 300)
+    got = snapper._find_best_snap(pos, dim, index, 8, 15)
+    want = linear_best(pos, dim, targets, 8, 15)
+    assert (got is None) == (want is None), (pos, dim, got, want)
+    if got:
+        mine = {"start": pos, "end": pos + dim, "center": pos + dim / 2}[got[1]]
+        assert abs(abs(mine - got[0]) - want) < 1e-9, (got, want)
+scene = QGraphicsScene(QRectF(0, 0, 1080, 1920))
+items = []
+for i in range(40):
+    it = ResizablePixmapItem(QPixmap(60, 40), QRectF(0, 0, 60, 40)); it.assigned_role = f"Layer {i}"
+    scene.addItem(it); it.setPos(20 + (i % 8) * 120, 200 + (i // 8) * 150); items.append(it)
+walks = []
+real_items = scene.items
+scene.items = lambda *a: walks.append(1) or real_items(*a)
+mover, other = items[0], items[5]
+tx, ty = mover._snap_targets()
+assert len(tx) == 3 + 39 * 3 and walks == [1]
+for step in range(50):
+    mover.setPos(20 + step, 200 + step); mover._snap_targets()
+assert walks == [1], len(walks)
+other.setPos(other.pos() + QPointF(7, 0))
+tx, _ = mover._snap_targets()
+assert walks == [1, 1] and tx.nearest(other.content_scene_rect().left())[1] == "Layer 5 Left"
+other.setVisible(False); tx, _ = mover._snap_targets()
+assert len(tx) == 3 + 38 * 3
+scene.removeItem(items[9]); tx, _ = mover._snap_targets()
+assert len(tx) == 3 + 37 * 3
+print("ok")
+'''
+
+def test_snap_targets_are_indexed_once_per_layout_change() -> None:
+    env = dict(os.environ, QT_QPA_PLATFORM="offscreen")
+    out = subprocess.run([sys.executable, "-c", SCRIPT], cwd=str(ROOT), env=env, capture_output=True, text=True, timeout=120)
+    assert out.returncode == 0 and "ok" in out.stdout, out.stderr[-2000:]
@@ -0,0 +1,48 @@
+from __future__ import annotations
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+SCRIPT = r'''
+import glob, logging, os, sys, tempfile
+sys.path.insert(0, "developer_tools")
+from PyQt5.QtCore import QCoreApplication
+app = QCoreApplication.instance() or QCoreApplication([])
+import config_manager, state_manager
+hashes = []
+real = config_manager._content_digest
+config_manager._content_digest = lambda data: hashes.append(1) or real(data)
+path = os.path.join(tempfile.mkdtemp(), "crops_coordinations.conf")
+manager = config_manager.ConfigManager(path, logging.getLogger("test_main_43"))
+copies = []
+real_copy = config_manager.shutil.copy2
+config_manager.shutil.copy2 = lambda a, b, **k: copies.append(os.path.basename(b)) or real_copy(a, b, **k)
+
+def save(crop):
+    config = manager.load_config()
+    config["crops_1080p"]["loot"] = crop
+    config["scales"]["loot"], config["overlays"]["loot"], config["z_orders"]["loot"] = 1.0, {"x": 10, "y": 20}, 10
+    assert manager.save_config(config)
+    return os.stat(path).st_mtime_ns
+first = save([0, 0, 100, 50])
+assert len(hashes) == 1 and copies == [], (hashes, copies)
+assert save([0, 0, 100, 50]) == first and len(hashes) == 2 and copies == [], copies
+save([5, 5, 100, 50])
+assert len(hashes) == 3 and len(copies) == 1 and copies[0].startswith("crops_coordinations.conf.backup."), copies
+save([0, 0, 100, 50]); save([5, 5, 100, 50]); save([0, 0, 100, 50])
+assert len(hashes) == 6 and len(copies) == 2 and len(glob.glob(path + ".backup.*")) == 2, copies
+assert not any(p.startswith(tempfile.gettempdir()) and ".backup." in p for p in copies)
+tx = state_manager.TransactionState(state_manager.OperationType.CONFIG_SAVE, "t")
+shared = glob.glob(path + ".backup.*")[0]
+assert tx.add_file_backup(path, digest="d" * 64, backup_path=shared)
+tx.cleanup()
+assert os.path.exists(shared)
+print("ok")
+'''
+
+def test_repeated_hud_saves_only_write_real_changes() -> None:
+    env = dict(os.environ, QT_QPA_PLATFORM="offscreen")
+    out = subprocess.run([sys.executable, "-c", SCRIPT], cwd=str(ROOT), env=env, capture_output=True, text=True, timeout=120)
+    assert out.returncode == 0 and "ok" in out.stdout, out.stderr[-2000:]
@@ -0,0 +1,50 @@
+from __future__ import annotations
+import json
+import os
+import time
+from pathlib import Path
+import pytest
+from system import diagnostic_runtime as runtime
+
+@pytest.fixture
+def trees(monkeypatch, tmp_path: Path):
+    active, master, logs = tmp_path / "active", tmp_path / "master", tmp_path / "logs"
+    for name, value in (("PROJECT_ROOT", active), ("MASTER_BACKUP_DIR", master), ("LOGS_DIR", logs)):
+        monkeypatch.setattr(runtime, name, value)
+    monkeypatch.setattr(runtime, "DIFF_TEXT_PATH", logs / "diff.txt")
+    monkeypatch.setattr(runtime, "DIFF_HTML_PATH", logs / "diff.html")
+    monkeypatch.setattr(runtime, "DIFF_MANIFEST_PATH", logs / "manifest.json")
+    monkeypatch.setattr(runtime, "_runtime_dirs_ready", False)
+    monkeypatch.setattr(runtime, "append_python_debug", lambda message: None)
+    old = time.time() - 60
+    for root in (active, master):
+        (root / "binaries").mkdir(parents=True)
+        (root / "binaries" / "tool.exe").write_bytes(b"\0" * 4096)
+        (root / "main.py").write_text("print('a')\n", encoding="utf-8")
+        for path in (root / "binaries" / "tool.exe", root / "main.py"):
+            os.utime(path, (old, old))
+    hashed = []
+    real = runtime._sha256
+    monkeypatch.setattr(runtime, "_sha256", lambda path: hashed.append(path.name) or real(path))
+    return active, master, hashed
+
+def test_unchanged_files_are_not_rehashed(trees) -> None:
+    active, master, hashed = trees
+    assert runtime.generate_master_diff()["changed_files"] == []
+    assert sorted(hashed) == ["main.py", "main.py", "tool.exe", "tool.exe"]
+    assert len(json.loads(runtime.DIFF_MANIFEST_PATH.read_text(encoding="utf-8"))["files"]) == 4
+    hashed.clear()
+    (active / "main.py").write_text("print('b')\n", encoding="utf-8")
+    (active / "extra.txt").write_text("new", encoding="utf-8")
+    result = runtime.generate_master_diff()
+    assert result["changed_files"] == ["extra.txt", "main.py"] and hashed == ["main.py"]
+    report = Path(result["text_report"]).read_text(encoding="utf-8")
+    assert "=== main.py ===" in report and "+print('b')" in report and "ADDED IN ACTIVE PROJECT" in report
+    assert Path(result["html_report"]).read_text(encoding="utf-8").endswith("</body></html>")
+
+def test_size_mismatch_is_drift_without_hashing(trees) -> None:
+    active, master, hashed = trees
+    (master / "binaries" / "tool.exe").write_bytes(b"\0" * 10)
+    assert runtime.generate_master_diff()["changed_files"] == ["binaries/tool.exe"]
+    assert "tool.exe" not in hashed
+    assert "Binary change detected." in runtime.DIFF_HTML_PATH.read_text(encoding="utf-8")
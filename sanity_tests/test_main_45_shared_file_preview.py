@@ -0,0 +1,60 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+ROOT = Path(__file__).resolve().parents[1]
+SCRIPT = r'''
+import os, sys, tempfile, threading, time
+from PyQt5.QtWidgets import QApplication
+app = QApplication([])
+from system.utils import MPVSafetyManager
+from ui.widgets import custom_file_dialog as cfd
+created, shutdowns, sent = [], [], []
+gate = threading.Event()
+
+class FakePlayer:
+    def __init__(self):
+        self._core_shutdown = False; self._safe_shutdown_initiated = False
+
+    def property_observer(self, name):
+        return lambda fn: fn
+MPVSafetyManager.create_safe_mpv = staticmethod(lambda **kw: created.append(kw["wid"]) or FakePlayer())
+MPVSafetyManager.safe_mpv_shutdown = staticmethod(lambda *a, **k: shutdowns.append(1))
+MPVSafetyManager.safe_mpv_set = staticmethod(lambda p, name, value, **k: sent.append((name, value)))
+
+def slow_command(p, *args, **k):
+    gate.wait(5); sent.append(args); return True
+MPVSafetyManager.safe_mpv_command = staticmethod(slow_command)
+assert cfd.prewarm_preview_player() and len(created) == 1
+folder = tempfile.mkdtemp()
+clips = []
+for n in range(4):
+    clips.append(os.path.join(folder, f"clip{n}.mp4")); open(clips[-1], "wb").write(b"x")
+for attempt in range(2):
+    dialog = cfd.CustomFileDialog(None, "t", folder, "", config=None)
+    assert dialog._preview_player is not None and dialog._preview_video.parent() is dialog._preview_panel
+    sent.clear(); gate.clear()
+    started = time.monotonic()
+    for clip in clips:
+        dialog._preview_video_path(clip)
+    assert time.monotonic() - started < 1.0
+    gate.set()
+    deadline = time.monotonic() + 5
+    while ("loadfile", clips[-1], "replace") not in sent and time.monotonic() < deadline:
+        time.sleep(0.01)
+    loads = [s for s in sent if s and s[0] == "loadfile"]
+    assert loads[-1] == ("loadfile", clips[-1], "replace") and len(loads) <= 2, loads
+    assert dialog._preview_title.text() == "clip3.mp4"
+    surface = dialog._preview_video
+    dialog.done(0)
+    assert surface.parent() is not dialog._preview_panel and dialog._preview_player is None
+    dialog.deleteLater(); app.processEvents()
+assert len(created) == 1 and shutdowns == []
+assert cfd.PREVIEW_SETTLE_MS < 400
+print("ok")
+'''
+
+def test_one_preview_player_serves_every_dialog_and_loads_latest_only() -> None:
+    env = dict(os.environ, QT_QPA_PLATFORM="offscreen", PYTHONDONTWRITEBYTECODE="1")
+    proc = subprocess.run([sys.executable, "-c", SCRIPT], cwd=ROOT, env=env, capture_output=True, text=True, timeout=120)
+    assert "ok" in proc.stdout, proc.stdout + proc.stderr
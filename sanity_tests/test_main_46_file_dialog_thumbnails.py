@@ -0,0 +1,82 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+ROOT = Path(__file__).resolve().parents[1]
+SCRIPT = r'''
+import os, sys, tempfile, threading, time
+from pathlib import Path
+from PyQt5.QtCore import QBuffer, QByteArray, QIODevice
+from PyQt5.QtGui import QColor, QImage
+from PyQt5.QtWidgets import QApplication
+app = QApplication([])
+from system.utils import MPVSafetyManager
+MPVSafetyManager.create_safe_mpv = staticmethod(lambda **kw: None)
+from ui.widgets import custom_file_dialog as cfd, file_dialog_thumbnails as thumbs, music_wizard_workers as asset_cache
+work = tempfile.mkdtemp()
+asset_cache._CACHE_ROOT = Path(work) / "cache"
+folder = os.path.join(work, "clips"); os.mkdir(folder)
+for n in range(80):
+    open(os.path.join(folder, f"clip{n:03d}.mp4"), "wb").write(b"x")
+open(os.path.join(folder, "notes.txt"), "w").write("x")
+img = QImage(32, 18, QImage.Format_RGB32); img.fill(QColor("red"))
+data = QByteArray(); buf = QBuffer(data); buf.open(QIODevice.WriteOnly); img.save(buf, "JPG"); jpeg = bytes(data)
+decoded, active, peak, lock = [], [0], [0], threading.Lock()
+
+def fake_extract(ffmpeg_exe, path, timeout=12.0):
+    with lock:
+        active[0] += 1; peak[0] = max(peak[0], active[0]); decoded.append(os.path.basename(path))
+    time.sleep(0.01)
+    with lock:
+        active[0] -= 1
+    return jpeg
+thumbs.extract_poster = fake_extract
+
+class Config:
+    def __init__(self):
+        self.config = {}
+
+    def save_config(self, cfg):
+        pass
+
+def pump(until, seconds=8.0):
+    deadline = time.monotonic() + seconds
+    while not until() and time.monotonic() < deadline:
+        app.processEvents(); time.sleep(0.01)
+    return until()
+
+def open_dialog(config):
+    dialog = cfd.CustomFileDialog(None, "t", folder, "", config=config)
+    dialog.resize(1200, 700); dialog.show()
+    assert pump(lambda: dialog.list_view.model().rowCount(dialog.list_view.rootIndex()) == 81)
+    return dialog
+config = Config()
+dialog = open_dialog(config)
+assert not dialog._thumbnail_mode_active() and decoded == []
+dialog._thumb_button.setChecked(True)
+assert pump(lambda: len(decoded) > 0 and not dialog._poster_loader._inflight)
+visible = set(decoded)
+assert 0 < len(visible) < 80 and len(decoded) == len(visible) and peak[0] <= thumbs.POSTER_WORKERS
+assert all(dialog._poster_loader.icon(os.path.join(folder, name)) is not None for name in visible)
+dialog.list_view.verticalScrollBar().setValue(dialog.list_view.verticalScrollBar().maximum())
+dialog.list_view.horizontalScrollBar().setValue(dialog.list_view.horizontalScrollBar().maximum())
+assert pump(lambda: "clip079.mp4" in decoded and not dialog._poster_loader._inflight)
+assert len(decoded) < 80 and "notes.txt" not in decoded
+dialog.done(0)
+assert config.config["file_dialog_thumbnail_mode"] is True
+decoded.clear()
+again = open_dialog(config)
+assert again._thumbnail_mode_active()
+assert pump(lambda: again._poster_loader is not None and len(again._poster_loader._icons) > 0 and not again._poster_loader._inflight)
+assert decoded == []
+again._thumb_button.setChecked(False)
+from PyQt5.QtWidgets import QListView
+assert again.list_view.viewMode() == QListView.ListMode
+again.done(0)
+print("ok")
+'''
+
+def test_thumbnail_grid_decodes_visible_rows_once() -> None:
+    env = dict(os.environ, QT_QPA_PLATFORM="offscreen", PYTHONDONTWRITEBYTECODE="1")
+    proc = subprocess.run([sys.executable, "-c", SCRIPT], cwd=ROOT, env=env, capture_output=True, text=True, timeout=120)
+    assert "ok" in proc.stdout, proc.stdout + proc.stderr
@@ -0,0 +1,72 @@
+from __future__ import annotations
+import os
+import subprocess
+import sys
+import threading
+import time
+from pathlib import Path
+from types import SimpleNamespace
+import pytest
+from system import probe_flight
+from system.utils import MediaProber as SystemMediaProber
+ROOT = Path(__file__).resolve().parents[1]
+
+@pytest.fixture
+def clip(monkeypatch, tmp_path: Path) -> Path:
+    monkeypatch.setattr(probe_flight, "FLIGHT_DIR", str(tmp_path / "flight"))
+    path = tmp_path / "clip.mp4"; path.write_bytes(b"video")
+    return path
+
+def _together(count, fn):
+    results, barrier = [None] * count, threading.Barrier(count)
+
+    def call(i):
+        barrier.wait(); results[i] = fn()
+    threads = [threading.Thread(target=call, args=(i,)) for i in range(count)]
+    for t in threads: t.start()
+    for t in threads: t.join(10)
+    return results
+
+def test_concurrent_identical_probes_share_one_subprocess(clip: Path, monkeypatch) -> None:
+    calls = []
+
+    def fake_run(cmd, **kwargs):
+        calls.append(cmd[0]); time.sleep(0.2)
+        return SimpleNamespace(returncode=0, stdout="10.0\n", stderr="")
+    monkeypatch.setattr("system.utils.subprocess.run", fake_run)
+    durations = _together(6, lambda: SystemMediaProber.probe_duration("bin", str(clip)))
+    assert durations == [10.0] * 6 and len(calls) == 1
+    cmd = ["/crop/ffprobe", "-v", "error", "-show_entries", "format=duration", "-of", "csv=p=0", str(clip)]
+    assert probe_flight.run(cmd, fake_run).stdout == "10.0\n" and len(calls) == 1
+    os.utime(clip, ns=(time.time_ns(), time.time_ns() + 5_000_000_000))
+    assert probe_flight.run(cmd, fake_run).returncode == 0 and calls == ["ffprobe", "/crop/ffprobe"]
+    assert probe_flight.flight_key(["a", str(clip)]) == probe_flight.flight_key(["b", str(clip)])
+    assert probe_flight.flight_key(["a", "-show_streams", str(clip)]) != probe_flight.flight_key(["a", "-show_format", str(clip)])
+
+def test_leader_failure_reaches_waiting_threads(clip: Path) -> None:
+    runs = []
+
+    def boom():
+        runs.append(1); time.sleep(0.2); raise subprocess.CalledProcessError(1, "ffprobe")
+
+    def guarded():
+        try:
+            return probe_flight.shared(["ffprobe", str(clip)], boom, 5)
+        except subprocess.CalledProcessError as exc:
+            return exc.returncode
+    assert _together(4, guarded) == [1, 1, 1, 1] and runs == [1]
+    assert probe_flight.shared(["ffprobe", str(clip)], lambda: [0, "ok"], 5) == [0, "ok"]
+
+def test_second_process_reuses_the_in_flight_result(clip: Path) -> None:
+    script = (
+        "import sys, time; from system import probe_flight; probe_flight.FLIGHT_DIR = sys.argv[1]; "
+        "print(probe_flight.shared(['ffprobe', sys.argv[2]], lambda: (time.sleep(1.0), [0, 'from-crop-tool'])[1], 5))"
+    )
+    proc = subprocess.Popen([sys.executable, "-c", script, probe_flight.FLIGHT_DIR, str(clip)], cwd=ROOT, stdout=subprocess.PIPE, text=True)
+    deadline = time.monotonic() + 20
+    while not any(n.endswith(".lock") for n in (os.listdir(probe_flight.FLIGHT_DIR) if os.path.isdir(probe_flight.FLIGHT_DIR) else [])):
+        assert time.monotonic() < deadline and proc.poll() is None
+        time.sleep(0.01)
+    local = []
+    assert probe_flight.shared(["/main/ffprobe", str(clip)], lambda: local.append(1) or [0, "from-main"], 5) == [0, "from-crop-tool"]
+    assert local == [] and "from-crop-tool" in proc.communicate(timeout=20)[0]
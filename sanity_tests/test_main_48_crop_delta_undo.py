@@ -0,0 +1,121 @@
+import ast
+import sys
+import types
+from pathlib import Path
+sys.dont_write_bytecode = True
+
+from sanity_tests._real_sanity_harness import install_qt_mpv_stubs, DummyLogger
+install_qt_mpv_stubs()
+
+from developer_tools.state_manager import StateManager, DeltaUndoAction, diff_states
+
+CROP_TOOLS = Path(__file__).resolve().parents[1] / "developer_tools" / "crop_tools.py"
+
+class Scene:
+    def __init__(self):
+        self.items = {"hp": {"x": 0.0, "y": 0.0, "width": 100.0, "height": 40.0, "z": 50}}
+
+    def snap(self, *keys):
+        return {k: dict(self.items[k]) for k in keys}
+
+    def apply(self, key, fields):
+        self.items[key].update(fields)
+        return True
+
+def test_only_changed_fields_are_stored():
+    assert diff_states({"a": {"x": 1, "y": 2}, "b": {"x": 0}}, {"a": {"x": 1, "y": 5}, "b": {"x": 0}}) == {"a": {"y": (2, 5)}}
+    scene, manager = Scene(), StateManager(logger=DummyLogger())
+    before = scene.snap("hp")
+    scene.items["hp"]["x"] = 30.0
+    assert manager.add_delta_action("portrait_drag", "Move", before, scene.snap("hp"), scene.apply)
+    assert manager.undo_stack[-1].deltas == {"hp": {"x": (0.0, 30.0)}}
+    assert not manager.add_delta_action("portrait_drag", "Move", scene.snap("hp"), scene.snap("hp"), scene.apply)
+    assert manager.undo() and scene.items["hp"]["x"] == 0.0
+    assert manager.redo() and scene.items["hp"]["x"] == 30.0
+
+def test_drag_coalesces_until_sealed():
+    scene, manager = Scene(), StateManager(logger=DummyLogger())
+    for step in range(1, 40):
+        before = scene.snap("hp")
+        scene.items["hp"].update(x=float(step), y=float(step * 2))
+        manager.add_delta_action("portrait_drag", "Move", before, scene.snap("hp"), scene.apply, None)
+    manager.seal_recent_undo()
+    assert len(manager.undo_stack) == 1
+    assert manager.undo_stack[0].deltas == {"hp": {"x": (0.0, 39.0), "y": (0.0, 78.0)}}
+    before = scene.snap("hp")
+    scene.items["hp"]["width"] = 120.0
+    manager.add_delta_action("portrait_drag", "Resize", before, scene.snap("hp"), scene.apply, None)
+    assert len(manager.undo_stack) == 2
+    manager.undo(); manager.undo()
+    assert scene.items["hp"] == {"x": 0.0, "y": 0.0, "width": 100.0, "height": 40.0, "z": 50}
+    manager.redo()
+    before = scene.snap("hp")
+    scene.items["hp"]["x"] = 5.0
+    manager.add_delta_action("portrait_drag", "Move", before, scene.snap("hp"), scene.apply, None)
+    assert len(manager.undo_stack) == 2 and not manager.can_redo()
+
+def test_move_back_to_start_drops_the_entry():
+    scene, manager = Scene(), StateManager(logger=DummyLogger())
+    for x in (10.0, 0.0):
+        before = scene.snap("hp")
+        scene.items["hp"]["x"] = x
+        manager.add_delta_action("portrait_nudge", "Nudge", before, scene.snap("hp"), scene.apply, 1000)
+    assert not manager.can_undo()
+
+def test_byte_budget_trims_oldest_entries():
+    scene, manager = Scene(), StateManager(logger=DummyLogger())
+    manager.add_undo_action("portrait_edit", "Add hp", lambda: True, lambda: True)
+    manager.max_undo_bytes = 4096 + 10 * DeltaUndoAction.BASE_COST
+    for step in range(1, 20):
+        before = scene.snap("hp")
+        scene.items["hp"]["y"] = float(step)
+        manager.add_delta_action("portrait_drag", "Move", before, scene.snap("hp"), scene.apply)
+    assert manager.undo_bytes() <= manager.max_undo_bytes
+    assert all(isinstance(a, DeltaUndoAction) for a in manager.undo_stack)
+    assert manager.undo_stack[-1].deltas == {"hp": {"y": (18.0, 19.0)}}
+    assert manager.get_state_summary()["undo_bytes"] == manager.undo_bytes()
+
+def _crop_app_methods(*names):
+    src = CROP_TOOLS.read_text(encoding="utf-8-sig")
+    cls = next(n for n in ast.parse(src).body if isinstance(n, ast.ClassDef) and n.name == "CropApp")
+    ns = {"UI_BEHAVIOR": types.SimpleNamespace(NUDGE_UNDO_COALESCE_MS=1000)}
+    for node in cls.body:
+        if isinstance(node, ast.FunctionDef) and node.name in names:
+            exec(ast.get_source_segment(src, node).replace("\n    ", "\n"), ns)
+    return {name: ns[name] for name in names}
+
+class Item:
+    def __init__(self, x):
+        self.x, self._is_dragging, self.is_resizing_br, self.is_resizing_tl, self._is_nudging = x, False, False, False, False
+
+def test_multi_selection_drag_is_one_step_until_release():
+    methods = _crop_app_methods("_handle_item_changed", "_item_gesture_active", "record_item_edit")
+    grabbed, follower = Item(0.0), Item(100.0)
+    manager = StateManager(logger=DummyLogger())
+    app = types.SimpleNamespace(_in_undo_redo=False, _suppress_undo_registration=False, state_manager=manager, _mark_dirty=lambda: None,
+                                update_undo_redo_buttons=lambda: None, portrait_scene=types.SimpleNamespace(selectedItems=lambda: [grabbed, follower]),
+                                _get_item_state=lambda item: {"x": item.x}, _apply_item_fields=lambda item, fields: True)
+    for name, fn in methods.items():
+        setattr(app, name, types.MethodType(fn, app))
+    app._item_edit_cache = {grabbed: {"x": 0.0}, follower: {"x": 100.0}}
+    grabbed._is_dragging = True
+    for step in range(1, 11):
+        for item, start in ((grabbed, 0.0), (follower, 100.0)):
+            item.x = start + step
+            app._handle_item_changed(item)
+    assert len(manager.undo_stack) == 1 and not manager.undo_stack[0].sealed
+    grabbed._is_dragging = False
+    app._handle_item_changed(grabbed)
+    assert len(manager.undo_stack) == 1 and manager.undo_stack[0].sealed
+    assert manager.undo_stack[0].deltas == {grabbed: {"x": (0.0, 10.0)}, follower: {"x": (100.0, 110.0)}}
+
+def test_deleted_items_leave_the_edit_cache():
+    delete_selected = _crop_app_methods("delete_selected")["delete_selected"]
+    delete_selected.__globals__["ResizablePixmapItem"] = Item
+    doomed, kept = Item(0.0), Item(5.0)
+    removed = []
+    app = types.SimpleNamespace(portrait_scene=types.SimpleNamespace(selectedItems=lambda: [doomed], removeItem=removed.append),
+                                _mark_dirty=lambda: None, _refresh_layer_list=lambda: None)
+    app._item_edit_cache = {doomed: {"x": 0.0}, kept: {"x": 5.0}}
+    delete_selected(app)
+    assert removed == [doomed] and app._item_edit_cache == {kept: {"x": 5.0}}
@@ -0,0 +1,90 @@
+from __future__ import annotations
+import os
+import threading
+import time
+from pathlib import Path
+import pytest
+from sanity_tests._real_sanity_harness import install_qt_mpv_stubs
+install_qt_mpv_stubs()
+
+from system import music_library
+from system.music_library import MusicLibraryIndex
+
+@pytest.fixture
+def probes(monkeypatch):
+    seen = []
+    gate = threading.Event(); gate.set()
+
+    def fake_probe(bin_dir, path, timeout=None):
+        assert timeout == music_library.LIBRARY_PROBE_TIMEOUT
+        if threading.current_thread().name.startswith("music-library"):
+            gate.wait(5)
+        seen.append(os.path.basename(path))
+        return float(len(Path(path).read_bytes())), {"title": Path(path).stem}
+    monkeypatch.setattr(music_library.MediaProber, "probe_audio_info", staticmethod(fake_probe))
+    return seen, gate
+
+def _wait_idle(index: MusicLibraryIndex) -> None:
+    deadline = time.time() + 5
+    while index._waiters and time.time() < deadline:
+        time.sleep(0.01)
+    time.sleep(0.05); index.flush()
+
+def _track(folder: Path, name: str, size: int, age: float = 0.0) -> Path:
+    path = folder / name
+    path.write_bytes(b"x" * size)
+    stamp = time.time() - age
+    os.utime(path, (stamp, stamp))
+    return path
+
+def test_scan_probes_once_and_persists(tmp_path: Path, probes) -> None:
+    seen, _ = probes
+    folder = tmp_path / "mp3"; folder.mkdir()
+    _track(folder, "old.mp3", 10, age=60); _track(folder, "new.mp3", 20); _track(folder, "cover.jpg", 5)
+    index = MusicLibraryIndex("bin", directory=str(tmp_path / "lib"))
+    assert [n for n, _ in index.scan(str(folder))] == ["new.mp3", "old.mp3"]
+    _wait_idle(index)
+    assert sorted(seen) == ["new.mp3", "old.mp3"]
+    assert index.lookup(str(folder / "new.mp3")) == {"duration": 20.0, "tags": {"title": "new"}}
+    reopened = MusicLibraryIndex("bin", directory=str(tmp_path / "lib"))
+    reopened.scan(str(folder)); _wait_idle(reopened)
+    assert len(seen) == 2 and reopened.lookup(str(folder / "old.mp3"))["duration"] == 10.0
+
+def test_rescan_only_probes_changed_files(tmp_path: Path, probes) -> None:
+    seen, _ = probes
+    folder = tmp_path / "mp3"; folder.mkdir()
+    for name in ("a.mp3", "b.mp3", "c.mp3"):
+        _track(folder, name, 4, age=30)
+    index = MusicLibraryIndex("bin", directory=str(tmp_path / "lib"))
+    index.scan(str(folder)); _wait_idle(index); seen.clear()
+    _track(folder, "b.mp3", 9); (folder / "c.mp3").unlink(); _track(folder, "d.mp3", 3)
+    index.scan(str(folder)); _wait_idle(index)
+    assert sorted(seen) == ["b.mp3", "d.mp3"]
+    assert index.lookup(str(folder / "b.mp3"))["duration"] == 9.0
+    assert str(folder / "c.mp3") not in index._entries
+
+def test_concurrent_requests_share_one_probe(tmp_path: Path, probes) -> None:
+    seen, gate = probes
+    track = _track(tmp_path, "song.mp3", 7)
+    index = MusicLibraryIndex("bin", directory=str(tmp_path / "lib"))
+    gate.clear()
+    results = []
+    for _ in range(5):
+        index.request(str(track), results.append)
+    gate.set(); _wait_idle(index)
+    assert seen == ["song.mp3"] and results == [7.0] * 5
+    index.request(str(track), results.append)
+    assert results[-1] == 7.0 and index.duration(str(track)) == 7.0 and seen == ["song.mp3"]
+
+def test_direct_duration_does_not_queue_behind_prefetch(tmp_path: Path, probes) -> None:
+    seen, gate = probes
+    queued = [_track(tmp_path, f"q{i}.mp3", 5) for i in range(6)]
+    wanted = _track(tmp_path, "wanted.mp3", 12)
+    index = MusicLibraryIndex("bin", directory=str(tmp_path / "lib"), workers=1)
+    gate.clear()
+    index.prefetch([str(p) for p in queued])
+    started = time.monotonic()
+    assert index.duration(str(wanted)) == 12.0
+    assert time.monotonic() - started < 1.0 and seen == ["wanted.mp3"]
+    assert index.lookup(str(wanted))["duration"] == 12.0
+    gate.set(); _wait_idle(index)
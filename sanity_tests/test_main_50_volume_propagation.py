@@ -0,0 +1,119 @@
+from __future__ import annotations
+import types
+from sanity_tests._real_sanity_harness import install_qt_mpv_stubs
+install_qt_mpv_stubs()
+
+from ui.parts import volume_mixin
+from ui.parts.volume_mixin import VolumeMixin
+
+class FakeTimer:
+    def __init__(self, parent=None):
+        self.active = False
+        self.callbacks = []
+        self.timeout = types.SimpleNamespace(connect=self.callbacks.append)
+
+    def setSingleShot(self, flag): pass
+    def setInterval(self, ms): self.interval = ms
+    def isActive(self): return self.active
+    def start(self, ms=None): self.active = True
+
+    def fire(self):
+        self.active = False
+        for cb in self.callbacks: cb()
+
+class Slider:
+    def __init__(self, value):
+        self._value = value
+
+    def value(self): return self._value
+    def setValue(self, v): self._value = v
+    def invertedAppearance(self): return False
+
+class HeldLock:
+    def __init__(self):
+        self.depth = 0
+
+    def __enter__(self): self.depth += 1
+    def __exit__(self, *exc): self.depth -= 1
+
+class BatchPlayer:
+    def __init__(self, lock=None):
+        self.batches = []
+        self.lock = lock
+
+    def set_properties(self, props):
+        assert self.lock is None or self.lock.depth == 1
+        self.batches.append(props)
+        self.__dict__.update(props)
+        return True
+
+def _host(monkeypatch):
+    monkeypatch.setattr(volume_mixin, "QTimer", FakeTimer)
+    calls = []
+    real = volume_mixin.MPVSafetyManager.safe_mpv_set_many
+    monkeypatch.setattr(volume_mixin.MPVSafetyManager, "safe_mpv_set_many", staticmethod(lambda updates, lock=None: calls.append(len(updates)) or real(updates, lock=lock)))
+    lock = HeldLock()
+    host = types.SimpleNamespace(volume_slider=Slider(50), player=BatchPlayer(lock), _music_preview_player=BatchPlayer(lock), _music_volume_pct=70, _mpv_lock=lock)
+    for name in ("_vol_eff", "_music_eff", "_volume_targets", "_sync_all_volumes", "_request_volume_sync", "_forget_volume_sent", "_reinforce_volumes", "_schedule_volume_reinforce"):
+        setattr(host, name, types.MethodType(getattr(VolumeMixin, name), host))
+    return host, calls
+
+def test_slider_ticks_coalesce_into_one_batched_send(monkeypatch) -> None:
+    host, calls = _host(monkeypatch)
+    for v in range(40, 60):
+        host.volume_slider.setValue(v)
+        host._request_volume_sync()
+    assert calls == [] and host._volume_frame_timer.interval == volume_mixin.VOLUME_FRAME_MS
+    host._volume_frame_timer.fire()
+    assert calls == [2]
+    assert host.player.batches == [{"volume": 59, "mute": False}]
+    assert host._music_preview_player.batches == [{"volume": 70, "mute": False}]
+
+def test_unchanged_values_are_skipped_until_the_player_drifts(monkeypatch) -> None:
+    host, calls = _host(monkeypatch)
+    host._sync_all_volumes()
+    host._sync_all_volumes()
+    host.volume_slider.setValue(55)
+    host._sync_all_volumes()
+    assert calls == [2, 1] and len(host._music_preview_player.batches) == 1
+    host._schedule_volume_reinforce(250)
+    host._volume_reinforce_timer.fire()
+    assert calls == [2, 1] and host.player.batches[-1] == {"volume": 55, "mute": False}
+    host.player.volume = 100.0
+    host._volume_reinforce_timer.fire()
+    assert calls == [2, 1, 1] and host.player.batches[-1] == {"volume": 55, "mute": False}
+    host._music_preview_player.mute = True
+    host._forget_volume_sent(host._music_preview_player)
+    host._sync_all_volumes()
+    assert calls == [2, 1, 1, 1] and host._music_preview_player.mute is False
+    host._sync_all_volumes(force=True)
+    assert calls == [2, 1, 1, 1, 2]
+    host._music_preview_player = BatchPlayer()
+    host._sync_all_volumes()
+    assert calls[-1] == 1 and host._music_preview_player.batches == [{"volume": 70, "mute": False}]
+
+def test_plain_players_fall_back_to_attribute_sets() -> None:
+    plain = types.SimpleNamespace(volume=100, mute=True)
+    closed = types.SimpleNamespace(_core_shutdown=True)
+    assert volume_mixin.MPVSafetyManager.safe_mpv_set_many([(plain, {"volume": 30, "mute": False}), (closed, {"volume": 1})]) == [True, False]
+    assert plain.volume == 30 and plain.mute is False
+
+def test_process_player_batch_is_one_pipe_write(tmp_path, monkeypatch) -> None:
+    import time
+    from sanity_tests._perf_harness import ScriptedMpvPipe, install_fake_media_tools, install_scripted_mpv_ipc
+    from system.mpv_process_manager import MpvProcessProxy
+    pipe = ScriptedMpvPipe()
+    writes = []
+    original = pipe.write
+    pipe.write = lambda data: writes.append(data) or original(data)
+    install_scripted_mpv_ipc(monkeypatch, install_fake_media_tools(tmp_path / "binaries")["mpv"], pipe)
+    proxy = MpvProcessProxy()
+    try:
+        assert volume_mixin.MPVSafetyManager.safe_mpv_set_many([(proxy, {"volume": 33, "mute": False})]) == [True]
+        deadline = time.monotonic() + 5.0
+        while pipe.properties.get("volume") != 33 and time.monotonic() < deadline:
+            time.sleep(0.005)
+        assert pipe.properties["volume"] == 33 and pipe.properties["mute"] is False
+        assert [w.count(b"set_property") for w in writes if b"set_property" in w] == [2]
+    finally:
+        proxy.terminate()
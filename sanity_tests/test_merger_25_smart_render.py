@@ -0,0 +1,76 @@
+﻿import sys
+from types import SimpleNamespace
+sys.dont_write_bytecode = True
+
+from sanity_tests._real_sanity_harness import install_qt_mpv_stubs
+install_qt_mpv_stubs()
+
+from utilities import merger_engine, merger_smart_render
+from utilities.merger_engine import MergerEngine
+from utilities.merger_smart_render import plan_smart_render, transcode_input_args, conform_output_args, smart_render_enabled
+
+def _info(path, codec="h264", res=(1920, 1080), fps=30.0, audio=True, a_rate=48000, duration=10.0, profile="High", level=41, time_base="1/15360"):
+    return {
+        "path": path, "duration": duration, "resolution": res, "has_audio": audio,
+        "video_codec": codec, "video_profile": profile, "video_level": level, "video_time_base": time_base, "video_pix_fmt": "yuv420p", "video_fps": fps,
+        "audio_codec": "aac" if audio else "", "audio_rate": a_rate if audio else 0, "audio_channels": 2 if audio else 0,
+    }
+
+def test_only_the_odd_clip_is_transcoded():
+    infos = [_info(f"c{i}.mp4") for i in range(20)]
+    infos.insert(7, _info("phone.mp4", res=(1080, 1920), fps=29.97, audio=False))
+    plan = plan_smart_render(infos)
+    assert plan["target"] == {
+        "width": 1920, "height": 1080, "fps": "30", "profile": "high", "level": "4.1", "timescale": 15360,
+        "audio_rate": 48000, "audio_channels": 2, "has_audio": True,
+    }
+    assert [(o["index"], o["path"]) for o in plan["outliers"]] == [(7, "phone.mp4")]
+    args = transcode_input_args(plan["outliers"][0], plan["target"])
+    assert "anullsrc=channel_layout=stereo:sample_rate=48000" in args and args[-1] == "-shortest"
+    assert args[args.index("-map", args.index("0:v:0")) + 1] == "1:a:0"
+    assert "scale=1920:1080" in args[args.index("-vf") + 1]
+
+def test_profile_level_and_timescale_mismatches_are_conformed_to_the_majority():
+    infos = [_info("a.mp4"), _info("b.mp4"), _info("c.mp4", profile="Main", level=31), _info("d.mp4", time_base="1/90000")]
+    plan = plan_smart_render(infos)
+    assert [o["path"] for o in plan["outliers"]] == ["c.mp4", "d.mp4"]
+    assert conform_output_args(plan["target"]) == ["-profile:v", "high", "-level:v", "4.1", "-video_track_timescale", "15360", "-bsf:v", "dump_extra"]
+    assert plan_smart_render([_info("a.mp4", profile=""), _info("b.mp4", profile="")]) is None
+    assert plan_smart_render([_info("a.mp4", time_base=""), _info("b.mp4", time_base="")]) is None
+
+def test_majority_that_cannot_be_copied_keeps_full_render(monkeypatch):
+    assert plan_smart_render([_info("a.mkv", codec="hevc"), _info("b.mkv", codec="hevc"), _info("c.mp4")]) is None
+    assert plan_smart_render([_info("a.mp4", res=(1280, 720)), _info("b.mp4")]) is not None
+    assert smart_render_enabled(4) and not smart_render_enabled(3)
+    monkeypatch.setenv(merger_smart_render.SMART_RENDER_ENV, "0")
+    assert not smart_render_enabled(4)
+
+def test_engine_conforms_outliers_then_stream_copies(monkeypatch, tmp_path):
+    monkeypatch.setattr(merger_engine.subprocess, "run", lambda *a, **k: SimpleNamespace(stdout=" V....D h264_nvenc NVIDIA NVENC H.264 encoder\n"))
+    calls = []
+
+    class FakeProc:
+        def __init__(self, cmd, **kwargs):
+            calls.append(cmd)
+            open(cmd[-1], "wb").write(b"x")
+            self.stdout = SimpleNamespace(readline=lambda: "", close=lambda: None)
+            self.returncode = 0
+
+        def wait(self, *a, **k):
+            return 0
+    monkeypatch.setattr(merger_engine.subprocess, "Popen", FakeProc)
+    smart = str(tmp_path / "smart_1.mp4")
+    job = {"path": "odd.mp4", "duration": 4.0, "args": ["-i", "odd.mp4", "-map", "0:v:0"], "video_args": ["-level:v", "4.1"], "audio": True, "output": smart}
+    engine = MergerEngine("ffmpeg", ["-f", "concat", "-i", "list.txt"], str(tmp_path / "out.mp4"), 40.0, use_gpu=True, prepass_jobs=[job], copy_video=True)
+    done, progress = [], []
+    engine.finished = SimpleNamespace(emit=lambda ok, msg: done.append(ok))
+    engine.progress = SimpleNamespace(emit=lambda pct, t: progress.append(pct))
+    engine.run()
+    assert done == [True] and len(calls) == 2
+    assert calls[0][-1] == smart and "h264_nvenc" in calls[0]
+    assert calls[0][-3:-1] == ["-level:v", "4.1"] and calls[0].index("h264_nvenc") < len(calls[0]) - 3
+    final = calls[1]
+    assert final[final.index("-c:v") + 1] == "copy" and "h264_nvenc" not in final
+    engine._pass_span = (0.0, 50.0, 4.0)
+    engine._parse_progress_v2("out_time_us=2000000")
+    assert progress[-1] == 25
@@ -0,0 +1,58 @@
+﻿import contextlib
+import os
+import sys
+from types import SimpleNamespace
+sys.dont_write_bytecode = True
+
+from sanity_tests._real_sanity_harness import install_qt_mpv_stubs
+install_qt_mpv_stubs()
+
+from utilities import workers
+from utilities.workers import FastFileLoaderWorker, PartialHashIndex
+
+def _no_lock(monkeypatch):
+    monkeypatch.setattr(workers, "QMutexLocker", lambda mutex: contextlib.nullcontext())
+    monkeypatch.setattr(workers.subprocess, "run", lambda *a, **k: SimpleNamespace(returncode=1, stdout=""))
+
+def _load(files, index_path, existing=(), hashes=()):
+    worker = FastFileLoaderWorker(files, list(existing), set(hashes), 100, "ffmpeg", hash_index=PartialHashIndex(index_path))
+    loaded, done = [], []
+    worker.file_loaded = SimpleNamespace(emit=lambda path, size, probe, f_hash: loaded.append((path, f_hash)))
+    worker.finished = SimpleNamespace(emit=lambda added, dupes: done.append((added, dupes)))
+    worker.progress = SimpleNamespace(emit=lambda *a: None)
+    worker.run()
+    return loaded, done[0]
+
+def test_known_clips_are_not_read_again(monkeypatch, tmp_path):
+    _no_lock(monkeypatch)
+    reads = []
+    real_hash = workers._partial_hash
+    monkeypatch.setattr(workers, "_partial_hash", lambda path: reads.append(path) or real_hash(path))
+    clips = []
+    for i in range(30):
+        clip = tmp_path / f"clip_{i}.mp4"; clip.write_bytes(bytes([i]) * (600 * 1024)); clips.append(str(clip))
+    index_path = tmp_path / "index.json"
+    first, counts = _load(clips, index_path)
+    assert counts == (30, 0) and sorted(reads) == sorted(clips)
+    reads.clear()
+    again, counts = _load(clips, index_path)
+    assert reads == [] and again == first
+    st = os.stat(clips[3]); os.utime(clips[3], ns=(st.st_atime_ns, st.st_mtime_ns + 5_000_000_000))
+    _, counts = _load(clips, index_path, hashes={h for _, h in first})
+    assert reads == [clips[3]] and counts == (0, 30)
+
+def test_copies_are_still_flagged_as_duplicates(monkeypatch, tmp_path):
+    _no_lock(monkeypatch)
+    a, b = tmp_path / "a.mp4", tmp_path / "b.mp4"
+    a.write_bytes(b"y" * 2048); b.write_bytes(b"y" * 2048)
+    loaded, counts = _load([str(a), str(b)], tmp_path / "index.json")
+    assert [p for p, _ in loaded] == [str(a)] and counts == (1, 1)
+
+def test_index_keeps_most_recent_entries(tmp_path):
+    index = PartialHashIndex(tmp_path / "index.json", max_entries=3)
+    for i in range(5):
+        clip = tmp_path / f"c{i}.bin"; clip.write_bytes(bytes([i]) * 10)
+        assert index.hash_file(str(clip))
+        index._entries[str(clip)][5] = float(i)
+    assert index.flush()
+    assert sorted(PartialHashIndex(tmp_path / "index.json")._entries) == [str(tmp_path / f"c{i}.bin") for i in (2, 3, 4)]
@@ -0,0 +1,40 @@
+﻿from __future__ import annotations
+from pathlib import Path
+from sanity_tests._perf_harness import check_benchmark, measure
+from processing.config_data import VideoConfig
+from processing.filter_builder import FilterBuilder
+ROOT = Path(__file__).resolve().parent.parent
+
+def _segments(count: int) -> list[dict]:
+    return [{"start_ms": 1000 + i * 700, "end_ms": 1000 + i * 700 + 400, "speed": 0.0 if i % 9 == 0 else (0.5 + (i % 5) * 0.5)} for i in range(count)]
+
+def test_perf_granular_speed_chain_construction() -> None:
+    fb = FilterBuilder()
+    segments = _segments(40)
+
+    def build():
+        for _ in range(25):
+            chain, v, a, dur, mapper = fb.build_granular_speed_chain(None, 40000, segments, 1.1, source_cut_start_ms=500, target_fps="60")
+        assert v == "[v_speed_out]" and dur > 0
+    check_benchmark("filter_graph.granular_chain_40_segments", measure(build))
+
+def test_perf_mobile_filter_chain_construction() -> None:
+    fb = FilterBuilder()
+    coords = VideoConfig(str(ROOT)).get_mobile_coordinates()
+
+    def build():
+        for _ in range(200):
+            chain, out = fb.build_mobile_filter_chain("[v_stabilized]", coords, False, True, True, "[3:v]", False, "2560x1440")
+        assert out == "[v_final]"
+    check_benchmark("filter_graph.mobile_chain", measure(build))
+
+def test_perf_audio_chain_construction() -> None:
+    fb = FilterBuilder()
+    tracks = [("a.mp3", 1.0, 12.0), ("b.mp3", 0.0, 9.5), ("c.mp3", 3.0, 20.0)]
+    music_cfg = {"music_vol": 0.7, "main_vol": 0.9, "timeline_start_sec": 1.5, "timeline_end_sec": 38.0}
+
+    def build():
+        for _ in range(300):
+            chain, label = fb.build_audio_chain(music_cfg, 0.0, 40.0, 1.1, False, 0.5, "", 48000, tracks, 1, 36.4)
+        assert label == "[a_music_prepared]"
+    check_benchmark("filter_graph.audio_chain_3_tracks", measure(build))
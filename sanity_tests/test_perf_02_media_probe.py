@@ -0,0 +1,41 @@
+﻿from __future__ import annotations
+import os
+from pathlib import Path
+from sanity_tests._perf_harness import check_benchmark, install_fake_media_tools, measure
+from processing.media_utils import MediaProber
+from system.utils import MediaProber as SystemMediaProber
+
+def _clips(tmp_path: Path, count: int) -> list[Path]:
+    clips = []
+    for i in range(count):
+        clip = tmp_path / f"clip_{i}.mp4"
+        clip.write_bytes(b"video")
+        clips.append(clip)
+    return clips
+
+def test_perf_worker_probe_fan_out(tmp_path: Path) -> None:
+    bin_dir = tmp_path / "binaries"
+    install_fake_media_tools(bin_dir)
+    clips = _clips(tmp_path, 3)
+
+    def probe_all():
+        for clip in clips:
+            prober = MediaProber(str(bin_dir), str(clip))
+            assert prober.has_audio()
+            assert prober.get_audio_bitrate() == 192
+            assert prober.get_duration() == 10.0
+            assert prober.get_video_fps_expr("60") == "60"
+    check_benchmark("media_probe.worker_fan_out_3_clips", measure(probe_all, repeat=3))
+
+def test_perf_system_probe_fan_out(tmp_path: Path, monkeypatch) -> None:
+    bin_dir = tmp_path / "binaries"
+    install_fake_media_tools(bin_dir)
+    monkeypatch.setenv("PATH", f"{bin_dir}{os.pathsep}{os.environ.get('PATH', '')}")
+    clips = _clips(tmp_path, 3)
+
+    def probe_all():
+        for clip in clips:
+            assert SystemMediaProber.probe_duration(str(bin_dir), str(clip)) == 10.0
+            assert SystemMediaProber.probe_metadata(str(bin_dir), str(clip)) == (10.0, "1920x1080")
+            assert SystemMediaProber.probe_volume(str(bin_dir), str(clip)) == (-20.5, -1.2)
+    check_benchmark("media_probe.system_fan_out_3_clips", measure(probe_all, repeat=3))
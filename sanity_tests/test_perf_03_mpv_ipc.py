@@ -0,0 +1,43 @@
+﻿from __future__ import annotations
+import time
+from pathlib import Path
+from sanity_tests._perf_harness import (
+    ScriptedMpvPipe,
+    check_benchmark,
+    install_fake_media_tools,
+    install_scripted_mpv_ipc,
+    measure,
+)
+from system.mpv_process_manager import MpvProcessProxy
+
+def _proxy(tmp_path: Path, monkeypatch) -> tuple[MpvProcessProxy, ScriptedMpvPipe]:
+    tools = install_fake_media_tools(tmp_path / "binaries")
+    pipe = ScriptedMpvPipe({"time-pos": 4.25})
+    install_scripted_mpv_ipc(monkeypatch, tools["mpv"], pipe)
+    return MpvProcessProxy(), pipe
+
+def test_perf_mpv_property_round_trips(tmp_path: Path, monkeypatch) -> None:
+    proxy, _ = _proxy(tmp_path, monkeypatch)
+    try:
+        def round_trips():
+            for _ in range(20):
+                assert proxy.get_property("time-pos", timeout=1.0) == 4.25
+        check_benchmark("mpv_ipc.get_property_20_round_trips", measure(round_trips, repeat=3))
+    finally:
+        proxy.terminate()
+
+def test_perf_mpv_command_throughput(tmp_path: Path, monkeypatch) -> None:
+    proxy, pipe = _proxy(tmp_path, monkeypatch)
+    try:
+        def burst():
+            target = pipe.received + 200
+            for i in range(200):
+                assert proxy.set_property("volume", i % 100)
+            deadline = time.monotonic() + 5.0
+            while pipe.received < target and time.monotonic() < deadline:
+                time.sleep(0.001)
+            assert pipe.received >= target
+        check_benchmark("mpv_ipc.set_property_200_burst", measure(burst, repeat=3))
+        assert pipe.properties["volume"] == 99
+    finally:
+        proxy.terminate()
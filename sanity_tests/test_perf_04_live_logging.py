@@ -0,0 +1,33 @@
+﻿from __future__ import annotations
+import logging
+from pathlib import Path
+from sanity_tests._perf_harness import check_benchmark, measure
+from system.live_logging import ReopenableFileHandler, ReopenableTextStream, append_text_unlocked
+
+def test_perf_append_text_with_rotation(tmp_path: Path) -> None:
+    log_path = tmp_path / "logs" / "main_app.log"
+    line = "2026-01-01 00:00:00 | INFO | FFMPEG progress frame=1200 fps=240 q=23.0 size=4096kB\n"
+
+    def append_lines():
+        for _ in range(1000):
+            append_text_unlocked(log_path, line, max_bytes=256 * 1024, backup_count=3)
+    check_benchmark("live_logging.append_1000_lines_rotating", measure(append_lines, repeat=3))
+    assert log_path.exists() and (tmp_path / "logs" / "main_app.log.1").exists()
+
+def test_perf_file_handler_and_stream_capture(tmp_path: Path) -> None:
+    handler = ReopenableFileHandler(str(tmp_path / "handler.log"), maxBytes=1024 * 1024, backupCount=2)
+    handler.setFormatter(logging.Formatter("%(asctime)s | %(levelname)s | %(message)s"))
+    logger = logging.getLogger("fvs.perf.live_logging")
+    logger.propagate = False
+    logger.setLevel(logging.INFO)
+    logger.addHandler(handler)
+    stream = ReopenableTextStream(str(tmp_path / "stream.log"), "stdout")
+    try:
+        def emit():
+            for i in range(500):
+                logger.info("PROGRESS: %d%% frame=%d", i % 100, i)
+                stream.write(f"worker tick {i}\n")
+        check_benchmark("live_logging.handler_and_stream_500_records", measure(emit, repeat=3))
+    finally:
+        logger.removeHandler(handler)
+        handler.close()
@@ -0,0 +1,39 @@
+﻿from __future__ import annotations
+from pathlib import Path
+from sanity_tests._perf_harness import check_benchmark, measure
+from sanity_tests._real_sanity_harness import DummyLogger
+from system.recovery_manager import RECOVERY_JSON_SCHEMA_MAIN, RecoveryManager
+
+def _manager(tmp_path: Path) -> RecoveryManager:
+    rm = RecoveryManager("sanity_perf_recovery", DummyLogger())
+    rm.temp_dir = tmp_path
+    rm.state_file = tmp_path / "perf_state.json"
+    return rm
+
+def _state(slider_ms: int) -> dict:
+    state = {k: dict(v) if isinstance(v, dict) else v for k, v in RECOVERY_JSON_SCHEMA_MAIN.items()}
+    state["volatile_settings"] = dict(state["volatile_settings"], speed_segments=[{"start": i * 500, "end": i * 500 + 250, "speed": 1.5} for i in range(60)])
+    state["ui_dynamics"] = dict(state["ui_dynamics"], slider_value_ms=slider_ms)
+    return state
+
+def test_perf_recovery_scrub_burst_async(tmp_path: Path) -> None:
+    rm = _manager(tmp_path)
+    try:
+        def scrub():
+            for ms in range(0, 400 * 40, 40):
+                rm.save_state_async(_state(ms))
+            assert rm.flush(10.0)
+        check_benchmark("recovery.scrub_burst_400_async_saves", measure(scrub, repeat=3))
+        assert rm.load_state()["ui_dynamics"]["slider_value_ms"] == 399 * 40
+    finally:
+        rm.stop_writer()
+
+def test_perf_recovery_unchanged_periodic_saves(tmp_path: Path) -> None:
+    rm = _manager(tmp_path)
+    state = _state(1234)
+    rm.save_state(state)
+
+    def periodic():
+        for _ in range(50):
+            rm.save_state(_state(1234), durable=False)
+    check_benchmark("recovery.periodic_50_unchanged_saves", measure(periodic, repeat=3))
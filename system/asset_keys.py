@@ -0,0 +1,37 @@
+﻿import os
+import hashlib
+import threading
+from typing import Any, Sequence
+_KEY_LOCKS: dict[str, threading.Lock] = {}
+_KEY_LOCKS_GUARD = threading.Lock()
+
+def read_file_bytes(path: str) -> bytes | None:
+    try:
+        with open(path, "rb") as f:
+            data = f.read()
+        return data if data else None
+    except Exception:
+        return None
+
+def media_signature(path: str) -> tuple[int, int]:
+    try:
+        st = os.stat(path)
+        return int(getattr(st, "st_mtime_ns", int(st.st_mtime * 1_000_000_000))), int(st.st_size)
+    except Exception:
+        return 0, 0
+
+def hash_key(parts: Sequence[Any]) -> str:
+    raw = "||".join(str(p) for p in parts)
+    return hashlib.sha1(raw.encode("utf-8", errors="ignore")).hexdigest()
+
+def source_fingerprint(path: str) -> str:
+    sig = media_signature(path)
+    return f"{path}|{sig[0]}|{sig[1]}"
+
+def key_lock(key: str) -> threading.Lock:
+    """One in-process lock per cache key, shared by every front end that writes the same entry."""
+    with _KEY_LOCKS_GUARD:
+        lock = _KEY_LOCKS.get(key)
+        if lock is None:
+            lock = _KEY_LOCKS[key] = threading.Lock()
+        return lock
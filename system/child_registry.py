@@ -0,0 +1,199 @@
+﻿import os
+import json
+import time
+import threading
+import psutil
+REGISTRY_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "logs", "child_pids")
+PRUNE_THRESHOLD = 32
+FLUSH_DELAY_SEC = 0.2
+CREATE_TIME_TOLERANCE_SEC = 0.5
+
+def _create_time(pid):
+    try:
+        return float(psutil.Process(int(pid)).create_time())
+    except Exception:
+        return None
+
+def _name_matches(name, process_names):
+    if not process_names:
+        return True
+    low = str(name or "").lower()
+    stem = low[:-4] if low.endswith(".exe") else low
+    for target in process_names:
+        t = str(target).lower()
+        t_stem = t[:-4] if t.endswith(".exe") else t
+        if stem == t_stem or t_stem in stem:
+            return True
+    return False
+
+class ChildProcessRegistry:
+    """
+    Persists the PIDs (and creation times) of media-tool children so orphans can be reaped without scanning every process.
+    register/unregister only touch memory; a short timer thread resolves creation times and rewrites the file.
+    """
+    directory = REGISTRY_DIR
+    _lock = threading.Lock()
+    _entries = {}
+    _owner_create_time = None
+    _dirty = False
+    _flush_timer = None
+
+    @classmethod
+    def _owner_path(cls, owner_pid=None):
+        return os.path.join(cls.directory, f"{int(owner_pid or os.getpid())}.json")
+
+    @classmethod
+    def register(cls, pid, name=None):
+        entry = {"pid": int(pid), "create_time": None, "name": str(name or ""), "registered_at": time.time()}
+        with cls._lock:
+            cls._entries[entry["pid"]] = entry
+            cls._mark_dirty_locked()
+        return True
+
+    @classmethod
+    def unregister(cls, pid):
+        with cls._lock:
+            if cls._entries.pop(int(pid), None) is not None:
+                cls._mark_dirty_locked()
+
+    @classmethod
+    def _mark_dirty_locked(cls):
+        cls._dirty = True
+        if cls._flush_timer is None:
+            timer = threading.Timer(FLUSH_DELAY_SEC, cls.flush)
+            timer.daemon = True
+            cls._flush_timer = timer
+            timer.start()
+
+    @classmethod
+    def flush(cls):
+        """Writes pending changes now. Children that exited before their creation time was read are dropped."""
+        with cls._lock:
+            cls._flush_timer = None
+            if not cls._dirty:
+                return True
+            unresolved = [e for e in cls._entries.values() if e["create_time"] is None]
+        resolved = []
+        for entry in unresolved:
+            try:
+                proc = psutil.Process(entry["pid"])
+                resolved.append((entry, float(proc.create_time()), entry["name"] or proc.name()))
+            except Exception:
+                resolved.append((entry, None, None))
+        with cls._lock:
+            for entry, create_time, name in resolved:
+                if cls._entries.get(entry["pid"]) is not entry:
+                    continue
+                if create_time is None or create_time > entry["registered_at"] + CREATE_TIME_TOLERANCE_SEC:
+                    del cls._entries[entry["pid"]]
+                else:
+                    entry["create_time"], entry["name"] = create_time, name
+            if len(cls._entries) > PRUNE_THRESHOLD:
+                cls._prune_locked()
+            ok = cls._save_locked()
+            cls._dirty = not ok
+            if any(e["create_time"] is None for e in cls._entries.values()):
+                cls._mark_dirty_locked()
+            return ok
+
+    @classmethod
+    def tracked(cls):
+        with cls._lock:
+            return [dict(e) for e in cls._entries.values()]
+
+    @classmethod
+    def _prune_locked(cls):
+        for pid, entry in list(cls._entries.items()):
+            if entry["create_time"] is None:
+                continue
+            ct = _create_time(pid)
+            if ct is None or abs(ct - entry["create_time"]) > CREATE_TIME_TOLERANCE_SEC:
+                cls._entries.pop(pid, None)
+
+    @classmethod
+    def _save_locked(cls):
+        if cls._owner_create_time is None:
+            cls._owner_create_time = _create_time(os.getpid())
+        path = cls._owner_path()
+        children = [e for e in cls._entries.values() if e["create_time"] is not None]
+        try:
+            if not children:
+                if os.path.exists(path): os.remove(path)
+                return True
+            os.makedirs(cls.directory, exist_ok=True)
+            payload = {"owner_pid": os.getpid(), "owner_create_time": cls._owner_create_time, "children": children}
+            tmp = f"{path}.tmp"
+            with open(tmp, "w", encoding="utf-8") as f: json.dump(payload, f, separators=(",", ":"))
+            os.replace(tmp, path)
+            return True
+        except Exception:
+            return False
+
+    @classmethod
+    def _owner_alive(cls, payload):
+        ct = _create_time(payload.get("owner_pid"))
+        expected = payload.get("owner_create_time")
+        return ct is not None and (expected is None or abs(ct - float(expected)) <= CREATE_TIME_TOLERANCE_SEC)
+
+    @classmethod
+    def _kill_entry(cls, entry, process_names, logger=None):
+        try:
+            proc = psutil.Process(int(entry["pid"]))
+            if abs(float(proc.create_time()) - float(entry["create_time"])) > CREATE_TIME_TOLERANCE_SEC:
+                return False
+            if not _name_matches(entry.get("name") or proc.name(), process_names):
+                return False
+            proc.kill()
+            if logger: logger.info(f"ORPHANS: Reaped {entry.get('name')} (PID {entry['pid']})")
+            return True
+        except Exception:
+            return False
+
+    @classmethod
+    def reap(cls, process_names=None, include_self=False, logger=None):
+        """Kill registered children of dead owners (and our own when include_self). Returns (killed, registry_ok)."""
+        killed, ok = 0, True
+        cls.flush()
+        try:
+            names = [n for n in os.listdir(cls.directory) if n.endswith(".json")]
+        except FileNotFoundError:
+            names = []
+        except Exception:
+            return 0, False
+        for file_name in names:
+            path = os.path.join(cls.directory, file_name)
+            try:
+                with open(path, "r", encoding="utf-8") as f: payload = json.load(f)
+                is_self = int(payload.get("owner_pid", -1)) == os.getpid()
+            except Exception:
+                ok = False
+                try: os.remove(path)
+                except Exception: pass
+                continue
+            if is_self and not include_self:
+                continue
+            if not is_self and cls._owner_alive(payload):
+                continue
+            for entry in payload.get("children") or []:
+                if cls._kill_entry(entry, process_names, logger): killed += 1
+            if is_self:
+                with cls._lock:
+                    cls._entries.clear()
+                    cls._dirty = False
+                    cls._save_locked()
+            else:
+                try: os.remove(path)
+                except Exception: pass
+        return killed, ok
+
+def register_child(pid, name=None):
+    try:
+        return ChildProcessRegistry.register(pid, name)
+    except Exception:
+        return False
+
+def unregister_child(pid):
+    try:
+        ChildProcessRegistry.unregister(pid)
+    except Exception:
+        pass
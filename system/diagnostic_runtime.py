@@ -10,6 +10,7 @@ import sys
 import tempfile
 import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Any, Iterator, Optional, Sequence, cast
 import psutil
@@ -24,6 +25,9 @@ PYTHON_DEBUG_LOG_PATH = LOGS_DIR / "python_debug.log"
 DIFF_TEXT_PATH = LOGS_DIR / "master_state_diff.txt"
 DIFF_HTML_PATH = LOGS_DIR / "master_state_diff.html"
 ROLLBACK_LOG_PATH = LOGS_DIR / "rollback_protocol.log"
+DIFF_MANIFEST_PATH = LOGS_DIR / "master_state_manifest.json"
+DIFF_HASH_WORKERS = 4
+DIFF_RACY_WINDOW_NS = 2_000_000_000
 ALARM_MESSAGE = (
     "ISOLATION ACTIVE. MASTER BACKUP SECURED AT "
     r"C:\Users\alon\.gemini\Backups. PROCEED TO TEST."
@@ -220,47 +224,112 @@ def _sha256(path: Path) -> str:
             digest.update(chunk)
     return digest.hexdigest().lower()
 
+def _load_diff_manifest() -> dict[str, list[Any]]:
+    try:
+        with open(DIFF_MANIFEST_PATH, "r", encoding="utf-8") as handle:
+            data = json.load(handle)
+        files = data.get("files") if isinstance(data, dict) else None
+        return cast(dict[str, list[Any]], files) if isinstance(files, dict) else {}
+    except Exception:
+        return {}
+
+def _hash_paths(paths: Sequence[Path], manifest: dict[str, list[Any]]) -> tuple[dict[Path, Optional[str]], dict[str, list[Any]]]:
+    """Reuses the manifest digest of every file whose size and mtime are unchanged and hashes the rest in a bounded pool."""
+    hashes: dict[Path, Optional[str]] = {}
+    fresh: dict[str, list[Any]] = {}
+    pending: dict[Path, os.stat_result] = {}
+    for path in paths:
+        try:
+            st = path.stat()
+        except OSError:
+            hashes[path] = None
+            continue
+        entry = manifest.get(str(path))
+        if isinstance(entry, list) and len(entry) == 3 and entry[0] == st.st_size and entry[1] == st.st_mtime_ns:
+            hashes[path] = cast(str, entry[2])
+            fresh[str(path)] = entry
+        else:
+            pending[path] = st
+    if pending:
+        def _safe_sha256(path: Path) -> Optional[str]:
+            try:
+                return _sha256(path)
+            except OSError:
+                return None
+        now_ns = time.time_ns()
+        with ThreadPoolExecutor(max_workers=min(DIFF_HASH_WORKERS, len(pending)), thread_name_prefix="master-diff") as pool:
+            for path, digest in zip(pending, pool.map(_safe_sha256, pending)):
+                hashes[path] = digest
+                st = pending[path]
+                if digest is not None and now_ns - st.st_mtime_ns > DIFF_RACY_WINDOW_NS:
+                    fresh[str(path)] = [st.st_size, st.st_mtime_ns, digest]
+    return hashes, fresh
+
+def _drifted_pairs(active: dict[str, Path], backup: dict[str, Path]) -> tuple[list[str], dict[str, list[Any]]]:
+    common = [rel for rel in active if rel in backup]
+    manifest = _load_diff_manifest()
+    sized: list[str] = []
+    changed = set(active).symmetric_difference(backup)
+    for rel in common:
+        try:
+            same_size = active[rel].stat().st_size == backup[rel].stat().st_size
+        except OSError:
+            same_size = False
+        if same_size:
+            sized.append(rel)
+        else:
+            changed.add(rel)
+    hashes, fresh = _hash_paths([p for rel in sized for p in (active[rel], backup[rel])], manifest)
+    for rel in sized:
+        digest = hashes.get(active[rel])
+        if digest is None or digest != hashes.get(backup[rel]):
+            changed.add(rel)
+    return sorted(changed), fresh
+
 def generate_master_diff(ignore_logs: bool = True) -> dict[str, Any]:
     ensure_runtime_directories()
     active = {rel: path for rel, path in _iter_files(PROJECT_ROOT, ignore_logs=ignore_logs)}
     backup = {rel: path for rel, path in _iter_files(MASTER_BACKUP_DIR, ignore_logs=ignore_logs)}
-    html: list[str] = ["<html><head><meta charset='utf-8'><title>Master State Diff</title></head><body>", "<h1>Master State Diff</h1>"]
-    text: list[str] = []
-    changed: list[str] = []
+    changed, manifest = _drifted_pairs(active, backup)
     table_builder = difflib.HtmlDiff(wrapcolumn=120)
-    for rel in sorted(set(active) | set(backup)):
-        active_path = active.get(rel)
-        backup_path = backup.get(rel)
-        if active_path and backup_path and _sha256(active_path) == _sha256(backup_path):
-            continue
-        changed.append(rel)
-        text.append(f"=== {rel} ===")
-        if active_path is None:
-            text.append("REMOVED FROM ACTIVE PROJECT")
-            html.append(f"<h2>{rel}</h2><p>Removed from active project.</p>")
-            continue
-        if backup_path is None:
-            text.append("ADDED IN ACTIVE PROJECT")
-            html.append(f"<h2>{rel}</h2><p>Added in active project.</p>")
-            continue
-        if active_path.suffix.lower() in TEXT_SUFFIXES and backup_path.suffix.lower() in TEXT_SUFFIXES:
-            with open(backup_path, "r", encoding="utf-8", errors="replace") as handle:
-                backup_lines = handle.readlines()
-            with open(active_path, "r", encoding="utf-8", errors="replace") as handle:
-                active_lines = handle.readlines()
-            text.extend(difflib.unified_diff(backup_lines, active_lines, fromfile=f"master/{rel}", tofile=f"active/{rel}", lineterm=""))
-            html.append(f"<h2>{rel}</h2>")
-            html.append(table_builder.make_table(backup_lines, active_lines, f"master/{rel}", f"active/{rel}", context=True, numlines=3))
-        else:
-            text.append("BINARY CHANGE DETECTED")
-            html.append(f"<h2>{rel}</h2><p>Binary change detected.</p>")
-        text.append("")
-    if not changed:
-        text.append("NO DRIFT DETECTED AGAINST MASTER STATE")
-        html.append("<p>No drift detected against master state.</p>")
-    html.append("</body></html>")
-    DIFF_TEXT_PATH.write_text("\n".join(text), encoding="utf-8")
-    DIFF_HTML_PATH.write_text("\n".join(html), encoding="utf-8")
+    text_tmp, html_tmp = DIFF_TEXT_PATH.with_name(DIFF_TEXT_PATH.name + ".tmp"), DIFF_HTML_PATH.with_name(DIFF_HTML_PATH.name + ".tmp")
+    with open(text_tmp, "w", encoding="utf-8") as text, open(html_tmp, "w", encoding="utf-8") as html:
+        html.write("<html><head><meta charset='utf-8'><title>Master State Diff</title></head><body>\n<h1>Master State Diff</h1>\n")
+        for rel in changed:
+            active_path = active.get(rel)
+            backup_path = backup.get(rel)
+            text.write(f"=== {rel} ===\n")
+            if active_path is None:
+                text.write("REMOVED FROM ACTIVE PROJECT\n")
+                html.write(f"<h2>{rel}</h2><p>Removed from active project.</p>\n")
+                continue
+            if backup_path is None:
+                text.write("ADDED IN ACTIVE PROJECT\n")
+                html.write(f"<h2>{rel}</h2><p>Added in active project.</p>\n")
+                continue
+            if active_path.suffix.lower() in TEXT_SUFFIXES and backup_path.suffix.lower() in TEXT_SUFFIXES:
+                with open(backup_path, "r", encoding="utf-8", errors="replace") as handle:
+                    backup_lines = handle.readlines()
+                with open(active_path, "r", encoding="utf-8", errors="replace") as handle:
+                    active_lines = handle.readlines()
+                for line in difflib.unified_diff(backup_lines, active_lines, fromfile=f"master/{rel}", tofile=f"active/{rel}", lineterm=""):
+                    text.write(line + "\n")
+                html.write(f"<h2>{rel}</h2>\n")
+                html.write(table_builder.make_table(backup_lines, active_lines, f"master/{rel}", f"active/{rel}", context=True, numlines=3) + "\n")
+            else:
+                text.write("BINARY CHANGE DETECTED\n")
+                html.write(f"<h2>{rel}</h2><p>Binary change detected.</p>\n")
+            text.write("\n")
+        if not changed:
+            text.write("NO DRIFT DETECTED AGAINST MASTER STATE")
+            html.write("<p>No drift detected against master state.</p>\n")
+        html.write("</body></html>")
+    os.replace(text_tmp, DIFF_TEXT_PATH)
+    os.replace(html_tmp, DIFF_HTML_PATH)
+    try:
+        _atomic_write_json(DIFF_MANIFEST_PATH, {"version": 1, "files": manifest})
+    except Exception:
+        pass
     append_python_debug(f"MASTER DIFF GENERATED | changed_files={len(changed)} | text={DIFF_TEXT_PATH} | html={DIFF_HTML_PATH}")
     return {"changed_files": changed, "text_report": str(DIFF_TEXT_PATH), "html_report": str(DIFF_HTML_PATH)}
 
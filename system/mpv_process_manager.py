@@ -23,6 +23,7 @@ import logging
 import threading
 import subprocess
 import weakref
+from system.child_registry import register_child, unregister_child
 if sys.platform == 'win32':
     import win32file
     import win32pipe
@@ -197,6 +198,7 @@ class MpvProcessProxy:
             creationflags=creation,
         )
         self.handle = self.process.pid
+        register_child(self.process.pid, os.path.basename(mpv_exe))
         try:
             self._pipe = _connect_named_pipe(self.pipe_name)
         except Exception:
@@ -309,9 +311,13 @@ class MpvProcessProxy:
         harmless; only the most recent cached target will be flushed on seek
         completion.
         """
+        return self._write_payloads([payload])
+
+    def _write_payloads(self, payloads):
+        """Enqueue several JSON commands as one pipe write; mpv reads them line by line."""
         if self._core_shutdown or self._safe_shutdown_initiated or self._pipe is None:
             return False
-        data = (json.dumps(payload, separators=(',', ':')) + '\n').encode('utf-8')
+        data = ''.join(json.dumps(payload, separators=(',', ':')) + '\n' for payload in payloads).encode('utf-8')
         try:
             self._write_queue.put_nowait(data)
             return True
@@ -431,6 +437,9 @@ class MpvProcessProxy:
     def set_property(self, prop, value):
         return self._write_payload({'command': ['set_property', prop, value]})
 
+    def set_properties(self, props):
+        return self._write_payloads([{'command': ['set_property', prop, value]} for prop, value in props.items()])
+
     def get_property(self, prop, default=None, timeout=1.0):
         if self._core_shutdown or self._safe_shutdown_initiated or self._pipe is None:
             return default
@@ -610,6 +619,8 @@ class MpvProcessProxy:
                         proc.kill()
                     except Exception:
                         pass
+            if proc is not None and proc.poll() is not None:
+                unregister_child(proc.pid)
         except Exception:
             pass
         try:
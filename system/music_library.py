@@ -0,0 +1,178 @@
+﻿import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from system.diagnostic_runtime import PROJECT_ROOT
+from system.utils import MediaProber
+
+LIBRARY_DIR = os.path.join(str(PROJECT_ROOT), "config", "main_app")
+LIBRARY_INDEX_NAME = "music_library_index.json"
+LIBRARY_PROBE_WORKERS = 3
+LIBRARY_SCAN_LIMIT = 1000
+LIBRARY_PROBE_TIMEOUT = 5.0
+LIBRARY_EXTENSIONS = (".mp3",)
+_library = None
+_library_lock = threading.Lock()
+
+def _signature(st):
+    return [int(st.st_size), int(st.st_mtime_ns)]
+
+class MusicLibraryIndex:
+    """
+    Durations and tags of the music folder, probed once per file version in a small pool and persisted by path, size and mtime.
+    Rescans only probe files that are new or changed; entries for files gone from a scanned folder are dropped.
+    """
+
+    def __init__(self, bin_dir, directory=LIBRARY_DIR, workers=LIBRARY_PROBE_WORKERS):
+        self.bin_dir = bin_dir
+        self.index_path = os.path.join(directory, LIBRARY_INDEX_NAME)
+        self._lock = threading.Lock()
+        self._entries = self._load()
+        self._waiters = {}
+        self._dirty = False
+        self._pool = ThreadPoolExecutor(max_workers=max(1, int(workers)), thread_name_prefix="music-library")
+
+    def _load(self):
+        try:
+            with open(self.index_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            return {p: e for p, e in (data.get("entries") or {}).items() if isinstance(e, dict) and "sig" in e}
+        except Exception:
+            return {}
+
+    def flush(self):
+        with self._lock:
+            if not self._dirty:
+                return True
+            payload = {"version": 1, "saved_at": time.time(), "entries": dict(self._entries)}
+            self._dirty = False
+        tmp = f"{self.index_path}.{os.getpid()}.tmp"
+        try:
+            os.makedirs(os.path.dirname(self.index_path), exist_ok=True)
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(payload, f, separators=(",", ":"))
+            os.replace(tmp, self.index_path)
+            return True
+        except Exception:
+            try: os.remove(tmp)
+            except Exception: pass
+            with self._lock: self._dirty = True
+            return False
+
+    def _fresh(self, path, sig):
+        entry = self._entries.get(path)
+        return entry if entry and entry.get("sig") == sig else None
+
+    def scan(self, folder, limit=LIBRARY_SCAN_LIMIT):
+        """Lists the folder newest first as (name, path) and queues probes for tracks the index does not know in this version."""
+        found = []
+        try:
+            with os.scandir(folder) as it:
+                for de in it:
+                    if de.name.lower().endswith(LIBRARY_EXTENSIONS):
+                        try: st = de.stat()
+                        except OSError: continue
+                        found.append((st.st_mtime, de.name, de.path, _signature(st)))
+        except OSError:
+            return []
+        found.sort(key=lambda x: x[0], reverse=True)
+        found = found[:limit]
+        present = {p for _, _, p, _ in found}
+        root = os.path.abspath(folder)
+        with self._lock:
+            for path in [p for p in self._entries if p not in present and os.path.dirname(os.path.abspath(p)) == root]:
+                del self._entries[path]; self._dirty = True
+            stale = [(p, sig) for _, _, p, sig in found if not self._fresh(p, sig)]
+        for path, sig in stale:
+            self._submit(path, sig, None)
+        if not stale:
+            self.flush()
+        return [(n, p) for _, n, p, _ in found]
+
+    def prefetch(self, paths):
+        """Queues probes for any of the given tracks not yet indexed in their current version."""
+        for path in paths:
+            try: sig = _signature(os.stat(path))
+            except OSError: continue
+            with self._lock:
+                known = self._fresh(path, sig)
+            if not known:
+                self._submit(path, sig, None)
+
+    def lookup(self, path):
+        """Cached {'duration', 'tags'} for the current version of the file, or None."""
+        try: sig = _signature(os.stat(path))
+        except OSError: return None
+        with self._lock:
+            entry = self._fresh(path, sig)
+        return {"duration": entry["duration"], "tags": dict(entry.get("tags") or {})} if entry else None
+
+    def request(self, path, callback):
+        """Calls back with the duration: at once when indexed, otherwise from a pool thread once the shared probe finishes."""
+        entry = self.lookup(path)
+        if entry is not None:
+            callback(entry["duration"]); return
+        try: sig = _signature(os.stat(path))
+        except OSError:
+            callback(0.0); return
+        self._submit(path, sig, callback)
+
+    def duration(self, path, timeout=LIBRARY_PROBE_TIMEOUT):
+        """Lookup-or-probe for callers that need the number now; a miss is probed on the calling thread, never behind queued prefetches."""
+        entry = self.lookup(path)
+        if entry is not None:
+            return entry["duration"]
+        try: sig = _signature(os.stat(path))
+        except OSError: return 0.0
+        try:
+            duration, tags = MediaProber.probe_audio_info(self.bin_dir, path, timeout=timeout)
+        except Exception:
+            return 0.0
+        if duration > 0:
+            with self._lock:
+                self._entries[path] = {"sig": sig, "duration": float(duration), "tags": tags}
+                self._dirty = True
+        return duration
+
+    def _submit(self, path, sig, callback):
+        with self._lock:
+            waiters = self._waiters.get(path)
+            if waiters is not None:
+                if callback: waiters.append(callback)
+                return
+            self._waiters[path] = [callback] if callback else []
+        try:
+            self._pool.submit(self._probe, path, sig)
+        except RuntimeError:
+            self._probe(path, sig)
+
+    def _probe(self, path, sig):
+        duration, tags = 0.0, {}
+        try:
+            duration, tags = MediaProber.probe_audio_info(self.bin_dir, path, timeout=LIBRARY_PROBE_TIMEOUT)
+        except Exception:
+            pass
+        with self._lock:
+            if duration > 0:
+                self._entries[path] = {"sig": sig, "duration": float(duration), "tags": tags}
+                self._dirty = True
+            callbacks = self._waiters.pop(path, [])
+            idle = not self._waiters
+        for cb in callbacks:
+            try: cb(duration)
+            except Exception: pass
+        if idle:
+            self.flush()
+
+    def shutdown(self):
+        self._pool.shutdown(wait=False)
+        self.flush()
+
+def get_music_library(bin_dir):
+    """Process-wide index; the first caller's binaries folder is used for probing."""
+    global _library
+    with _library_lock:
+        if _library is None:
+            _library = MusicLibraryIndex(bin_dir)
+        return _library
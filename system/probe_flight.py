@@ -0,0 +1,157 @@
+﻿import hashlib
+import json
+import os
+import subprocess
+import tempfile
+import threading
+import time
+
+FLIGHT_DIR = os.path.join(tempfile.gettempdir(), "fvs_probe_flight")
+FLIGHT_RESULT_TTL_SEC = 2.0
+FLIGHT_STALE_LOCK_SEC = 30.0
+FLIGHT_PRUNE_AGE_SEC = 60.0
+FLIGHT_POLL_SEC = 0.02
+_MISSING = object()
+_flights = {}
+_flights_guard = threading.Lock()
+
+class _Flight:
+    __slots__ = ("done", "value", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.value = None
+        self.error = None
+
+def _input_path(args):
+    if "-i" in args:
+        i = args.index("-i")
+        if i + 1 < len(args):
+            return args[i + 1]
+    return args[-1] if args else ""
+
+def flight_key(cmd):
+    """One query of one file version: every argument except the executable, plus the input's size and mtime. None when the input is not a file."""
+    args = [str(a) for a in cmd[1:]]
+    try:
+        st = os.stat(_input_path(args))
+    except (OSError, ValueError):
+        return None
+    raw = json.dumps([args, st.st_size, st.st_mtime_ns], separators=(",", ":"))
+    return hashlib.sha1(raw.encode("utf-8", errors="ignore")).hexdigest()
+
+def _wait_budget(timeout):
+    return float(timeout or 30.0) + 5.0
+
+def _read_result(path, not_before):
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        if float(data.get("at") or 0.0) >= not_before:
+            return data.get("value")
+    except Exception:
+        pass
+    return _MISSING
+
+def _publish(path, value):
+    tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"at": time.time(), "value": value}, f, separators=(",", ":"))
+        os.replace(tmp, path)
+    except Exception:
+        try: os.remove(tmp)
+        except Exception: pass
+    try:
+        cutoff = time.time() - FLIGHT_PRUNE_AGE_SEC
+        for name in os.listdir(FLIGHT_DIR):
+            p = os.path.join(FLIGHT_DIR, name)
+            if name.endswith(".json") and os.path.getmtime(p) < cutoff:
+                os.remove(p)
+    except Exception:
+        pass
+
+def _try_lock(path):
+    """Returns an fd when we own the probe, None while another process does, -1 when the flight directory is unusable."""
+    try:
+        os.makedirs(FLIGHT_DIR, exist_ok=True)
+        return os.open(path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+    except FileExistsError:
+        try:
+            if time.time() - os.path.getmtime(path) > FLIGHT_STALE_LOCK_SEC:
+                os.remove(path)
+        except Exception:
+            pass
+        return None
+    except Exception:
+        return -1
+
+def _run_across_processes(key, compute, timeout):
+    lock_path = os.path.join(FLIGHT_DIR, key + ".lock")
+    result_path = os.path.join(FLIGHT_DIR, key + ".json")
+    started = time.time()
+    not_before = started - FLIGHT_RESULT_TTL_SEC
+    deadline = started + _wait_budget(timeout)
+    while True:
+        value = _read_result(result_path, not_before)
+        if value is not _MISSING:
+            return value
+        fd = _try_lock(lock_path)
+        if fd == -1 or (fd is None and time.time() >= deadline):
+            return compute()
+        if fd is not None:
+            break
+        time.sleep(FLIGHT_POLL_SEC)
+    try:
+        value = _read_result(result_path, not_before)
+        if value is not _MISSING:
+            return value
+        value = compute()
+        _publish(result_path, value)
+        return value
+    finally:
+        try: os.close(fd)
+        except Exception: pass
+        try: os.remove(lock_path)
+        except Exception: pass
+
+def shared(cmd, compute, timeout=None):
+    """
+    Single-flight for probe subprocesses: concurrent callers asking the same query of the same unchanged file share one run.
+    Threads wait on the in-process leader; other app processes wait on its lock file and read the published result.
+    compute() must return a JSON-serializable value. Its exceptions reach in-process waiters, other processes just run their own probe.
+    """
+    key = flight_key(cmd)
+    if key is None:
+        return compute()
+    with _flights_guard:
+        flight = _flights.get(key)
+        leader = flight is None
+        if leader:
+            flight = _flights[key] = _Flight()
+    if not leader:
+        if not flight.done.wait(_wait_budget(timeout)):
+            return compute()
+        if flight.error is not None:
+            raise flight.error
+        return flight.value
+    try:
+        flight.value = _run_across_processes(key, compute, timeout)
+        return flight.value
+    except BaseException as exc:
+        flight.error = exc
+        raise
+    finally:
+        flight.done.set()
+        with _flights_guard:
+            if _flights.get(key) is flight:
+                del _flights[key]
+
+def completed_fields(result):
+    return [int(getattr(result, "returncode", 0) or 0), getattr(result, "stdout", "") or "", getattr(result, "stderr", "") or ""]
+
+def run(cmd, runner=None, **kwargs):
+    """subprocess.run through the single-flight layer (text mode only); returns a CompletedProcess rebuilt from the shared outcome."""
+    runner = runner or subprocess.run
+    returncode, stdout, stderr = shared(cmd, lambda: completed_fields(runner(cmd, **kwargs)), kwargs.get("timeout"))
+    return subprocess.CompletedProcess(cmd, returncode, stdout, stderr)
@@ -1,6 +1,7 @@
 ﻿import os
 import sys
 import json
+import hashlib
 import psutil
 import tempfile
 import threading
@@ -24,9 +25,15 @@ class RecoveryManager:
         self.safe_mode_file = self.temp_dir / f"{self.app_id}_safe_mode.sentinel"
         self._safe_mode_threshold = 120 
         self._save_lock = threading.Lock()
-        self._save_counter_lock = threading.Lock()
+        self._writer_cond = threading.Condition()
+        self._writer_thread: Optional[threading.Thread] = None
+        self._writer_busy = False
+        self._writer_stop = False
+        self._pending_save: Optional[Tuple[Dict[str, Any], int, bool]] = None
         self._save_counter = 0
         self._latest_committed_save = 0
+        self._cleared_through = 0
+        self._last_state_digest: Optional[str] = None
         self._skip_cleanup = False
 
     def check_fault(self) -> bool:
@@ -117,26 +124,83 @@ class RecoveryManager:
         except Exception as e:
             self.logger.error(f"CRP: Cleanup error: {e}")
 
-    def save_state_async(self, state: Dict[str, Any]):
-        """Serializes session state on a background thread to prevent UI stutter."""
-        with self._save_counter_lock:
+    def save_state_async(self, state: Dict[str, Any], durable: bool = False):
+        """
+        Hands the snapshot to the single background writer.
+        Snapshots queued before the writer catches up are coalesced; only the newest is written.
+        """
+        with self._writer_cond:
             self._save_counter += 1
-            sequence = self._save_counter
-        self.logger.debug(f"CRP: Scheduling async save #{sequence}")
-        thread = threading.Thread(target=self.save_state, args=(state, sequence), daemon=True)
-        thread.start()
+            durable = durable or bool(self._pending_save and self._pending_save[2])
+            self._pending_save = (state, self._save_counter, durable)
+            if self._writer_thread is None or not self._writer_thread.is_alive():
+                self._writer_stop = False
+                self._writer_thread = threading.Thread(target=self._writer_loop, name=f"RecoveryWriter-{self.app_id}", daemon=True)
+                self._writer_thread.start()
+            self._writer_cond.notify_all()
+
+    def _writer_loop(self):
+        while True:
+            with self._writer_cond:
+                while self._pending_save is None and not self._writer_stop:
+                    self._writer_cond.wait()
+                if self._pending_save is None:
+                    return
+                state, sequence, durable = self._pending_save
+                self._pending_save = None
+                self._writer_busy = True
+            try:
+                self.save_state(state, sequence, durable=durable)
+            finally:
+                with self._writer_cond:
+                    self._writer_busy = False
+                    self._writer_cond.notify_all()
+
+    def flush(self, timeout: float = 2.0) -> bool:
+        """Blocks until every queued snapshot has been handled by the writer."""
+        deadline = time.monotonic() + max(0.0, float(timeout))
+        with self._writer_cond:
+            while self._pending_save is not None or self._writer_busy:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                self._writer_cond.wait(remaining)
+        return True
+
+    def stop_writer(self, timeout: float = 2.0):
+        self.flush(timeout)
+        with self._writer_cond:
+            self._writer_stop = True
+            self._writer_cond.notify_all()
+            thread = self._writer_thread
+        if thread is not None and thread is not threading.current_thread():
+            thread.join(timeout)
 
-    def save_state(self, state: Dict[str, Any], sequence: Optional[int] = None):
+    def save_state(self, state: Dict[str, Any], sequence: Optional[int] = None, durable: bool = True) -> bool:
         """
         Performs an atomic 'write-then-replace' state serialization.
-        Ensures the recovery file is never corrupted mid-crash.
+        Unchanged snapshots are skipped; fsync is reserved for durable saves.
         """
+        if sequence is None:
+            with self._writer_cond:
+                self._save_counter += 1
+                sequence = self._save_counter
+                if self._pending_save is not None and self._pending_save[1] < sequence:
+                    self._pending_save = None
+                    self._writer_cond.notify_all()
         try:
+            body = {k: v for k, v in state.items() if k != "_recovery_meta"}
+            digest = hashlib.blake2b(json.dumps(body, ensure_ascii=False, sort_keys=True, separators=(",", ":")).encode("utf-8"), digest_size=16).hexdigest()
             with self._save_lock:
-                if sequence is not None and sequence < self._latest_committed_save:
+                if sequence < self._latest_committed_save or sequence <= self._cleared_through:
                     self.logger.debug(f"CRP: Skipping stale save #{sequence} (Latest: {self._latest_committed_save})")
-                    return
-                state["_recovery_meta"] = {
+                    return False
+                state_exists = self.state_file.exists()
+                if digest == self._last_state_digest and state_exists:
+                    self._latest_committed_save = sequence
+                    self.logger.debug(f"CRP: State unchanged, skipping save #{sequence}")
+                    return False
+                body["_recovery_meta"] = {
                     "timestamp": time.time(),
                     "app_id": self.app_id,
                     "pid": os.getpid(),
@@ -145,19 +209,22 @@ class RecoveryManager:
                 fd, temp_path = tempfile.mkstemp(dir=str(self.temp_dir), prefix="rec_", suffix=".tmp")
                 try:
                     with os.fdopen(fd, 'w', encoding='utf-8') as f:
-                        json.dump(state, f, indent=4, ensure_ascii=False)
-                        f.flush()
-                        os.fsync(f.fileno())
+                        json.dump(body, f, ensure_ascii=False, separators=(",", ":"))
+                        if durable or not state_exists:
+                            f.flush()
+                            os.fsync(f.fileno())
                     os.replace(temp_path, str(self.state_file))
-                    if sequence is not None:
-                        self._latest_committed_save = sequence
-                    self.logger.info(f"CRP: State saved successfully to {self.state_file.absolute()} (Seq: {sequence})")
+                    self._latest_committed_save = sequence
+                    self._last_state_digest = digest
+                    self.logger.info(f"CRP: State saved successfully to {self.state_file.absolute()} (Seq: {sequence}, Durable: {durable or not state_exists})")
+                    return True
                 except Exception as e:
                     if os.path.exists(temp_path):
                         os.remove(temp_path)
                     raise e
         except Exception as e:
             self.logger.error(f"CRP: State save failed: {e}")
+            return False
 
     def load_state(self) -> Optional[Dict[str, Any]]:
         """Reads the recovery JSON if it exists."""
@@ -200,9 +267,14 @@ class RecoveryManager:
 
     def clear_state(self):
         """Manually wipes the recovery state (e.g., after user declines restore)."""
+        with self._writer_cond:
+            self._pending_save = None
+            self._cleared_through = self._save_counter
         try:
-            if self.state_file.exists():
-                self.state_file.unlink()
+            with self._save_lock:
+                self._last_state_digest = None
+                if self.state_file.exists():
+                    self.state_file.unlink()
         except Exception as e:
             self.logger.error(f"CRP: State clear failed: {e}")
 RECOVERY_JSON_SCHEMA_MAIN = {
@@ -0,0 +1,130 @@
+﻿import os
+import sys
+import json
+import time
+import threading
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
+HEAVY_MODULES = ("cv2", "numpy", "mpv", "psutil", "PyQt5.QtMultimedia", "processing.worker", "ui.widgets.music_wizard", "utilities.merger_music_wizard")
+HISTORY_KEEP = 50
+
+class _ImportRecorder:
+    """
+    Meta-path hook that only watches: every module import Python has to resolve is credited to the stages open on
+    the importing thread, so imports done by background boot tasks never land in a foreground stage.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._sinks = {}
+
+    def find_spec(self, fullname, path=None, target=None):
+        for sink in self._sinks.get(threading.get_ident(), ()):
+            sink.add(fullname)
+        return None
+
+    def open(self):
+        sink = set()
+        with self._lock:
+            ident = threading.get_ident()
+            self._sinks[ident] = self._sinks.get(ident, ()) + (sink,)
+            if self not in sys.meta_path:
+                sys.meta_path.insert(0, self)
+        return sink
+
+    def close(self, sink):
+        with self._lock:
+            ident = threading.get_ident()
+            rest = tuple(s for s in self._sinks.get(ident, ()) if s is not sink)
+            if rest: self._sinks[ident] = rest
+            else: self._sinks.pop(ident, None)
+            if not self._sinks and self in sys.meta_path:
+                sys.meta_path.remove(self)
+        return {m for m in sink if m in sys.modules}
+
+_IMPORTS = _ImportRecorder()
+
+class StartupProfile:
+    """Times boot stages, the modules each stage's own thread imports, and background start-up tasks."""
+
+    def __init__(self, name="main_app"):
+        self.name = str(name)
+        self.stages = []
+        self.marks = []
+        self._t0 = time.perf_counter()
+        self._lock = threading.Lock()
+        self._pool = None
+
+    def elapsed(self):
+        return round(time.perf_counter() - self._t0, 6)
+
+    @contextmanager
+    def stage(self, name, **attrs):
+        sink = _IMPORTS.open()
+        record = {"name": str(name), "thread": threading.current_thread().name, "start_sec": self.elapsed(), "status": "ok", **attrs}
+        t0 = time.perf_counter()
+        try:
+            yield record
+        except BaseException as e:
+            record["status"] = "error"; record["error"] = f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            record["wall_sec"] = round(time.perf_counter() - t0, 6)
+            new_modules = _IMPORTS.close(sink)
+            record["new_modules"] = len(new_modules)
+            heavy = sorted(m for m in new_modules if m in HEAVY_MODULES)
+            if heavy: record["heavy_modules"] = heavy
+            with self._lock:
+                self.stages.append(record)
+
+    def mark(self, name):
+        with self._lock:
+            self.marks.append({"name": str(name), "at_sec": self.elapsed()})
+
+    def submit(self, name, fn, *args, **kwargs):
+        if self._pool is None:
+            self._pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix="fvs_boot")
+
+        def task():
+            with self.stage(name, background=True):
+                return fn(*args, **kwargs)
+        return self._pool.submit(task)
+
+    def shutdown(self):
+        if self._pool is not None:
+            self._pool.shutdown(wait=False)
+            self._pool = None
+
+    def snapshot(self):
+        with self._lock:
+            stages = sorted(self.stages, key=lambda s: s["start_sec"])
+            marks = list(self.marks)
+        loaded_heavy = sorted(m for m in HEAVY_MODULES if m in sys.modules)
+        return {"app": self.name, "recorded_at": time.time(), "total_sec": self.elapsed(), "module_count": len(sys.modules), "loaded_heavy_modules": loaded_heavy, "stages": stages, "marks": marks}
+
+    def write(self, logs_dir, logger=None):
+        payload = self.snapshot()
+        try:
+            os.makedirs(logs_dir, exist_ok=True)
+            path = os.path.join(logs_dir, f"startup_profile_{self.name}.json")
+            tmp = f"{path}.tmp"
+            with open(tmp, "w", encoding="utf-8") as f: json.dump(payload, f, indent=2)
+            os.replace(tmp, path)
+            self._append_history(os.path.join(logs_dir, f"startup_history_{self.name}.jsonl"), payload)
+            if logger:
+                slowest = max((s for s in payload["stages"] if not s.get("background")), key=lambda s: s["wall_sec"], default=None)
+                logger.info(f"BOOT: Startup profile {payload['total_sec']:.3f}s (slowest: {slowest['name'] if slowest else '-'}) -> {path}")
+            return path
+        except Exception as e:
+            if logger: logger.warning(f"BOOT: Could not write startup profile: {e}")
+            return None
+
+    def _append_history(self, path, payload):
+        entry = {"recorded_at": payload["recorded_at"], "total_sec": payload["total_sec"], "stages": {s["name"]: s["wall_sec"] for s in payload["stages"]}}
+        lines = []
+        try:
+            with open(path, "r", encoding="utf-8") as f: lines = [l for l in f.read().splitlines() if l.strip()]
+        except Exception:
+            pass
+        lines = (lines + [json.dumps(entry, separators=(",", ":"))])[-HISTORY_KEEP:]
+        with open(path, "w", encoding="utf-8") as f: f.write("\n".join(lines) + "\n")
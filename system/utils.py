@@ -9,9 +9,10 @@ import shutil
 import time
 import threading
 import weakref
+import contextlib
 import json
 from PyQt5.QtCore import QTimer, QThread, QObject, pyqtSignal, QCoreApplication, Qt
-from system import diagnostic_runtime
+from system import diagnostic_runtime, probe_flight
 try:
     import sip
 except ImportError:
@@ -27,6 +28,7 @@ if sys.platform == 'win32':
             except: pass
         os.environ['PATH'] = _bin_dir + os.pathsep + os.environ.get('PATH','')
 _VALID_SEEK_PRECISIONS = ('unused', 'default-precise', 'keyframes', 'exact')
+SHARED_CACHE_DIRS = ("fvs_timeline_cache", "fvs_probe_flight")
 _qt_dispatcher_lock = threading.RLock()
 _qt_dispatcher = None
 
@@ -246,7 +248,14 @@ class DependencyDoctor:
 
 class ProcessManager:
     @staticmethod
-    def kill_orphans(process_names: list = ["ffmpeg.exe", "ffprobe.exe", "mpv.exe", "ffplay.exe"]):
+    def kill_orphans(process_names: list = ["ffmpeg.exe", "ffprobe.exe", "mpv.exe", "ffplay.exe"], full_scan: bool = False, include_own: bool = False):
+        from system.child_registry import ChildProcessRegistry
+        killed, registry_ok = ChildProcessRegistry.reap(process_names, include_self=include_own)
+        if full_scan or not registry_ok or os.environ.get("FVS_ORPHAN_FULL_SCAN") == "1":
+            ProcessManager.kill_orphans_full_scan(process_names)
+        return killed
+    @staticmethod
+    def kill_orphans_full_scan(process_names: list = ["ffmpeg.exe", "ffprobe.exe", "mpv.exe", "ffplay.exe"]):
         my_pid = os.getpid()
         base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
         bin_dir = os.path.join(base_dir, 'binaries')
@@ -276,7 +285,7 @@ class ProcessManager:
                     if p.status() == psutil.STATUS_ZOMBIE: break
                 except: break
                 time.sleep(2.0)
-            ProcessManager.kill_orphans()
+            ProcessManager.kill_orphans(include_own=True)
 
             from PyQt5.QtWidgets import QApplication
             if QApplication.instance(): QApplication.instance().quit()
@@ -288,7 +297,7 @@ class ProcessManager:
         t_d = tempfile.gettempdir(); pats = [prefix, "fvs_job_"]
         try:
             for n in os.listdir(t_d):
-                if any(n.startswith(p) for p in pats):
+                if any(n.startswith(p) for p in pats) and n not in SHARED_CACHE_DIRS:
                     p_h = os.path.join(t_d, n)
                     try:
                         if os.path.isfile(p_h): os.remove(p_h)
@@ -586,6 +595,21 @@ class MPVSafetyManager:
             except: time.sleep(0.02)
         return False
     @staticmethod
+    def safe_mpv_set_many(updates, lock=None):
+        """Applies [(player, {prop: value})] under one lock hold (the caller's player lock first, if given); process players get each batch as a single pipe write."""
+        results = []
+        with (lock if lock is not None else contextlib.nullcontext()), MPVSafetyManager._mpv_command_lock:
+            for player, props in updates:
+                if not player or getattr(player, '_core_shutdown', False) or getattr(player, '_safe_shutdown_initiated', False):
+                    results.append(False); continue
+                try:
+                    if callable(getattr(type(player), 'set_properties', None)):
+                        results.append(bool(player.set_properties(dict(props)))); continue
+                    for prop, value in props.items(): setattr(player, prop, value)
+                    results.append(True)
+                except: results.append(False)
+        return results
+    @staticmethod
     def safe_mpv_get(player, property_name, default=None, max_attempts=3, lock=None):
         if not player or getattr(player, '_core_shutdown', False) or getattr(player, '_safe_shutdown_initiated', False): return default
         MPVSafetyManager.reset_stale_seek_guard(player, f"get:{property_name}")
@@ -770,15 +794,25 @@ class MediaProber:
         try:
             ffp = os.path.join(bin_dir, 'ffprobe.exe') if sys.platform == 'win32' else 'ffprobe'
             cmd = [ffp, "-v", "error", "-show_entries", "format=duration", "-of", "csv=p=0", path]
-            r = subprocess.run(cmd, text=True, capture_output=True, creationflags=0x08000000 if sys.platform == 'win32' else 0)
+            r = probe_flight.run(cmd, subprocess.run, text=True, capture_output=True, creationflags=0x08000000 if sys.platform == 'win32' else 0)
             return max(0.0, float(r.stdout.strip() or 0.0))
         except: return 0.0
     @staticmethod
+    def probe_audio_info(bin_dir, path, timeout=None):
+        try:
+            ffp = os.path.join(bin_dir, 'ffprobe.exe') if sys.platform == 'win32' else 'ffprobe'
+            cmd = [ffp, "-v", "error", "-show_entries", "format=duration:format_tags=title,artist,album", "-of", "json", path]
+            r = probe_flight.run(cmd, subprocess.run, text=True, capture_output=True, timeout=timeout, creationflags=0x08000000 if sys.platform == 'win32' else 0)
+            fmt = json.loads(r.stdout or "{}").get('format', {})
+            tags = {str(k).lower(): str(v) for k, v in (fmt.get('tags') or {}).items()}
+            return max(0.0, float(fmt.get('duration', 0.0) or 0.0)), {k: tags[k] for k in ("title", "artist", "album") if tags.get(k)}
+        except: return 0.0, {}
+    @staticmethod
     def probe_metadata(bin_dir, path):
         try:
             ffp = os.path.join(bin_dir, 'ffprobe.exe') if sys.platform == 'win32' else 'ffprobe'
             cmd = [ffp, "-v", "error", "-show_entries", "format=duration:stream=duration,width,height", "-of", "json", path]
-            r = subprocess.run(cmd, text=True, capture_output=True, creationflags=0x08000000 if sys.platform == 'win32' else 0)
+            r = probe_flight.run(cmd, subprocess.run, text=True, capture_output=True, creationflags=0x08000000 if sys.platform == 'win32' else 0)
             data = json.loads(r.stdout)
             streams = data.get('streams', [])
             dur = 0.0
@@ -797,7 +831,7 @@ class MediaProber:
         try:
             ffp = os.path.join(bin_dir, 'ffmpeg.exe') if sys.platform == 'win32' else 'ffmpeg'
             cmd = [ffp, "-i", path, "-af", "volumedetect", "-f", "null", "-"]
-            r = subprocess.run(cmd, text=True, capture_output=True, creationflags=0x08000000 if sys.platform == 'win32' else 0)
+            r = probe_flight.run(cmd, subprocess.run, text=True, capture_output=True, creationflags=0x08000000 if sys.platform == 'win32' else 0)
             mean_volume = 0.0
             max_volume = 0.0
             for line in r.stderr.splitlines():
@@ -18,6 +18,8 @@ from ui.parts.main_window_ui_helpers_b import MainWindowUiHelpersBMixin
 from ui.parts.music_mixin import MusicMixin
 from ui.parts.trim_mixin import TrimMixin
 from ui.parts.ffmpeg_mixin import FfmpegMixin
+from ui.parts.export_queue_mixin import ExportQueueMixin
+from ui.parts.proxy_preview_mixin import ProxyPreviewMixin
 from ui.parts.keyboard_mixin import KeyboardMixin
 from ui.parts.phase_overlay_mixin import PhaseOverlayMixin
 from ui.styles import UIStyles
@@ -45,6 +47,17 @@ def _recovery_float(value, default=0.0):
     except Exception:
         return float(default)
 
+def _recovery_geometry_b64(window):
+    cached = getattr(window, "_recovery_geometry_cache", None)
+    if cached is None or getattr(window, "_recovery_geometry_dirty", True):
+        try:
+            cached = bytes(window.saveGeometry().toBase64()).decode("utf-8")
+        except Exception:
+            cached = cached or ""
+        window._recovery_geometry_cache = cached
+        window._recovery_geometry_dirty = False
+    return cached
+
 def _normalize_recovery_music_track(track):
     if isinstance(track, dict):
         path = track.get("path") or track.get("file") or track.get("music_path")
@@ -113,10 +126,11 @@ class FortniteVideoSoftware(QMainWindow, PlayerMixin, UiBuilderMixin, VolumeMixi
                             MainWindowCoreAMixin, MainWindowCoreBMixin, MainWindowCoreCMixin,
                             MainWindowEventsMixin, MainWindowFileAMixin, MainWindowFileBMixin,
                             MainWindowToolsMixin, MainWindowUiHelpersAMixin, MainWindowUiHelpersBMixin,
-                            MusicMixin, TrimMixin, FfmpegMixin, KeyboardMixin, PhaseOverlayMixin):
+                            MusicMixin, TrimMixin, FfmpegMixin, ExportQueueMixin, ProxyPreviewMixin, KeyboardMixin, PhaseOverlayMixin):
     progress_update_signal = pyqtSignal(float)
     status_update_signal = pyqtSignal(str)
     process_finished_signal = pyqtSignal(bool, str)
+    proxy_preview_finished_signal = pyqtSignal(object, bool, str)
     video_ended_signal = pyqtSignal()
     thumbnail_extracted_signal = pyqtSignal(object)
     duration_changed_signal = pyqtSignal(int)
@@ -157,7 +171,7 @@ class FortniteVideoSoftware(QMainWindow, PlayerMixin, UiBuilderMixin, VolumeMixi
         self.central_widget = QWidget(); self.setCentralWidget(self.central_widget)
         self._init_core_logic(file_path, hardware_strategy)
         self._setup_recovery_manager()
-        self.set_style(); self.init_ui(); self._setup_mpv(); self._set_video_controls_enabled(False)
+        self.set_style(); self.init_ui(); self._init_export_queue(); self._setup_mpv(); self._set_video_controls_enabled(False)
         self.setAcceptDrops(True); self.status_bar = self.statusBar(); self.status_bar.hide(); self.restore_geometry()
 
         def redirect_show_message(message, timeout=5000):
@@ -180,6 +194,7 @@ class FortniteVideoSoftware(QMainWindow, PlayerMixin, UiBuilderMixin, VolumeMixi
         _safe_single_shot(100, self._update_overlay_positions)
         _safe_single_shot(500, self._update_overlay_positions)
         _safe_single_shot(1500, self._update_overlay_positions)
+        _safe_single_shot(3000, self._prewarm_file_preview)
 
     def _post_show_bootstrap(self):
         try:
@@ -202,6 +217,15 @@ class FortniteVideoSoftware(QMainWindow, PlayerMixin, UiBuilderMixin, VolumeMixi
         except Exception:
             pass
 
+    def _prewarm_file_preview(self):
+        if not getattr(self, "_mpv_ready", False):
+            return
+        try:
+            from ui.widgets.custom_file_dialog import prewarm_preview_player
+            prewarm_preview_player()
+        except Exception as e:
+            self.logger.debug("FILE: preview prewarm skipped: %s", e)
+
     def log_overlay_sink(self, msg: str):
         if hasattr(self, "_append_live_log"):
             self._append_live_log(msg)
@@ -233,6 +257,15 @@ class FortniteVideoSoftware(QMainWindow, PlayerMixin, UiBuilderMixin, VolumeMixi
     def _immediate_recovery_save(self):
         self._save_recovery_state(sync=True)
 
+    def _shutdown_recovery_writer(self):
+        """Writes the final snapshot on the calling thread, then stops the writer so nothing lands after exit cleanup."""
+        if not hasattr(self, "recovery_manager"): return
+        for timer_name in ("recovery_timer", "recovery_debounce_timer"):
+            timer = getattr(self, timer_name, None)
+            if timer is not None: timer.stop()
+        self._save_recovery_state(sync=True, blocking=True)
+        self.recovery_manager.stop_writer()
+
     def _connect_recovery_signals(self):
         try:
             immediate_widgets = [
@@ -266,7 +299,7 @@ class FortniteVideoSoftware(QMainWindow, PlayerMixin, UiBuilderMixin, VolumeMixi
         except Exception as e:
             self.logger.debug(f"RECOVERY: Signal binding error: {e}")
 
-    def _save_recovery_state(self, sync=False):
+    def _save_recovery_state(self, sync=False, blocking=False):
         if not hasattr(self, "recovery_manager"): return
         if getattr(self, "_restoring_recovery_state", False): return
         input_path = getattr(self, "source_file_path", None) or self.input_file_path
@@ -322,14 +355,16 @@ class FortniteVideoSoftware(QMainWindow, PlayerMixin, UiBuilderMixin, VolumeMixi
                 "portrait_text": self.portrait_text_input.text() if hasattr(self, "portrait_text_input") else "",
                 "music_button_active": has_music,
                 "active_tab_index": 0,
-                "window_geometry_base64": bytes(self.saveGeometry().toBase64()).decode("utf-8"),
+                "window_geometry_base64": _recovery_geometry_b64(self),
                 "last_directory": self.last_dir,
                 "slider_value_ms": self.positionSlider.value() if hasattr(self, "positionSlider") else 0
             }
         }
-        self.logger.info(f"RECOVERY: Saving state (Sync={sync}). File: {input_path}")
-        if sync:
+        if hasattr(self, "logger"): self.logger.info(f"RECOVERY: Saving state (Sync={sync}). File: {input_path}")
+        if blocking:
             self.recovery_manager.save_state(state)
+        elif sync:
+            self.recovery_manager.save_state_async(state, durable=True)
         else:
             self.recovery_manager.save_state_async(state)
 
@@ -544,7 +579,12 @@ class FortniteVideoSoftware(QMainWindow, PlayerMixin, UiBuilderMixin, VolumeMixi
         files = [u.toLocalFile() for u in event.mimeData().urls()]
         if files: self.handle_file_selection(files[0])
 
+    def moveEvent(self, event):
+        self._recovery_geometry_dirty = True
+        MainWindowEventsMixin.moveEvent(self, event)
+
     def resizeEvent(self, event):
+        self._recovery_geometry_dirty = True
         self._update_overlay_positions()
         if hasattr(self, "_update_upload_hint_responsive"): self._update_upload_hint_responsive()
         MainWindowEventsMixin.resizeEvent(self, event)
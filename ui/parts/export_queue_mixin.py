@@ -0,0 +1,120 @@
+﻿import os
+from PyQt5.QtCore import Qt
+from PyQt5.QtWidgets import QPushButton, QMenu
+from processing.export_queue import ExportQueue, JOB_QUEUED, JOB_RUNNING
+from ui.parts.ffmpeg_mixin import ProcessRequestError
+
+class ExportQueueMixin:
+    def _init_export_queue(self):
+        from system.recovery_manager import RecoveryManager
+        try:
+            store = RecoveryManager("main_app_export_queue", self.logger)
+            self.export_queue = ExportQueue(
+                self.base_dir, logger=self.logger, store=store, foreground_busy=lambda: bool(getattr(self, "is_processing", False)),
+            )
+            self.export_queue.queue_changed.connect(self._update_queue_button_text)
+            self.export_queue.job_finished.connect(self._on_export_queue_job_finished)
+            self.export_queue.queue_blocked.connect(self._on_export_queue_blocked)
+            self.export_queue.queue_drained.connect(self._on_export_queue_drained)
+            restored = self.export_queue.restore()
+            if restored:
+                self._queue_status_message(f"{restored} queued export(s) restored from the previous session.")
+                if self.export_queue.resume_requested:
+                    self.export_queue.start()
+        except Exception as e:
+            self.export_queue = None
+            self.logger.error(f"EXPORT_QUEUE: init failed: {e}")
+        self._update_queue_button_text()
+
+    def _build_queue_button(self):
+        self.queue_button = QPushButton('QUEUE')
+        self.queue_button.setProperty('class', 'primary')
+        self.queue_button.setFixedSize(90, 65)
+        self.queue_button.setCursor(Qt.PointingHandCursor)
+        self.queue_button.setToolTip("Queue the current clip settings for batch export")
+        self.queue_button.clicked.connect(self._show_export_queue_menu)
+        self.queue_button.setEnabled(False)
+        return self.queue_button
+
+    def _queue_status_message(self, message: str, timeout: int = 6000):
+        try:
+            if hasattr(self, "_set_right_status_message"):
+                self._set_right_status_message(message, timeout)
+            else:
+                self.status_update_signal.emit(message)
+        except Exception:
+            pass
+
+    def enqueue_current_export(self):
+        queue = getattr(self, "export_queue", None)
+        if queue is None:
+            return None
+        try:
+            request = self._build_process_request()
+        except ProcessRequestError as e:
+            self.show_message(e.title, str(e))
+            return None
+        except Exception as e:
+            self.logger.exception(f"EXPORT_QUEUE: could not build request: {e}")
+            self.show_message("Error", f"Could not add to queue:\n{e}")
+            return None
+        source = getattr(self, "source_file_path", None)
+        if source and os.path.isfile(source):
+            request["input_path"] = source
+        label = os.path.basename(str(getattr(self, "_loaded_display_path", None) or request["input_path"]))
+        job_id = queue.add_job(request, label=label)
+        self._queue_status_message(f"Queued '{label}' ({len(queue.pending_jobs())} waiting).")
+        if not queue.is_running:
+            queue.start()
+        return job_id
+
+    def _show_export_queue_menu(self):
+        queue = getattr(self, "export_queue", None)
+        if queue is None:
+            return
+        menu = QMenu(self)
+        menu.addAction("Add current clip to queue", self.enqueue_current_export)
+        menu.addSeparator()
+        toggle = menu.addAction("Run jobs concurrently")
+        toggle.setCheckable(True)
+        toggle.setChecked(queue.concurrent)
+        toggle.toggled.connect(lambda checked: setattr(queue, "concurrent", bool(checked)))
+        if queue.is_running:
+            menu.addAction("Pause queue", queue.pause)
+        elif queue.pending_jobs():
+            menu.addAction("Resume queue", queue.start)
+        menu.addAction("Clear finished jobs", queue.clear_finished)
+        pending = queue.pending_jobs()
+        if pending:
+            menu.addSeparator()
+            for job in pending[:15]:
+                menu.addAction(f"Remove: {job['label']}", lambda jid=job["job_id"]: queue.remove_job(jid))
+        menu.exec_(self.queue_button.mapToGlobal(self.queue_button.rect().bottomLeft()))
+
+    def _update_queue_button_text(self):
+        btn = getattr(self, "queue_button", None)
+        queue = getattr(self, "export_queue", None)
+        if btn is None:
+            return
+        active = [j for j in (queue.jobs if queue else []) if j["state"] in (JOB_QUEUED, JOB_RUNNING)]
+        btn.setText(f"QUEUE ({len(active)})" if active else "QUEUE")
+
+    def _on_export_queue_job_finished(self, job_id, success, message):
+        queue = getattr(self, "export_queue", None)
+        job = queue.get_job(job_id) if queue else None
+        label = job["label"] if job else job_id
+        if success:
+            self._queue_status_message(f"Queue: '{label}' exported to {os.path.basename(str(message))}.")
+        else:
+            self._queue_status_message(f"Queue: '{label}' failed: {message}", 10000)
+
+    def _on_export_queue_blocked(self, message):
+        self._queue_status_message(message, 10000)
+
+    def _on_export_queue_drained(self):
+        self._queue_status_message("Export queue finished.")
+
+    def _shutdown_export_queue(self):
+        queue = getattr(self, "export_queue", None)
+        if queue is not None:
+            queue.shutdown(wait_ms=1000)
@@ -14,6 +14,13 @@ from processing.system_utils import kill_process_tree
 from ui.styles import UIStyles
 from system.utils import UIManager, MediaProber
 
+class ProcessRequestError(ValueError):
+    """The current editor state cannot be turned into a render request; carries the dialog title for the caller to show."""
+
+    def __init__(self, title, message):
+        super().__init__(message)
+        self.title = title
+
 class FfmpegMixin:
     def _log_ffmpeg_ui_exc(self, context: str, err: Exception):
         log = getattr(self, "logger", None)
@@ -106,108 +113,130 @@ class FfmpegMixin:
         self.on_process_finished(False, "Processing was canceled by the user.")
         self._save_app_state_and_config()
 
+    def _build_process_request(self):
+        """Reads the editor state into ProcessThread kwargs without touching it; raises ProcessRequestError when it is not exportable."""
+        if not self.input_file_path or not os.path.exists(self.input_file_path):
+            raise ProcessRequestError("Error", "Please select a valid video file first.")
+
+        from processing.system_utils import check_disk_space
+        out_dir = os.path.join(os.path.expanduser("~"), "Downloads")
+        os.makedirs(out_dir, exist_ok=True)
+        if not check_disk_space(out_dir, 2.0):
+            raise ProcessRequestError("Disk Space Low", "You have less than 2GB free on the output drive. Please free up space before processing.")
+        if self.trim_start_ms > 0 or self.trim_end_ms > 0:
+            start_time_ms = self.trim_start_ms; end_time_ms = self.trim_end_ms
+        else:
+            start_time_ms = (self.start_minute_input.value() * 60 * 1000) + (self.start_second_input.value() * 1000) + self.start_ms_input.value()
+            end_time_ms = (self.end_minute_input.value() * 60 * 1000) + (self.end_second_input.value() * 1000) + self.end_ms_input.value()
+        total_duration_ms = self.original_duration_ms
+        if total_duration_ms <= 0: total_duration_ms = 99999 * 1000
+        start_time_ms = max(0, min(start_time_ms, total_duration_ms))
+        end_time_ms = max(0, min(end_time_ms, total_duration_ms))
+        MIN_DURATION_MS = 500
+        if end_time_ms < start_time_ms + MIN_DURATION_MS:
+            end_time_ms = min(total_duration_ms, start_time_ms + MIN_DURATION_MS)
+            if end_time_ms < start_time_ms + MIN_DURATION_MS: start_time_ms = max(0, end_time_ms - MIN_DURATION_MS)
+        is_mobile_format = self.mobile_checkbox.isChecked()
+        speed_factor = float(self.speed_spinbox.value())
+        if speed_factor < 0.1 or speed_factor > 4.0:
+            raise ProcessRequestError("Invalid Speed", "Allowed speed range is 0.1x to 4.0x.")
+        stored_speed_segments = list(getattr(self, "speed_segments", []) or [])
+        raw_segments = stored_speed_segments
+        segments = []; speed_segments_for_worker = []
+        for seg in raw_segments:
+            try:
+                s_ms = int(seg.get("start_ms", seg.get("start", 0))); e_ms = int(seg.get("end_ms", seg.get("end", 0))); spd = float(seg.get("speed", speed_factor))
+                if e_ms <= s_ms: continue
+                segments.append({"start": s_ms, "end": e_ms, "speed": spd}); speed_segments_for_worker.append({"start_ms": s_ms, "end_ms": e_ms, "speed": spd})
+            except: continue
+        segments.sort(key=lambda item: (item["start"], item["end"]))
+        speed_segments_for_worker.sort(key=lambda item: (item["start_ms"], item["end_ms"]))
+        try:
+            self.logger.info(
+                "GRANULAR_EXPORT_STATE: stored=%d worker=%d base_speed=%.3f trim=%d-%d segments=%s",
+                len(stored_speed_segments), len(speed_segments_for_worker), speed_factor,
+                start_time_ms, end_time_ms, speed_segments_for_worker,
+            )
+        except Exception:
+            pass
+        music_path = None; music_offset_s = 0.0; music_tracks_for_worker = []
+        linear_video_vol = self._get_master_eff() / 100.0
+        if hasattr(self, "_video_volume_pct"):
+            linear_video_vol = float(getattr(self, "_video_volume_pct", 80)) / 100.0
+        for track in list(getattr(self, "_wizard_tracks", []) or []):
+            try:
+                if isinstance(track, dict):
+                    t_path = track.get("path")
+                    t_offset = float(track.get("offset_sec", track.get("offset", track.get("file_offset_sec", 0.0))) or 0.0)
+                    t_dur = float(track.get("duration_sec", track.get("duration", track.get("dur", 0.0))) or 0.0)
+                else:
+                    t_path = track[0]
+                    t_offset = float(track[1]) if len(track) > 1 else 0.0
+                    t_dur = float(track[2]) if len(track) > 2 else 0.0
+                if not t_path or not os.path.exists(str(t_path)):
+                    continue
+                if t_dur <= 0.001:
+                    t_dur = max(0.001, (end_time_ms - start_time_ms) / 1000.0)
+                music_tracks_for_worker.append((str(t_path), max(0.0, t_offset), max(0.001, t_dur)))
+            except Exception:
+                continue
+        if getattr(self, "_wizard_tracks", None) and not music_tracks_for_worker:
+            raise ProcessRequestError(
+                "Music unavailable",
+                "Music is selected, but none of the selected music files are available. Please reselect the music before processing.",
+            )
+        if music_tracks_for_worker:
+            music_path = music_tracks_for_worker[0][0]; music_offset_s = music_tracks_for_worker[0][1]
+        music_vol_linear = self._music_eff() / 100.0 if music_path else 0.0
+        if music_path and hasattr(self, "_music_volume_pct"):
+            music_vol_linear = float(getattr(self, "_music_volume_pct", 80)) / 100.0
+        q_level = int(self.quality_slider.value())
+        target_mb = None if q_level >= 20 else float(5 + q_level * 5)
+        if self.logger:
+            self.logger.info(f"QUALITY_EXPORT_STATE: slider={q_level} target_mb={target_mb if target_mb is not None else 'CQ'}")
+        m_start_ms = int(getattr(self, 'music_timeline_start_ms', start_time_ms)); m_end_ms = int(getattr(self, 'music_timeline_end_ms', end_time_ms))
+        if music_path and m_end_ms <= m_start_ms:
+            m_start_ms = start_time_ms
+            m_end_ms = end_time_ms
+        v_wall_start = self._calculate_wall_clock_time(start_time_ms, segments, speed_factor)
+        m_wall_start = self._calculate_wall_clock_time(m_start_ms, segments, speed_factor)
+        m_wall_end = self._calculate_wall_clock_time(m_end_ms, segments, speed_factor)
+        m_proj_start_sec = max(0.0, (m_wall_start - v_wall_start) / 1000.0)
+        m_proj_end_sec = max(0.0, (m_wall_end - v_wall_start) / 1000.0)
+        music_conf = {'path': music_path, 'ducking_threshold': 0.15, 'ducking_ratio': 2.5, 'eq_enabled': True, 'main_vol': linear_video_vol, 'music_vol': music_vol_linear if music_path else 1.0, 'timeline_start_sec': m_proj_start_sec, 'timeline_end_sec': m_proj_end_sec, 'file_offset_sec': music_offset_s}
+        try:
+            self.logger.info(
+                "MUSIC_EXPORT_STATE: enabled=%s tracks=%d path=%s offset=%.3fs music_vol=%.2f video_vol=%.2f timeline_ms=%d-%d project_sec=%.3f-%.3f",
+                bool(music_path), len(music_tracks_for_worker), music_path, music_offset_s,
+                music_vol_linear, linear_video_vol, m_start_ms, m_end_ms, m_proj_start_sec, m_proj_end_sec,
+            )
+        except Exception:
+            pass
+        p_text = None
+        if is_mobile_format and hasattr(self, 'portrait_text_input'):
+            raw_text = self.portrait_text_input.text().strip()
+            if raw_text: p_text = raw_text
+        intro_abs_time = getattr(self, 'selected_intro_abs_time', 0.0)
+        if not intro_abs_time or intro_abs_time <= 0:
+            segment_duration = (end_time_ms - start_time_ms) / 1000.0
+            intro_abs_time = (start_time_ms / 1000.0) + (segment_duration * 0.66)
+        intro_abs_time_ms = int(intro_abs_time * 1000)
+        v_norm_db = getattr(self, "volume_normalize_db", 0.0)
+        return dict(input_path=self.input_file_path, start_time_ms=start_time_ms, end_time_ms=end_time_ms, original_resolution=self.original_resolution, is_mobile_format=is_mobile_format, speed_factor=speed_factor, is_boss_hp=self.boss_hp_checkbox.isChecked(), show_teammates_overlay=(is_mobile_format and self.teammates_checkbox.isChecked()), show_spectating_overlay=is_mobile_format, quality_level=q_level, bg_music_path=music_path, bg_music_volume=music_vol_linear, bg_music_offset_ms=int(music_offset_s * 1000), original_total_duration_ms=self.original_duration_ms, disable_fades=self.no_fade_checkbox.isChecked(), intro_still_sec=0.1, intro_from_midpoint=(intro_abs_time_ms <= 0), intro_abs_time_ms=intro_abs_time_ms if intro_abs_time_ms > 0 else None, portrait_text=p_text, music_config=music_conf, speed_segments=speed_segments_for_worker, hardware_strategy=getattr(self, 'hardware_strategy', 'CPU'), music_tracks=music_tracks_for_worker, target_mb_override=target_mb, volume_normalize_db=v_norm_db)
+
     def start_processing(self):
         try:
             if self.is_processing:
                 self.show_message("Info", "A video is already being processed. Please wait.")
                 return
-            if not self.input_file_path or not os.path.exists(self.input_file_path):
-                self.show_message("Error", "Please select a valid video file first.")
-                return
-
-            from processing.system_utils import check_disk_space
-            out_dir = os.path.join(os.path.expanduser("~"), "Downloads")
-            os.makedirs(out_dir, exist_ok=True)
-            if not check_disk_space(out_dir, 2.0):
-                self.show_message("Disk Space Low", "You have less than 2GB free on the output drive. Please free up space before processing.")
-                return
-            if self.trim_start_ms > 0 or self.trim_end_ms > 0:
-                start_time_ms = self.trim_start_ms; end_time_ms = self.trim_end_ms
-            else:
-                start_time_ms = (self.start_minute_input.value() * 60 * 1000) + (self.start_second_input.value() * 1000) + self.start_ms_input.value()
-                end_time_ms = (self.end_minute_input.value() * 60 * 1000) + (self.end_second_input.value() * 1000) + self.end_ms_input.value()
-            total_duration_ms = self.original_duration_ms
-            if total_duration_ms <= 0: total_duration_ms = 99999 * 1000
-            start_time_ms = max(0, min(start_time_ms, total_duration_ms))
-            end_time_ms = max(0, min(end_time_ms, total_duration_ms))
-            MIN_DURATION_MS = 500
-            if end_time_ms < start_time_ms + MIN_DURATION_MS:
-                end_time_ms = min(total_duration_ms, start_time_ms + MIN_DURATION_MS)
-                if end_time_ms < start_time_ms + MIN_DURATION_MS: start_time_ms = max(0, end_time_ms - MIN_DURATION_MS)
-            self.trim_start_ms = start_time_ms; self.trim_end_ms = end_time_ms
-            is_mobile_format = self.mobile_checkbox.isChecked()
-            speed_factor = float(self.speed_spinbox.value())
-            if speed_factor < 0.1 or speed_factor > 4.0:
-                self.show_message("Invalid Speed", "Allowed speed range is 0.1x to 4.0x."); self.is_processing = False
-                self.process_button.setEnabled(True); return
-            stored_speed_segments = list(getattr(self, "speed_segments", []) or [])
-            checkbox = getattr(self, "granular_checkbox", None)
-            is_checked = getattr(checkbox, "isChecked", None)
-            checkbox_enabled = bool(is_checked()) if callable(is_checked) else bool(stored_speed_segments)
-            if stored_speed_segments and not checkbox_enabled:
-                try:
-                    self.logger.warning("GRANULAR: hidden checkbox was off while segments exist; exporting stored segments anyway.")
-                except Exception:
-                    pass
-                try:
-                    checkbox.setChecked(True)
-                except Exception:
-                    pass
-            raw_segments = stored_speed_segments
-            segments = []; speed_segments_for_worker = []
-            for seg in raw_segments:
-                try:
-                    s_ms = int(seg.get("start_ms", seg.get("start", 0))); e_ms = int(seg.get("end_ms", seg.get("end", 0))); spd = float(seg.get("speed", speed_factor))
-                    if e_ms <= s_ms: continue
-                    segments.append({"start": s_ms, "end": e_ms, "speed": spd}); speed_segments_for_worker.append({"start_ms": s_ms, "end_ms": e_ms, "speed": spd})
-                except: continue
-            segments.sort(key=lambda item: (item["start"], item["end"]))
-            speed_segments_for_worker.sort(key=lambda item: (item["start_ms"], item["end_ms"]))
             try:
-                self.logger.info(
-                    "GRANULAR_EXPORT_STATE: stored=%d worker=%d base_speed=%.3f trim=%d-%d segments=%s",
-                    len(stored_speed_segments), len(speed_segments_for_worker), speed_factor,
-                    start_time_ms, end_time_ms, speed_segments_for_worker,
-                )
-            except Exception:
-                pass
-            self.positionSlider.set_trim_times(self.trim_start_ms, self.trim_end_ms)
-            music_path = None; music_offset_s = 0.0; music_tracks_for_worker = []
-            linear_video_vol = self._get_master_eff() / 100.0
-            if hasattr(self, "_video_volume_pct"):
-                linear_video_vol = float(getattr(self, "_video_volume_pct", 80)) / 100.0
-            for track in list(getattr(self, "_wizard_tracks", []) or []):
-                try:
-                    if isinstance(track, dict):
-                        t_path = track.get("path")
-                        t_offset = float(track.get("offset_sec", track.get("offset", track.get("file_offset_sec", 0.0))) or 0.0)
-                        t_dur = float(track.get("duration_sec", track.get("duration", track.get("dur", 0.0))) or 0.0)
-                    else:
-                        t_path = track[0]
-                        t_offset = float(track[1]) if len(track) > 1 else 0.0
-                        t_dur = float(track[2]) if len(track) > 2 else 0.0
-                    if not t_path or not os.path.exists(str(t_path)):
-                        continue
-                    if t_dur <= 0.001:
-                        t_dur = max(0.001, (end_time_ms - start_time_ms) / 1000.0)
-                    music_tracks_for_worker.append((str(t_path), max(0.0, t_offset), max(0.001, t_dur)))
-                except Exception:
-                    continue
-            if getattr(self, "_wizard_tracks", None) and not music_tracks_for_worker:
-                self.show_message(
-                    "Music unavailable",
-                    "Music is selected, but none of the selected music files are available. Please reselect the music before processing.",
-                )
+                request = self._build_process_request()
+            except ProcessRequestError as e:
+                self.show_message(e.title, str(e))
                 return
-            if music_tracks_for_worker:
-                music_path = music_tracks_for_worker[0][0]; music_offset_s = music_tracks_for_worker[0][1]
-            music_vol_linear = self._music_eff() / 100.0 if music_path else 0.0
-            if music_path and hasattr(self, "_music_volume_pct"):
-                music_vol_linear = float(getattr(self, "_music_volume_pct", 80)) / 100.0
-            q_level = int(self.quality_slider.value())
-            target_mb = None if q_level >= 20 else float(5 + q_level * 5)
-            if self.logger:
-                self.logger.info(f"QUALITY_EXPORT_STATE: slider={q_level} target_mb={target_mb if target_mb is not None else 'CQ'}")
+            self.trim_start_ms = request['start_time_ms']; self.trim_end_ms = request['end_time_ms']
+            self.positionSlider.set_trim_times(self.trim_start_ms, self.trim_end_ms)
+            self._sync_granular_checkbox(request)
             if hasattr(self, 'portrait_mask_overlay'): self.portrait_mask_overlay.hide()
             if hasattr(self, 'set_overlays_force_hidden'): self.set_overlays_force_hidden(True)
             self.is_processing = True; self._proc_start_ts = time.time(); self._pulse_phase = 0
@@ -222,37 +251,9 @@ class FfmpegMixin:
                 self._log_ffmpeg_ui_exc("set processing icon", icon_err)
             self._safe_set_phase("Processing"); self._show_processing_overlay(); self._safe_status("Preparing... (probing/seek)...", "white")
             self.progress_update_signal.emit(0)
-            cfg = dict(self.config_manager.config); cfg['last_speed'] = float(speed_factor); cfg['mobile_checked'] = bool(is_mobile_format); cfg['teammates_checked'] = bool(self.teammates_checkbox.isChecked())
+            cfg = dict(self.config_manager.config); cfg['last_speed'] = float(request['speed_factor']); cfg['mobile_checked'] = bool(request['is_mobile_format']); cfg['teammates_checked'] = bool(self.teammates_checkbox.isChecked())
             self.config_manager.save_config(cfg)
-            m_start_ms = int(getattr(self, 'music_timeline_start_ms', self.trim_start_ms)); m_end_ms = int(getattr(self, 'music_timeline_end_ms', self.trim_end_ms))
-            if music_path and m_end_ms <= m_start_ms:
-                m_start_ms = self.trim_start_ms
-                m_end_ms = self.trim_end_ms
-            v_wall_start = self._calculate_wall_clock_time(start_time_ms, segments, speed_factor)
-            m_wall_start = self._calculate_wall_clock_time(m_start_ms, segments, speed_factor)
-            m_wall_end = self._calculate_wall_clock_time(m_end_ms, segments, speed_factor)
-            m_proj_start_sec = max(0.0, (m_wall_start - v_wall_start) / 1000.0)
-            m_proj_end_sec = max(0.0, (m_wall_end - v_wall_start) / 1000.0)
-            music_conf = {'path': music_path, 'ducking_threshold': 0.15, 'ducking_ratio': 2.5, 'eq_enabled': True, 'main_vol': linear_video_vol, 'music_vol': music_vol_linear if music_path else 1.0, 'timeline_start_sec': m_proj_start_sec, 'timeline_end_sec': m_proj_end_sec, 'file_offset_sec': music_offset_s}
-            try:
-                self.logger.info(
-                    "MUSIC_EXPORT_STATE: enabled=%s tracks=%d path=%s offset=%.3fs music_vol=%.2f video_vol=%.2f timeline_ms=%d-%d project_sec=%.3f-%.3f",
-                    bool(music_path), len(music_tracks_for_worker), music_path, music_offset_s,
-                    music_vol_linear, linear_video_vol, m_start_ms, m_end_ms, m_proj_start_sec, m_proj_end_sec,
-                )
-            except Exception:
-                pass
-            p_text = None
-            if is_mobile_format and hasattr(self, 'portrait_text_input'):
-                raw_text = self.portrait_text_input.text().strip()
-                if raw_text: p_text = raw_text
-            intro_abs_time = getattr(self, 'selected_intro_abs_time', 0.0)
-            if not intro_abs_time or intro_abs_time <= 0:
-                segment_duration = (end_time_ms - start_time_ms) / 1000.0
-                intro_abs_time = (start_time_ms / 1000.0) + (segment_duration * 0.66)
-            intro_abs_time_ms = int(intro_abs_time * 1000)
-            v_norm_db = getattr(self, "volume_normalize_db", 0.0)
-            self.process_thread = ProcessThread(input_path=self.input_file_path, start_time_ms=start_time_ms, end_time_ms=end_time_ms, original_resolution=self.original_resolution, is_mobile_format=is_mobile_format, speed_factor=speed_factor, base_dir=self.base_dir, progress_signal=self.progress_update_signal, status_signal=self.status_update_signal, finished_signal=self.process_finished_signal, logger=self.logger, is_boss_hp=self.boss_hp_checkbox.isChecked(), show_teammates_overlay=(is_mobile_format and self.teammates_checkbox.isChecked()), show_spectating_overlay=is_mobile_format, quality_level=q_level, bg_music_path=music_path, bg_music_volume=music_vol_linear, bg_music_offset_ms=int(music_offset_s * 1000), original_total_duration_ms=self.original_duration_ms, disable_fades=self.no_fade_checkbox.isChecked(), intro_still_sec=0.1, intro_from_midpoint=(intro_abs_time_ms <= 0), intro_abs_time_ms=intro_abs_time_ms if intro_abs_time_ms > 0 else None, portrait_text=p_text, music_config=music_conf, speed_segments=speed_segments_for_worker, hardware_strategy=getattr(self, 'hardware_strategy', 'CPU'), music_tracks=music_tracks_for_worker, target_mb_override=target_mb, volume_normalize_db=v_norm_db)
+            self.process_thread = ProcessThread(base_dir=self.base_dir, progress_signal=self.progress_update_signal, status_signal=self.status_update_signal, finished_signal=self.process_finished_signal, logger=self.logger, **request)
             self.process_thread.start()
         except Exception as e:
             try:
@@ -277,6 +278,20 @@ class FfmpegMixin:
                 self.process_button.setEnabled(True)
             self.show_message("Error", f"Could not start processing:\n{e}")
 
+    def _sync_granular_checkbox(self, request):
+        checkbox = getattr(self, "granular_checkbox", None)
+        is_checked = getattr(checkbox, "isChecked", None)
+        if not request.get('speed_segments') or not callable(is_checked) or is_checked():
+            return
+        try:
+            self.logger.warning("GRANULAR: hidden checkbox was off while segments exist; exporting stored segments anyway.")
+        except Exception:
+            pass
+        try:
+            checkbox.setChecked(True)
+        except Exception:
+            pass
+
     def _show_error_with_log(self, message):
         msg = QMessageBox(self); msg.setIcon(QMessageBox.Critical); msg.setWindowTitle("Processing Error"); msg.setText("An error occurred during processing."); msg.setInformativeText(message)
         UIManager.style_and_size_msg_box(msg, message)
@@ -333,6 +348,8 @@ class FfmpegMixin:
             if "canceled by user" in message.lower(): self._safe_set_phase("Canceled", ok=False)
             else: self._safe_set_phase("Error", ok=False)
         self.status_update_signal.emit("Ready.")
+        queue = getattr(self, "export_queue", None)
+        if queue is not None: queue.reschedule()
         if success:
             if hasattr(self, "set_overlays_force_hidden"):
                 self.set_overlays_force_hidden(True)
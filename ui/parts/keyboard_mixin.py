@@ -53,6 +53,10 @@ class KeyboardMixin:
             if hasattr(self, "seek_relative_time"):
                 self.seek_relative_time(ms)
                 return True
+        if key == Qt.Key_P and mods == Qt.NoModifier:
+            if hasattr(self, "start_proxy_preview"):
+                self.start_proxy_preview()
+                return True
         if key in (Qt.Key_Return, Qt.Key_Enter):
             if hasattr(self, "_on_process_clicked"):
                 self._on_process_clicked()
@@ -60,7 +60,7 @@ class MainWindowCoreAMixin:
                     pass
             m_p = getattr(self, "_music_preview_player", None)
             if m_p:
-                try: self._safe_mpv_set("pause", True, target_player=m_p); m_p.mute = True
+                try: self._safe_mpv_set("pause", True, target_player=m_p); self._safe_mpv_set("mute", True, target_player=m_p)
                 except: pass
             if hasattr(self, "playPauseButton"):
                 self.playPauseButton.setText("PLAY"); self.playPauseButton.setIcon(self.style().standardIcon(QStyle.SP_MediaPlay))
@@ -119,7 +119,7 @@ class MainWindowCoreAMixin:
                 self.positionSlider.set_speed_segments(visible_segments); self.positionSlider.update()
             if hasattr(self, "_save_recovery_state"): self._save_recovery_state()
             if m_p:
-                try: m_p.mute = False
+                try: self._safe_mpv_set("mute", False, target_player=m_p)
                 except: pass
             if hasattr(self, "update_player_state"): self.update_player_state()
             if hasattr(self, "positionSlider"): self.positionSlider.show()
@@ -139,7 +139,7 @@ class MainWindowCoreAMixin:
                 except Exception: pass
             m_p = getattr(self, "_music_preview_player", None)
             if m_p:
-                try: m_p.mute = False
+                try: self._safe_mpv_set("mute", False, target_player=m_p)
                 except Exception: pass
             if locals().get("preview_reload") and getattr(self, "player", None) and getattr(self, "input_file_path", None):
                 try:
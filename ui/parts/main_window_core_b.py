@@ -92,7 +92,7 @@ class MainWindowCoreBMixin:
             )
             self.mpv_instance = self.player
             if self.player:
-                self.player.volume = 100
+                self._safe_mpv_set("volume", 100)
                 try: self.player.speed = float(getattr(self, "playback_rate", 1.1) or 1.1)
                 except Exception: pass
                 self._bind_main_player_output()
@@ -54,6 +54,12 @@ class MainWindowCoreCMixin:
                     self.process_thread.cancel()
                     if self.process_thread.isRunning(): self.process_thread.wait(1000)
                 except: pass
+            if hasattr(self, "_shutdown_proxy_preview"):
+                try: self._shutdown_proxy_preview()
+                except: pass
+            if hasattr(self, "_shutdown_export_queue"):
+                try: self._shutdown_export_queue()
+                except: pass
 
             from system.utils import MPVSafetyManager
             if getattr(self, "player", None): 
@@ -69,6 +75,9 @@ class MainWindowCoreCMixin:
                 except: pass
             try: self._save_app_state_and_config()
             except: pass
+            if hasattr(self, "_shutdown_recovery_writer"):
+                try: self._shutdown_recovery_writer()
+                except: pass
             if hasattr(self, "logger"): self.logger.info("SYSTEM: Cleanup complete.")
             QTimer.singleShot(100, lambda: QCoreApplication.instance().quit())
         except Exception as e:
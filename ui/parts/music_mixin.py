@@ -3,7 +3,6 @@ import sys
 import subprocess
 import tempfile
 import time
-import threading
 from PyQt5.QtCore import Qt, QTimer, QRect, pyqtSignal, QObject
 from PyQt5.QtGui import QPixmap, QPainter, QColor
 from PyQt5.QtWidgets import (QStyleOptionSlider, QStyle, QDialog, QVBoxLayout,
@@ -11,7 +10,8 @@ from PyQt5.QtWidgets import (QStyleOptionSlider, QStyle, QDialog, QVBoxLayout,
 
 from ui.widgets.trimmed_slider import TrimmedSlider
 from ui.styles import UIStyles
-from system.utils import MPVSafetyManager, MediaProber
+from system.utils import MPVSafetyManager
+from system.music_library import get_music_library
 
 def _active_speed_segments(host):
     raw_segments = list(getattr(host, "speed_segments", []) or [])
@@ -69,17 +69,11 @@ class MusicMixin:
         except: pass
         return d
 
+    def _music_library(self):
+        return get_music_library(getattr(self, "bin_dir", ""))
+
     def _scan_mp3_folder(self):
-        try:
-            d = self._mp3_dir(); files = []
-            for name in os.listdir(d):
-                if name.lower().endswith(".mp3"):
-                    p = os.path.join(d, name)
-                    try: mt = os.path.getmtime(p)
-                    except: mt = 0
-                    files.append((mt, name, p))
-            files.sort(key=lambda x: x[0], reverse=True)
-            self._music_files = [ (n, p) for _, n, p in files[:1000] ]
+        try: self._music_files = self._music_library().scan(self._mp3_dir())
         except: self._music_files = []
 
     def _on_select_music_folder(self, wizard):
@@ -114,6 +108,7 @@ class MusicMixin:
                 self._pre_wizard_state['player_playing'] = not getattr(self.player, "pause", True)
                 self._pre_wizard_state['player_mute'] = getattr(self.player, "mute", False)
                 self.player.pause = True; self.player.mute = True
+                if hasattr(self, "_forget_volume_sent"): self._forget_volume_sent(self.player)
                 if getattr(self, "_music_preview_player", None): self._music_preview_player.pause = True
             except: pass
         self.wants_to_play = False
@@ -212,7 +207,7 @@ class MusicMixin:
             self._in_transition = False
 
     def _final_unmute_after_wizard(self):
-        if hasattr(self, "_sync_all_volumes"): self._sync_all_volumes()
+        if hasattr(self, "_sync_all_volumes"): self._sync_all_volumes(force=True)
         elif getattr(self, "player", None):
             self._safe_mpv_set("mute", False)
             if hasattr(self, "volume_slider"): self._safe_mpv_set("volume", self.volume_slider.value())
@@ -314,9 +309,5 @@ class MusicMixin:
         finally: self._mpv_lock.release()
 
     def _probe_audio_duration_async(self, path, callback):
-        def _worker():
-            try:
-                res = MediaProber.probe_duration(self.bin_dir, path)
-                callback(res)
-            except: callback(0.0)
-        threading.Thread(target=_worker, daemon=True).start()
+        try: self._music_library().request(path, callback)
+        except: callback(0.0)
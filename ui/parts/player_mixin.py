@@ -1,4 +1,4 @@
-import time
+﻿import time
 import threading
 from PyQt5.QtCore import QTimer
 from PyQt5.QtWidgets import QStyle
@@ -148,6 +148,8 @@ class PlayerMixin:
     def _safe_mpv_set(self, prop, value, target_player=None):
         p = target_player if target_player is not None else getattr(self, "player", None)
         if not p: return False
+        if prop in ("volume", "mute") and hasattr(self, "_forget_volume_sent"):
+            self._forget_volume_sent(p)
         return MPVSafetyManager.safe_mpv_set(p, prop, value, lock=self._mpv_lock)
 
     def _safe_mpv_get(self, prop, default=None, target_player=None):
@@ -0,0 +1,89 @@
+﻿import os
+from PyQt5.QtCore import QUrl
+from PyQt5.QtGui import QDesktopServices
+from processing.proxy_render import ProxyRenderThread, PROXY_WINDOW_MS
+from ui.parts.ffmpeg_mixin import ProcessRequestError
+
+class ProxyPreviewMixin:
+    def _proxy_window_start_ms(self):
+        try:
+            pos_ms = int((self._safe_mpv_get("time-pos", 0) or 0) * 1000)
+        except Exception:
+            pos_ms = 0
+        lo, hi = int(getattr(self, "trim_start_ms", 0) or 0), int(getattr(self, "trim_end_ms", 0) or 0)
+        return pos_ms if lo <= pos_ms < hi else lo
+
+    def start_proxy_preview(self, window_ms=PROXY_WINDOW_MS):
+        if getattr(self, "is_processing", False):
+            return None
+        running = getattr(self, "_proxy_thread", None)
+        if running is not None:
+            try:
+                running.cancel()
+            except Exception:
+                pass
+        try:
+            request = self._build_process_request()
+        except ProcessRequestError as e:
+            self.show_message(e.title, str(e))
+            return None
+        except Exception as e:
+            self.logger.exception(f"PROXY: could not build request: {e}")
+            return None
+        thread = ProxyRenderThread(
+            window_start_ms=self._proxy_window_start_ms(), window_ms=window_ms, base_dir=self.base_dir,
+            progress_signal=None, status_signal=None, finished_signal=None,
+            logger=self.logger, **request,
+        )
+        thread.finished_signal = lambda ok, msg, t=thread: self.proxy_preview_finished_signal.emit(t, ok, msg)
+        self._proxy_thread = thread
+        if thread.cached_output():
+            thread.run()
+            return thread
+        self._keep_proxy_thread(thread)
+        self.status_update_signal.emit(f"Rendering low-res preview ({(thread.window_end_ms - thread.window_start_ms) / 1000.0:.1f}s)...")
+        thread.start()
+        return thread
+
+    def _keep_proxy_thread(self, thread):
+        """Holds every started render (cancelled ones included) until its QThread has really exited."""
+        live = getattr(self, "_proxy_threads", None)
+        if live is None:
+            live = self._proxy_threads = []
+        live.append(thread)
+        try:
+            thread.finished.connect(lambda t=thread: self._release_proxy_thread(t))
+        except Exception:
+            pass
+
+    def _release_proxy_thread(self, thread):
+        live = getattr(self, "_proxy_threads", None) or []
+        if thread in live:
+            live.remove(thread)
+
+    def _on_proxy_preview_finished(self, thread, success, message):
+        if thread is not getattr(self, "_proxy_thread", None):
+            return
+        self._proxy_thread = None
+        if getattr(thread, "is_canceled", False):
+            self.status_update_signal.emit("Preview render cancelled.")
+            return
+        if not success:
+            self.status_update_signal.emit(f"Preview render failed: {message}")
+            return
+        self.status_update_signal.emit(f"Preview ready: {os.path.basename(str(message))}")
+        try:
+            QDesktopServices.openUrl(QUrl.fromLocalFile(str(message)))
+        except Exception as e:
+            self.logger.error(f"PROXY: could not open preview: {e}")
+
+    def _shutdown_proxy_preview(self):
+        threads = list(getattr(self, "_proxy_threads", None) or [])
+        current = getattr(self, "_proxy_thread", None)
+        if current is not None and current not in threads:
+            threads.append(current)
+        for thread in threads:
+            try:
+                thread.cancel(); thread.wait(1000)
+            except Exception:
+                pass
@@ -284,6 +284,8 @@ class UiBuilderMixin:
                 self.process_button.setText('PROCESS')
             if hasattr(self, 'quality_slider'):
                 self.quality_slider.setEnabled(has_video)
+            if hasattr(self, 'queue_button'):
+                self.queue_button.setEnabled(has_video and scan_done)
             if hasattr(self, 'music_button'):
                 self.music_button.setCursor(Qt.PointingHandCursor if self.music_button.isEnabled() else Qt.ArrowCursor)
             if hasattr(self, 'granular_button'):
@@ -410,8 +412,12 @@ class UiBuilderMixin:
         _left_trim_l.addStretch(1)
         self._trim_grid.addWidget(self._trim_left_panel, 0, 0, Qt.AlignLeft | Qt.AlignVCenter)
         self._trim_grid.addLayout(self.trim_layout, 0, 1, Qt.AlignHCenter | Qt.AlignVCenter)
-        self._trim_right_spacer = QWidget()
-        self._trim_grid.addWidget(self._trim_right_spacer, 0, 2)
+        self._trim_right_panel = QWidget()
+        _right_trim_l = QHBoxLayout(self._trim_right_panel)
+        _right_trim_l.setContentsMargins(0, 0, 5, 0)
+        _right_trim_l.addStretch(1)
+        _right_trim_l.addWidget(self.proxy_preview_button)
+        self._trim_grid.addWidget(self._trim_right_panel, 0, 2)
         player_col.addSpacing(8)
         player_col.addLayout(self._trim_grid)
         self._init_process_controls()
@@ -424,7 +430,7 @@ class UiBuilderMixin:
         self.player_col_container.installEventFilter(self)
 
     def _set_video_controls_enabled(self, enabled: bool):
-        widgets = [self.playPauseButton, self.start_trim_button, self.end_trim_button, self.thumb_pick_btn, self.boss_hp_checkbox, self.quality_slider, self.speed_spinbox, self.granular_button, getattr(self, "granular_clear_button", None), self.granular_checkbox, self.mobile_checkbox, self.teammates_checkbox, self.no_fade_checkbox, self.portrait_text_input, self.music_button, self.positionSlider, self.start_minute_input, self.start_second_input, self.start_ms_input, self.end_minute_input, self.end_second_input, self.end_ms_input]
+        widgets = [self.playPauseButton, self.start_trim_button, self.end_trim_button, self.thumb_pick_btn, getattr(self, "proxy_preview_button", None), self.boss_hp_checkbox, self.quality_slider, self.speed_spinbox, self.granular_button, getattr(self, "granular_clear_button", None), self.granular_checkbox, self.mobile_checkbox, self.teammates_checkbox, self.no_fade_checkbox, self.portrait_text_input, self.music_button, self.positionSlider, self.start_minute_input, self.start_second_input, self.start_ms_input, self.end_minute_input, self.end_second_input, self.end_ms_input]
         for w in widgets:
             if w is not None:
                 w.setEnabled(enabled)
@@ -436,7 +442,7 @@ class UiBuilderMixin:
             self._update_granular_button_state()
 
     def _set_preview_controls_available(self, available: bool):
-        preview_widgets = [self.playPauseButton, self.start_trim_button, self.end_trim_button, self.thumb_pick_btn, self.granular_button, self.granular_checkbox, self.music_button, self.positionSlider]
+        preview_widgets = [self.playPauseButton, self.start_trim_button, self.end_trim_button, self.thumb_pick_btn, getattr(self, "proxy_preview_button", None), self.granular_button, self.granular_checkbox, self.music_button, self.positionSlider]
         for w in preview_widgets:
             if w is not None:
                 w.setEnabled(bool(available))
@@ -570,6 +576,13 @@ class UiBuilderMixin:
         self.thumb_pick_btn.setToolTip("Use current frame as video intro/thumbnail")
         self.thumb_pick_btn.clicked.connect(self._pick_thumbnail_from_current_frame)
         self.thumb_pick_btn.setEnabled(False)
+        self.proxy_preview_button = QPushButton('🎞 PREVIEW')
+        self.proxy_preview_button.setProperty('class', 'primary')
+        self.proxy_preview_button.setFixedSize(UI_LAYOUT.BTN_WIDTH_MD + 10, UI_LAYOUT.BUTTON_HEIGHT)
+        self.proxy_preview_button.setCursor(Qt.PointingHandCursor)
+        self.proxy_preview_button.setToolTip("Render a short low-res preview from the playhead (P)")
+        self.proxy_preview_button.clicked.connect(lambda: self.start_proxy_preview() if hasattr(self, "start_proxy_preview") else None)
+        self.proxy_preview_button.setEnabled(False)
         self.start_minute_input = QSpinBox()
         self.start_second_input = QSpinBox()
         self.start_ms_input = QSpinBox()
@@ -699,6 +712,8 @@ class UiBuilderMixin:
         btn_l.setSpacing(12)
         btn_l.addWidget(self.cancel_button)
         btn_l.addWidget(self.process_button)
+        if hasattr(self, "_build_queue_button"):
+            btn_l.addWidget(self._build_queue_button())
         self.speed_spinbox = ClickableSpinBox()
         self.speed_spinbox.setRange(0.1, 4.0)
         self.speed_spinbox.setDecimals(1)
@@ -1003,6 +1018,7 @@ class UiBuilderMixin:
         self.progress_update_signal.connect(self.on_progress)
         self.status_update_signal.connect(self.on_phase_update)
         self.process_finished_signal.connect(self.on_process_finished)
+        self.proxy_preview_finished_signal.connect(self._on_proxy_preview_finished)
         self.video_ended_signal.connect(self._handle_video_end)
         try:
             from ui.main_window import _QtLiveLogHandler
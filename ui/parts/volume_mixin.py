@@ -1,6 +1,9 @@
 ﻿from PyQt5.QtCore import QTimer, QPoint, Qt
 from PyQt5.QtWidgets import QStyleOptionSlider, QStyle
 import threading
+from system.utils import MPVSafetyManager
+
+VOLUME_FRAME_MS = 16
 
 class VolumeMixin:
     def _vol_eff(self, raw: int | None = None) -> int:
@@ -19,31 +22,75 @@ class VolumeMixin:
                 self._music_volume_pct = 80
         return int(self._music_volume_pct)
 
-    def _sync_all_volumes(self):
-        if bool(getattr(self, "_suspend_volume_sync", False)) or getattr(self, "_in_transition", False):
-            return
-        v_eff = self._vol_eff()
-        m_eff = self._music_eff()
-        if hasattr(self, "_safe_mpv_set"):
-            self._safe_mpv_set("volume", v_eff)
-            self._safe_mpv_set("mute", False)
-        else:
-            player = getattr(self, "player", None)
-            if player:
-                try:
-                    player.volume = v_eff
-                    player.mute = False
-                except Exception:
-                    pass
+    def _volume_targets(self):
+        targets = []
+        player = getattr(self, "player", None)
+        if player:
+            targets.append(("video", player, {"volume": self._vol_eff(), "mute": False}))
         music_player = getattr(self, "_music_preview_player", None)
         if music_player:
+            targets.append(("music", music_player, {"volume": self._music_eff(), "mute": False}))
+        return targets
+
+    def _sync_all_volumes(self, force: bool = False):
+        """Sends both players' effective volume in one batch, skipping a player whose last sent value still holds unless forced."""
+        if bool(getattr(self, "_suspend_volume_sync", False)) or getattr(self, "_in_transition", False):
+            return
+        sent = getattr(self, "_volume_sent", None)
+        if sent is None:
+            sent = self._volume_sent = {}
+        pending = []
+        for role, player, props in self._volume_targets():
+            key = (id(player), props["volume"], props["mute"])
+            if force or sent.get(role) != key:
+                pending.append((role, player, props, key))
+        if not pending:
+            return
+        results = MPVSafetyManager.safe_mpv_set_many([(player, props) for _, player, props, _ in pending], lock=getattr(self, "_mpv_lock", None))
+        for (role, _, props, key), ok in zip(pending, results):
+            if ok:
+                sent[role] = key
+            else:
+                sent.pop(role, None)
+            if role == "music" and ok and hasattr(self, "logger"):
+                self.logger.info(f"HARDWARE_SET: [MUSIC_PREVIEW] Volume -> {props['volume']}%")
+
+    def _request_volume_sync(self):
+        """Coalesces slider ticks into at most one send per display frame."""
+        try:
+            timer = getattr(self, "_volume_frame_timer", None)
+            if timer is None:
+                timer = QTimer(self)
+                timer.setSingleShot(True)
+                timer.setInterval(VOLUME_FRAME_MS)
+                timer.timeout.connect(self._sync_all_volumes)
+                self._volume_frame_timer = timer
+            if not timer.isActive():
+                timer.start()
+        except Exception:
+            self._sync_all_volumes()
+
+    def _forget_volume_sent(self, player=None):
+        """Drops the last-sent record for a player (all players when None) after something else wrote its volume or mute."""
+        sent = getattr(self, "_volume_sent", None)
+        if not sent:
+            return
+        for role in [r for r, key in sent.items() if player is None or key[0] == id(player)]:
+            del sent[role]
+
+    def _reinforce_volumes(self):
+        """Re-asserts volume on players whose actual mpv state drifted from what was last sent (mpv resets it on reloads)."""
+        lock = getattr(self, "_mpv_lock", None)
+        for role, player, props in self._volume_targets():
+            volume = MPVSafetyManager.safe_mpv_get(player, "volume", None, lock=lock)
+            mute = MPVSafetyManager.safe_mpv_get(player, "mute", None, lock=lock)
             try:
-                music_player.volume = m_eff
-                music_player.mute = False
-                if hasattr(self, "logger"):
-                    self.logger.info(f"HARDWARE_SET: [MUSIC_PREVIEW] Volume -> {m_eff}%")
-            except Exception:
-                pass
+                drifted = int(round(float(volume))) != props["volume"] or bool(mute) != props["mute"] or mute is None
+            except (TypeError, ValueError):
+                drifted = True
+            if drifted:
+                self._forget_volume_sent(player)
+        self._sync_all_volumes()
 
     def _schedule_volume_reinforce(self, delay_ms: int = 350):
         if bool(getattr(self, "_suspend_volume_sync", False)):
@@ -53,7 +100,7 @@ class VolumeMixin:
             if timer is None:
                 timer = QTimer(self)
                 timer.setSingleShot(True)
-                timer.timeout.connect(self._sync_all_volumes)
+                timer.timeout.connect(self._reinforce_volumes)
                 self._volume_reinforce_timer = timer
             timer.start(max(60, int(delay_ms)))
         except Exception:
@@ -73,12 +120,12 @@ class VolumeMixin:
                 self.logger.error(f"Volume Badge Error: {e}")
 
     def apply_master_volume(self):
-        self._sync_all_volumes()
+        self._sync_all_volumes(force=True)
         self._update_volume_badge()
         self._schedule_volume_reinforce(350)
 
     def _on_master_volume_changed(self, v: int):
-        self._sync_all_volumes()
+        self._request_volume_sync()
         eff_pct = self._vol_eff(v)
         if hasattr(self, "config_manager"):
             try:
@@ -2,6 +2,7 @@
 import shutil
 import os
 import sys
+import threading
 from PyQt5.QtWidgets import (
     QFileDialog,
     QDesktopWidget,
@@ -28,6 +29,8 @@ from PyQt5.QtWidgets import (
     QSizePolicy,
     QGridLayout,
     QSplitter,
+    QToolButton,
+    QStyleOptionViewItem,
 )
 
 from system.utils import MPVSafetyManager
@@ -93,6 +96,22 @@ class _CenteredTextDelegate(QStyledItemDelegate):
         s = super().sizeHint(option, index)
         return QSize(s.width(), s.height())
 
+class _PosterDelegate(_CenteredTextDelegate):
+    def __init__(self, loader, parent=None):
+        super().__init__(parent)
+        self._loader = loader
+
+    def initStyleOption(self, option, index):
+        super().initStyleOption(option, index)
+        option.displayAlignment = Qt.AlignHCenter | Qt.AlignTop
+        try:
+            icon = self._loader.icon(index.model().filePath(index))
+        except Exception:
+            icon = None
+        if icon is not None:
+            option.icon = icon
+            option.features |= QStyleOptionViewItem.HasDecoration
+
 class RubberBandHelper(QObject):
     def __init__(self, tree_view: QTreeView):
         super().__init__(tree_view)
@@ -375,6 +394,146 @@ class SVGSeekButton(QPushButton):
             draw_tri(start_x)
             draw_tri(start_x + w + gap)
 
+PREVIEW_SETTLE_MS = 150
+THUMBNAIL_SETTLE_MS = 120
+VIDEO_EXTENSIONS = {
+    ".mp4", ".mkv", ".mov", ".avi", ".webm", ".m4v", ".flv", ".wmv",
+    ".3gp", ".mpeg", ".mpg", ".asf", ".ogg", ".ogv", ".vob", ".qt",
+    ".ts", ".mts", ".m2ts", ".yuv", ".rm", ".rmvb", ".amv", ".mp2",
+    ".mpe", ".mpv", ".m2v", ".m4p"
+}
+
+def _binaries_dir():
+    return os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), "binaries")
+
+class SharedPreviewPlayer:
+    """
+    One embedded mpv preview kept alive for the whole session. Each dialog borrows its render surface,
+    and commands are handed to a worker thread latest-wins so selection changes never wait on mpv.
+    """
+    _instance = None
+
+    @classmethod
+    def instance(cls):
+        if cls._instance is None:
+            cls._instance = cls()
+        return cls._instance
+
+    def __init__(self):
+        self.player = None
+        self.surface = None
+        self.error = None
+        self._parking = None
+        self._owner = None
+        self._pending = None
+        self._cond = threading.Condition()
+        self._worker = None
+
+    def _ensure_surface(self):
+        if self.surface is None:
+            self._parking = QWidget(None)
+            self._parking.setObjectName("filePreviewParking")
+            self.surface = QFrame(self._parking)
+            self.surface.setObjectName("filePreviewVideo")
+            self.surface.setMinimumSize(320, 220)
+            self.surface.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
+            self.surface.setAttribute(Qt.WA_DontCreateNativeAncestors)
+            self.surface.setAttribute(Qt.WA_NativeWindow)
+            self.surface.setAttribute(Qt.WA_OpaquePaintEvent)
+            self.surface.setAttribute(Qt.WA_NoSystemBackground)
+            self.surface.setAutoFillBackground(False)
+        return self.surface
+
+    def _alive(self):
+        p = self.player
+        return p is not None and not getattr(p, "_core_shutdown", False) and not getattr(p, "_safe_shutdown_initiated", False)
+
+    def ensure_player(self):
+        if self._alive():
+            return self.player
+        self.player = None
+        surface = self._ensure_surface()
+        try:
+            player = MPVSafetyManager.create_safe_mpv(
+                wid=int(surface.winId()),
+                osc=False,
+                hr_seek='yes',
+                hwdec='auto',
+                keep_open='yes',
+                ytdl=False,
+                demuxer_max_bytes='500M',
+                demuxer_max_back_bytes='100M',
+                vo='gpu,direct3d,d3d11,null',
+                input_vo_keyboard=False,
+                input_default_bindings=False,
+                aid='no',
+            )
+            if player is not None:
+                MPVSafetyManager.safe_mpv_set(player, "volume", 0)
+                MPVSafetyManager.safe_mpv_set(player, "mute", True)
+                @player.property_observer('idle-active')
+                def _on_idle_change(name, value):
+                    if value is True:
+                        MPVSafetyManager.run_on_qt_thread(self._notify_idle)
+            self.player, self.error = player, None
+        except Exception as exc:
+            self.player, self.error = None, exc
+        return self.player
+
+    def _notify_idle(self):
+        owner = self._owner
+        if owner is not None:
+            try:
+                owner._handle_eof_reset()
+            except Exception:
+                pass
+
+    def attach(self, owner, parent):
+        self._owner = owner
+        surface = self._ensure_surface()
+        surface.setParent(parent)
+        self.ensure_player()
+        return surface
+
+    def detach(self, owner):
+        if self._owner is not owner:
+            return
+        self._owner = None
+        self.submit(("set", "pause", True), ("command", "stop"))
+        if self.surface is not None:
+            self.surface.hide()
+            self.surface.setParent(self._parking)
+
+    def submit(self, *ops):
+        if not self._alive():
+            return False
+        with self._cond:
+            self._pending = ops
+            if self._worker is None or not self._worker.is_alive():
+                self._worker = threading.Thread(target=self._drain, name="file-preview-ipc", daemon=True)
+                self._worker.start()
+            self._cond.notify()
+        return True
+
+    def _drain(self):
+        while True:
+            with self._cond:
+                while self._pending is None:
+                    self._cond.wait()
+                ops, self._pending = self._pending, None
+            player = self.player
+            for op in ops:
+                try:
+                    if op[0] == "set":
+                        MPVSafetyManager.safe_mpv_set(player, op[1], op[2])
+                    else:
+                        MPVSafetyManager.safe_mpv_command(player, *op[1:])
+                except Exception:
+                    pass
+
+def prewarm_preview_player():
+    return SharedPreviewPlayer.instance().ensure_player() is not None
+
 class CustomFileDialog(QFileDialog):
     def __init__(self, *args, config=None, **kwargs):
         super(CustomFileDialog, self).__init__(*args, **kwargs)
@@ -393,9 +552,16 @@ class CustomFileDialog(QFileDialog):
         self._preview_video = None
         self._preview_title = None
         self._preview_status = None
+        self._preview_shared = SharedPreviewPlayer.instance()
         self._preview_timer = QTimer(self)
         self._preview_timer.setSingleShot(True)
         self._preview_timer.timeout.connect(self._preview_current_selection)
+        self._poster_loader = None
+        self._thumb_button = None
+        self._list_view_defaults = None
+        self._poster_timer = QTimer(self)
+        self._poster_timer.setSingleShot(True)
+        self._poster_timer.timeout.connect(self._request_visible_posters)
         self._init_dialog_flags()
         self._init_modes()
         self._init_title()
@@ -406,6 +572,7 @@ class CustomFileDialog(QFileDialog):
         self._setup_lookin_width()
         self._setup_sidebar()
         self._tune_buttons()
+        self._setup_thumbnail_mode()
 
     def _init_dialog_flags(self):
         self.setOption(QFileDialog.DontUseNativeDialog, True)
@@ -697,15 +864,7 @@ class CustomFileDialog(QFileDialog):
         self._preview_title.setObjectName("filePreviewTitle")
         self._preview_title.setAlignment(Qt.AlignCenter)
         self._preview_title.clicked.connect(self._launch_default_player)
-        self._preview_video = QFrame(self._preview_panel)
-        self._preview_video.setObjectName("filePreviewVideo")
-        self._preview_video.setMinimumSize(320, 220)
-        self._preview_video.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
-        self._preview_video.setAttribute(Qt.WA_DontCreateNativeAncestors)
-        self._preview_video.setAttribute(Qt.WA_NativeWindow)
-        self._preview_video.setAttribute(Qt.WA_OpaquePaintEvent)
-        self._preview_video.setAttribute(Qt.WA_NoSystemBackground)
-        self._preview_video.setAutoFillBackground(False)
+        self._preview_video = self._preview_shared.attach(self, self._preview_panel)
         self._preview_status = ClickableLabel("Select a video")
         self._preview_status.setObjectName("filePreviewStatus")
         self._preview_status.setAlignment(Qt.AlignCenter)
@@ -732,32 +891,10 @@ class CustomFileDialog(QFileDialog):
         preview_layout.addWidget(self._preview_status)
         self._preview_video.installEventFilter(self)
         QTimer.singleShot(100, self._position_seek_buttons)
-        try:
-            self._preview_video.show()
-            self._preview_player = MPVSafetyManager.create_safe_mpv(
-                wid=int(self._preview_video.winId()),
-                osc=False,
-                hr_seek='yes',
-                hwdec='auto',
-                keep_open='yes',
-                ytdl=False,
-                demuxer_max_bytes='500M',
-                demuxer_max_back_bytes='100M',
-                vo='gpu,direct3d,d3d11,null',
-                input_vo_keyboard=False,
-                input_default_bindings=False,
-                aid='no',
-            )
-            if self._preview_player is not None:
-                MPVSafetyManager.safe_mpv_set(self._preview_player, "volume", 0)
-                MPVSafetyManager.safe_mpv_set(self._preview_player, "mute", True)
-                @self._preview_player.property_observer('idle-active')
-                def _on_idle_change(name, value):
-                    if value is True:
-                        MPVSafetyManager.run_on_qt_thread(self._handle_eof_reset)
-        except Exception as exc:
-            self._preview_player = None
-            self._preview_status.setText(f"Preview unavailable: {exc}")
+        self._preview_video.show()
+        self._preview_player = self._preview_shared.player
+        if self._preview_player is None:
+            self._preview_status.setText(f"Preview unavailable: {self._preview_shared.error}" if self._preview_shared.error else "Preview unavailable")
         splitter = self.findChild(QSplitter, "splitter")
         if splitter:
             splitter.addWidget(self._preview_panel)
@@ -844,6 +981,102 @@ class CustomFileDialog(QFileDialog):
                 else:
                     layout.setRowStretch(r, 0)
 
+    def _setup_thumbnail_mode(self):
+        if self.list_view is None:
+            return
+        self._thumb_button = QToolButton(self)
+        self._thumb_button.setObjectName("thumbModeButton")
+        self._thumb_button.setText("\u25a6")
+        self._thumb_button.setToolTip("Thumbnail View")
+        self._thumb_button.setCheckable(True)
+        self._thumb_button.toggled.connect(self._set_thumbnail_mode)
+        placed = False
+        detail_button = self.findChild(QToolButton, "detailModeButton")
+        for name in ("listModeButton", "detailModeButton"):
+            button = self.findChild(QToolButton, name)
+            if button is not None:
+                button.clicked.connect(lambda *_: self._thumb_button.setChecked(False))
+        if detail_button is not None:
+            for row in self.findChildren(QHBoxLayout):
+                pos = row.indexOf(detail_button)
+                if pos >= 0:
+                    row.insertWidget(pos + 1, self._thumb_button)
+                    placed = True
+                    break
+        if not placed:
+            self._thumb_button.hide()
+        self.list_view.verticalScrollBar().valueChanged.connect(self._schedule_visible_posters)
+        self.list_view.horizontalScrollBar().valueChanged.connect(self._schedule_visible_posters)
+        model = self.list_view.model()
+        for name in ("directoryLoaded", "rowsInserted", "layoutChanged"):
+            try:
+                getattr(model, name).connect(self._schedule_visible_posters)
+            except Exception:
+                pass
+        if self.config and self.config.config.get("file_dialog_thumbnail_mode"):
+            self._thumb_button.setChecked(True)
+
+    def _thumbnail_mode_active(self):
+        return self._thumb_button is not None and self._thumb_button.isChecked()
+
+    def _set_thumbnail_mode(self, enabled):
+        view = self.list_view
+        if view is None:
+            return
+        if enabled:
+            if self._poster_loader is None:
+                from ui.widgets.file_dialog_thumbnails import PosterLoader
+                self._poster_loader = PosterLoader(_binaries_dir(), self)
+                self._poster_loader.poster_ready.connect(lambda _path: self.list_view.viewport().update())
+            if self._list_view_defaults is None:
+                self._list_view_defaults = (view.itemDelegate(), view.iconSize(), view.gridSize(), view.wordWrap(), view.uniformItemSizes())
+            from ui.widgets.file_dialog_thumbnails import POSTER_ICON_SIZE, POSTER_GRID_SIZE
+            self.setViewMode(QFileDialog.List)
+            view.setViewMode(QListView.IconMode)
+            view.setMovement(QListView.Static)
+            view.setResizeMode(QListView.Adjust)
+            view.setIconSize(POSTER_ICON_SIZE)
+            view.setGridSize(POSTER_GRID_SIZE)
+            view.setWordWrap(True)
+            view.setUniformItemSizes(True)
+            view.setItemDelegate(_PosterDelegate(self._poster_loader, view))
+            self._schedule_visible_posters()
+            return
+        if self._list_view_defaults is None:
+            return
+        delegate, icon_size, grid_size, word_wrap, uniform = self._list_view_defaults
+        view.setViewMode(QListView.ListMode)
+        view.setMovement(QListView.Static)
+        view.setWrapping(True)
+        view.setIconSize(icon_size)
+        view.setGridSize(grid_size)
+        view.setWordWrap(word_wrap)
+        view.setUniformItemSizes(uniform)
+        view.setItemDelegate(delegate)
+        if self._poster_loader is not None:
+            self._poster_loader.request([])
+
+    def _schedule_visible_posters(self, *_args):
+        if self._thumbnail_mode_active():
+            self._poster_timer.start(THUMBNAIL_SETTLE_MS)
+
+    def _request_visible_posters(self):
+        view = self.list_view
+        if view is None or self._poster_loader is None or not self._thumbnail_mode_active():
+            return
+        model = view.model()
+        root = view.rootIndex()
+        area = view.viewport().rect()
+        paths = []
+        for row in range(model.rowCount(root)):
+            idx = model.index(row, 0, root)
+            if view.isRowHidden(row) or not view.visualRect(idx).intersects(area):
+                continue
+            path = model.filePath(idx)
+            if os.path.splitext(path)[1].lower() in VIDEO_EXTENSIONS:
+                paths.append(path)
+        self._poster_loader.request(paths)
+
     def _bind_preview_selection(self, view):
         if view is None:
             return
@@ -863,7 +1096,7 @@ class CustomFileDialog(QFileDialog):
 
     def _schedule_preview(self, view):
         self._preview_source_view = view
-        self._preview_timer.start(400)
+        self._preview_timer.start(PREVIEW_SETTLE_MS)
 
     def _preview_current_selection(self):
         view = self._preview_source_view
@@ -885,13 +1118,7 @@ class CustomFileDialog(QFileDialog):
     def _is_video_path(self, path):
         if not path or not os.path.isfile(path):
             return False
-        ext = os.path.splitext(path)[1].lower()
-        return ext in {
-            ".mp4", ".mkv", ".mov", ".avi", ".webm", ".m4v", ".flv", ".wmv",
-            ".3gp", ".mpeg", ".mpg", ".asf", ".ogg", ".ogv", ".vob", ".qt",
-            ".ts", ".mts", ".m2ts", ".yuv", ".rm", ".rmvb", ".amv", ".mp2",
-            ".mpe", ".mpv", ".m2v", ".m4p"
-        }
+        return os.path.splitext(path)[1].lower() in VIDEO_EXTENSIONS
 
     def _seek_preview(self, seconds):
         if self._preview_player is not None and self._preview_path:
@@ -913,12 +1140,8 @@ class CustomFileDialog(QFileDialog):
             self._play_video([self._preview_path])
 
     def _set_preview_idle(self, text):
-        if self._preview_player is not None:
-            try:
-                MPVSafetyManager.safe_mpv_set(self._preview_player, "pause", True)
-                MPVSafetyManager.safe_mpv_command(self._preview_player, "stop")
-            except Exception:
-                pass
+        if self._preview_player is not None and self._preview_path:
+            self._preview_shared.submit(("set", "pause", True), ("command", "stop"))
         self._preview_path = None
         if self._preview_title is not None:
             self._preview_title.setText("Video Preview")
@@ -933,10 +1156,7 @@ class CustomFileDialog(QFileDialog):
                 self._preview_status.setText("Preview unavailable")
             return
         if self._preview_path == path:
-            try:
-                MPVSafetyManager.safe_mpv_set(self._preview_player, "pause", False)
-            except Exception:
-                pass
+            self._preview_shared.submit(("set", "pause", False))
             return
         self._preview_path = path
         if self._preview_title is not None:
@@ -947,30 +1167,22 @@ class CustomFileDialog(QFileDialog):
             self.seek_controls_widget.show()
             self.seek_controls_widget.raise_()
             self._position_seek_buttons()
-        try:
-            MPVSafetyManager.safe_mpv_set(self._preview_player, "pause", True)
-            ok = MPVSafetyManager.safe_mpv_command(self._preview_player, "loadfile", path, "replace")
-            MPVSafetyManager.safe_mpv_set(self._preview_player, "volume", 0)
-            MPVSafetyManager.safe_mpv_set(self._preview_player, "mute", True)
-            MPVSafetyManager.safe_mpv_set(self._preview_player, "pause", False)
-            if not ok and self._preview_status is not None:
-                self._preview_status.setText("Preview unavailable")
-        except Exception as exc:
+        if not self._preview_shared.submit(("set", "pause", True), ("command", "loadfile", path, "replace"), ("set", "volume", 0), ("set", "mute", True), ("set", "pause", False)):
             if self._preview_status is not None:
-                self._preview_status.setText(f"Preview unavailable: {exc}")
+                self._preview_status.setText("Preview unavailable")
 
     def _stop_embedded_preview(self):
         try:
             self._preview_timer.stop()
         except Exception:
             pass
-        if self._preview_player is not None:
-            try:
-                MPVSafetyManager.safe_mpv_set(self._preview_player, "pause", True)
-                MPVSafetyManager.safe_mpv_command(self._preview_player, "stop")
-                MPVSafetyManager.safe_mpv_shutdown(self._preview_player, timeout=1.0)
-            except Exception:
-                pass
+        if self._preview_video is not None:
+            self._preview_video.removeEventFilter(self)
+        self._preview_shared.detach(self)
+        if self._poster_loader is not None:
+            self._poster_timer.stop()
+            self._poster_loader.shutdown()
+        self._preview_video = None
         self._preview_player = None
         self._preview_path = None
         if hasattr(self, 'seek_controls_widget'):
@@ -983,7 +1195,7 @@ class CustomFileDialog(QFileDialog):
         view.viewport().installEventFilter(self)
 
     def _position_seek_buttons(self):
-        if not hasattr(self, 'seek_controls_widget') or not self.seek_controls_widget:
+        if not hasattr(self, 'seek_controls_widget') or not self.seek_controls_widget or self._preview_video is None:
             return
         v_rect = self._preview_video.geometry()
         container_w = v_rect.width()
@@ -1006,6 +1218,8 @@ class CustomFileDialog(QFileDialog):
     def eventFilter(self, obj, event):
         if obj == getattr(self, "_preview_video", None) and event.type() == QEvent.Resize:
             self._position_seek_buttons()
+        if event.type() == QEvent.Resize and self.list_view is not None and obj is self.list_view.viewport():
+            self._schedule_visible_posters()
         if event.type() == QEvent.ContextMenu:
             view = obj
             if not isinstance(obj, (QTreeView, QListView)):
@@ -1369,6 +1583,7 @@ class CustomFileDialog(QFileDialog):
             self.config.config["file_dialog_header_state"] = (header.saveState().toBase64().data().decode())
             self.config.config["file_dialog_sort_column"] = header.sortIndicatorSection()
             self.config.config["file_dialog_sort_order"] = int(header.sortIndicatorOrder())
+        self.config.config["file_dialog_thumbnail_mode"] = self._thumbnail_mode_active()
         self.config.save_config(self.config.config)
 
     def restore_state(self, header):
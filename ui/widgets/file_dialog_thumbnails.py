@@ -0,0 +1,148 @@
+﻿import os
+import sys
+import subprocess
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from PyQt5.QtCore import QObject, QSize, pyqtSignal
+from PyQt5.QtGui import QIcon, QPixmap
+from ui.widgets import music_wizard_workers as asset_cache
+from system.asset_keys import read_file_bytes, media_signature, hash_key, source_fingerprint, key_lock
+
+POSTER_WORKERS = 3
+POSTER_WIDTH = 320
+POSTER_MEMORY_ITEMS = 600
+POSTER_SEEK_POINTS = ("1.000", "0")
+POSTER_ICON_SIZE = QSize(192, 108)
+POSTER_GRID_SIZE = QSize(212, 150)
+
+def poster_cache_key(path: str) -> str:
+    mtime_ns, size = media_signature(path)
+    return hash_key(("poster", path, mtime_ns, size, POSTER_WIDTH, "v1")) + ".jpg"
+
+def extract_poster(ffmpeg_exe: str, path: str, timeout: float = 12.0) -> bytes | None:
+    """Decodes one frame near the start of the clip straight to JPEG on stdout; retries at 0s for clips shorter than the first seek point."""
+    flags = subprocess.CREATE_NO_WINDOW if sys.platform == "win32" else 0
+    for seek in POSTER_SEEK_POINTS:
+        cmd = [
+            ffmpeg_exe, "-hide_banner", "-loglevel", "error",
+            "-ss", seek, "-i", path,
+            "-frames:v", "1", "-an",
+            "-vf", f"scale={POSTER_WIDTH}:-2",
+            "-q:v", "5", "-f", "image2pipe", "-vcodec", "mjpeg", "pipe:1",
+        ]
+        try:
+            r = subprocess.run(cmd, stdin=subprocess.DEVNULL, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, creationflags=flags, timeout=timeout)
+        except Exception:
+            return None
+        if r.stdout:
+            return r.stdout
+    return None
+
+def store_poster(entry: Path, blob: bytes) -> bool:
+    tmp = entry.with_name(f".{entry.name}.{os.getpid()}.{threading.get_ident()}")
+    try:
+        entry.parent.mkdir(parents=True, exist_ok=True)
+        with open(tmp, "wb") as f: f.write(blob)
+        os.replace(tmp, entry)
+        return True
+    except Exception:
+        try: tmp.unlink(missing_ok=True)
+        except Exception: pass
+        return False
+
+class PosterLoader(QObject):
+    """
+    Poster frames for the file dialog's thumbnail grid. Only the paths passed to the latest request() are decoded,
+    a bounded pool runs ffmpeg, and results persist in the shared asset cache keyed by path, size and mtime.
+    """
+    poster_ready = pyqtSignal(str)
+    _decoded = pyqtSignal(str, bytes)
+
+    def __init__(self, bin_dir: str, parent=None, max_workers: int = POSTER_WORKERS):
+        super().__init__(parent)
+        self.ffmpeg_exe = os.path.join(bin_dir, "ffmpeg.exe") if sys.platform == "win32" else "ffmpeg"
+        self.cache_dir = asset_cache.cache_bucket("poster")
+        self._pool = ThreadPoolExecutor(max_workers=max(1, int(max_workers)), thread_name_prefix="fvs-poster")
+        self._lock = threading.Lock()
+        self._wanted: set[str] = set()
+        self._inflight: set[str] = set()
+        self._failed: set[str] = set()
+        self._icons: OrderedDict[str, QIcon] = OrderedDict()
+        self._closed = False
+        self._decoded.connect(self._on_decoded)
+
+    def icon(self, path: str) -> QIcon | None:
+        icon = self._icons.get(path)
+        if icon is not None:
+            self._icons.move_to_end(path)
+        return icon
+
+    def request(self, paths) -> int:
+        """Makes these the only wanted posters; queued decodes for rows that scrolled away are dropped before ffmpeg starts."""
+        paths = list(paths)
+        with self._lock:
+            if self._closed:
+                return 0
+            self._wanted = set(paths)
+            todo = [p for p in paths if p not in self._icons and p not in self._inflight and p not in self._failed]
+            self._inflight.update(todo)
+        for p in todo:
+            self._pool.submit(self._load, p)
+        return len(todo)
+
+    def _load(self, path: str) -> None:
+        with self._lock:
+            wanted = path in self._wanted and not self._closed
+            if not wanted:
+                self._inflight.discard(path)
+        if not wanted:
+            return
+        blob = None
+        try:
+            blob = self._cached_poster(path)
+        except Exception:
+            pass
+        if not self._closed:
+            self._decoded.emit(path, blob or b"")
+
+    def _cached_poster(self, path: str) -> bytes | None:
+        index = asset_cache.cache_index(self.cache_dir)
+        key = poster_cache_key(path)
+        fingerprint = source_fingerprint(path)
+        entry = self.cache_dir / key
+        with key_lock(key):
+            if index.lookup(key, fingerprint) is not None:
+                blob = read_file_bytes(str(entry))
+                if blob:
+                    return blob
+                index.discard(key)
+            blob = extract_poster(self.ffmpeg_exe, path)
+            if blob and store_poster(entry, blob):
+                index.record(key, fingerprint)
+            return blob
+
+    def _on_decoded(self, path: str, blob: bytes) -> None:
+        with self._lock:
+            self._inflight.discard(path)
+        pix = QPixmap()
+        if not blob or not pix.loadFromData(blob, "JPG"):
+            self._failed.add(path)
+            return
+        self._icons[path] = QIcon(pix)
+        while len(self._icons) > POSTER_MEMORY_ITEMS:
+            self._icons.popitem(last=False)
+        self.poster_ready.emit(path)
+
+    def shutdown(self) -> None:
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._wanted.clear()
+        self._pool.shutdown(wait=False, cancel_futures=True)
+        try:
+            asset_cache.cache_index(self.cache_dir).flush()
+        except Exception:
+            pass
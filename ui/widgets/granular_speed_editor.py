@@ -7,6 +7,7 @@ import sys
 import os
 import threading
 import time as import_time
+from bisect import bisect_left, bisect_right
 from PyQt5.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QPushButton,
                              QLabel, QDoubleSpinBox, QWidget, QStyle, QLineEdit,
                              QTextEdit, QPlainTextEdit, QAbstractSpinBox, QComboBox,
@@ -60,6 +61,9 @@ class GranularTimelineSlider(TrimmedSlider):
         self._blocked_flash_timer = QTimer(self)
         self._blocked_flash_timer.setSingleShot(True)
         self._blocked_flash_timer.timeout.connect(self._clear_blocked_flash)
+        self._static_layer = None
+        self._static_key = None
+        self._seg_index = None
 
     def _visible_range(self):
         min_v, max_v = int(self.minimum()), int(self.maximum())
@@ -151,7 +155,9 @@ class GranularTimelineSlider(TrimmedSlider):
 
     def _update_ants(self):
         self.m_ants_offset = (self.m_ants_offset + 2) % 12
-        self.update()
+        rect = self._pending_rect()
+        if rect.isValid(): self.update(rect.adjusted(-3, -3, 3, 3))
+        else: self.update()
 
     def start_ants(self):
         if not self.m_ants_timer.isActive():
@@ -263,49 +269,93 @@ class GranularTimelineSlider(TrimmedSlider):
         top = (self.height() - h) // 2
         return QRect(8, top, max(1, self.width() - 16), h)
 
-    def paintEvent(self, event):
-        p = QPainter(self)
-
-        from developer_tools.config import UI_COLORS
+    def _segment_signature(self):
+        return tuple((seg.get('start', 0), seg.get('end', 0), seg.get('speed', 1.0)) for seg in self.segments)
+
+    def _segment_index(self, signature):
+        """Sorted span/freeze lookups for the committed segments, rebuilt only when their content changes."""
+        if self._seg_index is not None and self._seg_index[0] == signature:
+            return self._seg_index[1]
+        spans = sorted((int(s), int(e), i) for i, (s, e, sp) in enumerate(signature) if abs(sp) >= 0.001)
+        freezes = sorted((int(s), i) for i, (s, e, sp) in enumerate(signature) if abs(sp) < 0.001)
+        reach, furthest = [], None
+        for _, e, _ in spans:
+            furthest = e if furthest is None else max(furthest, e); reach.append(furthest)
+        index = {"spans": spans, "starts": [s for s, _, _ in spans], "reach": reach, "freezes": freezes, "freeze_starts": [s for s, _ in freezes]}
+        self._seg_index = (signature, index)
+        return index
+
+    def _visible_spans(self, index, view_start, view_end):
+        lo = bisect_left(index["reach"], view_start)
+        hi = bisect_right(index["starts"], view_end)
+        return [span for span in index["spans"][lo:hi] if span[1] >= view_start]
+
+    def _visible_freezes(self, index, view_start, view_end):
+        lo = bisect_left(index["freeze_starts"], view_start)
+        hi = bisect_right(index["freeze_starts"], view_end)
+        return index["freezes"][lo:hi]
+
+    def _is_obscured(self, index, ms):
+        j = bisect_right(index["starts"], ms) - 1
+        return j >= 0 and index["reach"][j] >= ms
+
+    def _pending_rect(self):
+        if self.pending_start == -1 or self.pending_end == -1 or self.pending_end <= self.pending_start:
+            return QRect()
+        return self._segment_rect(self._get_groove_rect(), self.pending_start, self.pending_end)
+
+    def _static_layer_pixmap(self):
+        signature = self._segment_signature()
+        dpr = self.devicePixelRatioF()
+        key = (self.width(), self.height(), dpr, self._visible_range(), self.active_segment_index, signature)
+        if self._static_layer is None or self._static_key != key:
+            self._static_layer = self._render_static_layer(signature, dpr)
+            self._static_key = key
+        return self._static_layer
+
+    def _render_static_layer(self, signature, dpr):
+        """Groove, committed segments, freeze markers and tick labels; reused until segments, zoom or size change."""
+        pm = QPixmap(max(1, int(self.width() * dpr)), max(1, int(self.height() * dpr)))
+        pm.setDevicePixelRatio(dpr)
+        pm.fill(Qt.transparent)
+        p = QPainter(pm)
         try:
+            p.setFont(self.font())
             p.setRenderHint(QPainter.Antialiasing)
             groove_rect = self._get_groove_rect()
             p.setPen(QPen(QColor("#1f3545"), 1))
             p.setBrush(QColor("#142d37"))
             p.drawRoundedRect(groove_rect, 4, 4)
             view_start, view_end = self._visible_range()
-            for i, seg in enumerate(self.segments):
-                if abs(seg.get('speed', 1.0)) < 0.001:
-                    continue
-                is_active = (i == self.active_segment_index)
-                if seg['end'] < view_start or seg['start'] > view_end:
-                    continue
-                self._draw_segment_on_groove(p, groove_rect, seg['start'], seg['end'], seg['speed'], is_active=is_active)
-            for i, seg in enumerate(self.segments):
-                if abs(seg.get('speed', 1.0)) >= 0.001:
-                    continue
-                if seg['start'] < view_start or seg['start'] > view_end:
-                    continue
-                self._draw_freeze_marker(p, seg, i == self.active_segment_index)
-            if self.pending_start != -1 and self.pending_end != -1:
-                self._draw_segment_on_groove(p, groove_rect, self.pending_start, self.pending_end, self.pending_speed, is_pending=True)
-            min_v, max_v = self._visible_range()
+            index = self._segment_index(signature)
+            for start, end, i in self._visible_spans(index, view_start, view_end):
+                self._draw_segment_on_groove(p, groove_rect, start, end, signature[i][2], is_active=(i == self.active_segment_index))
+            for _, i in self._visible_freezes(index, view_start, view_end):
+                self._draw_freeze_marker(p, self.segments[i], i == self.active_segment_index)
             fm = p.fontMetrics()
-            if max_v > min_v:
-                step = 10000 if (max_v - min_v) > 60000 else 5000 if (max_v - min_v) > 30000 else 1000
-                for ms in range(int(min_v // step * step), int(max_v + 1), step):
-                    if ms < min_v: continue
+            if view_end > view_start:
+                step = 10000 if (view_end - view_start) > 60000 else 5000 if (view_end - view_start) > 30000 else 1000
+                p.setFont(QFont("Segoe UI", 8))
+                for ms in range(int(view_start // step * step), int(view_end + 1), step):
+                    if ms < view_start or self._is_obscured(index, ms): continue
                     x = self._map_value_to_pos(ms)
-                    is_obscured = False
-                    for seg in self.segments:
-                        if abs(seg.get('speed', 1.0)) < 0.001:
-                            continue
-                        if seg['start'] <= ms <= seg['end']: is_obscured = True; break
-                    if not is_obscured:
-                        p.setPen(QColor("#7f8c8d"))
-                        p.drawLine(x, groove_rect.bottom() + 2, x, groove_rect.bottom() + 6)
-                        p.setFont(QFont("Segoe UI", 8))
-                        p.drawText(x - fm.horizontalAdvance(self._fmt(int(ms))) // 2, groove_rect.bottom() + 18, self._fmt(int(ms)))
+                    p.setPen(QColor("#7f8c8d"))
+                    p.drawLine(x, groove_rect.bottom() + 2, x, groove_rect.bottom() + 6)
+                    p.drawText(x - fm.horizontalAdvance(self._fmt(int(ms))) // 2, groove_rect.bottom() + 18, self._fmt(int(ms)))
+        finally:
+            if p.isActive(): p.end()
+        return pm
+
+    def paintEvent(self, event):
+        p = QPainter(self)
+
+        from developer_tools.config import UI_COLORS
+        try:
+            p.drawPixmap(0, 0, self._static_layer_pixmap())
+            p.setRenderHint(QPainter.Antialiasing)
+            groove_rect = self._get_groove_rect()
+            if self.pending_start != -1 and self.pending_end != -1:
+                self._draw_segment_on_groove(p, groove_rect, self.pending_start, self.pending_end, self.pending_speed, is_pending=True)
             try:
                 playhead_rect = self._get_playhead_rect()
                 if playhead_rect and playhead_rect.isValid():
@@ -360,6 +410,11 @@ class GranularTimelineSlider(TrimmedSlider):
         p.setBrush(Qt.white)
         p.drawRect(lens_rect)
 
+    def _segment_rect(self, groove_rect, start_ms, end_ms):
+        s_pos, e_pos = self._map_value_to_pos(start_ms), self._map_value_to_pos(end_ms)
+        if s_pos > e_pos: s_pos, e_pos = e_pos, s_pos
+        return QRect(s_pos, groove_rect.center().y() - 9, max(1, e_pos - s_pos), 18)
+
     def _draw_segment_on_groove(self, p, groove_rect, start_ms, end_ms, speed, is_pending=False, is_active=False):
         if end_ms <= start_ms: return
         is_freeze = abs(speed) < 0.001
@@ -368,10 +423,7 @@ class GranularTimelineSlider(TrimmedSlider):
         alpha = 190 if is_active else 175 if is_pending else 140
         seg_color.setAlpha(alpha); p.setBrush(seg_color)
         p.setPen(QPen(QColor("#7DD3FC"), 2) if is_active else QPen(Qt.black, 0.5))
-        s_pos, e_pos = self._map_value_to_pos(start_ms), self._map_value_to_pos(end_ms)
-        if s_pos > e_pos: s_pos, e_pos = e_pos, s_pos
-        h, y = 18, groove_rect.center().y() - 9
-        seg_rect = QRect(s_pos, y, max(1, e_pos - s_pos), h)
+        seg_rect = self._segment_rect(groove_rect, start_ms, end_ms)
         p.drawRoundedRect(seg_rect, 2, 2)
         if is_pending:
             p.setBrush(Qt.NoBrush)
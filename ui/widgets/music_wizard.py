@@ -14,7 +14,7 @@ from ui.widgets.music_wizard_page3 import MergerMusicWizardStep3PageMixin
 from ui.widgets.music_wizard_navigation import MergerMusicWizardNavigationMixin
 from ui.widgets.music_wizard_waveform import MergerMusicWizardWaveformMixin
 from ui.widgets.music_wizard_playback import MergerMusicWizardPlaybackMixin
-from ui.widgets.music_wizard_timeline import MergerMusicWizardTimelineMixin
+from ui.widgets.music_wizard_timeline import MergerMusicWizardTimelineMixin, _forget_loaded_media
 from ui.widgets.music_wizard_misc import MergerMusicWizardMiscMixin
 try:
     import mpv
@@ -234,6 +234,7 @@ class MergerMusicWizard(
         except: setattr(self, player_attr_name, None); return False
 
     def _release_player(self):
+        _forget_loaded_media(self)
         try:
             self._safe_mpv_shutdown("_wizard_music_player")
             if getattr(self, '_owns_video_player', False): self._safe_mpv_shutdown("_wizard_video_player")
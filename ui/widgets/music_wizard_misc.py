@@ -1,8 +1,29 @@
-﻿import os
-import sys
-import subprocess
+﻿import sys
+from bisect import bisect_left
 from PyQt5.QtCore import QPoint, QRect, QTimer
 from PyQt5.QtWidgets import QApplication, QLabel
+from system.music_library import get_music_library
+
+def _speed_map_index(host):
+    """Wall-clock pieces (segments and the gaps between them) with cumulative ends, built once per speed map."""
+    key = (host.speed_segments, len(host.speed_segments), host.speed_factor)
+    cached = getattr(host, "_speed_map_cache", None)
+    if cached is not None and cached[0][0] is key[0] and cached[0][1:] == key[1:]:
+        return cached[1]
+    segs, factor = host.speed_segments, host.speed_factor
+    ends, pieces = [], []
+    first_start = segs[0]['start']
+    acc = first_start if factor < 0.001 else first_start / factor
+    for i, seg in enumerate(segs):
+        start, end, speed = seg['start'], seg['end'], seg['speed']
+        dur = (end - start) if speed < 0.001 else (end - start) / speed
+        ends.append(acc + dur); pieces.append((acc, start, speed)); acc += dur
+        next_start = segs[i+1]['start'] if i+1 < len(segs) else float('inf')
+        gap = (next_start - end) if factor < 0.001 else (next_start - end) / factor
+        ends.append(acc + gap); pieces.append((acc, end, factor)); acc += gap
+    built = (first_start if factor < 0.001 else first_start / factor, ends, pieces)
+    host._speed_map_cache = (key, built)
+    return built
 
 class MergerMusicWizardMiscMixin:
     def _safe_mpv_get(self, player, prop, default=None):
@@ -176,11 +197,7 @@ class MergerMusicWizardMiscMixin:
         return f"{minutes:02d}:{seconds:02d}"
 
     def _probe_media_duration(self, path):
-        try:
-            ffprobe = os.path.join(self.bin_dir, "ffprobe.exe")
-            cmd = [ffprobe, "-v", "error", "-show_entries", "format=duration", "-of", "default=noprint_wrappers=1:nokey=1", path]
-            r = subprocess.run(cmd, capture_output=True, text=True, creationflags=0x08000000, timeout=5)
-            return float(r.stdout.strip()) if r.returncode == 0 else 0.0
+        try: return get_music_library(self.bin_dir).duration(path)
         except: return 0.0
 
     def update_coverage_ui(self):
@@ -277,28 +294,15 @@ class MergerMusicWizardMiscMixin:
         if not self.speed_segments:
             if self.speed_factor < 0.001: return int(target_wall_ms)
             return int(target_wall_ms * self.speed_factor)
-        accumulated_wall_ms = 0.0
-        first_start = self.speed_segments[0]['start']
-        if self.speed_factor < 0.001: wall_to_first = first_start
-        else: wall_to_first = first_start / self.speed_factor
+        wall_to_first, ends, pieces = _speed_map_index(self)
         if target_wall_ms <= wall_to_first:
             if self.speed_factor < 0.001: return int(target_wall_ms)
             return int(target_wall_ms * self.speed_factor)
-        accumulated_wall_ms = wall_to_first
-        for i, seg in enumerate(self.speed_segments):
-            start, end, speed = seg['start'], seg['end'], seg['speed']
-            if speed < 0.001: seg_dur_wall = (end - start)
-            else: seg_dur_wall = (end - start) / speed
-            if accumulated_wall_ms + seg_dur_wall >= target_wall_ms:
-                return int(start + ((target_wall_ms - accumulated_wall_ms) * speed))
-            accumulated_wall_ms += seg_dur_wall
-            next_start = self.speed_segments[i+1]['start'] if i+1 < len(self.speed_segments) else float('inf')
-            if self.speed_factor < 0.001: gap_wall = (next_start - end)
-            else: gap_wall = (next_start - end) / self.speed_factor
-            if accumulated_wall_ms + gap_wall >= target_wall_ms:
-                return int(end + ((target_wall_ms - accumulated_wall_ms) * self.speed_factor))
-            accumulated_wall_ms += gap_wall
-        return int(self.speed_segments[-1]['end'] + ((target_wall_ms - accumulated_wall_ms) * self.speed_factor))
+        i = bisect_left(ends, target_wall_ms)
+        if i < len(pieces):
+            wall_start, source_start, rate = pieces[i]
+            return int(source_start + ((target_wall_ms - wall_start) * rate))
+        return int(self.speed_segments[-1]['end'] + ((target_wall_ms - pieces[-1][0]) * self.speed_factor))
 
     def _on_search_changed(self, text): 
         if hasattr(self, "_search_timer"):
@@ -3,6 +3,7 @@ import time
 from PyQt5.QtCore import QTimer
 from PyQt5.QtWidgets import QStyle, QMessageBox
 from ui.widgets.music_wizard_constants import PREVIEW_VISUAL_LEAD_MS, RECURSIVE_MS_DRIFT_CORRECTION_MS
+from ui.widgets.music_wizard_timeline import _forget_loaded_media
 
 class MergerMusicWizardPlaybackMixin:
     def _on_video_vol_changed(self, val):
@@ -251,6 +252,7 @@ class MergerMusicWizardPlaybackMixin:
                     self._music_player.stop()
                 except:
                     pass
+                _forget_loaded_media(self, self._music_player)
         except Exception as e:
             self.logger.debug(f"WIZARD: End-of-project stop failed: {e}")
         try:
@@ -275,6 +277,7 @@ class MergerMusicWizardPlaybackMixin:
         if self.player: self.player.stop()
         if getattr(self, "_music_player", None):
             self._music_player.stop()
+        _forget_loaded_media(self)
 
 def _cleanup_zombie_code():
     pass
@@ -3,6 +3,7 @@ from PyQt5.QtCore import Qt, QThread, pyqtSignal, QTimer
 from PyQt5.QtWidgets import QWidget, QVBoxLayout, QLabel, QProgressBar, QHBoxLayout, QLineEdit, QListWidgetItem, QFrame, QPushButton, QStackedLayout, QSizePolicy, QStyle
 from ui.widgets.trimmed_slider import TrimmedSlider
 from ui.widgets.music_wizard_widgets import SearchableListWidget, MusicItemWidget
+from system.music_library import get_music_library
 
 class TrackScannerWorker(QThread):
     scanning_started = pyqtSignal()
@@ -87,6 +88,8 @@ class MergerMusicWizardStepPagesMixin:
             self.track_list.addItem(item)
             self.track_list.setItemWidget(item, custom_widget)
         self.logger.info(f"WIZARD: Loaded {len(files)} tracks from folder")
+        try: get_music_library(self.bin_dir).prefetch([p for _, p in files])
+        except Exception: pass
         self._report_non_mp3_files()
 
     def _on_scanning_error(self, error_msg):
@@ -1,11 +1,65 @@
 ﻿import os
 import time
+from bisect import bisect_right
 from PyQt5 import QtCore
-from PyQt5.QtCore import Qt, QTimer
+from PyQt5.QtCore import QTimer
 from PyQt5 import QtGui
 from PyQt5.QtGui import QPixmap
 from ui.widgets.music_wizard_workers import VideoFilmstripWorker, MusicWaveformWorker
 
+def _loaded_media_path(host, player):
+    """Path loaded into player, remembered from our own loadfile calls so seeks skip the IPC read."""
+    cache = getattr(host, "_player_loaded_paths", None)
+    if cache is None:
+        cache = host._player_loaded_paths = {}
+    entry = cache.get(id(player))
+    if entry is None or entry[0] is not player:
+        entry = cache[id(player)] = (player, host._safe_mpv_get(player, "path", "") or "")
+    return entry[1]
+
+def _remember_loaded_media(host, player, path):
+    if player is None: return
+    cache = getattr(host, "_player_loaded_paths", None)
+    if cache is None:
+        cache = host._player_loaded_paths = {}
+    cache[id(player)] = (player, path or "")
+
+def _forget_loaded_media(host, player=None):
+    cache = getattr(host, "_player_loaded_paths", None)
+    if not cache: return
+    if player is None: cache.clear()
+    else: cache.pop(id(player), None)
+
+def _prefix_index(host, attr, items, duration_of):
+    """Cumulative start/end times over items, cached on host until the list is replaced or resized."""
+    cached = getattr(host, attr, None)
+    if cached is not None and cached[0] is items and cached[1] == len(items):
+        return cached[2]
+    starts, ends, elapsed = [], [], 0.0
+    for item in items:
+        starts.append(elapsed); elapsed += duration_of(item); ends.append(elapsed)
+    built = (starts, ends, elapsed)
+    setattr(host, attr, (items, len(items), built))
+    return built
+
+def _locate_segment(starts, ends, t):
+    i = max(0, bisect_right(starts, t) - 1)
+    return i if i < len(ends) and ends[i] > t else -1
+
+def _locate_video_segment(host, project_time):
+    starts, ends, total = _prefix_index(host, "_video_time_index", host.video_segments, lambda seg: seg["duration"])
+    idx = _locate_segment(starts, ends, project_time)
+    if idx == -1:
+        return 0, total
+    return idx, starts[idx]
+
+def _locate_music_track(host, project_time):
+    starts, ends, _total = _prefix_index(host, "_music_time_index", host.selected_tracks, lambda track: track[2])
+    idx = _locate_segment(starts, ends, project_time)
+    if idx == -1:
+        return -1, 0.0
+    return idx, (project_time - starts[idx]) + host.selected_tracks[idx][1]
+
 class MergerMusicWizardTimelineMixin:
     def _payload_to_pixmap(self, payload):
         try:
@@ -47,6 +101,7 @@ class MergerMusicWizardTimelineMixin:
     def _safe_mpv_loadfile(self, player, path, start_sec=None):
         if not player or not path:
             return False
+        _forget_loaded_media(self, player)
 
         import mpv
         if not hasattr(self, "_mpv_lock"):
@@ -54,6 +109,7 @@ class MergerMusicWizardTimelineMixin:
                 if getattr(player, '_core_shutdown', False): return False
                 if start_sec is None: player.command("loadfile", path, "replace")
                 else: player.command("loadfile", path, "replace", f"start={float(start_sec or 0.0):.3f}")
+                _remember_loaded_media(self, player, path)
                 return True
             except (AttributeError, mpv.ShutdownError): return False
             except Exception: return False
@@ -66,6 +122,7 @@ class MergerMusicWizardTimelineMixin:
             else:
                 safe_start = max(0.0, float(start_sec or 0.0))
                 player.command("loadfile", path, "replace", f"start={safe_start:.3f}")
+            _remember_loaded_media(self, player, path)
             return True
         except (AttributeError, mpv.ShutdownError):
             return False
@@ -107,6 +164,7 @@ class MergerMusicWizardTimelineMixin:
                 except Exception as ex:
                     last_err = ex
             self.logger.debug(f"WIZARD_TIMELINE: seek failed ({label} @ {safe_target:.3f}s): {last_err}")
+            _forget_loaded_media(self, player)
             return False
         finally:
             self._mpv_lock.release()
@@ -193,14 +251,10 @@ class MergerMusicWizardTimelineMixin:
         is_paused = self._safe_mpv_get(music_player, "pause", True)
         if is_paused:
             return
-        elapsed = 0.0; target_idx = -1; music_offset = 0.0
-        for i, (path, start_off, dur) in enumerate(self.selected_tracks):
-            if elapsed + dur > project_time:
-                target_idx = i; music_offset = (project_time - elapsed) + start_off; break
-            elapsed += dur
+        target_idx, music_offset = _locate_music_track(self, project_time)
         if target_idx != -1:
             target_m_path = self.selected_tracks[target_idx][0]
-            curr_m_path = self._safe_mpv_get(music_player, "path", "")
+            curr_m_path = _loaded_media_path(self, music_player)
             used_start_load = False
             if target_m_path != curr_m_path:
                 used_start_load = self._safe_mpv_loadfile(music_player, target_m_path, start_sec=music_offset)
@@ -214,6 +268,7 @@ class MergerMusicWizardTimelineMixin:
         else:
             try: music_player.stop()
             except: pass
+            _forget_loaded_media(self, music_player)
             self._last_m_mrl = ""
 
     def _ensure_step3_seek_timer(self):
@@ -298,29 +353,20 @@ class MergerMusicWizardTimelineMixin:
             self._sync_all_players_to_time(target_sec)
         if not self.player: return
         music_player = getattr(self, "_music_player", None)
-        elapsed = 0.0; target_video_idx = 0; video_offset = 0.0
-        for i, seg in enumerate(self.video_segments):
-            if elapsed + seg["duration"] > timeline_sec:
-                target_video_idx = i; video_offset = timeline_sec - elapsed; break
-            elapsed += seg["duration"]
-        self._current_elapsed_offset = elapsed
+        target_video_idx, self._current_elapsed_offset = _locate_video_segment(self, timeline_sec)
         target_v_path = self.video_segments[target_video_idx]["path"]
-        elapsed_m = 0.0; target_music_idx = -1; music_offset = 0.0
-        for i, (path, start_off, dur) in enumerate(self.selected_tracks):
-            if elapsed_m + dur > timeline_sec:
-                target_music_idx = i; music_offset = (timeline_sec - elapsed_m) + start_off; break
-            elapsed_m += dur
+        target_music_idx, music_offset = _locate_music_track(self, timeline_sec)
 
         def _norm(p):
             if not p: return ""
             return os.path.normpath(p).lower()
-        curr_v_path = _norm(self._safe_mpv_get(self.player, "path", ""))
+        curr_v_path = _norm(_loaded_media_path(self, self.player))
         if _norm(target_v_path) != curr_v_path:
             self._safe_mpv_loadfile(self.player, target_v_path)
         if music_player:
             if target_music_idx != -1:
                 target_m_path = self.selected_tracks[target_music_idx][0]
-                curr_m_path = _norm(self._safe_mpv_get(music_player, "path", ""))
+                curr_m_path = _norm(_loaded_media_path(self, music_player))
                 used_start_load = False
                 if _norm(target_m_path) != curr_m_path:
                     used_start_load = self._safe_mpv_loadfile(music_player, target_m_path, start_sec=music_offset)
@@ -332,6 +378,7 @@ class MergerMusicWizardTimelineMixin:
             else:
                 try: music_player.stop()
                 except: pass
+                _forget_loaded_media(self, music_player)
                 self._last_m_mrl = ""
         real_v_pos_ms = self._project_time_to_source_ms(timeline_sec)
         self._safe_mpv_seek(self.player, real_v_pos_ms / 1000.0, exact_first=bool(seek_exact), label="video_player")
@@ -369,8 +416,8 @@ class MergerMusicWizardTimelineMixin:
     def _prepare_timeline_data(self):
         videos = []; video_info_list = []
         if hasattr(self.parent_window, "listw"):
-            for i in range(self.parent_window.listw.count()):
-                it = self.parent_window.listw.item(i); p = it.data(Qt.UserRole); probe_data = it.data(Qt.UserRole + 1) or {}
+            for clip in self.parent_window.listw.clip_model.entries():
+                p = clip["path"]; probe_data = clip["probe_data"] or {}
                 dur = float(probe_data.get("format", {}).get("duration", 0.0))
                 videos.append({"path": p, "duration": dur, "thumbs": []}); video_info_list.append((p, dur, 0.0, 1.0))
         else:
@@ -380,6 +427,7 @@ class MergerMusicWizardTimelineMixin:
                 videos.append({"path": p, "duration": dur, "thumbs": []})
                 video_info_list.append((p, dur, self.trim_start_ms, self.speed_factor))
         self.video_segments = videos
+        self._video_time_index = None
         music = []; music_segments_info = []
         if self.selected_tracks:
             for p, offset, dur in self.selected_tracks:
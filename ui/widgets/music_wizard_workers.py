@@ -1,18 +1,20 @@
 ﻿import os
 import sys
 import time
-import hashlib
 import shutil
 import tempfile
 import subprocess
 import logging
+import json
 import atexit
+import threading
 from pathlib import Path
 from typing import Any, Sequence
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from PyQt5 import QtCore
 from PyQt5.QtCore import pyqtSignal
 from PyQt5.QtGui import QPixmap
+from system.asset_keys import read_file_bytes, media_signature, hash_key, source_fingerprint, key_lock
 
 class ProcessRegistry:
     _processes = set()
@@ -54,57 +56,298 @@ def _kill_process_tree(proc: Any | None) -> None:
         except Exception:
             pass
 _CACHE_ROOT = Path(tempfile.gettempdir()) / "fvs_timeline_cache"
+CACHE_MANIFEST_NAME = "index.json"
+CACHE_BYTE_BUDGETS = {"video": 512 * 1024 * 1024, "wave": 128 * 1024 * 1024, "track": 768 * 1024 * 1024, "poster": 96 * 1024 * 1024}
+CACHE_MAX_AGE_SEC = 7 * 24 * 3600
+CACHE_RECONCILE_INTERVAL_SEC = 24 * 3600
+CACHE_LOW_WATER = 0.9
+_INDEXES: dict[str, "AssetCacheIndex"] = {}
+_INDEXES_GUARD = threading.Lock()
 
-def _read_file_bytes(path: str) -> bytes | None:
+def _remove_cache_path(p: Path) -> None:
     try:
-        with open(path, "rb") as f:
-            data = f.read()
-        return data if data else None
+        if p.is_dir():
+            shutil.rmtree(p, ignore_errors=True)
+        else:
+            p.unlink(missing_ok=True)
     except Exception:
-        return None
+        pass
 
-def _safe_media_signature(path: str) -> tuple[int, int]:
+def _cache_path_size(p: Path) -> int:
     try:
-        st = os.stat(path)
-        return int(getattr(st, "st_mtime_ns", int(st.st_mtime * 1_000_000_000))), int(st.st_size)
+        if p.is_dir():
+            return sum(c.stat().st_size for c in p.iterdir() if c.is_file())
+        return int(p.stat().st_size)
     except Exception:
-        return 0, 0
+        return 0
+
+def _acquire_file_lock(path: str, timeout: float = 1.0, stale_after: float = 10.0) -> int | None:
+    deadline = time.time() + timeout
+    while True:
+        try:
+            return os.open(path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+        except FileExistsError:
+            try:
+                if time.time() - os.path.getmtime(path) > stale_after:
+                    os.remove(path)
+                    continue
+            except Exception:
+                pass
+            if time.time() >= deadline:
+                return None
+            time.sleep(0.02)
+        except Exception:
+            return None
 
-def _hash_key(parts: Sequence[Any]) -> str:
-    raw = "||".join(str(p) for p in parts)
-    return hashlib.sha1(raw.encode("utf-8", errors="ignore")).hexdigest()
+def _release_file_lock(fd: int, path: str) -> None:
+    try: os.close(fd)
+    except Exception: pass
+    try: os.remove(path)
+    except Exception: pass
 
-def _prune_cache_dir(cache_dir: Path, *, max_entries: int = 500, max_age_seconds: int = 7 * 24 * 3600) -> None:
-    try:
-        if not cache_dir.exists():
-            return
-        now = time.time()
-        entries = []
-        for p in cache_dir.iterdir():
+class AssetCacheIndex:
+    """Manifest for one cache bucket (key -> size, last access, source fingerprint) with LRU eviction under a byte budget."""
+
+    def __init__(self, directory: Path, byte_budget: int):
+        self.directory = Path(directory)
+        self.byte_budget = max(0, int(byte_budget))
+        self.manifest_path = self.directory / CACHE_MANIFEST_NAME
+        self._lock = threading.RLock()
+        self._entries: dict[str, dict] = {}
+        self._removed: set[str] = set()
+        self._total = 0
+        self._dirty = False
+        self._replace_on_flush = False
+        self._reconciled_at = 0.0
+        entries, reconciled_at = self._read_manifest()
+        if entries is None or time.time() - reconciled_at > CACHE_RECONCILE_INTERVAL_SEC:
+            self.reconcile()
+        else:
+            self._entries, self._reconciled_at = entries, reconciled_at
+            self._total = sum(int(e.get("size") or 0) for e in entries.values())
+
+    def _read_manifest(self) -> tuple[dict | None, float]:
+        try:
+            with open(self.manifest_path, "r", encoding="utf-8") as f: data = json.load(f)
+            if isinstance(data.get("entries"), dict):
+                return data["entries"], float(data.get("reconciled_at") or 0.0)
+        except Exception:
+            pass
+        return None, 0.0
+
+    def reconcile(self) -> None:
+        """The only full directory walk: rebuilds the manifest from disk and clears abandoned temp entries."""
+        with self._lock:
+            now = time.time(); old = self._entries; entries = {}
             try:
-                mtime = p.stat().st_mtime
-                if now - mtime > max_age_seconds:
-                    if p.is_dir():
-                        shutil.rmtree(p, ignore_errors=True)
-                    else:
-                        p.unlink(missing_ok=True)
+                children = list(self.directory.iterdir()) if self.directory.is_dir() else []
+            except Exception:
+                children = []
+            for p in children:
+                if p.name.startswith(CACHE_MANIFEST_NAME):
+                    continue
+                try:
+                    mtime = p.stat().st_mtime
+                except Exception:
                     continue
-                entries.append((mtime, p))
+                if p.name.startswith("."):
+                    if now - mtime > 3600: _remove_cache_path(p)
+                    continue
+                prev = old.get(p.name) or {}
+                entries[p.name] = {"size": _cache_path_size(p), "last_access": max(mtime, float(prev.get("last_access") or 0.0)), "fingerprint": prev.get("fingerprint", "")}
+            self._entries = entries
+            self._total = sum(e["size"] for e in entries.values())
+            self._reconciled_at = now
+            self._dirty = self._replace_on_flush = True
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def total_bytes(self) -> int:
+        return self._total
+
+    def lookup(self, key: str, fingerprint: str | None = None) -> Path | None:
+        """O(1) hit test: one manifest probe plus one existence check on the entry itself."""
+        path = self.directory / key
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                if not path.exists():
+                    return None
+                self.record(key, fingerprint, enforce=False)
+                return path
+            if (fingerprint and entry.get("fingerprint") and entry["fingerprint"] != fingerprint) or not path.exists():
+                self.discard(key)
+                return None
+            entry["last_access"] = time.time(); self._dirty = True
+            return path
+
+    def record(self, key: str, fingerprint: str | None = None, *, enforce: bool = True) -> None:
+        size = _cache_path_size(self.directory / key)
+        with self._lock:
+            prev = self._entries.get(key)
+            if prev: self._total -= int(prev.get("size") or 0)
+            self._entries[key] = {"size": size, "last_access": time.time(), "fingerprint": fingerprint or ""}
+            self._total += size
+            self._removed.discard(key); self._dirty = True
+            if enforce and self._total > self.byte_budget:
+                self.enforce_budget()
+
+    def discard(self, key: str) -> None:
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            if entry: self._total -= int(entry.get("size") or 0)
+            self._removed.add(key); self._dirty = True
+        _remove_cache_path(self.directory / key)
+
+    def enforce_budget(self) -> int:
+        """Drops expired entries, then least recently used ones down to the low-water mark; returns how many went."""
+        with self._lock:
+            now = time.time()
+            victims = [k for k, e in self._entries.items() if now - float(e.get("last_access") or 0.0) > CACHE_MAX_AGE_SEC]
+            for k in victims: self.discard(k)
+            evicted = len(victims)
+            if self._total > self.byte_budget:
+                low_water = int(self.byte_budget * CACHE_LOW_WATER)
+                for k in sorted(self._entries, key=lambda k: float(self._entries[k].get("last_access") or 0.0)):
+                    if self._total <= low_water: break
+                    self.discard(k); evicted += 1
+            return evicted
+
+    def flush(self) -> bool:
+        """Merges with entries other processes published since our last write, then atomically rewrites the manifest."""
+        with self._lock:
+            if not self._dirty:
+                return True
+            try:
+                self.directory.mkdir(parents=True, exist_ok=True)
             except Exception:
-                continue
-        if len(entries) <= max_entries:
-            return
-        entries.sort(key=lambda t: t[0])
-        for _, p in entries[: max(0, len(entries) - max_entries)]:
+                return False
+            lock_path = f"{self.manifest_path}.lock"
+            fd = _acquire_file_lock(lock_path)
+            if fd is None:
+                return False
             try:
-                if p.is_dir():
-                    shutil.rmtree(p, ignore_errors=True)
-                else:
-                    p.unlink(missing_ok=True)
+                if not self._replace_on_flush:
+                    disk, _ = self._read_manifest()
+                    for key, entry in (disk or {}).items():
+                        if key in self._removed or not isinstance(entry, dict): continue
+                        mine = self._entries.get(key)
+                        if mine is None:
+                            self._entries[key] = entry; self._total += int(entry.get("size") or 0)
+                        elif float(entry.get("last_access") or 0.0) > float(mine.get("last_access") or 0.0):
+                            mine["last_access"] = entry["last_access"]
+                tmp = f"{self.manifest_path}.{os.getpid()}.tmp"
+                with open(tmp, "w", encoding="utf-8") as f:
+                    json.dump({"version": 1, "reconciled_at": self._reconciled_at, "entries": self._entries}, f, separators=(",", ":"))
+                os.replace(tmp, self.manifest_path)
+                self._dirty = self._replace_on_flush = False
+                self._removed.clear()
+                return True
             except Exception:
-                pass
+                return False
+            finally:
+                _release_file_lock(fd, lock_path)
+
+def cache_bucket(name: str) -> Path:
+    return _CACHE_ROOT / name
+
+def cache_index(directory: Path) -> AssetCacheIndex:
+    directory = Path(directory)
+    with _INDEXES_GUARD:
+        index = _INDEXES.get(str(directory))
+        if index is None:
+            index = _INDEXES[str(directory)] = AssetCacheIndex(directory, CACHE_BYTE_BUDGETS.get(directory.name, 256 * 1024 * 1024))
+        return index
+
+def _publish_dir(tmp_dir: Path, final_dir: Path) -> bool:
+    """Atomically moves a fully written entry into the shared cache; a concurrent writer that got there first wins."""
+    try:
+        if final_dir.exists():
+            return True
+        os.replace(tmp_dir, final_dir)
+        return True
+    except Exception:
+        return final_dir.exists()
+    finally:
+        if tmp_dir.exists():
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+
+def _link_or_copy(src: str, dst: str) -> bool:
+    try:
+        os.link(src, dst)
+        return True
     except Exception:
         pass
+    try:
+        shutil.copy2(src, dst)
+        return True
+    except Exception:
+        return False
+
+def load_filmstrip(cache_dir: Path) -> list[bytes]:
+    try:
+        if not cache_dir.is_dir():
+            return []
+        thumbs = [read_file_bytes(str(cache_dir / f)) for f in sorted(os.listdir(cache_dir)) if f.endswith(".jpg")]
+        return [t for t in thumbs if t]
+    except Exception:
+        return []
+
+def store_filmstrip(cache_dir: Path, thumbs: Sequence[bytes]) -> bool:
+    if not thumbs:
+        return False
+    try:
+        cache_dir.parent.mkdir(parents=True, exist_ok=True)
+        tmp_dir = Path(tempfile.mkdtemp(prefix=f".{cache_dir.name}.", dir=str(cache_dir.parent)))
+        for n, blob in enumerate(thumbs, 1):
+            with open(tmp_dir / f"thumb_{n:04d}.jpg", "wb") as f: f.write(blob)
+        return _publish_dir(tmp_dir, cache_dir)
+    except Exception:
+        return False
+
+def track_cache_dir(path: str) -> Path:
+    sig = media_signature(path)
+    return _CACHE_ROOT / "track" / hash_key(("track", path, sig[0], sig[1], "v1"))
+
+def restore_track_assets(path: str) -> tuple[float, str, str] | None:
+    """Hands out private temp copies of a cached step-2 waveform and sync WAV, or None on a miss."""
+    entry = track_cache_dir(path)
+    index = cache_index(entry.parent)
+    if index.lookup(entry.name, source_fingerprint(path)) is None:
+        return None
+    try:
+        with open(entry / "meta.json", "r", encoding="utf-8") as f: duration = float(json.load(f).get("duration") or 0.0)
+        png = tempfile.NamedTemporaryFile(prefix="fvs_wave_", suffix=".png", delete=False); png.close()
+        wav = tempfile.NamedTemporaryFile(prefix="fvs_sync_", suffix=".wav", delete=False); wav.close()
+        os.remove(png.name); os.remove(wav.name)
+        if _link_or_copy(str(entry / "wave.png"), png.name) and _link_or_copy(str(entry / "sync.wav"), wav.name):
+            index.flush()
+            return duration, png.name, wav.name
+        for leftover in (png.name, wav.name):
+            if os.path.exists(leftover): os.remove(leftover)
+    except Exception:
+        pass
+    index.discard(entry.name); index.flush()
+    return None
+
+def store_track_assets(path: str, duration: float, png_path: str, wav_path: str) -> bool:
+    entry = track_cache_dir(path)
+    try:
+        entry.parent.mkdir(parents=True, exist_ok=True)
+        tmp_dir = Path(tempfile.mkdtemp(prefix=f".{entry.name}.", dir=str(entry.parent)))
+        ok = _link_or_copy(png_path, str(tmp_dir / "wave.png")) and _link_or_copy(wav_path, str(tmp_dir / "sync.wav"))
+        if not ok:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+            return False
+        with open(tmp_dir / "meta.json", "w", encoding="utf-8") as f: json.dump({"duration": float(duration or 0.0), "source": path}, f)
+        if not _publish_dir(tmp_dir, entry):
+            return False
+        index = cache_index(entry.parent)
+        index.record(entry.name, source_fingerprint(path)); index.flush()
+        return True
+    except Exception:
+        return False
 
 class VideoFilmstripWorker(QtCore.QThread):
     asset_ready = pyqtSignal(int, object, str)
@@ -135,8 +378,8 @@ class VideoFilmstripWorker(QtCore.QThread):
             _kill_process_tree(p)
 
     def _cache_path(self, path: str, duration: float, t_start: float, speed: float) -> Path:
-        sig = _safe_media_signature(path)
-        key = _hash_key(("video", path, sig[0], sig[1], round(float(duration or 0.0), 3), round(float(t_start), 3), round(float(speed), 3), str(self.speed_segments), self.stage, "vGPU_v3_chunked"))
+        sig = media_signature(path)
+        key = hash_key(("video", path, sig[0], sig[1], round(float(duration or 0.0), 3), round(float(t_start), 3), round(float(speed), 3), str(self.speed_segments), self.stage, "vGPU_v3_chunked"))
         return self.cache_dir / key
 
     def _segment_settings(self, duration: float) -> tuple[float, str, str]:
@@ -196,7 +439,7 @@ class VideoFilmstripWorker(QtCore.QThread):
                 files = sorted([f for f in os.listdir(tmp_pattern_dir) if f.endswith(".jpg")])
                 for f in files:
                     src = os.path.join(tmp_pattern_dir, f)
-                    blob = _read_file_bytes(src)
+                    blob = read_file_bytes(src)
                     if blob:
                         thumbs.append(blob)
         except Exception as e:
@@ -239,7 +482,7 @@ class VideoFilmstripWorker(QtCore.QThread):
                 tmp_thumb,
             ]
             subprocess.run(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, creationflags=flags, timeout=12)
-            blob = _read_file_bytes(tmp_thumb)
+            blob = read_file_bytes(tmp_thumb)
             if blob:
                 return orig_idx, [blob]
         except Exception:
@@ -252,13 +495,32 @@ class VideoFilmstripWorker(QtCore.QThread):
                     pass
         return orig_idx, []
 
+    def _cached_chunk(self, info: tuple) -> tuple[int, list[bytes]]:
+        path, duration, t_start, speed, orig_idx = info
+        cache_path = self._cache_path(path, duration, t_start, speed)
+        index = cache_index(self.cache_dir)
+        fingerprint = source_fingerprint(path)
+        with key_lock(cache_path.name):
+            if index.lookup(cache_path.name, fingerprint) is not None:
+                thumbs = load_filmstrip(cache_path)
+                if thumbs or not self._running:
+                    return orig_idx, thumbs
+                index.discard(cache_path.name)
+            if not self._running:
+                return orig_idx, []
+            orig_idx, thumbs = self._render_chunk(info)
+            if thumbs and self._running and store_filmstrip(cache_path, thumbs):
+                index.record(cache_path.name, fingerprint)
+            return orig_idx, thumbs
+
     def run(self):
         logger = logging.getLogger("Video_Merger")
         logger.info("GPU_WORKER[%s]: Initializing extraction.", self.stage)
+        index = cache_index(self.cache_dir)
         try:
             final_results = {}
             with ThreadPoolExecutor(max_workers=max(1, int(self.max_workers or 2))) as pool:
-                future_to_info = {pool.submit(self._render_chunk, info): info for info in self.video_segments_info}
+                future_to_info = {pool.submit(self._cached_chunk, info): info for info in self.video_segments_info}
                 for fut in as_completed(future_to_info):
                     if not self._running:
                         break
@@ -277,6 +539,7 @@ class VideoFilmstripWorker(QtCore.QThread):
                         self.asset_ready.emit(orig_idx, list(chunk_thumbs), self.stage)
         finally:
             self.stop()
+            index.flush()
             self.finished.emit(self.stage)
 
 class MusicWaveformWorker(QtCore.QThread):
@@ -306,8 +569,8 @@ class MusicWaveformWorker(QtCore.QThread):
             _kill_process_tree(p)
 
     def _wave_cache_path(self, path: str, offset: float, dur: float) -> Path:
-        sig = _safe_media_signature(path)
-        key = _hash_key(
+        sig = media_signature(path)
+        key = hash_key(
             (
                 "wave",
                 path,
@@ -331,13 +594,13 @@ class MusicWaveformWorker(QtCore.QThread):
         if not self._running:
             return i, None
         cache_path = self._wave_cache_path(path, offset, dur)
-        try:
-            if cache_path.exists():
-                blob = _read_file_bytes(str(cache_path))
-                if blob:
-                    return i, blob
-        except Exception:
-            pass
+        index = cache_index(self.cache_dir)
+        fingerprint = source_fingerprint(path)
+        if index.lookup(cache_path.name, fingerprint) is not None:
+            blob = read_file_bytes(str(cache_path))
+            if blob:
+                return i, blob
+            index.discard(cache_path.name)
         ffmpeg_exe = os.path.join(self.bin_dir, "ffmpeg.exe")
         flags = subprocess.CREATE_NO_WINDOW if sys.platform == "win32" else 0
         tmp_path = ""
@@ -370,11 +633,12 @@ class MusicWaveformWorker(QtCore.QThread):
                 _kill_process_tree(proc)
                 return i, None
             if os.path.exists(tmp_path):
-                blob = _read_file_bytes(tmp_path)
+                blob = read_file_bytes(tmp_path)
                 if blob:
                     try:
                         self.cache_dir.mkdir(parents=True, exist_ok=True)
                         shutil.copy2(tmp_path, cache_path)
+                        index.record(cache_path.name, fingerprint)
                     except Exception:
                         pass
                     return i, blob
@@ -392,7 +656,7 @@ class MusicWaveformWorker(QtCore.QThread):
                     pass
         try:
             if cache_path.exists():
-                blob = _read_file_bytes(str(cache_path))
+                blob = read_file_bytes(str(cache_path))
                 if blob:
                     return i, blob
         except Exception:
@@ -403,7 +667,7 @@ class MusicWaveformWorker(QtCore.QThread):
         logger = logging.getLogger("Video_Merger")
         logger.info("CPU_WORKER[%s]: Initializing ordered waveform generation.", self.stage)
         self.cache_dir.mkdir(parents=True, exist_ok=True)
-        _prune_cache_dir(self.cache_dir, max_entries=900)
+        index = cache_index(self.cache_dir)
         try:
             for i, (path, offset, dur) in enumerate(self.music_segments_info):
                 if not self._running:
@@ -417,6 +681,7 @@ class MusicWaveformWorker(QtCore.QThread):
                     self.asset_ready.emit(wave_idx, blob, self.stage)
         finally:
             self.stop()
+            index.flush()
             self.finished.emit(self.stage)
 
 class SingleWaveformWorker(QtCore.QThread):
@@ -474,6 +739,16 @@ class SingleWaveformWorker(QtCore.QThread):
         logger = logging.getLogger("Video_Merger")
         if not self._running or not self.track_path:
             return
+        cached = restore_track_assets(self.track_path)
+        if cached:
+            duration, tmp_png, tmp_sync = cached
+            pm = QPixmap(tmp_png)
+            if not pm.isNull():
+                logger.info("WIZARD_STEP2: Reusing cached waveform for %s", os.path.basename(self.track_path))
+                self.ready.emit(self.track_path, duration, pm, tmp_png, tmp_sync)
+                return
+            for leftover in (tmp_png, tmp_sync):
+                if os.path.exists(leftover): os.remove(leftover)
         ffmpeg_exe = os.path.join(self.bin_dir, "ffmpeg.exe")
         flags = getattr(subprocess, "CREATE_NO_WINDOW", 0) if sys.platform == "win32" else 0
         tf_sync = tempfile.NamedTemporaryFile(prefix="fvs_sync_", suffix=".wav", delete=False)
@@ -550,6 +825,7 @@ class SingleWaveformWorker(QtCore.QThread):
                 if os.path.exists(tmp_png): os.remove(tmp_png)
                 if os.path.exists(tmp_sync): os.remove(tmp_sync)
                 return
+            store_track_assets(self.track_path, duration, tmp_png, tmp_sync)
             self.ready.emit(self.track_path, duration, pm, tmp_png, tmp_sync)
         except Exception as e:
             _kill_process_tree(self._proc)
@@ -0,0 +1,101 @@
+from PyQt5.QtCore import QRectF, QTimer
+from PyQt5.QtGui import QPainter, QColor, QPixmap
+TIMELINE_TILE_W = 256
+TILE_RESIZE_SETTLE_MS = 180
+
+class TiledTimelineMixin:
+    """Tile cache for the wizard timelines; the host supplies _paint_background(p, w, h, clip_x0, clip_x1)."""
+
+    def _init_tiles(self):
+        self._needs_repaint = True
+        self._tiles = {}
+        self._tile_w = 0
+        self._tile_h = 0
+        self._tile_structure = None
+        self._asset_keys = ([], [])
+        self._resize_settle = QTimer(self)
+        self._resize_settle.setSingleShot(True)
+        self._resize_settle.timeout.connect(self._on_resize_settled)
+
+    def resizeEvent(self, event):
+        if self._tiles and self.height() == self._tile_h:
+            self._resize_settle.start(TILE_RESIZE_SETTLE_MS)
+        else:
+            self._tiles.clear()
+        super().resizeEvent(event)
+
+    def _on_resize_settled(self):
+        if self._tile_w != self.width():
+            self._tiles.clear()
+            self.update()
+
+    def _segment_spans(self, segments, w):
+        spans, x = [], 0.0
+        for seg in segments:
+            seg_w = (seg.get("duration", 0) / self.total_duration) * w
+            spans.append((x, seg_w))
+            x += seg_w
+        return spans
+
+    def _current_asset_keys(self):
+        video = [tuple(t.cacheKey() for t in (seg.get("thumbs") or [])) for seg in self.video_segments]
+        music = []
+        for seg in self.music_segments:
+            wave = seg.get("wave")
+            music.append(wave.cacheKey() if wave is not None and not wave.isNull() else 0)
+        return video, music
+
+    def _invalidate_span(self, x, seg_w):
+        if self._tile_w <= 0: return
+        first = max(0, int((x - 3.0) // TIMELINE_TILE_W))
+        last = int((x + seg_w + 3.0) // TIMELINE_TILE_W)
+        for idx in range(first, last + 1):
+            self._tiles.pop(idx, None)
+
+    def _refresh_tiles(self):
+        """Drops only the tiles whose segments received new thumbnails or waveforms since the last paint."""
+        structure = (round(self.total_duration, 6), tuple(round(float(s.get("duration", 0)), 6) for s in self.video_segments), tuple(round(float(s.get("duration", 0)), 6) for s in self.music_segments))
+        video_keys, music_keys = self._current_asset_keys()
+        if structure != self._tile_structure:
+            self._tiles.clear()
+        else:
+            old_video, old_music = self._asset_keys
+            for spans, new, old in ((self._segment_spans(self.video_segments, self._tile_w), video_keys, old_video), (self._segment_spans(self.music_segments, self._tile_w), music_keys, old_music)):
+                for i, (x, seg_w) in enumerate(spans):
+                    if i >= len(old) or new[i] != old[i]:
+                        self._invalidate_span(x, seg_w)
+        self._tile_structure = structure
+        self._asset_keys = (video_keys, music_keys)
+        self._needs_repaint = False
+
+    def _render_tile(self, idx, w, h):
+        x0 = idx * TIMELINE_TILE_W
+        tile = QPixmap(max(1, min(TIMELINE_TILE_W, w - x0)), h)
+        tile.fill(QColor(15, 25, 35))
+        p = QPainter(tile)
+        p.translate(-x0, 0)
+        p.setClipRect(QRectF(x0, 0, tile.width(), h))
+        self._paint_background(p, w, h, x0, x0 + tile.width())
+        p.end()
+        return tile
+
+    def _paint_tiles(self, p, event):
+        """Blits the cached tiles under the dirty rect, scaling the old set while a resize settles."""
+        w_i, h_i = self.width(), self.height()
+        scaling = bool(self._tiles) and self._tile_w != w_i and self._resize_settle.isActive()
+        if not scaling and (self._tile_w != w_i or self._tile_h != h_i):
+            self._tiles.clear()
+            self._tile_w, self._tile_h = w_i, h_i
+        if self._needs_repaint:
+            self._refresh_tiles()
+        sx = float(w_i) / float(self._tile_w) if scaling else 1.0
+        if scaling: p.setRenderHint(QPainter.SmoothPixmapTransform, True)
+        dirty = QRectF(event.rect()) if event is not None else QRectF(0, 0, w_i, h_i)
+        for idx in range((self._tile_w + TIMELINE_TILE_W - 1) // TIMELINE_TILE_W):
+            x0 = idx * TIMELINE_TILE_W
+            dest = QRectF(x0 * sx, 0, min(TIMELINE_TILE_W, self._tile_w - x0) * sx, h_i)
+            if not dest.intersects(dirty): continue
+            tile = self._tiles.get(idx)
+            if tile is None:
+                tile = self._tiles[idx] = self._render_tile(idx, self._tile_w, self._tile_h)
+            p.drawPixmap(dest, tile, QRectF(tile.rect()))
@@ -0,0 +1,264 @@
+﻿import os
+import uuid
+from collections import Counter
+from PyQt5.QtCore import Qt, QAbstractListModel, QModelIndex, QMimeData, QRect, QRectF, QSize, QEvent, pyqtSignal
+from PyQt5.QtGui import QColor, QFont, QPainter, QPen, QLinearGradient
+from PyQt5.QtWidgets import QStyledItemDelegate, QStyle
+PATH_ROLE = Qt.UserRole
+PROBE_ROLE = Qt.UserRole + 1
+HASH_ROLE = Qt.UserRole + 2
+CLIP_ID_ROLE = Qt.UserRole + 3
+ROWS_MIME = "application/x-fvs-merger-rows"
+
+def _probe_duration(probe_data):
+    try:
+        return max(0.0, float(((probe_data or {}).get("format") or {}).get("duration") or 0.0))
+    except Exception:
+        return 0.0
+
+def _contiguous_runs(rows):
+    runs = []
+    for r in rows:
+        if runs and r == runs[-1][1] + 1:
+            runs[-1][1] = r
+        else:
+            runs.append([r, r])
+    return runs
+
+def make_clip_entry(path, probe_data=None, f_hash=None, clip_id=None):
+    return {"clip_id": clip_id or uuid.uuid4().hex, "path": path, "probe_data": probe_data, "f_hash": f_hash}
+
+class MergerClipListModel(QAbstractListModel):
+    """Merger clip rows with path, hash, clip-id and total-duration indexes kept in step with every edit."""
+    order_changed = pyqtSignal()
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._clips = []
+        self._rows_by_id = None
+        self._paths = Counter()
+        self._hashes = Counter()
+        self._total_duration = 0.0
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._clips)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid() or not (0 <= index.row() < len(self._clips)):
+            return None
+        clip = self._clips[index.row()]
+        if role == Qt.DisplayRole: return os.path.basename(str(clip["path"]))
+        if role in (Qt.ToolTipRole, PATH_ROLE): return clip["path"]
+        if role == PROBE_ROLE: return clip["probe_data"]
+        if role == HASH_ROLE: return clip["f_hash"]
+        if role == CLIP_ID_ROLE: return clip["clip_id"]
+        return None
+
+    def flags(self, index):
+        if not index.isValid():
+            return Qt.ItemIsDropEnabled
+        return Qt.ItemIsEnabled | Qt.ItemIsSelectable | Qt.ItemIsDragEnabled
+
+    def supportedDropActions(self):
+        return Qt.MoveAction
+
+    def mimeTypes(self):
+        return [ROWS_MIME]
+
+    def mimeData(self, indexes):
+        mime = QMimeData()
+        mime.setData(ROWS_MIME, ",".join(str(i.row()) for i in indexes).encode("ascii"))
+        return mime
+
+    def _index_clip(self, clip, sign):
+        for counter, key in ((self._paths, clip["path"]), (self._hashes, clip["f_hash"])):
+            if not key: continue
+            counter[key] += sign
+            if counter[key] <= 0: del counter[key]
+        self._total_duration += sign * _probe_duration(clip["probe_data"])
+
+    def _reindex(self):
+        self._paths.clear(); self._hashes.clear(); self._total_duration = 0.0; self._rows_by_id = None
+        for clip in self._clips: self._index_clip(clip, 1)
+
+    def row_of(self, clip_id):
+        if self._rows_by_id is None:
+            self._rows_by_id = {c["clip_id"]: r for r, c in enumerate(self._clips)}
+        return self._rows_by_id.get(clip_id, -1)
+
+    def entry(self, row):
+        return dict(self._clips[row]) if 0 <= row < len(self._clips) else None
+
+    def entries(self):
+        return [dict(c) for c in self._clips]
+
+    def ordered_paths(self):
+        return [c["path"] for c in self._clips]
+
+    def has_path(self, path):
+        return path in self._paths
+
+    def has_hash(self, f_hash):
+        return f_hash in self._hashes
+
+    def paths(self):
+        return set(self._paths)
+
+    def hashes(self):
+        return set(self._hashes)
+
+    def total_duration(self):
+        return max(0.0, self._total_duration)
+
+    def _insert_run(self, row, clips):
+        self.beginInsertRows(QModelIndex(), row, row + len(clips) - 1)
+        self._clips[row:row] = clips
+        for clip in clips: self._index_clip(clip, 1)
+        self._rows_by_id = None
+        self.endInsertRows()
+
+    def insert_clips(self, entries):
+        """Insert entries at their recorded "row" (appending when absent); consecutive rows are inserted as one batch."""
+        run_row, run, rows = 0, [], []
+        for entry in entries:
+            clip = make_clip_entry(entry.get("path"), entry.get("probe_data"), entry.get("f_hash"), entry.get("clip_id"))
+            size = len(self._clips) + len(run)
+            row = size if entry.get("row") is None else max(0, min(int(entry["row"]), size))
+            if run and row != run_row + len(run):
+                self._insert_run(run_row, run); run = []
+                size = len(self._clips)
+                row = size if entry.get("row") is None else max(0, min(int(entry["row"]), size))
+            if not run: run_row = row
+            run.append(clip); rows.append(row)
+        if run: self._insert_run(run_row, run)
+        return rows
+
+    def remove_clip_ids(self, clip_ids):
+        """Remove the given clips in contiguous blocks; returns the removed entries with their former rows."""
+        rows = sorted({self.row_of(cid) for cid in clip_ids} - {-1})
+        removed = [dict(self._clips[r], row=r) for r in rows]
+        for start, end in reversed(_contiguous_runs(rows)):
+            self.beginRemoveRows(QModelIndex(), start, end)
+            for clip in self._clips[start:end + 1]: self._index_clip(clip, -1)
+            del self._clips[start:end + 1]
+            self._rows_by_id = None
+            self.endRemoveRows()
+        return removed
+
+    def clear_clips(self):
+        self.beginResetModel()
+        self._clips = []
+        self._reindex()
+        self.endResetModel()
+
+    def apply_order(self, clip_ids):
+        """Reorder rows to follow clip_ids (unknown ids are skipped, unlisted clips dropped); persistent indexes follow their clips."""
+        by_id = {c["clip_id"]: c for c in self._clips}
+        ordered, seen = [], set()
+        for cid in clip_ids:
+            if cid in by_id and cid not in seen:
+                ordered.append(by_id[cid]); seen.add(cid)
+        if len(ordered) != len(self._clips):
+            self.beginResetModel()
+            self._clips = ordered
+            self._reindex()
+            self.endResetModel()
+        elif [c["clip_id"] for c in ordered] != [c["clip_id"] for c in self._clips]:
+            self.layoutAboutToBeChanged.emit()
+            new_rows = {c["clip_id"]: r for r, c in enumerate(ordered)}
+            persistent = self.persistentIndexList()
+            moved = [self.index(new_rows[self._clips[i.row()]["clip_id"]], 0) if 0 <= i.row() < len(self._clips) else QModelIndex() for i in persistent]
+            self._clips = ordered
+            self._rows_by_id = new_rows
+            self.changePersistentIndexList(persistent, moved)
+            self.layoutChanged.emit()
+        else:
+            return False
+        self.order_changed.emit()
+        return True
+
+    def move_rows(self, rows, dest_row):
+        """Move rows as one block so it lands where dest_row (a pre-move row) was."""
+        rows = sorted({int(r) for r in rows if 0 <= int(r) < len(self._clips)})
+        if not rows:
+            return False
+        dest = max(0, min(int(dest_row), len(self._clips)))
+        dest -= sum(1 for r in rows if r < dest)
+        moving = set(rows)
+        rest = [c["clip_id"] for r, c in enumerate(self._clips) if r not in moving]
+        return self.apply_order(rest[:dest] + [self._clips[r]["clip_id"] for r in rows] + rest[dest:])
+
+class MergerClipDelegate(QStyledItemDelegate):
+    """Paints a merger row (rank, clip card, preview button) from the model on demand."""
+    preview_requested = pyqtSignal(str)
+    ROW_H = 50
+    RANK_W = 45
+    GAP = 10
+    CARD_W = 500
+    BUTTON_W = 110
+    BUTTON_H = 32
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._rank_font = QFont(); self._rank_font.setPixelSize(16); self._rank_font.setBold(True)
+        self._label_font = QFont(); self._label_font.setPixelSize(13); self._label_font.setWeight(QFont.DemiBold)
+        self._label_bold = QFont(self._label_font); self._label_bold.setBold(True)
+        self._button_font = QFont(); self._button_font.setPixelSize(10); self._button_font.setBold(True)
+        self._pressed_row = -1
+
+    def sizeHint(self, option, index):
+        return QSize(self.RANK_W + self.GAP + self.CARD_W, self.ROW_H)
+
+    def row_rects(self, rect):
+        total = self.RANK_W + self.GAP + self.CARD_W
+        left = rect.left() + max(0, (rect.width() - total) // 2)
+        rank = QRect(left, rect.top(), self.RANK_W, self.ROW_H)
+        card = QRect(left + self.RANK_W + self.GAP, rect.top(), self.CARD_W, self.ROW_H)
+        button = QRect(card.right() - 10 - self.BUTTON_W, card.center().y() - self.BUTTON_H // 2, self.BUTTON_W, self.BUTTON_H)
+        label = QRect(card.left() + 15, card.top(), max(1, button.left() - 10 - card.left() - 15), card.height())
+        return rank, card, label, button
+
+    def paint(self, painter, option, index):
+        rank, card, label, button = self.row_rects(option.rect)
+        selected = bool(option.state & QStyle.State_Selected)
+        lit = selected or bool(option.state & QStyle.State_MouseOver)
+        painter.save()
+        try:
+            painter.setRenderHint(QPainter.Antialiasing)
+            painter.setFont(self._rank_font); painter.setPen(QColor("#7DD3FC"))
+            painter.drawText(rank, Qt.AlignRight | Qt.AlignVCenter, f"#{index.row() + 1}")
+            painter.setPen(QPen(QColor("#3498db" if lit else "#34495e"), 2))
+            painter.setBrush(QColor("#34495e" if lit else "#2c3e50"))
+            painter.drawRoundedRect(QRectF(card).adjusted(1, 1, -1, -1), 8, 8)
+            painter.setFont(self._label_bold if selected else self._label_font)
+            painter.setPen(QColor("#ffffff" if selected else "#ecf0f1"))
+            text = painter.fontMetrics().elidedText(str(index.data(Qt.DisplayRole) or ""), Qt.ElideRight, label.width())
+            painter.drawText(label, Qt.AlignLeft | Qt.AlignVCenter, text)
+            g = QLinearGradient(0, button.top(), 0, button.bottom())
+            if self._pressed_row == index.row():
+                g.setColorAt(0.0, QColor("#0d2c3d")); g.setColorAt(1.0, QColor("#1a5276"))
+            else:
+                g.setColorAt(0.0, QColor("#3a8db0")); g.setColorAt(0.1, QColor("#2d7da1")); g.setColorAt(1.0, QColor("#1a5276"))
+            painter.setPen(QPen(QColor(0, 0, 0, 150), 1)); painter.setBrush(g)
+            painter.drawRoundedRect(QRectF(button).adjusted(0.5, 0.5, -0.5, -0.5), 8, 8)
+            painter.setFont(self._button_font); painter.setPen(QColor("#ffffff"))
+            painter.drawText(button, Qt.AlignCenter, "▶  PREVIEW  ▶")
+        finally:
+            painter.restore()
+
+    def button_hit(self, rect, pos):
+        return self.row_rects(rect)[3].contains(pos)
+
+    def editorEvent(self, event, model, option, index):
+        etype = event.type()
+        if etype in (QEvent.MouseButtonPress, QEvent.MouseButtonDblClick, QEvent.MouseButtonRelease) and event.button() == Qt.LeftButton:
+            if self.button_hit(option.rect, event.pos()):
+                if etype == QEvent.MouseButtonRelease:
+                    self._pressed_row = -1
+                    path = index.data(PATH_ROLE)
+                    if path: self.preview_requested.emit(str(path))
+                else:
+                    self._pressed_row = index.row()
+                return True
+            self._pressed_row = -1
+        return super().editorEvent(event, model, option, index)
@@ -1,20 +1,30 @@
-﻿from PyQt5.QtWidgets import QListWidget, QAbstractItemView
-from PyQt5.QtCore import Qt, pyqtSignal
+﻿from PyQt5.QtWidgets import QListView, QAbstractItemView
+from PyQt5.QtCore import Qt, pyqtSignal, QItemSelection, QItemSelectionModel
 import os
+from utilities.merger_clip_model import MergerClipListModel, MergerClipDelegate, PATH_ROLE
 
-class MergerDraggableList(QListWidget):
+class MergerDraggableList(QListView):
     """
-    Standardized draggable list using QListWidget's built-in InternalMove.
-    Fixes performance issues (#7) and visual glitches (#10).
+    Virtualized draggable merger list: rows live in MergerClipListModel and are painted by MergerClipDelegate.
+    Internal drops reorder the model directly so no per-row widgets are ever created.
     """
     item_moved_signal = pyqtSignal(int, int)
     drag_started = pyqtSignal(int, str)
     drag_completed = pyqtSignal(int, int, str, str)
     drag_cancelled = pyqtSignal(int, str)
     files_dropped = pyqtSignal(list)
-    
+    itemSelectionChanged = pyqtSignal()
+    preview_requested = pyqtSignal(str)
+
     def __init__(self, parent=None):
         super().__init__(parent)
+        self.clip_model = MergerClipListModel(self)
+        self.setModel(self.clip_model)
+        self.clip_delegate = MergerClipDelegate(self)
+        self.setItemDelegate(self.clip_delegate)
+        self.clip_delegate.preview_requested.connect(self.preview_requested)
+        self.selectionModel().selectionChanged.connect(lambda *_: self.itemSelectionChanged.emit())
+        self.setObjectName("mergerClipList")
         self.setSelectionMode(QAbstractItemView.ExtendedSelection)
         self.setSelectionRectVisible(True)
         self.setDragEnabled(True)
@@ -25,35 +35,65 @@ class MergerDraggableList(QListWidget):
         self.setSpacing(5)
         self.setUniformItemSizes(True)
         self.setVerticalScrollMode(QAbstractItemView.ScrollPerPixel)
+        self.setMouseTracking(True)
+        self.viewport().setAttribute(Qt.WA_Hover, True)
         self._drag_start_row = -1
         self._drag_start_name = "Unknown"
 
+    def count(self):
+        return self.clip_model.rowCount()
+
+    def selected_rows(self):
+        return sorted(i.row() for i in self.selectionModel().selectedRows())
+
+    def select_rows(self, rows):
+        selection = QItemSelection()
+        for r in rows:
+            idx = self.clip_model.index(r, 0)
+            if idx.isValid(): selection.select(idx, idx)
+        self.selectionModel().select(selection, QItemSelectionModel.ClearAndSelect)
+        if rows:
+            self.selectionModel().setCurrentIndex(self.clip_model.index(rows[0], 0), QItemSelectionModel.NoUpdate)
+
+    def _row_name(self, row):
+        path = self.clip_model.index(row, 0).data(PATH_ROLE)
+        return os.path.basename(str(path)) if path else "Unknown"
+
+    def _drop_row(self, pos):
+        idx = self.indexAt(pos)
+        if not idx.isValid():
+            return self.count()
+        return idx.row() + (1 if pos.y() > self.visualRect(idx).center().y() else 0)
+
+    def mouseMoveEvent(self, event):
+        idx = self.indexAt(event.pos())
+        if idx.isValid() and self.clip_delegate.button_hit(self.visualRect(idx), event.pos()):
+            self.viewport().setCursor(Qt.PointingHandCursor)
+        else:
+            self.viewport().unsetCursor()
+        super().mouseMoveEvent(event)
+
     def startDrag(self, supportedActions):
-        self._drag_start_row = self.currentRow()
-        item = self.currentItem()
-        name = "Unknown"
-        if item:
-            name = os.path.basename(item.data(Qt.UserRole)) if item.data(Qt.UserRole) else item.text()
-        self._drag_start_name = name
-        self.drag_started.emit(self._drag_start_row, name)
+        self._drag_start_row = self.currentIndex().row()
+        self._drag_start_name = self._row_name(self._drag_start_row)
+        self.drag_started.emit(self._drag_start_row, self._drag_start_name)
         super().startDrag(supportedActions)
 
     def dropEvent(self, event):
         if event.source() == self:
             start = self._drag_start_row
             before_name = self._drag_start_name
-            super().dropEvent(event)
-            end = self.currentRow()
-            after_name = "Unknown"
-            item = self.item(end)
-            if item:
-                after_name = os.path.basename(item.data(Qt.UserRole)) if item.data(Qt.UserRole) else item.text()
+            rows = self.selected_rows() or ([start] if start >= 0 else [])
+            self.clip_model.move_rows(rows, self._drop_row(event.pos()))
+            end = self.currentIndex().row()
+            after_name = self._row_name(end)
             if start != -1 and start != end:
                 self.drag_completed.emit(start, end, before_name, after_name)
             elif start != -1:
                 self.drag_cancelled.emit(start, before_name)
             self._drag_start_row = -1
             self._drag_start_name = "Unknown"
+            event.setDropAction(Qt.MoveAction)
             event.accept()
         else:
             if event.mimeData().hasUrls():
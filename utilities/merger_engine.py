@@ -13,7 +13,7 @@ class MergerEngine(QThread):
     finished = pyqtSignal(bool, str)
     log_line = pyqtSignal(str)
 
-    def __init__(self, ffmpeg_path, cmd_base, output_path, total_duration_sec=0, use_gpu=False, target_v_bitrate=0, target_a_bitrate=0, target_a_rate=48000, quality_level=4):
+    def __init__(self, ffmpeg_path, cmd_base, output_path, total_duration_sec=0, use_gpu=False, target_v_bitrate=0, target_a_bitrate=0, target_a_rate=48000, quality_level=4, prepass_jobs=None, copy_video=False):
         super().__init__()
         self.ffmpeg_path = ffmpeg_path
         self.cmd_base = cmd_base
@@ -28,6 +28,9 @@ class MergerEngine(QThread):
         self._process = None
         self._is_cancelled = False
         self._last_time_str = "00:00:00"
+        self.prepass_jobs = list(prepass_jobs or [])
+        self.copy_video = bool(copy_video)
+        self._pass_span = (0.0, 100.0, self.total_duration)
 
     def _cmd_base_with_decode_flags(self):
         return list(self.cmd_base)
@@ -106,17 +109,108 @@ class MergerEngine(QThread):
             base.extend(v_bitrate_args)
         return base
 
+    def _execute(self, cmd):
+        """Runs one ffmpeg pass with live progress; returns (returncode, log tail), or (None, tail) once cancellation or a launch failure was reported."""
+        self.logger.info(f"ENGINE: Executing: {' '.join(cmd)}")
+        startupinfo = None
+        if os.name == 'nt':
+            startupinfo = subprocess.STARTUPINFO()
+            startupinfo.dwFlags |= subprocess.STARTF_USESHOWWINDOW
+        try:
+            self._process = subprocess.Popen(
+                cmd,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.STDOUT,
+                stdin=subprocess.DEVNULL,
+                universal_newlines=True,
+                encoding='utf-8',
+                errors='replace',
+                startupinfo=startupinfo,
+                creationflags=subprocess.CREATE_NO_WINDOW if os.name == 'nt' else 0
+            )
+        except Exception as e:
+            self.finished.emit(False, f"Failed to start FFmpeg: {e}")
+            return None, []
+        log_queue = queue.Queue()
+
+        def _reader_thread(proc, q):
+            try:
+                for line in iter(proc.stdout.readline, ''):
+                    q.put(line)
+                proc.stdout.close()
+            except: pass
+        t = threading.Thread(target=_reader_thread, args=(self._process, log_queue))
+        t.daemon = True
+        t.start()
+        log_buffer = []
+        while True:
+            if self._is_cancelled:
+                break
+            try:
+                line = log_queue.get(timeout=0.1)
+                line = line.strip()
+                if not line: continue
+                self.log_line.emit(line)
+                if '=' in line:
+                    self._parse_progress_v2(line)
+                else:
+                    self._parse_progress(line)
+                log_buffer.append(line)
+                if len(log_buffer) > 100:
+                    log_buffer.pop(0)
+            except queue.Empty:
+                if not t.is_alive():
+                    break
+        if self._is_cancelled:
+            self._kill_process()
+            self.finished.emit(False, "Cancelled by user.")
+            return None, log_buffer
+        self._process.wait()
+        self.logger.info(f"FFMPEG LOG DUMP:\n" + "\n".join(log_buffer))
+        return self._process.returncode, log_buffer
+
+    def _error_tail(self, log_buffer, rc):
+        important = [
+            l for l in log_buffer
+            if re.search(r"error|failed|invalid|unable|cannot|no such", l, re.IGNORECASE)
+        ]
+        return "\n".join(important[-12:] if important else log_buffer[-12:]) or f"Exit Code {rc}"
+
+    def _audio_args(self):
+        a_rate = f"{self.target_a_rate}" if self.target_a_rate > 0 else "48000"
+        return ["-c:a", "aac", "-ar", a_rate, "-b:a", f"{self._audio_bitrate_kbps()}k"]
+
+    def _run_prepass(self, video_flags):
+        """Smart render: conforms only the outlier clips to the majority profile before the stream-copy concat."""
+        prepass_sec = sum(max(0.1, float(job.get("duration") or 0.0)) for job in self.prepass_jobs)
+        prepass_share = 100.0 * prepass_sec / (prepass_sec + self.total_duration * 0.1)
+        done = 0.0
+        for n, job in enumerate(self.prepass_jobs, 1):
+            dur = max(0.1, float(job.get("duration") or 0.0))
+            self._pass_span = (prepass_share * done / prepass_sec, prepass_share * (done + dur) / prepass_sec, dur)
+            self.log_line.emit(f"SMART RENDER: conforming clip {n}/{len(self.prepass_jobs)}: {os.path.basename(str(job.get('path')))}")
+            audio = ["-c:a", "aac", "-b:a", f"{self._audio_bitrate_kbps()}k"] if job.get("audio") else ["-an"]
+            cmd = [self.ffmpeg_path, "-y", "-hide_banner", "-progress", "pipe:1"] + list(job["args"]) + audio + list(video_flags) + list(job.get("video_args") or []) + [str(job["output"])]
+            rc, log_buffer = self._execute(cmd)
+            if rc is None:
+                return False
+            if rc != 0 or not os.path.exists(job["output"]) or os.path.getsize(job["output"]) <= 0:
+                err_msg = self._error_tail(log_buffer, rc)
+                self.logger.error(f"SMART RENDER: conform pass failed for {job.get('path')}:\n{err_msg}")
+                self.finished.emit(False, f"Encoding Failed:\n{err_msg}")
+                return False
+            done += dur
+        self._pass_span = (prepass_share, 100.0, self.total_duration)
+        return True
+
     def run(self):
         while True:
             self._is_cancelled = False
             cmd = [self.ffmpeg_path, "-y", "-hide_banner", "-progress", "pipe:1"] + self._cmd_base_with_decode_flags()
-            a_bitrate = f"{self._audio_bitrate_kbps()}k"
-            a_rate = f"{self.target_a_rate}" if self.target_a_rate > 0 else "48000"
-            cmd.extend(["-c:a", "aac", "-ar", a_rate, "-b:a", a_bitrate])
+            cmd.extend(self._audio_args())
             try:
                 video_flags = self._detect_gpu_encoder()
                 used_cpu = len(video_flags) >= 2 and video_flags[1] == "libx264"
-                cmd.extend(video_flags)
             except Exception as e:
                 if self.use_gpu:
                     msg = f"GPU setup failed and CPU fallback is disabled: {e}"
@@ -125,75 +219,20 @@ class MergerEngine(QThread):
                     return
                 self.finished.emit(False, str(e))
                 return
-            cmd.append(str(self.output_path))
-            self.logger.info(f"ENGINE: Executing: {' '.join(cmd)}")
-            startupinfo = None
-            if os.name == 'nt':
-                startupinfo = subprocess.STARTUPINFO()
-                startupinfo.dwFlags |= subprocess.STARTF_USESHOWWINDOW
-            try:
-                self._process = subprocess.Popen(
-                    cmd,
-                    stdout=subprocess.PIPE,
-                    stderr=subprocess.STDOUT,
-                    stdin=subprocess.DEVNULL,
-                    universal_newlines=True,
-                    encoding='utf-8',
-                    errors='replace',
-                    startupinfo=startupinfo,
-                    creationflags=subprocess.CREATE_NO_WINDOW if os.name == 'nt' else 0
-                )
-            except Exception as e:
-                self.finished.emit(False, f"Failed to start FFmpeg: {e}")
+            if self.prepass_jobs and not self._run_prepass(video_flags):
                 return
-            log_queue = queue.Queue()
-
-            def _reader_thread(proc, q):
-                try:
-                    for line in iter(proc.stdout.readline, ''):
-                        q.put(line)
-                    proc.stdout.close()
-                except: pass
-            t = threading.Thread(target=_reader_thread, args=(self._process, log_queue))
-            t.daemon = True
-            t.start()
-            log_buffer = []
-            while True:
-                if self._is_cancelled:
-                    break
-                try:
-                    line = log_queue.get(timeout=0.1)
-                    line = line.strip()
-                    if not line: continue
-                    self.log_line.emit(line)
-                    if '=' in line:
-                        self._parse_progress_v2(line)
-                    else:
-                        self._parse_progress(line)
-                    log_buffer.append(line)
-                    if len(log_buffer) > 100:
-                        log_buffer.pop(0)
-                except queue.Empty:
-                    if not t.is_alive():
-                        break
-            if self._is_cancelled:
-                self._kill_process()
-                self.finished.emit(False, "Cancelled by user.")
+            cmd.extend(["-c:v", "copy"] if self.copy_video else video_flags)
+            cmd.append(str(self.output_path))
+            rc, log_buffer = self._execute(cmd)
+            if rc is None:
                 return
-            self._process.wait()
-            rc = self._process.returncode
-            self.logger.info(f"FFMPEG LOG DUMP:\n" + "\n".join(log_buffer))
             if rc == 0:
                 if os.path.exists(self.output_path) and os.path.getsize(self.output_path) > 0:
                     self.finished.emit(True, str(self.output_path))
                 else:
                     self.finished.emit(False, "Render complete but output file is empty.")
             else:
-                important = [
-                    l for l in log_buffer
-                    if re.search(r"error|failed|invalid|unable|cannot|no such", l, re.IGNORECASE)
-                ]
-                err_msg = "\n".join(important[-12:] if important else log_buffer[-12:]) or f"Exit Code {rc}"
+                err_msg = self._error_tail(log_buffer, rc)
                 self.logger.error(f"FFMPEG ERROR OUTPUT:\n" + err_msg)
                 if self.use_gpu and not used_cpu:
                     self.logger.error("Hardware encode failed during merge; CPU fallback is disabled.")
@@ -202,15 +241,18 @@ class MergerEngine(QThread):
                 self.finished.emit(False, f"Encoding Failed:\n{err_msg}")
             break
 
+    def _span_percent(self, current_sec):
+        start, end, span_sec = self._pass_span
+        frac = max(0.0, min(1.0, current_sec / max(0.1, span_sec)))
+        return max(0, min(100, int(start + (end - start) * frac)))
+
     def _parse_progress_v2(self, line):
         if 'out_time_us=' in line:
             try:
                 _, val = line.split('=')
                 us = int(val)
                 current_sec = us / 1000000.0
-                pct = int((current_sec / self.total_duration) * 100)
-                pct = max(0, min(100, pct))
-                self.progress.emit(pct, f"{int(current_sec)}s")
+                self.progress.emit(self._span_percent(current_sec), f"{int(current_sec)}s")
             except Exception:
                 pass
 
@@ -221,8 +263,7 @@ class MergerEngine(QThread):
                 if match:
                     h, m, s = map(float, match.groups())
                     current_sec = h*3600 + m*60 + s
-                    pct = int((current_sec / self.total_duration) * 100)
-                    pct = max(0, min(100, pct))
+                    pct = self._span_percent(current_sec)
                     self._last_time_str = f"{int(h):02}:{int(m):02}:{int(s):02}"
                     self.progress.emit(pct, self._last_time_str)
             except (ValueError, TypeError, ZeroDivisionError, AttributeError) as e:
@@ -2,11 +2,11 @@
     def update_button_states(self):
         n = self.parent.listw.count()
         is_processing = self.parent.is_processing
-        selected_items = self.parent.listw.selectedItems()
-        is_single_selection = len(selected_items) == 1
+        selected_rows = self.parent.listw.selected_rows()
+        is_single_selection = len(selected_rows) == 1
         self.parent.add_music_checkbox.setEnabled(n >= 1 and not is_processing)
         self.parent.btn_merge.setEnabled(n >= 1 and not is_processing)
-        self.parent.btn_remove.setEnabled(bool(selected_items) and not is_processing)
+        self.parent.btn_remove.setEnabled(bool(selected_rows) and not is_processing)
         self.parent.btn_clear.setEnabled(n > 0 and not is_processing)
         self.parent.btn_add.setEnabled(not is_processing and n < self.parent.MAX_FILES)
         self.parent.btn_add_folder.setEnabled(not is_processing and n < self.parent.MAX_FILES)
@@ -25,7 +25,7 @@
         if hasattr(self.parent, "btn_redo"):
             self.parent.btn_redo.setEnabled(redo_enabled)
         if is_single_selection and not is_processing:
-            current_row = self.parent.listw.row(selected_items[0])
+            current_row = selected_rows[0]
             self.parent.btn_up.setEnabled(current_row > 0)
             self.parent.btn_down.setEnabled(current_row < n - 1)
         else:
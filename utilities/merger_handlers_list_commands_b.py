@@ -1,6 +1,5 @@
 import os
 from PyQt5.QtWidgets import QUndoCommand
-from PyQt5.QtCore import Qt
 
 class AddCommand(QUndoCommand):
     def __init__(self, parent, items_data, list_widget):
@@ -10,56 +9,32 @@ class AddCommand(QUndoCommand):
         self.list_widget = list_widget
 
     def redo(self):
+        self.parent.event_handler._add_items_internal(self.items_data)
         for entry in self.items_data:
-            path = entry["path"]
-            self.parent.event_handler._add_single_item_internal(
-                path,
-                row=entry.get("row"),
-                probe_data=entry.get("probe_data"),
-                f_hash=entry.get("f_hash"),
-                clip_id=entry.get("clip_id"),
-                refresh=False
-            )
-            self.parent.logger.info(f"LIST: Added file '{os.path.basename(path)}' at row {entry.get('row')}")
-        self.parent.event_handler.refresh_ranks()
+            self.parent.logger.info(f"LIST: Added file '{os.path.basename(entry['path'])}' at row {entry.get('row')}")
 
     def undo(self):
-        for entry in self.items_data:
-            clip_id = entry.get("clip_id")
-            for i in range(self.list_widget.count()):
-                it = self.list_widget.item(i)
-                if it.data(Qt.UserRole + 3) == clip_id:
-                    self.list_widget.takeItem(i)
-                    self.parent.logger.info(f"UNDO: Removed file '{os.path.basename(entry.get('path'))}'")
-                    break
-        self.parent.event_handler.refresh_ranks()
+        removed = self.list_widget.clip_model.remove_clip_ids([entry.get("clip_id") for entry in self.items_data])
+        for entry in removed:
+            self.parent.logger.info(f"UNDO: Removed file '{os.path.basename(entry.get('path'))}'")
 
 class RemoveCommand(QUndoCommand):
-    def __init__(self, parent, items, list_widget):
-        super().__init__(f"Remove {len(items)} videos")
+    def __init__(self, parent, rows, list_widget):
+        super().__init__(f"Remove {len(rows)} videos")
         self.parent = parent
-        self.items_data = []
         self.list_widget = list_widget
-        self.items_data = sorted(
-            [(list_widget.row(it), it.data(Qt.UserRole), it.data(Qt.UserRole + 1), it.data(Qt.UserRole + 2), it.data(Qt.UserRole + 3)) for it in items], 
-            key=lambda x: x[0], reverse=True
-        )
+        model = list_widget.clip_model
+        self.items_data = [dict(model.entry(r), row=r) for r in sorted(rows) if model.entry(r)]
 
     def redo(self):
-        for row, path, _, _, clip_id in self.items_data:
-            for i in range(self.list_widget.count()):
-                it = self.list_widget.item(i)
-                if it.data(Qt.UserRole + 3) == clip_id:
-                    self.list_widget.takeItem(i)
-                    self.parent.logger.info(f"LIST: Removed file '{os.path.basename(path)}' from row {row}")
-                    break
-        self.parent.event_handler.refresh_ranks()
+        removed = self.list_widget.clip_model.remove_clip_ids([entry["clip_id"] for entry in self.items_data])
+        for entry in reversed(removed):
+            self.parent.logger.info(f"LIST: Removed file '{os.path.basename(entry['path'])}' from row {entry['row']}")
 
     def undo(self):
-        for row, path, probe_data, f_hash, clip_id in reversed(self.items_data):
-            self.parent.event_handler._add_single_item_internal(path, row, probe_data, f_hash, clip_id=clip_id, refresh=False)
-            self.parent.logger.info(f"UNDO: Restored file '{os.path.basename(path)}' to row {row}")
-        self.parent.event_handler.refresh_ranks()
+        self.parent.event_handler._add_items_internal(self.items_data)
+        for entry in self.items_data:
+            self.parent.logger.info(f"UNDO: Restored file '{os.path.basename(entry['path'])}' to row {entry['row']}")
 
 class ClearCommand(QUndoCommand):
     def __init__(self, parent, items_data, list_widget):
@@ -69,19 +44,9 @@ class ClearCommand(QUndoCommand):
         self.list_widget = list_widget
 
     def redo(self):
-        self.list_widget.clear()
+        self.list_widget.clip_model.clear_clips()
         self.parent.logger.info(f"LIST: Cleared all {len(self.items_data)} items from list")
 
     def undo(self):
-        for entry in self.items_data:
-            path = entry["path"]
-            self.parent.event_handler._add_single_item_internal(
-                path,
-                row=entry.get("row"),
-                probe_data=entry.get("probe_data"),
-                f_hash=entry.get("f_hash"),
-                clip_id=entry.get("clip_id"),
-                refresh=False
-            )
+        self.parent.event_handler._add_items_internal(self.items_data)
         self.parent.logger.info(f"UNDO: Restored {len(self.items_data)} items to list")
-        self.parent.event_handler.refresh_ranks()
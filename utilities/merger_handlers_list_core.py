@@ -20,16 +20,7 @@ class MergerHandlersListCoreMixin:
 
     def _snapshot_order(self):
         """Create a complete snapshot of all item data for undo/redo operations."""
-        out = []
-        for i in range(self.parent.listw.count()):
-            it = self.parent.listw.item(i)
-            out.append({
-                "clip_id": it.data(Qt.UserRole + 3),
-                "path": it.data(Qt.UserRole),
-                "probe_data": it.data(Qt.UserRole + 1),
-                "f_hash": it.data(Qt.UserRole + 2),
-            })
-        return out
+        return self.parent.listw.clip_model.entries()
 
     def setup_list_connections(self):
         self.parent.listw.setContextMenuPolicy(Qt.CustomContextMenu)
@@ -52,20 +43,3 @@ class MergerHandlersListCoreMixin:
         self.sel_all_shortcut.activated.connect(self.parent.listw.selectAll)
         self.esc_shortcut = QShortcut(QKeySequence("Esc"), self.parent)
         self.esc_shortcut.activated.connect(self.parent.listw.clearSelection)
-
-    def refresh_ranks(self):
-        """Update all ranking labels (#1, #2, etc.) based on current list order."""
-        for i in range(self.parent.listw.count()):
-            item = self.parent.listw.item(i)
-            w = self.parent.listw.itemWidget(item)
-            if w and hasattr(w, 'rank_label'):
-                w.rank_label.setText(f"#{i + 1}")
-
-    def refresh_selection_highlights(self):
-        """Sync the visual 'marked' state of custom widgets with their list selection state."""
-        listw = self.parent.listw
-        for i in range(listw.count()):
-            item = listw.item(i)
-            w = listw.itemWidget(item)
-            if w and hasattr(w, 'set_marked'):
-                w.set_marked(item.isSelected())
@@ -1,5 +1,4 @@
 ﻿import os
-from PyQt5.QtCore import Qt
 from utilities.merger_handlers_list_commands_a import ReorderCommand, BatchMoveCommand
 from utilities.merger_handlers_list_commands_b import RemoveCommand, ClearCommand
 
@@ -7,7 +6,7 @@ class MergerHandlersListEditMixin:
     def remove_selected(self):
         if self.parent.is_processing:
             return
-        selected = self.parent.listw.selectedItems()
+        selected = self.parent.listw.selected_rows()
         if not selected: return
         self.parent.logger.info(f"USER: Clicked REMOVE SELECTED ({len(selected)} items selected)")
         cmd = RemoveCommand(self.parent, selected, self.parent.listw)
@@ -21,16 +20,7 @@ class MergerHandlersListEditMixin:
             return
         if self.parent.listw.count() == 0: return
         self.parent.logger.info("USER: Clicked CLEAR ALL")
-        items_data = []
-        for i in range(self.parent.listw.count()):
-            it = self.parent.listw.item(i)
-            items_data.append({
-                "row": i,
-                "path": it.data(Qt.UserRole),
-                "probe_data": it.data(Qt.UserRole + 1),
-                "f_hash": it.data(Qt.UserRole + 2),
-                "clip_id": it.data(Qt.UserRole + 3),
-            })
+        items_data = [dict(entry, row=i) for i, entry in enumerate(self._snapshot_order())]
         self.undo_stack.push(ClearCommand(self.parent, items_data, self.parent.listw))
         self.parent.set_status_message("List cleared", "color: #e74c3c;", 2000, force=True)
         self.parent.logic_handler.request_save_config()
@@ -38,11 +28,10 @@ class MergerHandlersListEditMixin:
     def move_item(self, direction: int):
         if self.parent.is_processing:
             return
-        sel = self.parent.listw.selectedItems()
-        if not sel: return
+        rows = self.parent.listw.selected_rows()
+        if not rows: return
         dir_name = "UP" if direction < 0 else "DOWN"
-        self.parent.logger.info(f"USER: Clicked MOVE {dir_name} ({len(sel)} items selected)")
-        rows = sorted([self.parent.listw.row(i) for i in sel])
+        self.parent.logger.info(f"USER: Clicked MOVE {dir_name} ({len(rows)} items selected)")
         if not rows: return
         before = self._snapshot_order()
         if direction < 0 and rows[0] == 0:
@@ -68,8 +57,6 @@ class MergerHandlersListEditMixin:
     def on_drag_completed(self, start_row, end_row, path, tag):
         if start_row == end_row: return
         self.parent.logger.info(f"USER: Drag reordered '{os.path.basename(path)}' from row {start_row} to {end_row}")
-        if hasattr(self.parent.logic_handler, "ensure_item_widgets_consistent"):
-            self.parent.logic_handler.ensure_item_widgets_consistent()
         self.parent.logic_handler.request_save_config()
         self.parent.event_handler.update_button_states()
         self.parent.set_status_message("Order updated", "color: #7289da;", 1200, force=True)
@@ -77,12 +64,10 @@ class MergerHandlersListEditMixin:
     def on_drag_started(self, *_):
         self._order_before_drag = self._snapshot_order()
 
-    def on_rows_moved(self, sourceParent, sourceStart, sourceEnd, destinationParent, destinationRow):
+    def on_rows_moved(self, *_):
         """Capture drag-reorder as a single undoable transaction."""
         if self._is_replaying_undo:
             return
-        if hasattr(self.parent.logic_handler, "ensure_item_widgets_consistent"):
-            self.parent.logic_handler.ensure_item_widgets_consistent()
         before = self._order_before_drag or []
         after = self._snapshot_order()
         if before and before != after:
@@ -1,18 +1,14 @@
 ﻿from pathlib import Path
 import uuid
 from PyQt5.QtWidgets import QMessageBox
-from PyQt5.QtCore import Qt
 from utilities.workers import FastFileLoaderWorker
 from utilities.merger_handlers_list_commands_b import AddCommand
 
 class MergerHandlersListLoadingWorkerMixin:
     def _start_file_loader(self, files):
-        current_count = self.parent.listw.count()
-        current_files = set()
-        if current_count > 0:
-             for i in range(current_count):
-                it = self.parent.listw.item(i)
-                current_files.add(it.data(Qt.UserRole))
+        model = self.parent.listw.clip_model
+        current_count = model.rowCount()
+        current_files = model.paths()
         room = max(0, int(self.parent.MAX_FILES - current_count))
         unique_candidates = []
         seen = set(current_files)
@@ -41,13 +37,7 @@ class MergerHandlersListLoadingWorkerMixin:
         self._loading_lock = True
         self.parent.set_ui_busy(True)
         self.parent.set_status_message("Loading files...", "color: #ffa500;", force=True)
-        existing_hashes = set()
-        if current_count > 0:
-             for i in range(current_count):
-                it = self.parent.listw.item(i)
-                h = it.data(Qt.UserRole + 2)
-                if h: existing_hashes.add(h)
-        self._loader = FastFileLoaderWorker(files, current_files, existing_hashes, self.parent.MAX_FILES, self.parent.ffmpeg)
+        self._loader = FastFileLoaderWorker(files, current_files, model.hashes(), self.parent.MAX_FILES, self.parent.ffmpeg)
         self._loader.file_loaded.connect(self._on_file_loaded)
         self._loader.progress.connect(self._on_loader_progress)
         self._loader.finished.connect(self._on_loading_finished)
@@ -1,15 +1,16 @@
 ﻿import os
 import uuid
 from PyQt5.QtWidgets import QMenu, QAction
-from PyQt5.QtCore import Qt, QPoint, QUrl
+from PyQt5.QtCore import QPoint, QUrl
 from PyQt5.QtGui import QDesktopServices
 from utilities.merger_handlers_list_commands_b import AddCommand
+from utilities.merger_clip_model import PATH_ROLE
 
 class MergerHandlersListMenuMixin:
     def show_context_menu(self, pos: QPoint):
-        item = self.parent.listw.itemAt(pos)
+        index = self.parent.listw.indexAt(pos)
         menu = QMenu(self.parent)
-        selected = self.parent.listw.selectedItems()
+        selected = self.parent.listw.selected_rows()
         add_action = QAction("Add Videos...", self.parent)
         add_action.triggered.connect(self.add_videos)
         menu.addAction(add_action)
@@ -19,15 +20,16 @@ class MergerHandlersListMenuMixin:
         quick_smart_add = QAction("Smart Add & Auto-Merge Prep", self.parent)
         quick_smart_add.triggered.connect(self.smart_add_and_prepare)
         menu.addAction(quick_smart_add)
-        if item:
-            if not item.isSelected():
-                self.parent.listw.setCurrentItem(item)
-            path = item.data(Qt.UserRole)
+        if index.isValid():
+            if not self.parent.listw.selectionModel().isSelected(index):
+                self.parent.listw.setCurrentIndex(index)
+            row = index.row()
+            path = index.data(PATH_ROLE)
             open_action = QAction("Open in Default Player", self.parent)
             open_action.triggered.connect(lambda: QDesktopServices.openUrl(QUrl.fromLocalFile(path)))
             menu.addAction(open_action)
             dup_action = QAction("Duplicate Item", self.parent)
-            dup_action.triggered.connect(lambda: self.duplicate_item(item))
+            dup_action.triggered.connect(lambda: self.duplicate_item(row))
             menu.addAction(dup_action)
             remove_action = QAction("Remove Selected", self.parent)
             remove_action.triggered.connect(self.remove_selected)
@@ -53,18 +55,10 @@ class MergerHandlersListMenuMixin:
         menu.addAction(redo_action)
         menu.exec_(self.parent.listw.mapToGlobal(pos))
 
-    def duplicate_item(self, item):
-        path = item.data(Qt.UserRole)
-        probe_data = item.data(Qt.UserRole + 1)
-        f_hash = item.data(Qt.UserRole + 2)
-        row = self.parent.listw.row(item) + 1
-        entry = {
-            "path": path,
-            "row": row,
-            "probe_data": probe_data,
-            "f_hash": f_hash,
-            "clip_id": uuid.uuid4().hex,
-        }
+    def duplicate_item(self, row):
+        source = self.parent.listw.clip_model.entry(row)
+        if not source: return
+        entry = dict(source, row=row + 1, clip_id=uuid.uuid4().hex)
         self.undo_stack.push(AddCommand(self.parent, [entry], self.parent.listw))
 
     def smart_add_and_prepare(self):
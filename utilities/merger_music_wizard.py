@@ -17,7 +17,7 @@ from utilities.merger_music_wizard_page3 import MergerMusicWizardStep3PageMixin
 from utilities.merger_music_wizard_navigation import MergerMusicWizardNavigationMixin
 from utilities.merger_music_wizard_waveform import MergerMusicWizardWaveformMixin
 from utilities.merger_music_wizard_playback import MergerMusicWizardPlaybackMixin
-from utilities.merger_music_wizard_timeline import MergerMusicWizardTimelineMixin
+from utilities.merger_music_wizard_timeline import MergerMusicWizardTimelineMixin, _forget_loaded_media
 from utilities.merger_music_wizard_misc import MergerMusicWizardMiscMixin
 try:
     import mpv
@@ -261,6 +261,7 @@ class MergerMusicWizard(
 
     def _release_player(self):
         """[FIX] Streamlined release sequence without heavy GC."""
+        _forget_loaded_media(self)
         try:
             self._safe_mpv_shutdown("_wizard_music_player")
             if getattr(self, '_owns_video_player', False):
@@ -2,6 +2,7 @@
 import time
 from PyQt5.QtWidgets import QMessageBox, QStyle, QWidget, QPushButton
 from PyQt5.QtCore import Qt, QTimer
+from utilities.merger_music_wizard_timeline import _forget_loaded_media
 
 class MergerMusicWizardNavigationMixin:
     def _on_nav_cancel_clicked(self):
@@ -141,7 +142,7 @@ class MergerMusicWizardNavigationMixin:
 
     def confirm_current_track(self):
         """Records the current track's offset selection and checks coverage."""
-        if self._player: self._player.stop()
+        if self._player: self._player.stop(); _forget_loaded_media(self, self._player)
         if hasattr(self, '_play_timer') and self._play_timer:
             try:
                 self._play_timer.stop()
@@ -158,6 +159,7 @@ class MergerMusicWizardNavigationMixin:
             self._editing_track_index = -1
         else:
             self.selected_tracks.append((self.current_track_path, offset, actual_dur))
+        self._music_time_index = None
         self.update_coverage_ui()
         if hasattr(self, "_refresh_selected_tracks_ui"):
             self._refresh_selected_tracks_ui()
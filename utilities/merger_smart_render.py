@@ -0,0 +1,112 @@
+﻿import os
+from collections import defaultdict
+from fractions import Fraction
+SMART_RENDER_ENV = "FVS_MERGER_SMART_RENDER"
+COPYABLE_VIDEO_CODECS = ("h264",)
+COPYABLE_PIX_FMTS = ("yuv420p",)
+COPYABLE_AUDIO_CODECS = ("aac",)
+H264_PROFILE_FLAGS = {"constrained baseline": "baseline", "baseline": "baseline", "main": "main", "high": "high"}
+SMART_RENDER_QUALITY_LEVEL = 4
+
+def smart_render_enabled(quality_level):
+    if os.environ.get(SMART_RENDER_ENV, "1").strip().lower() in ("0", "false", "no", "off"):
+        return False
+    return int(quality_level) == SMART_RENDER_QUALITY_LEVEL
+
+def fps_expr(fps):
+    try:
+        frac = Fraction(float(fps)).limit_denominator(1001)
+    except Exception:
+        return "30"
+    return str(frac.numerator) if frac.denominator == 1 else f"{frac.numerator}/{frac.denominator}"
+
+def _timescale(time_base):
+    try:
+        frac = Fraction(str(time_base or ""))
+    except (ValueError, ZeroDivisionError):
+        return 0
+    return frac.denominator if frac > 0 and frac.numerator == 1 else 0
+
+def clip_profile(info):
+    """
+    Everything the concat demuxer needs to match for a stream copy: codec, H.264 profile and level, size, rate,
+    stream timescale, pixel format, audio layout.
+    """
+    res = tuple(info.get("resolution") or (0, 0))
+    video = (
+        str(info.get("video_codec") or "").lower(), str(info.get("video_profile") or "").lower(), int(info.get("video_level") or 0),
+        int(res[0]), int(res[1]), fps_expr(info.get("video_fps") or 0.0), _timescale(info.get("video_time_base")), str(info.get("video_pix_fmt") or "").lower(),
+    )
+    if not info.get("has_audio"):
+        return video + ("", 0, 0)
+    return video + (str(info.get("audio_codec") or "").lower(), int(info.get("audio_rate") or 0), int(info.get("audio_channels") or 0))
+
+def _copyable(profile, needs_audio):
+    codec, h264_profile, level, w, h, fps, timescale, pix_fmt, a_codec, a_rate, a_channels = profile
+    if codec not in COPYABLE_VIDEO_CODECS or pix_fmt not in COPYABLE_PIX_FMTS or w <= 0 or h <= 0 or fps in ("0", ""):
+        return False
+    if h264_profile not in H264_PROFILE_FLAGS or level < 10 or timescale <= 0:
+        return False
+    if needs_audio:
+        return a_codec in COPYABLE_AUDIO_CODECS and a_rate > 0 and a_channels in (1, 2)
+    return not a_codec
+
+def plan_smart_render(infos):
+    """
+    Picks the profile covering the most running time and lists the clips that must be transcoded to it.
+    Returns None when the majority cannot be stream-copied or its profile, level or timescale is unknown (so an outlier
+    could not be encoded to match it); the caller then keeps the full re-encode graph.
+    """
+    if not infos:
+        return None
+    weights = defaultdict(float)
+    profiles = []
+    for info in infos:
+        profile = clip_profile(info)
+        profiles.append(profile)
+        weights[profile] += max(0.001, float(info.get("duration") or 0.0))
+    needs_audio = any(info.get("has_audio") for info in infos)
+    target = max(weights, key=lambda p: (weights[p], -profiles.index(p)))
+    if not _copyable(target, needs_audio):
+        return None
+    outliers = [
+        {"index": i, "path": info.get("path"), "duration": float(info.get("duration") or 0.0), "has_audio": bool(info.get("has_audio"))}
+        for i, (info, profile) in enumerate(zip(infos, profiles)) if profile != target
+    ]
+    if len(outliers) == len(infos):
+        return None
+    codec, h264_profile, level, w, h, fps, timescale, pix_fmt, a_codec, a_rate, a_channels = target
+    return {
+        "target": {
+            "width": w, "height": h, "fps": fps, "profile": H264_PROFILE_FLAGS[h264_profile], "level": f"{level // 10}.{level % 10}",
+            "timescale": timescale, "audio_rate": a_rate, "audio_channels": a_channels, "has_audio": needs_audio,
+        },
+        "outliers": outliers,
+    }
+
+def transcode_input_args(job, target):
+    """Input, mapping and filter arguments that conform one outlier clip to the target profile (encoder flags are added by the engine)."""
+    w, h = int(target["width"]), int(target["height"])
+    args = ["-i", job["path"]]
+    silent = target["has_audio"] and not job.get("has_audio")
+    if silent:
+        layout = "mono" if int(target["audio_channels"]) == 1 else "stereo"
+        args.extend(["-f", "lavfi", "-t", f"{max(0.05, float(job.get('duration') or 0.0)):.3f}", "-i", f"anullsrc=channel_layout={layout}:sample_rate={int(target['audio_rate'])}"])
+    args.extend(["-map", "0:v:0"])
+    if target["has_audio"]:
+        args.extend(["-map", "1:a:0" if silent else "0:a:0", "-ar", str(int(target["audio_rate"])), "-ac", str(int(target["audio_channels"]))])
+    args.extend([
+        "-vf",
+        f"scale={w}:{h}:force_original_aspect_ratio=decrease:flags=lanczos,pad={w}:{h}:(ow-iw)/2:(oh-ih)/2,setsar=1,fps={target['fps']},format=yuv420p",
+    ])
+    if silent:
+        args.append("-shortest")
+    return args
+
+def conform_output_args(target):
+    """
+    Output flags applied after the engine's encoder flags so a conformed clip carries the majority's H.264 profile,
+    level and track timescale; dump_extra repeats its SPS/PPS in-band so the copied concat never decodes it with the
+    first clip's parameter sets.
+    """
+    return ["-profile:v", str(target["profile"]), "-level:v", str(target["level"]), "-video_track_timescale", str(int(target["timescale"])), "-bsf:v", "dump_extra"]
@@ -3,8 +3,9 @@ import sys
 from PyQt5.QtWidgets import QWidget
 from PyQt5.QtCore import Qt, QRect, QPoint, pyqtSignal, QRectF
 from PyQt5.QtGui import QPainter, QColor, QFont, QPen, QBrush, QPixmap
+from ui.widgets.timeline_tiles import TiledTimelineMixin, TIMELINE_TILE_W
 
-class MergerTimelineWidget(QWidget):
+class MergerTimelineWidget(TiledTimelineMixin, QWidget):
     clicked_pos = pyqtSignal(float)
 
     def __init__(self, parent=None):
@@ -18,8 +19,7 @@ class MergerTimelineWidget(QWidget):
         self.setMouseTracking(True)
         self.setAttribute(Qt.WA_OpaquePaintEvent)
         self.setAttribute(Qt.WA_NoSystemBackground)
-        self._bg_buffer = QPixmap()
-        self._needs_repaint = True
+        self._init_tiles()
 
     def set_data(self, total_dur, videos, music):
         self.total_duration = max(0.1, total_dur)
@@ -34,19 +34,7 @@ class MergerTimelineWidget(QWidget):
             self.current_time = new_time
             self.update()
 
-    def resizeEvent(self, event):
-        self._needs_repaint = True
-        super().resizeEvent(event)
-
-    def _render_background(self):
-        """Draws the static heavy content (thumbnails, waveforms) to a pixmap."""
-        w = self.width()
-        h = self.height()
-        if w <= 0 or h <= 0: return
-        if self._bg_buffer.size() != self.size():
-            self._bg_buffer = QPixmap(self.size())
-        self._bg_buffer.fill(QColor(15, 25, 35))
-        p = QPainter(self._bg_buffer)
+    def _paint_background(self, p, w, h, clip_x0, clip_x1):
         p.setRenderHint(QPainter.Antialiasing, False)
         p.setRenderHint(QPainter.SmoothPixmapTransform, True)
         lane_h = 40.0
@@ -62,6 +50,9 @@ class MergerTimelineWidget(QWidget):
         for i, seg in enumerate(self.video_segments):
             dur = seg.get("duration", 0)
             seg_w = (dur / self.total_duration) * w
+            if current_x > clip_x1 + 2 or current_x + seg_w < clip_x0 - 2:
+                current_x += seg_w
+                continue
             rect_f = QRectF(current_x, v_y, seg_w, lane_h)
             p.save()
             p.setClipRect(rect_f)
@@ -73,7 +64,7 @@ class MergerTimelineWidget(QWidget):
                     t_render_w = seg_w / float(num_thumbs)
                     for t_idx, thumb in enumerate(thumbs):
                         t_pos_x = current_x + (t_idx * t_render_w)
-                        if t_pos_x < w and t_pos_x + t_render_w > 0:
+                        if t_pos_x < clip_x1 and t_pos_x + t_render_w > clip_x0:
                             p.drawPixmap(QRectF(t_pos_x, v_y, t_render_w + 0.5, lane_h), thumb, QRectF(thumb.rect()))
             else:
                 p.setPen(QPen(QColor(125, 211, 252, 120), 1))
@@ -96,6 +87,9 @@ class MergerTimelineWidget(QWidget):
         for i, seg in enumerate(self.music_segments):
             dur = seg.get("duration", 0)
             seg_w = (dur / self.total_duration) * w
+            if current_x > clip_x1 + 2 or current_x + seg_w < clip_x0 - 2:
+                current_x += seg_w
+                continue
             rect_f = QRectF(current_x, m_y, seg_w, lane_h)
             p.fillRect(rect_f, QColor(10, 20, 24))
             wave = seg.get("wave")
@@ -114,16 +108,14 @@ class MergerTimelineWidget(QWidget):
         p.setBrush(Qt.NoBrush)
         p.drawRect(QRectF(0, v_y, w, lane_h))
         p.drawRect(QRectF(0, m_y, w, lane_h))
-        p.end()
-        self._needs_repaint = False
 
     def paintEvent(self, event):
-        if self._needs_repaint or self._bg_buffer.isNull():
-            self._render_background()
+        w_i, h_i = self.width(), self.height()
+        if w_i <= 0 or h_i <= 0: return
         p = QPainter(self)
-        p.drawPixmap(0, 0, self._bg_buffer)
-        w = float(self.width())
-        h = float(self.height())
+        self._paint_tiles(p, event)
+        w = float(w_i)
+        h = float(h_i)
         caret_x = (self.current_time / self.total_duration) * w
         caret_top = -5.0
         p.setPen(QPen(QColor(52, 152, 219, 100), 6))
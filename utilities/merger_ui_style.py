@@ -232,7 +232,7 @@ class MergerUIStyleMixin:
                 font-family: "Helvetica Neue", Arial, sans-serif;
             }
             QLabel { font-size: 12px; padding: 5px; background: transparent; }
-            QListWidget {
+            QListWidget, QListView#mergerClipList {
                 background-color: #34495e;
                 border: 2px solid #266b89;
                 border-radius: 10px;
@@ -240,10 +240,10 @@ class MergerUIStyleMixin:
                 color: white;
                 outline: none;
             }
-            QListWidget::item {
+            QListWidget::item, QListView#mergerClipList::item {
                 background: transparent;
             }
-            QListWidget::item:selected {
+            QListWidget::item:selected, QListView#mergerClipList::item:selected {
                 background: transparent;
             }
             QRubberBand {
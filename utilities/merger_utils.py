@@ -17,6 +17,9 @@ def _proj_root() -> Path:
 
 def _conf_path() -> Path:
     return _proj_root() / "config" / "video_merger.conf"
+
+def _hash_index_path() -> Path:
+    return _proj_root() / "config" / "merger_hash_index.json"
 SESSION_ONLY_CONFIG_KEYS = {"music_widget"}
 
 def sanitize_persistent_config(cfg: dict) -> dict:
@@ -18,6 +18,7 @@ from utilities.merger_utils import _get_logger, _human, escape_ffmpeg_path, get_
 from utilities.merger_window_logic import MergerWindowLogic
 from utilities.workers import ProbeWorker
 from utilities.merger_engine import MergerEngine
+from utilities.merger_smart_render import smart_render_enabled, plan_smart_render, transcode_input_args, conform_output_args
 from utilities.merger_draggable_list import MergerDraggableList
 from utilities.merger_phase_overlay_mixin import MergerPhaseOverlayMixin
 from utilities.merger_phase_overlay_logic import MergerPhaseOverlayLogic
@@ -102,15 +103,7 @@ class VideoMergerWindow(QMainWindow, MergerPhaseOverlayMixin, MergerPhaseOverlay
 
     def _save_recovery_state(self):
         if not hasattr(self, "recovery_manager"): return
-        video_files = []
-        for i in range(self.listw.count()):
-            it = self.listw.item(i)
-            video_files.append({
-                "path": it.data(Qt.UserRole),
-                "probe_data": it.data(Qt.UserRole + 1),
-                "hash": it.data(Qt.UserRole + 2),
-                "clip_id": it.data(Qt.UserRole + 3)
-            })
+        video_files = [{"path": c["path"], "probe_data": c["probe_data"], "hash": c["f_hash"], "clip_id": c["clip_id"]} for c in self.listw.clip_model.entries()]
         state = {
             "assets": {
                 "video_files": video_files,
@@ -140,15 +133,10 @@ class VideoMergerWindow(QMainWindow, MergerPhaseOverlayMixin, MergerPhaseOverlay
         video_files = a.get("video_files", [])
         if video_files:
             self.event_handler.clear_all()
-            for item in video_files:
-                p = item.get("path")
-                if p and os.path.exists(p):
-                    self.event_handler._add_single_item_internal(
-                        p,
-                        probe_data=item.get("probe_data"),
-                        f_hash=item.get("hash"),
-                        clip_id=item.get("clip_id")
-                    )
+            self.event_handler._add_items_internal([
+                {"path": item.get("path"), "probe_data": item.get("probe_data"), "f_hash": item.get("hash"), "clip_id": item.get("clip_id")}
+                for item in video_files if item.get("path") and os.path.exists(item.get("path"))
+            ])
         if hasattr(self, "unified_music_widget"):
             w_tracks = a.get("wizard_tracks", [])
             if w_tracks:
@@ -174,6 +162,8 @@ class VideoMergerWindow(QMainWindow, MergerPhaseOverlayMixin, MergerPhaseOverlay
             listw.drag_completed.connect(self.event_handler.on_drag_completed)
         if hasattr(listw, "files_dropped"):
             listw.files_dropped.connect(self._handle_dropped_files)
+        if hasattr(listw, "preview_requested"):
+            listw.preview_requested.connect(self.event_handler.preview_file)
         return listw
 
     def add_videos(self):
@@ -212,9 +202,6 @@ class VideoMergerWindow(QMainWindow, MergerPhaseOverlayMixin, MergerPhaseOverlay
     def perform_move(self, from_row, to_row, rebuild_widget=False):
         self.logic_handler.perform_move(from_row, to_row, rebuild_widget)
 
-    def make_item_widget(self, path):
-        return self.event_handler.make_item_widget(path)
-
     def set_ui_busy(self, busy: bool):
         self.btn_add.setEnabled(not busy)
         self.btn_add_folder.setEnabled(not busy)
@@ -399,13 +386,15 @@ class VideoMergerWindow(QMainWindow, MergerPhaseOverlayMixin, MergerPhaseOverlay
     def connect_signals(self):
         self.event_handler.setup_list_connections()
         self.listw.itemSelectionChanged.connect(self.event_handler.update_button_states)
-        self.listw.itemSelectionChanged.connect(self.event_handler.refresh_selection_highlights)
         self.status_updated.connect(self.handle_status_update)
-        self.listw.model().rowsInserted.connect(self.event_handler.update_button_states)
-        self.listw.model().rowsRemoved.connect(self.event_handler.update_button_states)
-        self.listw.model().rowsRemoved.connect(self.on_list_cleared)
-        self.listw.model().rowsMoved.connect(self.event_handler.update_button_states)
-        self.listw.model().rowsMoved.connect(self.event_handler.on_rows_moved)
+        model = self.listw.clip_model
+        model.rowsInserted.connect(self.event_handler.update_button_states)
+        model.rowsRemoved.connect(self.event_handler.update_button_states)
+        model.rowsRemoved.connect(self.on_list_cleared)
+        model.modelReset.connect(self.event_handler.update_button_states)
+        model.modelReset.connect(self.on_list_cleared)
+        model.order_changed.connect(self.event_handler.update_button_states)
+        model.order_changed.connect(self.event_handler.on_rows_moved)
         self.btn_add.clicked.connect(self.add_videos)
         self.btn_add_folder.clicked.connect(self.event_handler.add_folder)
         self.btn_remove.clicked.connect(self.remove_selected)
@@ -502,15 +491,7 @@ class VideoMergerWindow(QMainWindow, MergerPhaseOverlayMixin, MergerPhaseOverlay
         return f"{h:02}:{m:02}:{s:02}"
 
     def estimate_total_duration_seconds(self) -> float:
-        total = 0.0
-        for i in range(self.listw.count()):
-            try:
-                it = self.listw.item(i)
-                probe_data = it.data(Qt.UserRole + 1) or {}
-                dur = float((probe_data.get("format") or {}).get("duration") or 0.0)
-                total += max(0.0, dur)
-            except Exception:
-                continue
+        total = self.listw.clip_model.total_duration()
         try:
             if hasattr(self, "unified_music_widget"):
                 self.unified_music_widget.set_video_total_seconds(total)
@@ -551,10 +532,9 @@ class VideoMergerWindow(QMainWindow, MergerPhaseOverlayMixin, MergerPhaseOverlay
 
     def _collect_preflight_warnings(self) -> list[str]:
         warnings = []
-        for i in range(self.listw.count()):
-            it = self.listw.item(i)
-            p = it.data(Qt.UserRole)
-            probe_data = it.data(Qt.UserRole + 1) or {}
+        for i, clip in enumerate(self.listw.clip_model.entries()):
+            p = clip["path"]
+            probe_data = clip["probe_data"] or {}
             streams = probe_data.get("streams") or []
             has_video = any((s.get("codec_type") == "video") or (s.get("width") and s.get("height")) for s in streams)
             if not has_video:
@@ -593,10 +573,7 @@ class VideoMergerWindow(QMainWindow, MergerPhaseOverlayMixin, MergerPhaseOverlay
             QMessageBox.information(self, "Need a video", "Please add at least 1 video to merge.")
             self.set_processing_state(False)
             return
-        video_files = []
-        for i in range(n):
-            it = self.listw.item(i)
-            video_files.append(it.data(Qt.UserRole))
+        video_files = self.listw.clip_model.ordered_paths()
         preflight_warnings = self._collect_preflight_warnings()
         if preflight_warnings:
             preview = "\n".join(preflight_warnings[:5])
@@ -728,14 +705,14 @@ class VideoMergerWindow(QMainWindow, MergerPhaseOverlayMixin, MergerPhaseOverlay
         total_v_dur = 0.0
         total_a_dur = 0.0
         peak_a_rate = 44100
-        for i in range(self.listw.count()):
-            it = self.listw.item(i)
-            path = it.data(Qt.UserRole)
+        infos = []
+        for path in self.listw.clip_model.ordered_paths():
             video_files.append(path)
             info = result_by_path.get(path)
             if not info:
                 self._merge_finished_cleanup(False, f"Probe data missing for file: {path}")
                 return
+            infos.append(info)
             dur = float(info.get("duration") or 0.0)
             v_bitrate = info.get("video_bitrate", 0)
             a_bitrate = info.get("audio_bitrate", 0)
@@ -768,6 +745,10 @@ class VideoMergerWindow(QMainWindow, MergerPhaseOverlayMixin, MergerPhaseOverlay
         target_v_bitrate = int(total_v_bits / total_v_dur) if total_v_dur > 0 else 0
         target_a_bitrate = int(total_a_bits / total_a_dur) if total_a_dur > 0 else 192000
         if peak_a_rate == 0: peak_a_rate = 48000
+        smart_plan = None
+        quality = self.quality_slider.value() if hasattr(self, "quality_slider") else 4
+        if smart_render_enabled(quality):
+            smart_plan = plan_smart_render(infos)
         self._finalize_merge_setup(
             video_files,
             total_duration,
@@ -779,6 +760,7 @@ class VideoMergerWindow(QMainWindow, MergerPhaseOverlayMixin, MergerPhaseOverlay
             peak_a_rate,
             audio_plan=audio_plan,
             audio_mixed=audio_mixed,
+            smart_plan=smart_plan,
         )
 
     def _finalize_merge_setup(
@@ -793,6 +775,7 @@ class VideoMergerWindow(QMainWindow, MergerPhaseOverlayMixin, MergerPhaseOverlay
         target_a_rate=48000,
         audio_plan=None,
         audio_mixed=False,
+        smart_plan=None,
     ):
         if not self.is_processing: return
         self._temp_dir = tempfile.TemporaryDirectory(prefix="fvs_merger_")
@@ -808,6 +791,28 @@ class VideoMergerWindow(QMainWindow, MergerPhaseOverlayMixin, MergerPhaseOverlay
         video_vol = self.unified_music_widget.get_video_volume()
         cmd = ["-y"]
         filters = []
+        prepass_jobs = []
+        concat_files = list(video_files)
+        if smart_plan:
+            target = smart_plan["target"]
+            normalize_video = audio_mixed = False
+            has_audio_input = bool(target["has_audio"])
+            if target["has_audio"]: target_a_rate = int(target["audio_rate"])
+            for job in smart_plan["outliers"]:
+                out = Path(self._temp_dir.name, f"smart_{job['index']}.mp4")
+                prepass_jobs.append({
+                    "path": job["path"],
+                    "duration": job["duration"],
+                    "args": transcode_input_args(job, target),
+                    "video_args": conform_output_args(target),
+                    "audio": target["has_audio"],
+                    "output": str(out),
+                })
+                concat_files[job["index"]] = str(out)
+            self.logger.info(
+                f"MERGE: Smart render - {len(video_files) - len(prepass_jobs)} clip(s) stream-copied, "
+                f"{len(prepass_jobs)} conformed to {target['width']}x{target['height']}@{target['fps']}"
+            )
         if normalize_video:
             tw, th = int(target_resolution[0]), int(target_resolution[1])
             for i, path in enumerate(video_files):
@@ -842,7 +847,7 @@ class VideoMergerWindow(QMainWindow, MergerPhaseOverlayMixin, MergerPhaseOverlay
             concat_txt = Path(self._temp_dir.name, "concat_list.txt")
             with concat_txt.open("w", encoding="utf-8") as f:
                 f.write("ffconcat version 1.0\n")
-                for path in video_files:
+                for path in concat_files:
                     f.write(f"file '{escape_ffmpeg_path(path)}'\n")
             cmd.extend(["-f", "concat", "-safe", "0", "-i", str(concat_txt)])
             map_video = "0:v"
@@ -908,7 +913,7 @@ class VideoMergerWindow(QMainWindow, MergerPhaseOverlayMixin, MergerPhaseOverlay
             self.ffmpeg, cmd, self._output_path, total_duration, 
             use_gpu=True, target_v_bitrate=target_v_bitrate, 
             target_a_bitrate=target_a_bitrate, target_a_rate=target_a_rate,
-            quality_level=quality
+            quality_level=quality, prepass_jobs=prepass_jobs, copy_video=bool(smart_plan)
         )
         self.engine.progress.connect(self._update_progress)
         self.engine.log_line.connect(self._append_log)
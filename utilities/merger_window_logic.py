@@ -1,8 +1,7 @@
 ﻿import os
 from pathlib import Path
 from PyQt5.QtCore import QByteArray
-from PyQt5.QtCore import QPropertyAnimation, QEasingCurve, Qt, QTimer, QPoint, QRect
-from PyQt5.QtWidgets import QLabel
+from PyQt5.QtCore import QTimer, QRect
 from utilities.merger_utils import _load_conf, _save_conf
 
 class MergerWindowLogic:
@@ -12,15 +11,6 @@ class MergerWindowLogic:
         self._save_timer.setSingleShot(True)
         self._save_timer.timeout.connect(self.save_config)
 
-    def _is_widget_alive(self, widget):
-        if not widget:
-            return False
-        try:
-            _ = widget.isVisible()
-            return True
-        except RuntimeError:
-            return False
-
     def load_config(self):
         self.window._cfg = _load_conf()
         self.window._last_dir = self.window._cfg.get("last_dir", str(Path.home() / "Downloads"))
@@ -113,98 +103,6 @@ class MergerWindowLogic:
     def set_last_out_dir(self, path):
         self.window._last_out_dir = path
 
-    def can_anim(self, row, new_row):
-        if row == new_row or not (0 <= row < self.window.listw.count()) or not (0 <= new_row < self.window.listw.count()):
-            return False
-        if getattr(self.window, "_animating", False):
-            return False
-        w_row = self.window.listw.itemWidget(self.window.listw.item(row))
-        w_new = self.window.listw.itemWidget(self.window.listw.item(new_row))
-        if not self._is_widget_alive(w_row) or not self._is_widget_alive(w_new):
-            return False
-        return True
-
-    def start_swap_animation(self, row, new_row):
-        ghost1 = None
-        ghost2 = None
-        a1 = None
-        a2 = None
-        try:
-            v = self.window.listw.viewport()
-            it1, it2 = self.window.listw.item(row), self.window.listw.item(new_row)
-            w1, w2 = self.window.listw.itemWidget(it1), self.window.listw.itemWidget(it2)
-            if not self._is_widget_alive(w1) or not self._is_widget_alive(w2):
-                return False
-            if not w1.isVisible() or not w2.isVisible():
-                self.window.listw.scrollToItem(it1)
-                if not w1.isVisible() or not w2.isVisible():
-                    self.perform_swap(row, new_row)
-                    return True
-            r1 = self.window.listw.visualItemRect(it1)
-            r2 = self.window.listw.visualItemRect(it2)
-            if r1.isNull() or r2.isNull():
-                return False
-            try:
-                pm1 = w1.grab()
-                pm2 = w2.grab()
-            except RuntimeError:
-                return False
-            ghost1 = QLabel(v); ghost1.setPixmap(pm1); ghost1.setAttribute(Qt.WA_TransparentForMouseEvents, True)
-            ghost1.setStyleSheet("background: transparent;")
-            ghost2 = QLabel(v); ghost2.setPixmap(pm2); ghost2.setAttribute(Qt.WA_TransparentForMouseEvents, True)
-            ghost2.setStyleSheet("background: transparent;")
-            ghost1.move(r1.topLeft()); ghost1.show()
-            ghost2.move(r2.topLeft()); ghost2.show()
-            w1.setVisible(False); w2.setVisible(False)
-            a1 = QPropertyAnimation(ghost1, b"pos", self.window); a1.setDuration(150)
-            a2 = QPropertyAnimation(ghost2, b"pos", self.window); a2.setDuration(150)
-            a1.setStartValue(r1.topLeft()); a1.setEndValue(r2.topLeft()); a1.setEasingCurve(QEasingCurve.InOutQuad)
-            a2.setStartValue(r2.topLeft()); a2.setEndValue(r1.topLeft()); a2.setEasingCurve(QEasingCurve.InOutQuad)
-            self.window._animating = True
-
-            def _cleanup_animation():
-                """Safe cleanup of animation resources."""
-                try:
-                    if w1: w1.setVisible(True)
-                    if w2: w2.setVisible(True)
-                    if ghost1: ghost1.deleteLater()
-                    if ghost2: ghost2.deleteLater()
-                    if a1: a1.deleteLater()
-                    if a2: a2.deleteLater()
-                except Exception as ex:
-                    self.window.logger.debug(f"Error cleaning up animation: {ex}")
-                finally:
-                    self.window._animating = False
-
-            def _finish():
-                try:
-                    self.perform_swap(row, new_row)
-                except Exception as ex:
-                    self.window.logger.debug(f"Error during swap animation finish: {ex}")
-                finally:
-                    _cleanup_animation()
-            animations_completed = [False, False]
-            
-            def _on_animation_finished(anim_index):
-                animations_completed[anim_index] = True
-                if all(animations_completed):
-                    _finish()
-            a1.finished.connect(lambda: _on_animation_finished(0))
-            a2.finished.connect(lambda: _on_animation_finished(1))
-            try:
-                a1.start()
-                a2.start()
-                return True
-            except Exception as ex:
-                self.window.logger.debug(f"Animation start failed: {ex}")
-                _cleanup_animation()
-                return False
-        except Exception as ex:
-            self.window.logger.debug(f"Animation setup failed: {ex}")
-            if hasattr(self.window, '_animating'):
-                self.window._animating = False
-            return False
-
     def perform_swap(self, row, new_row):
         """Redirects swap to move, as swapping neighbors is effectively a move."""
         self.perform_move(row, new_row)
@@ -212,62 +110,12 @@ class MergerWindowLogic:
     def perform_move(self, from_row, to_row, rebuild_widget: bool = False):
         """Robustly moves an item from from_row to to_row (insertion)."""
         listw = self.window.listw
-        if from_row == to_row or from_row < 0 or to_row < 0 or from_row >= listw.count() or to_row >= listw.count():
+        model = listw.clip_model
+        if from_row == to_row or from_row < 0 or to_row < 0 or from_row >= model.rowCount() or to_row >= model.rowCount():
             return
-        updates_prev = listw.updatesEnabled()
-        listw.setUpdatesEnabled(False)
-        blocker = None
-        try:
-            from PyQt5.QtCore import QSignalBlocker
-            blocker = QSignalBlocker(listw)
-        except Exception:
-            blocker = None
-        try:
-            item = listw.item(from_row)
-            if not item:
-                return
-            path = item.data(Qt.UserRole)
-            probe_data = item.data(Qt.UserRole + 1)
-            f_hash = item.data(Qt.UserRole + 2)
-            clip_id = item.data(Qt.UserRole + 3)
-            self.window.logger.info(f"LOGIC: Moving item '{os.path.basename(str(path))}' from index {from_row} to {to_row}.")
-            listw.takeItem(from_row)
-            self.window.event_handler._add_single_item_internal(
-                path,
-                row=to_row,
-                probe_data=probe_data,
-                f_hash=f_hash,
-                clip_id=clip_id,
-            )
-            item = listw.item(to_row)
-            listw.clearSelection()
-            item.setSelected(True)
-            listw.setCurrentItem(item)
-            self.ensure_item_widgets_consistent()
-            if hasattr(self.window.event_handler, 'update_button_states'):
-                self.window.event_handler.update_button_states()
-        finally:
-            if blocker is not None:
-                try:
-                    blocker.unblock()
-                except Exception:
-                    pass
-            listw.setUpdatesEnabled(updates_prev)
-
-    def ensure_item_widgets_consistent(self):
-        """Self-heal: ensure every row has a bound widget to prevent visual ghost blanks."""
-        listw = self.window.listw
-        for i in range(listw.count()):
-            try:
-                item = listw.item(i)
-                if not item:
-                    continue
-                if listw.itemWidget(item) is not None:
-                    continue
-                path = item.data(Qt.UserRole)
-                probe_data = item.data(Qt.UserRole + 1)
-                w = self.window.make_item_widget(path)
-                item.setSizeHint(w.sizeHint())
-                listw.setItemWidget(item, w)
-            except Exception:
-                continue
+        path = model.entry(from_row)["path"]
+        self.window.logger.info(f"LOGIC: Moving item '{os.path.basename(str(path))}' from index {from_row} to {to_row}.")
+        model.move_rows([from_row], to_row + 1 if to_row > from_row else to_row)
+        listw.select_rows([to_row])
+        if hasattr(self.window.event_handler, 'update_button_states'):
+            self.window.event_handler.update_button_states()
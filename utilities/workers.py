@@ -6,10 +6,16 @@ import math
 import logging
 import time
 import signal
+import threading
 import psutil
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from PyQt5.QtCore import QThread, pyqtSignal, QMutex, QMutexLocker
-from utilities.merger_utils import _ffprobe, _get_logger, kill_process_tree
+from system import probe_flight
+from utilities.merger_utils import _ffprobe, _get_logger, kill_process_tree, _hash_index_path
+HASH_INDEX_MAX_ENTRIES = 20000
+HASH_POOL_WORKERS = 4
+HASH_BATCH = 16
 
 def _safe_subprocess_run(cmd, timeout_seconds, logger, description="subprocess"):
     """
@@ -62,6 +68,107 @@ def _safe_subprocess_run(cmd, timeout_seconds, logger, description="subprocess")
             except:
                 pass
 
+def _partial_hash(filepath):
+    """Hashes first 256KB + middle 256KB + last 256KB + file size for robust duplicate detection (Issue #7)."""
+    try:
+        h = hashlib.sha256()
+        size = os.stat(filepath).st_size
+        h.update(str(size).encode('utf-8'))
+        with open(filepath, "rb") as f:
+            h.update(f.read(256 * 1024))
+            if size > 1024 * 1024:
+                f.seek(size // 2)
+                h.update(f.read(256 * 1024))
+            if size > 512 * 1024:
+                f.seek(-256 * 1024, 2)
+                h.update(f.read(256 * 1024))
+        return h.hexdigest()
+    except (OSError, IOError, MemoryError):
+        return None
+
+def _file_identity(st):
+    """Size, mtime and inode (the NTFS file index on Windows): any rewrite, replace or move-over changes it."""
+    return [int(st.st_size), int(st.st_mtime_ns), int(getattr(st, "st_ino", 0) or 0), int(getattr(st, "st_dev", 0) or 0)]
+
+class PartialHashIndex:
+    """
+    Persistent path -> partial-hash map so clips seen in earlier sessions are not read again.
+    Entries are trusted only while size, mtime and inode still match; the file keeps the most recently used entries.
+    """
+
+    def __init__(self, path, max_entries=HASH_INDEX_MAX_ENTRIES):
+        self.path = Path(path)
+        self.max_entries = max(1, int(max_entries))
+        self._lock = threading.Lock()
+        self._entries = {}
+        self._dirty = False
+        try:
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+            if isinstance(data, dict) and data.get("version") == 1 and isinstance(data.get("entries"), dict):
+                self._entries = {k: v for k, v in data["entries"].items() if isinstance(v, list) and len(v) == 6}
+        except (OSError, ValueError):
+            self._entries = {}
+
+    def __len__(self):
+        return len(self._entries)
+
+    def lookup(self, filepath, st):
+        with self._lock:
+            entry = self._entries.get(filepath)
+            if not entry or entry[:4] != _file_identity(st):
+                return None
+            entry[5] = time.time(); self._dirty = True
+            return entry[4]
+
+    def record(self, filepath, st, f_hash):
+        if not f_hash: return
+        with self._lock:
+            self._entries[filepath] = _file_identity(st) + [f_hash, time.time()]
+            self._dirty = True
+
+    def hash_file(self, filepath):
+        """Returns the stored hash when the file is unchanged, otherwise reads it and remembers the result."""
+        try:
+            st = os.stat(filepath)
+        except OSError:
+            return None
+        f_hash = self.lookup(filepath, st)
+        if f_hash:
+            return f_hash
+        f_hash = _partial_hash(filepath)
+        self.record(filepath, st, f_hash)
+        return f_hash
+
+    def flush(self):
+        with self._lock:
+            if not self._dirty: return True
+            entries = self._entries
+            if len(entries) > self.max_entries:
+                keep = sorted(entries, key=lambda k: entries[k][5], reverse=True)[:self.max_entries]
+                self._entries = entries = {k: entries[k] for k in keep}
+            payload = {"version": 1, "entries": entries}
+            self._dirty = False
+        tmp = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with open(tmp, "w", encoding="utf-8") as f: json.dump(payload, f, separators=(",", ":"))
+            os.replace(tmp, self.path)
+            return True
+        except OSError as e:
+            _get_logger().warning(f"Hash index save failed: {e}")
+            try: os.unlink(tmp)
+            except OSError: pass
+            return False
+_HASH_INDEX = None
+_HASH_INDEX_LOCK = threading.Lock()
+
+def partial_hash_index():
+    global _HASH_INDEX
+    with _HASH_INDEX_LOCK:
+        if _HASH_INDEX is None:
+            _HASH_INDEX = PartialHashIndex(_hash_index_path())
+        return _HASH_INDEX
+
 class FolderScanWorker(QThread):
     finished = pyqtSignal(list, str)
 
@@ -110,7 +217,7 @@ class FastFileLoaderWorker(QThread):
     progress = pyqtSignal(int, int)
     finished = pyqtSignal(int, int)
 
-    def __init__(self, files, existing_files, existing_hashes, max_limit, ffmpeg_path):
+    def __init__(self, files, existing_files, existing_hashes, max_limit, ffmpeg_path, hash_index=None):
         super().__init__()
         self.files = files
         self.existing_files = set(existing_files)
@@ -120,32 +227,31 @@ class FastFileLoaderWorker(QThread):
         self._cancelled = False
         self._mutex = QMutex()
         self.existing_file_sizes = {}
+        self.hash_index = hash_index
 
     def _calculate_partial_hash(self, filepath):
-        """Hashes first 256KB + middle 256KB + last 256KB + file size for robust duplicate detection (Issue #7)."""
-        try:
-            h = hashlib.sha256()
-            p = Path(filepath)
-            stat = p.stat()
-            size = stat.st_size
-            h.update(str(size).encode('utf-8'))
-            with open(filepath, "rb") as f:
-                h.update(f.read(256 * 1024))
-                if size > 1024 * 1024:
-                    f.seek(size // 2)
-                    h.update(f.read(256 * 1024))
-                if size > 512 * 1024:
-                    f.seek(-256 * 1024, 2)
-                    h.update(f.read(256 * 1024))
-            return h.hexdigest()
-        except (OSError, IOError, MemoryError):
-            return None
+        return _partial_hash(filepath)
+
+    def _hash_batch(self, pool, index, files):
+        """Hashes the next batch ahead of the probe loop: index hits cost one stat, misses are read in parallel."""
+        todo = [f for f in dict.fromkeys(files) if f not in self.existing_files]
+        return dict(zip(todo, pool.map(index.hash_file, todo)))
 
     def run(self):
+        index = self.hash_index or partial_hash_index()
+        pool = ThreadPoolExecutor(max_workers=HASH_POOL_WORKERS, thread_name_prefix="fvs_hash")
+        try:
+            self._load_files(pool, index)
+        finally:
+            pool.shutdown(wait=True)
+            index.flush()
+
+    def _load_files(self, pool, index):
         added = 0
         duplicates = 0
         room = self.max_limit - len(self.existing_files)
         total = max(1, len(self.files))
+        hashes = {}
         for idx, f in enumerate(self.files, start=1):
             with QMutexLocker(self._mutex):
                 if self._cancelled: break
@@ -154,7 +260,9 @@ class FastFileLoaderWorker(QThread):
             if f in self.existing_files:
                 duplicates += 1
                 continue
-            f_hash = self._calculate_partial_hash(f) or ""
+            if f not in hashes:
+                hashes = self._hash_batch(pool, index, self.files[idx - 1:idx - 1 + HASH_BATCH])
+            f_hash = hashes.get(f) or ""
             if f_hash and f_hash in self.existing_hashes:
                 duplicates += 1
                 continue
@@ -233,12 +341,12 @@ class ProbeWorker(QThread):
                     cmd = [
                         self.ffprobe,
                         "-v", "error",
-                        "-show_entries", "format=duration,bit_rate:stream=codec_type,width,height,codec_name,pix_fmt,r_frame_rate,sample_rate,channels,bit_rate",
+                        "-show_entries", "format=duration,bit_rate:stream=codec_type,width,height,codec_name,profile,level,time_base,pix_fmt,r_frame_rate,sample_rate,channels,bit_rate",
                         "-of", "json",
                         path,
                     ]
-                    success, stdout, stderr, error_msg = _safe_subprocess_run(
-                        cmd, timeout_s, logger, description=f"ffprobe {os.path.basename(path)}"
+                    success, stdout, stderr, error_msg = probe_flight.shared(
+                        cmd, lambda: list(_safe_subprocess_run(cmd, timeout_s, logger, description=f"ffprobe {os.path.basename(path)}")), timeout_s
                     )
                     if success and stdout:
                         payload = json.loads(stdout)
@@ -247,6 +355,9 @@ class ProbeWorker(QThread):
                         streams = payload.get("streams", []) or []
                         v_codec = ""
                         v_pix_fmt = ""
+                        v_profile = ""
+                        v_level = 0
+                        v_time_base = ""
                         v_fps = 0.0
                         v_bitrate = 0
                         a_codec = ""
@@ -258,6 +369,9 @@ class ProbeWorker(QThread):
                                 resolution = (int(s.get("width")), int(s.get("height")))
                                 v_codec = str(s.get("codec_name") or "")
                                 v_pix_fmt = str(s.get("pix_fmt") or "")
+                                v_profile = str(s.get("profile") or "")
+                                v_level = int(s.get("level") or 0)
+                                v_time_base = str(s.get("time_base") or "")
                                 v_bitrate = int(s.get("bit_rate") or 0)
                                 fr = str(s.get("r_frame_rate") or "0/1")
                                 try:
@@ -300,6 +414,9 @@ class ProbeWorker(QThread):
                     has_audio = False
                     v_codec = ""
                     v_pix_fmt = ""
+                    v_profile = ""
+                    v_level = 0
+                    v_time_base = ""
                     v_fps = 0.0
                     v_bitrate = 0
                     a_codec = ""
@@ -313,6 +430,9 @@ class ProbeWorker(QThread):
                     "has_audio": has_audio,
                     "video_codec": v_codec,
                     "video_pix_fmt": v_pix_fmt,
+                    "video_profile": v_profile,
+                    "video_level": v_level,
+                    "video_time_base": v_time_base,
                     "video_fps": v_fps,
                     "video_bitrate": v_bitrate,
                     "audio_codec": a_codec,